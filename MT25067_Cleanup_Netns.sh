@@ -19,10 +19,17 @@ if [ "$EUID" -ne 0 ]; then
     exit 1
 fi
 
+# Optional: number of namespace pairs created by MT25067_Setup_Netns.sh
+NUM_PAIRS=${1:-1}
+
 log_info "Cleaning up network namespaces..."
 
 # Delete namespaces (this automatically removes veth pair)
 ip netns del server_ns 2>/dev/null || true
 ip netns del client_ns 2>/dev/null || true
+for ((pair=1; pair<NUM_PAIRS; pair++)); do
+    ip netns del server_ns${pair} 2>/dev/null || true
+    ip netns del client_ns${pair} 2>/dev/null || true
+done
 
 log_info "✓ Cleanup complete!"
\ No newline at end of file
@@ -0,0 +1,101 @@
+/*
+ * MT25067
+ * Per-message latency histogram (HdrHistogram-style log-linear buckets)
+ * Shared by the Part A clients.
+ *
+ * Values are recorded in nanoseconds. Values below 2^HIST_SUB_BITS get one
+ * bucket each; every power-of-two range above that is split into
+ * 2^(HIST_SUB_BITS-1) equal buckets, so the relative error is bounded by
+ * 1/2^(HIST_SUB_BITS-1) (~0.8%) and memory is fixed (~34 KB) no matter how
+ * many messages are recorded.
+ *
+ * File layout (little endian), read by MT25067_PartD_Latency.py:
+ *   HistHeader (64 bytes) followed by uint64_t counts[num_buckets]
+ */
+
+#ifndef MT25067_LATENCY_HIST_H
+#define MT25067_LATENCY_HIST_H
+
+#include <stdio.h>
+#include <stdint.h>
+#include <string.h>
+#include <time.h>
+
+#define HIST_MAGIC "MT25HIST"
+#define HIST_VERSION 1
+#define HIST_SUB_BITS 8                         // 256 linear buckets
+#define HIST_MAX_EXP 40                         // 2^40 ns ~ 18 minutes
+#define HIST_SUB_COUNT (1u << HIST_SUB_BITS)
+#define HIST_HALF_COUNT (HIST_SUB_COUNT / 2)
+#define HIST_NUM_BUCKETS (HIST_SUB_COUNT + (HIST_MAX_EXP - HIST_SUB_BITS) * HIST_HALF_COUNT)
+
+typedef struct {
+    char magic[8];
+    uint32_t version;
+    uint32_t sub_bits;
+    uint32_t max_exp;
+    uint32_t num_buckets;
+    uint64_t total_count;
+    uint64_t min_ns;
+    uint64_t max_ns;
+    uint64_t sum_ns;
+    uint64_t reserved;
+} HistHeader;
+
+typedef struct {
+    HistHeader hdr;
+    uint64_t counts[HIST_NUM_BUCKETS];
+} LatencyHist;
+
+static inline uint64_t hist_now_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (uint64_t)ts.tv_sec * 1000000000ull + (uint64_t)ts.tv_nsec;
+}
+
+static inline void hist_init(LatencyHist *h) {
+    memset(h, 0, sizeof(*h));
+    memcpy(h->hdr.magic, HIST_MAGIC, sizeof(h->hdr.magic));
+    h->hdr.version = HIST_VERSION;
+    h->hdr.sub_bits = HIST_SUB_BITS;
+    h->hdr.max_exp = HIST_MAX_EXP;
+    h->hdr.num_buckets = HIST_NUM_BUCKETS;
+    h->hdr.min_ns = UINT64_MAX;
+}
+
+static inline uint32_t hist_bucket(uint64_t v) {
+    if (v < HIST_SUB_COUNT) {
+        return (uint32_t)v;
+    }
+    uint32_t msb = 63 - __builtin_clzll(v);
+    if (msb >= HIST_MAX_EXP) {
+        return HIST_NUM_BUCKETS - 1;            // clamp into the last bucket
+    }
+    uint32_t shift = msb - HIST_SUB_BITS + 1;
+    return HIST_SUB_COUNT + (msb - HIST_SUB_BITS) * HIST_HALF_COUNT
+           + (uint32_t)(v >> shift) - HIST_HALF_COUNT;
+}
+
+static inline void hist_record(LatencyHist *h, uint64_t v) {
+    h->counts[hist_bucket(v)]++;
+    h->hdr.total_count++;
+    h->hdr.sum_ns += v;
+    if (v < h->hdr.min_ns) h->hdr.min_ns = v;
+    if (v > h->hdr.max_ns) h->hdr.max_ns = v;
+}
+
+static inline int hist_write(const LatencyHist *h, const char *path) {
+    FILE *f = fopen(path, "wb");
+    if (!f) {
+        perror("fopen histogram");
+        return -1;
+    }
+    size_t ok = fwrite(h, sizeof(*h), 1, f);
+    if (fclose(f) != 0 || ok != 1) {
+        perror("write histogram");
+        return -1;
+    }
+    return 0;
+}
+
+#endif /* MT25067_LATENCY_HIST_H */
@@ -0,0 +1,262 @@
+/*
+ * MT25067
+ * Message layout and buffer arena shared by the Part A servers
+ *
+ * A message is <fields> string fields (default 8, -f) that together hold
+ * exactly message_size bytes; the sweep varies the count to change the
+ * scatter-gather width of sendmsg(). Two allocation modes:
+ * - heap (default): every field is its own malloc(), scattered across the
+ *   heap as in the original assignment layout
+ * - arena (-a, -A for huge pages): every message is one contiguous,
+ *   cache-line aligned slot carved from preallocated page-aligned slabs.
+ *   Freed slots go on a free list and are reused by the next message of
+ *   any thread, so the miss counters measure copies, not the allocator.
+ */
+
+#ifndef MT25067_MESSAGE_H
+#define MT25067_MESSAGE_H
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <pthread.h>
+#include <sys/mman.h>
+#include <sys/uio.h>
+
+#define NUM_STRING_FIELDS 8       // default field count (-f)
+#define MAX_STRING_FIELDS 128
+#define ARENA_SLAB_SIZE (2UL * 1024 * 1024)   // one 2 MB huge page
+#define ARENA_SLOT_ALIGN 64
+
+typedef struct {
+    int num_fields;
+    int size;
+    char *fields[MAX_STRING_FIELDS];
+    int field_len[MAX_STRING_FIELDS];
+    char *slot;                 // arena slot holding every field, NULL for heap
+} Message;
+
+typedef struct {
+    pthread_mutex_t lock;
+    int enabled;
+    int huge_pages;             // requested MAP_HUGETLB slabs
+    size_t slot_size;           // fixed by the first allocation
+    void *free_list;            // freed slots, linked through their first word
+    char *cursor, *limit;       // unused tail of the newest slab
+    void **slabs;
+    size_t *slab_lens;
+    int num_slabs;
+    int huge_slabs;             // slabs actually backed by huge pages
+    long slots_carved;
+    long slots_reused;
+} MessageArena;
+
+static MessageArena msg_arena = {PTHREAD_MUTEX_INITIALIZER, 0, 0, 0, NULL, NULL, NULL,
+                                 NULL, NULL, 0, 0, 0, 0};
+static int message_fields = NUM_STRING_FIELDS;
+
+/*
+ * Map one slab; with huge pages requested, fall back to normal pages
+ * (advised for transparent huge pages) when none are reserved
+ */
+static inline void* arena_map_slab(size_t len, int *huge) {
+    void *p = MAP_FAILED;
+    *huge = 0;
+    if (msg_arena.huge_pages) {
+        p = mmap(NULL, len, PROT_READ | PROT_WRITE,
+                 MAP_PRIVATE | MAP_ANONYMOUS | MAP_HUGETLB, -1, 0);
+        *huge = p != MAP_FAILED;
+    }
+    if (p == MAP_FAILED) {
+        p = mmap(NULL, len, PROT_READ | PROT_WRITE, MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+        if (p != MAP_FAILED && msg_arena.huge_pages) {
+            madvise(p, len, MADV_HUGEPAGE);
+        }
+    }
+    return p == MAP_FAILED ? NULL : p;
+}
+
+/*
+ * One slot of `size` bytes: a recycled one if available, else carved from
+ * the current slab (a new slab is mapped when it runs out)
+ */
+static inline char* arena_alloc(size_t size) {
+    pthread_mutex_lock(&msg_arena.lock);
+    if (!msg_arena.slot_size) {
+        msg_arena.slot_size = (size + ARENA_SLOT_ALIGN - 1) & ~(size_t)(ARENA_SLOT_ALIGN - 1);
+    }
+    char *slot = NULL;
+    if (size > msg_arena.slot_size) {
+        fprintf(stderr, "arena: %zu byte slot requested, arena holds %zu byte slots\n",
+                size, msg_arena.slot_size);
+    } else if (msg_arena.free_list) {
+        slot = (char*)msg_arena.free_list;
+        msg_arena.free_list = *(void**)slot;
+        msg_arena.slots_reused++;
+    } else {
+        if (msg_arena.cursor + msg_arena.slot_size > msg_arena.limit) {
+            size_t len = msg_arena.slot_size > ARENA_SLAB_SIZE
+                         ? (msg_arena.slot_size + ARENA_SLAB_SIZE - 1) & ~(ARENA_SLAB_SIZE - 1)
+                         : ARENA_SLAB_SIZE;
+            int huge;
+            char *slab = (char*)arena_map_slab(len, &huge);
+            void **slabs = (void**)realloc(msg_arena.slabs,
+                                           (msg_arena.num_slabs + 1) * sizeof(void*));
+            size_t *lens = (size_t*)realloc(msg_arena.slab_lens,
+                                            (msg_arena.num_slabs + 1) * sizeof(size_t));
+            if (slabs) msg_arena.slabs = slabs;
+            if (lens) msg_arena.slab_lens = lens;
+            if (!slab || !slabs || !lens) {
+                perror("arena slab");
+                if (slab) munmap(slab, len);
+                pthread_mutex_unlock(&msg_arena.lock);
+                return NULL;
+            }
+            msg_arena.slabs[msg_arena.num_slabs] = slab;
+            msg_arena.slab_lens[msg_arena.num_slabs] = len;
+            msg_arena.num_slabs++;
+            msg_arena.huge_slabs += huge;
+            msg_arena.cursor = slab;
+            msg_arena.limit = slab + len;
+        }
+        slot = msg_arena.cursor;
+        msg_arena.cursor += msg_arena.slot_size;
+        msg_arena.slots_carved++;
+    }
+    pthread_mutex_unlock(&msg_arena.lock);
+    return slot;
+}
+
+static inline void arena_free(char *slot) {
+    pthread_mutex_lock(&msg_arena.lock);
+    *(void**)slot = msg_arena.free_list;
+    msg_arena.free_list = slot;
+    pthread_mutex_unlock(&msg_arena.lock);
+}
+
+/*
+ * Print the slab usage and unmap every slab (after all handlers exited)
+ */
+static inline void arena_destroy(void) {
+    if (!msg_arena.enabled) {
+        return;
+    }
+    printf("Message arena: %ld slots of %zu bytes (%ld reused), %d slabs (%d huge pages)\n",
+           msg_arena.slots_carved, msg_arena.slot_size, msg_arena.slots_reused,
+           msg_arena.num_slabs, msg_arena.huge_slabs);
+    for (int i = 0; i < msg_arena.num_slabs; i++) {
+        munmap(msg_arena.slabs[i], msg_arena.slab_lens[i]);
+    }
+    free(msg_arena.slabs);
+    free(msg_arena.slab_lens);
+    msg_arena.slabs = NULL;
+    msg_arena.slab_lens = NULL;
+    msg_arena.num_slabs = 0;
+}
+
+/*
+ * Fields per message: the -f count, but at least one byte per field
+ */
+static inline int message_field_count(int message_size) {
+    return message_fields < message_size ? message_fields : message_size;
+}
+
+/*
+ * Validate -f and print the layout in use; 0 on success
+ */
+static inline int message_layout_init(int message_size) {
+    if (message_fields < 1 || message_fields > MAX_STRING_FIELDS) {
+        fprintf(stderr, "fields must be between 1 and %d\n", MAX_STRING_FIELDS);
+        return -1;
+    }
+    printf("Message layout: %d fields, %s\n", message_field_count(message_size),
+           !msg_arena.enabled ? "one malloc per field" :
+           msg_arena.huge_pages ? "contiguous arena slots (huge pages)" :
+           "contiguous arena slots");
+    return 0;
+}
+
+static inline void destroy_message(Message *msg) {
+    if (!msg) {
+        return;
+    }
+    if (msg->slot) {
+        arena_free(msg->slot);
+    } else {
+        for (int i = 0; i < msg->num_fields; i++) {
+            free(msg->fields[i]);
+        }
+    }
+    free(msg);
+}
+
+/*
+ * Allocate and initialize a message of message_size bytes split over
+ * message_field_count() fields (the first message_size % n fields get one
+ * extra byte, so the fields add up exactly)
+ */
+static inline Message* create_message(int message_size) {
+    Message *msg = (Message*)calloc(1, sizeof(Message));
+    if (!msg) {
+        perror("malloc message");
+        return NULL;
+    }
+    int n = message_field_count(message_size);
+    msg->num_fields = n;
+    msg->size = message_size;
+
+    if (msg_arena.enabled) {
+        msg->slot = arena_alloc(message_size);
+        if (!msg->slot) {
+            free(msg);
+            return NULL;
+        }
+    }
+
+    char *next = msg->slot;
+    for (int i = 0; i < n; i++) {
+        int len = message_size / n + (i < message_size % n);
+        // Arena: fields are adjacent in one slot; heap: one malloc each
+        msg->fields[i] = next ? next : (char*)malloc(len);
+        if (!msg->fields[i]) {
+            perror("malloc fields");
+            destroy_message(msg);
+            return NULL;
+        }
+        if (next) next += len;
+        msg->field_len[i] = len;
+
+        // Fill with dummy data ('A', 'B', ... per field)
+        memset(msg->fields[i], 'A' + i % 26, len - 1);
+        msg->fields[i][len - 1] = '\0';
+    }
+    return msg;
+}
+
+/*
+ * Serialize message into a buffer for sending
+ * Format: field1|field2|...|fieldN (the fields back to back)
+ */
+static inline int serialize_message(Message *msg, char *buffer, int buffer_size) {
+    int offset = 0;
+    for (int i = 0; i < msg->num_fields && offset < buffer_size; i++) {
+        int len = msg->field_len[i];
+        if (len > buffer_size - offset) len = buffer_size - offset;
+        memcpy(buffer + offset, msg->fields[i], len);
+        offset += len;
+    }
+    return offset;
+}
+
+/*
+ * Point one iovec at each field (NO COPY!); returns the iovec count
+ */
+static inline int setup_iovec(Message *msg, struct iovec *iov) {
+    for (int i = 0; i < msg->num_fields; i++) {
+        iov[i].iov_base = msg->fields[i];
+        iov[i].iov_len = msg->field_len[i];
+    }
+    return msg->num_fields;
+}
+
+#endif /* MT25067_MESSAGE_H */
@@ -0,0 +1,210 @@
+/*
+ * MT25067
+ * Multi-connection receive loop shared by the Part A clients (-n <conns>)
+ *
+ * One client process opens <conns> connections and drains all of them from
+ * a single epoll loop, so the Part C sweep can drive hundreds to thousands
+ * of concurrent connections without one process per connection.
+ *
+ * Output: one "Connection <k>:" line per connection (parsed as a separate
+ * client by MT25067_PartC_Collect.py) followed by the usual Results block
+ * summed over all connections.
+ */
+
+#ifndef MT25067_MULTI_CLIENT_H
+#define MT25067_MULTI_CLIENT_H
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <errno.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <arpa/inet.h>
+#include <sys/epoll.h>
+#include <sys/resource.h>
+#include <sys/socket.h>
+#include <sys/time.h>
+
+#include "MT25067_LatencyHist.h"
+#include "MT25067_Placement.h"
+#include "MT25067_Sampler.h"
+
+#define MULTI_RECV_BUFFER (256 * 1024)
+#define MULTI_EPOLL_BATCH 256
+
+// recv() flags of the receive loop; MSG_TRUNC discards the bytes in the
+// kernel instead of copying them to recv_buffer (Part A5)
+static int multi_recv_flags = 0;
+
+typedef struct {
+    int fd;
+    int messages;
+    long bytes;
+    long partial;               // bytes of the current message received so far
+    int done;
+    uint64_t last_ns;           // previous message completion (histogram)
+    struct timeval start, end;
+} ClientConn;
+
+static inline double tv_seconds(struct timeval tv) {
+    return tv.tv_sec + tv.tv_usec / 1e6;
+}
+
+static inline void client_conn_close(int epfd, ClientConn *c) {
+    gettimeofday(&c->end, NULL);
+    epoll_ctl(epfd, EPOLL_CTL_DEL, c->fd, NULL);
+    close(c->fd);
+    c->done = 1;
+}
+
+/*
+ * Connect `conns` sockets to ip:port and receive num_messages messages of
+ * message_size bytes on each. Returns 0 when every connection finished.
+ */
+static inline int run_multi_client(const char *ip, int port, int message_size,
+                                   int num_messages, int conns, LatencyHist *hist) {
+    struct rlimit rl;
+    if (getrlimit(RLIMIT_NOFILE, &rl) == 0 && (long)rl.rlim_cur < conns + 64) {
+        rl.rlim_cur = ((long)rl.rlim_max >= conns + 64 || rl.rlim_max == RLIM_INFINITY)
+                      ? (rlim_t)(conns + 64) : rl.rlim_max;
+        setrlimit(RLIMIT_NOFILE, &rl);
+    }
+
+    ClientConn *cs = (ClientConn*)calloc(conns, sizeof(ClientConn));
+    char *recv_buffer = (char*)malloc(MULTI_RECV_BUFFER);
+    int epfd = epoll_create1(0);
+    if (!cs || !recv_buffer || epfd < 0) {
+        perror("multi-client setup");
+        return -1;
+    }
+
+    struct sockaddr_in server_addr;
+    memset(&server_addr, 0, sizeof(server_addr));
+    server_addr.sin_family = AF_INET;
+    server_addr.sin_port = htons(port);
+    if (inet_pton(AF_INET, ip, &server_addr.sin_addr) <= 0) {
+        perror("inet_pton");
+        return -1;
+    }
+
+    for (int i = 0; i < conns; i++) {
+        ClientConn *c = &cs[i];
+        c->fd = socket(AF_INET, SOCK_STREAM, 0);
+        if (c->fd >= 0) {
+            placement_tune_socket(c->fd, SO_RCVBUF);
+        }
+        if (c->fd < 0 || connect(c->fd, (struct sockaddr*)&server_addr,
+                                 sizeof(server_addr)) < 0) {
+            perror("connect");
+            return -1;
+        }
+        fcntl(c->fd, F_SETFL, fcntl(c->fd, F_GETFL) | O_NONBLOCK);
+        gettimeofday(&c->start, NULL);
+        c->last_ns = hist ? hist_now_ns() : 0;
+
+        struct epoll_event ev;
+        ev.events = EPOLLIN;
+        ev.data.ptr = c;
+        if (epoll_ctl(epfd, EPOLL_CTL_ADD, c->fd, &ev) < 0) {
+            perror("epoll_ctl");
+            return -1;
+        }
+    }
+    printf("Connected %d sockets to server at %s:%d\n", conns, ip, port);
+    // One receiving thread: placement slot 0 (irq: the first connection's CPU)
+    placement_pin(0, cs[0].fd);
+
+    int open_conns = conns;
+    struct epoll_event events[MULTI_EPOLL_BATCH];
+    while (open_conns > 0) {
+        int n = epoll_wait(epfd, events, MULTI_EPOLL_BATCH, -1);
+        if (n < 0) {
+            if (errno == EINTR) continue;
+            perror("epoll_wait");
+            break;
+        }
+        for (int i = 0; i < n; i++) {
+            ClientConn *c = (ClientConn*)events[i].data.ptr;
+            if (c->done) continue;
+
+            // Level-triggered: one bounded read per event keeps connections fair
+            ssize_t received = recv(c->fd, recv_buffer, MULTI_RECV_BUFFER,
+                                     multi_recv_flags);
+            if (received < 0) {
+                if (errno == EAGAIN || errno == EWOULDBLOCK || errno == EINTR) continue;
+                perror("recv");
+                client_conn_close(epfd, c);
+                open_conns--;
+                continue;
+            }
+            if (received == 0) {
+                client_conn_close(epfd, c);
+                open_conns--;
+                continue;
+            }
+
+            c->bytes += received;
+            c->partial += received;
+            int completed = c->messages;
+            while (c->partial >= message_size && c->messages < num_messages) {
+                c->partial -= message_size;
+                c->messages++;
+            }
+            // Per-message latency: one read can finish several messages, so the
+            // time since the previous completion is shared evenly between them
+            int finished = c->messages - completed;
+            if (hist && finished > 0) {
+                uint64_t now_ns = hist_now_ns();
+                uint64_t gap_ns = (now_ns - c->last_ns) / finished;
+                for (int k = 0; k < finished; k++) {
+                    hist_record(hist, gap_ns);
+                }
+                c->last_ns = now_ns;
+            }
+            sampler_add(received, finished);
+            if (c->messages >= num_messages) {
+                client_conn_close(epfd, c);
+                open_conns--;
+            }
+        }
+    }
+
+    // Per-connection lines, then the Results block summed over connections
+    long total_bytes = 0;
+    long total_messages = 0;
+    struct timeval first = cs[0].start, last = cs[0].end;
+    for (int i = 0; i < conns; i++) {
+        ClientConn *c = &cs[i];
+        printf("Connection %d: messages=%d bytes=%ld start=%ld.%06ld end=%ld.%06ld\n",
+               i + 1, c->messages, c->bytes, (long)c->start.tv_sec, (long)c->start.tv_usec,
+               (long)c->end.tv_sec, (long)c->end.tv_usec);
+        total_bytes += c->bytes;
+        total_messages += c->messages;
+        if (tv_seconds(c->start) < tv_seconds(first)) first = c->start;
+        if (tv_seconds(c->end) > tv_seconds(last)) last = c->end;
+    }
+
+    double elapsed = tv_seconds(last) - tv_seconds(first);
+    printf("\n=== Results ===\n");
+    printf("Connections: %d\n", conns);
+    printf("Messages received: %ld\n", total_messages);
+    printf("Total bytes: %ld\n", total_bytes);
+    printf("Time elapsed: %.3f sec\n", elapsed);
+    printf("Throughput: %.2f Mbps\n", elapsed > 0 ? (total_bytes * 8.0) / (elapsed * 1e6) : 0.0);
+    printf("Average latency: %.2f µs\n",
+           total_messages > 0 ? (elapsed * 1e6) / total_messages * conns : 0.0);
+    printf("Start time: %ld.%06ld\n", (long)first.tv_sec, (long)first.tv_usec);
+    printf("End time: %ld.%06ld\n", (long)last.tv_sec, (long)last.tv_usec);
+
+    int complete = 1;
+    for (int i = 0; i < conns; i++) {
+        if (cs[i].messages < num_messages) complete = 0;
+    }
+    close(epfd);
+    free(recv_buffer);
+    free(cs);
+    return complete ? 0 : -1;
+}
+
+#endif /* MT25067_MULTI_CLIENT_H */
@@ -11,22 +11,81 @@
 #include <unistd.h>
 #include <arpa/inet.h>
 #include <sys/time.h>
+#include <getopt.h>
+
+#include "MT25067_LatencyHist.h"
+#include "MT25067_MultiClient.h"
 
 #define PORT 8080
 #define SERVER_IP "10.0.0.1"
 
+static void usage(const char *prog) {
+    fprintf(stderr, "Usage: %s [-p port] [-H hist_file] [-S ring [-I ms]] [-n conns] [-C policy[@n]] [-B usec] [-K bytes] <message_size> <num_messages>\n", prog);
+    fprintf(stderr, "  -n  open <conns> connections from this process (epoll receive loop)\n");
+    fprintf(stderr, "  -C  pin the receiving thread: compact, spread, irq or a core list (0-3,8); @n picks entry n\n");
+    fprintf(stderr, "  -B  SO_BUSY_POLL microseconds on every connection\n");
+    fprintf(stderr, "  -K  SO_RCVBUF bytes of every connection (set before connect)\n");
+    fprintf(stderr, "  -S  write bytes/messages received per -I ms slice (default %d) to ring file <ring>\n",
+            SAMPLER_INTERVAL_MS);
+    fprintf(stderr, "Example: %s 1024 10000\n", prog);
+    exit(1);
+}
+
 int main(int argc, char *argv[]) {
-    if (argc != 3) {
-        fprintf(stderr, "Usage: %s <message_size> <num_messages>\n", argv[0]);
-        fprintf(stderr, "Example: %s 1024 10000\n", argv[0]);
-        exit(1);
+    int port = PORT;
+    const char *hist_path = NULL;  // -H: per-message latency histogram file
+    const char *sample_path = NULL;  // -S: interval sampler ring
+    double sample_ms = SAMPLER_INTERVAL_MS;
+    int num_conns = 1;             // -n: connections opened by this process
+    int c;
+    while ((c = getopt(argc, argv, "p:H:n:S:I:C:B:K:")) != -1) {
+        switch (c) {
+        case 'p': port = atoi(optarg); break;
+        case 'H': hist_path = optarg; break;
+        case 'S': sample_path = optarg; break;
+        case 'I': sample_ms = atof(optarg); break;
+        case 'n': num_conns = atoi(optarg); break;
+        case 'C': if (placement_parse(optarg) < 0) usage(argv[0]); break;
+        case 'B': placement.busy_poll_us = atoi(optarg); break;
+        case 'K': placement.sock_buf = atoi(optarg); break;
+        default: usage(argv[0]);
+        }
+    }
+    if (argc - optind != 2) {
+        usage(argv[0]);
     }
     
-    int message_size = atoi(argv[1]);
-    int num_messages = atoi(argv[2]);
+    setvbuf(stdout, NULL, _IOLBF, 0);
+    
+    int message_size = atoi(argv[optind]);
+    int num_messages = atoi(argv[optind + 1]);
     
     printf("=== Part A1: Two-Copy Client ===\n");
     printf("Expecting %d messages of %d bytes\n", num_messages, message_size);
+    placement_print("SO_RCVBUF");
+    if (sample_path && sampler_start(sample_path, sample_ms) < 0) {
+        exit(1);
+    }
+    
+    // Many connections from one process (large fan-out sweeps)
+    if (num_conns > 1) {
+        LatencyHist *multi_hist = NULL;
+        if (hist_path) {
+            multi_hist = (LatencyHist*)malloc(sizeof(LatencyHist));
+            if (!multi_hist) {
+                perror("malloc histogram");
+                exit(1);
+            }
+            hist_init(multi_hist);
+        }
+        int ret = run_multi_client(SERVER_IP, port, message_size, num_messages,
+                                   num_conns, multi_hist);
+        if (multi_hist) {
+            hist_write(multi_hist, hist_path);
+            free(multi_hist);
+        }
+        return ret == 0 ? 0 : 1;
+    }
     
     int sock_fd;
     struct sockaddr_in server_addr;
@@ -37,11 +96,12 @@ int main(int argc, char *argv[]) {
         perror("socket");
         exit(1);
     }
+    placement_tune_socket(sock_fd, SO_RCVBUF);
     
     // Configure server address
     memset(&server_addr, 0, sizeof(server_addr));
     server_addr.sin_family = AF_INET;
-    server_addr.sin_port = htons(PORT);
+    server_addr.sin_port = htons(port);
     
     if (inet_pton(AF_INET, SERVER_IP, &server_addr.sin_addr) <= 0) {
         perror("inet_pton");
@@ -54,7 +114,8 @@ int main(int argc, char *argv[]) {
         exit(1);
     }
     
-    printf("Connected to server at %s:%d\n", SERVER_IP, PORT);
+    printf("Connected to server at %s:%d\n", SERVER_IP, port);
+    placement_pin(0, sock_fd);
     
     // Allocate receive buffer
     char *recv_buffer = (char*)malloc(message_size);
@@ -63,8 +124,20 @@ int main(int argc, char *argv[]) {
         exit(1);
     }
     
+    // Optional per-message latency histogram (fixed size, no per-sample storage)
+    LatencyHist *hist = NULL;
+    if (hist_path) {
+        hist = (LatencyHist*)malloc(sizeof(LatencyHist));
+        if (!hist) {
+            perror("malloc histogram");
+            exit(1);
+        }
+        hist_init(hist);
+    }
+    
     struct timeval start, end;
     gettimeofday(&start, NULL);
+    uint64_t last_ns = hist ? hist_now_ns() : 0;
     
     long total_bytes_received = 0;
     int messages_received = 0;
@@ -90,11 +163,19 @@ int main(int argc, char *argv[]) {
             }
             
             total_recv += received;
+            sampler_add(received, total_recv == bytes_to_recv);
         }
         
         total_bytes_received += total_recv;
         messages_received++;
         
+        // Per-message latency: time since the previous message completed
+        if (hist) {
+            uint64_t now_ns = hist_now_ns();
+            hist_record(hist, now_ns - last_ns);
+            last_ns = now_ns;
+        }
+        
         // Print progress every 1000 messages
         if (messages_received % 1000 == 0) {
             printf("Received %d messages...\n", messages_received);
@@ -115,8 +196,15 @@ int main(int argc, char *argv[]) {
     printf("Time elapsed: %.3f sec\n", elapsed);
     printf("Throughput: %.2f Mbps\n", throughput_mbps);
     printf("Average latency: %.2f µs\n", avg_latency_us);
+    // Wall-clock window, used to aggregate concurrent clients
+    printf("Start time: %ld.%06ld\n", (long)start.tv_sec, (long)start.tv_usec);
+    printf("End time: %ld.%06ld\n", (long)end.tv_sec, (long)end.tv_usec);
     
 cleanup:
+    if (hist) {
+        hist_write(hist, hist_path);
+        free(hist);
+    }
     free(recv_buffer);
     close(sock_fd);
     
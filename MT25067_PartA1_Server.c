@@ -13,26 +13,18 @@
 #include <arpa/inet.h>
 #include <sys/time.h>
 #include <errno.h>
+#include <getopt.h>
+
+#include "MT25067_Message.h"
+#include "MT25067_ServerCommon.h"
 
 #define PORT 8080
 #define MAX_CLIENTS 100
-#define NUM_STRING_FIELDS 8
-
-// Message structure with 8 dynamically allocated string fields
-typedef struct {
-    char *field1;
-    char *field2;
-    char *field3;
-    char *field4;
-    char *field5;
-    char *field6;
-    char *field7;
-    char *field8;
-} Message;
 
 // Thread arguments
 typedef struct {
     int client_fd;
+    int client_id;
     int message_size;
     int num_messages;
 } ThreadArgs;
@@ -46,95 +38,6 @@ typedef struct {
 
 Stats global_stats = {0, 0.0, PTHREAD_MUTEX_INITIALIZER};
 
-/*
- * Allocate and initialize a message structure
- * Each field gets message_size/8 bytes (distributed equally)
- */
-Message* create_message(int message_size) {
-    Message *msg = (Message*)malloc(sizeof(Message));
-    if (!msg) {
-        perror("malloc message");
-        return NULL;
-    }
-    
-    int field_size = message_size / NUM_STRING_FIELDS;
-    if (field_size < 1) field_size = 1;
-    
-    // Allocate each field on heap
-    msg->field1 = (char*)malloc(field_size);
-    msg->field2 = (char*)malloc(field_size);
-    msg->field3 = (char*)malloc(field_size);
-    msg->field4 = (char*)malloc(field_size);
-    msg->field5 = (char*)malloc(field_size);
-    msg->field6 = (char*)malloc(field_size);
-    msg->field7 = (char*)malloc(field_size);
-    msg->field8 = (char*)malloc(field_size);
-    
-    // Check allocations
-    if (!msg->field1 || !msg->field2 || !msg->field3 || !msg->field4 ||
-        !msg->field5 || !msg->field6 || !msg->field7 || !msg->field8) {
-        perror("malloc fields");
-        return NULL;
-    }
-    
-    // Fill with dummy data
-    memset(msg->field1, 'A', field_size - 1); msg->field1[field_size-1] = '\0';
-    memset(msg->field2, 'B', field_size - 1); msg->field2[field_size-1] = '\0';
-    memset(msg->field3, 'C', field_size - 1); msg->field3[field_size-1] = '\0';
-    memset(msg->field4, 'D', field_size - 1); msg->field4[field_size-1] = '\0';
-    memset(msg->field5, 'E', field_size - 1); msg->field5[field_size-1] = '\0';
-    memset(msg->field6, 'F', field_size - 1); msg->field6[field_size-1] = '\0';
-    memset(msg->field7, 'G', field_size - 1); msg->field7[field_size-1] = '\0';
-    memset(msg->field8, 'H', field_size - 1); msg->field8[field_size-1] = '\0';
-    
-    return msg;
-}
-
-/*
- * Free message structure
- */
-void destroy_message(Message *msg) {
-    if (msg) {
-        free(msg->field1);
-        free(msg->field2);
-        free(msg->field3);
-        free(msg->field4);
-        free(msg->field5);
-        free(msg->field6);
-        free(msg->field7);
-        free(msg->field8);
-        free(msg);
-    }
-}
-
-/*
- * Serialize message into a buffer for sending
- * Format: field1|field2|field3|...|field8
- */
-int serialize_message(Message *msg, char *buffer, int buffer_size) {
-    int offset = 0;
-    int field_size = buffer_size / NUM_STRING_FIELDS;
-    
-    memcpy(buffer + offset, msg->field1, field_size);
-    offset += field_size;
-    memcpy(buffer + offset, msg->field2, field_size);
-    offset += field_size;
-    memcpy(buffer + offset, msg->field3, field_size);
-    offset += field_size;
-    memcpy(buffer + offset, msg->field4, field_size);
-    offset += field_size;
-    memcpy(buffer + offset, msg->field5, field_size);
-    offset += field_size;
-    memcpy(buffer + offset, msg->field6, field_size);
-    offset += field_size;
-    memcpy(buffer + offset, msg->field7, field_size);
-    offset += field_size;
-    memcpy(buffer + offset, msg->field8, field_size);
-    offset += field_size;
-    
-    return offset;
-}
-
 /*
  * Client handler thread
  * Sends messages repeatedly to the client
@@ -145,6 +48,11 @@ void* handle_client(void *arg) {
     int message_size = args->message_size;
     int num_messages = args->num_messages;
     
+    // Park until the profiler has attached (no-op without -g)
+    name_handler_thread("A1", args->client_id);
+    place_handler(args->client_id, client_fd);
+    gate_wait();
+    
     printf("[Thread %lu] Handling client, sending %d messages of %d bytes\n",
            pthread_self(), num_messages, message_size);
     
@@ -181,6 +89,7 @@ void* handle_client(void *arg) {
             break;
         }
         bytes_sent_total += sent;
+        sampler_add(sent, 1);
     }
     
     gettimeofday(&end, NULL);
@@ -206,21 +115,109 @@ void* handle_client(void *arg) {
     return NULL;
 }
 
+/*
+ * Event-driven send path (-e): every connection sends the same serialized
+ * buffer, resuming at c->offset after a partial send
+ */
+static ssize_t epoll_send_some(EpollWorker *w, Conn *c) {
+    const char *send_buffer = (const char*)w->ops->payload;
+    // TWO-COPY: send() copies from user buffer to kernel socket buffer
+    return send(c->fd, send_buffer + c->offset, w->ops->message_size - c->offset,
+                MSG_NOSIGNAL);
+}
+
+/*
+ * Serve max_clients connections from a fixed pool of epoll workers
+ */
+static int serve_epoll(int server_fd, int message_size, int num_messages,
+                       int max_clients, int num_workers) {
+    Message *msg = create_message(message_size);
+    char *send_buffer = (char*)malloc(message_size);
+    if (!msg || !send_buffer) {
+        perror("malloc");
+        return -1;
+    }
+    serialize_message(msg, send_buffer, message_size);
+    
+    EpollOps ops = {"A1", message_size, num_messages, send_buffer,
+                    NULL, epoll_send_some, NULL};
+    EpollTotals totals;
+    int ret = run_epoll_server(server_fd, max_clients, num_workers, &ops, &totals);
+    
+    global_stats.total_bytes_sent = totals.bytes_sent;
+    global_stats.total_time_sec = totals.total_time_sec;
+    
+    free(send_buffer);
+    destroy_message(msg);
+    return ret;
+}
+
+static void usage(const char *prog) {
+    fprintf(stderr, "Usage: %s [-p port] [-g] [-S ring [-I ms]] [-e workers] [-f fields] [-a|-A] [-C policy[@n]] [-B usec] [-K bytes] <message_size> <num_messages> <max_clients>\n", prog);
+    fprintf(stderr, "  -e  event-driven mode: <workers> epoll threads instead of a thread per client\n");
+    fprintf(stderr, "  -f  string fields per message (default %d, max %d)\n",
+            NUM_STRING_FIELDS, MAX_STRING_FIELDS);
+    fprintf(stderr, "  -a  contiguous messages from a page-aligned slab arena (-A: huge pages)\n");
+    fprintf(stderr, "  -g  hold handlers until a line is read on stdin (per-thread profiling)\n");
+    fprintf(stderr, "  -C  pin handler/worker threads: compact, spread, irq or a core list (0-3,8); @n starts at entry n\n");
+    fprintf(stderr, "  -B  SO_BUSY_POLL microseconds on every connection\n");
+    fprintf(stderr, "  -K  SO_SNDBUF bytes of every connection\n");
+    fprintf(stderr, "  -S  write bytes/messages sent per -I ms slice (default %d) to ring file <ring>\n",
+            SAMPLER_INTERVAL_MS);
+    fprintf(stderr, "Example: %s 1024 10000 4\n", prog);
+    exit(1);
+}
+
 int main(int argc, char *argv[]) {
-    if (argc != 4) {
-        fprintf(stderr, "Usage: %s <message_size> <num_messages> <max_clients>\n", argv[0]);
-        fprintf(stderr, "Example: %s 1024 10000 4\n", argv[0]);
-        exit(1);
+    int port = PORT;
+    int num_workers = 0;  // -e: epoll worker threads (0 = thread per client)
+    const char *sample_path = NULL;  // -S: interval sampler ring
+    double sample_ms = SAMPLER_INTERVAL_MS;
+    int c;
+    while ((c = getopt(argc, argv, "p:ge:f:aAS:I:C:B:K:")) != -1) {
+        switch (c) {
+        case 'p': port = atoi(optarg); break;
+        case 'g': start_gate.enabled = 1; break;
+        case 'C': if (placement_parse(optarg) < 0) usage(argv[0]); break;
+        case 'B': placement.busy_poll_us = atoi(optarg); break;
+        case 'K': placement.sock_buf = atoi(optarg); break;
+        case 'S': sample_path = optarg; break;
+        case 'I': sample_ms = atof(optarg); break;
+        case 'f': message_fields = atoi(optarg); break;
+        case 'a': msg_arena.enabled = 1; break;
+        case 'A': msg_arena.enabled = msg_arena.huge_pages = 1; break;
+        case 'e': num_workers = atoi(optarg); break;
+        default: usage(argv[0]);
+        }
     }
+    if (argc - optind != 3) {
+        usage(argv[0]);
+    }
+    
+    // Line-buffered so the orchestrator sees readiness lines immediately
+    setvbuf(stdout, NULL, _IOLBF, 0);
     
-    int message_size = atoi(argv[1]);
-    int num_messages = atoi(argv[2]);
-    int max_clients = atoi(argv[3]);
+    int message_size = atoi(argv[optind]);
+    int num_messages = atoi(argv[optind + 1]);
+    int max_clients = atoi(argv[optind + 2]);
+    
+    int client_limit = num_workers > 0 ? MAX_EPOLL_CLIENTS : MAX_CLIENTS;
+    if (max_clients < 1 || max_clients > client_limit) {
+        fprintf(stderr, "max_clients must be between 1 and %d\n", client_limit);
+        exit(1);
+    }
     
     printf("=== Part A1: Two-Copy Server ===\n");
     printf("Message size: %d bytes\n", message_size);
     printf("Messages per client: %d\n", num_messages);
     printf("Max clients: %d\n", max_clients);
+    placement_print("SO_SNDBUF");
+    if (message_layout_init(message_size) < 0) {
+        exit(1);
+    }
+    if (sample_path && sampler_start(sample_path, sample_ms) < 0) {
+        exit(1);
+    }
     
     int server_fd;
     struct sockaddr_in server_addr, client_addr;
@@ -244,7 +241,7 @@ int main(int argc, char *argv[]) {
         perror("inet_pton");
         exit(1);
     }    
-    server_addr.sin_port = htons(PORT);
+    server_addr.sin_port = htons(port);
     
     if (bind(server_fd, (struct sockaddr*)&server_addr, sizeof(server_addr)) < 0) {
         perror("bind");
@@ -257,44 +254,54 @@ int main(int argc, char *argv[]) {
         exit(1);
     }
     
-    printf("Server listening on port %d...\n", PORT);
-    
-    pthread_t threads[MAX_CLIENTS];
-    int client_count = 0;
+    printf("Server listening on port %d...\n", port);
     
-    // Accept clients
-    while (client_count < max_clients) {
-        int client_fd = accept(server_fd, (struct sockaddr*)&client_addr, &addr_len);
-        if (client_fd < 0) {
-            perror("accept");
-            continue;
+    if (num_workers > 0) {
+        // Event-driven: fixed epoll worker pool, non-blocking sockets
+        if (serve_epoll(server_fd, message_size, num_messages, max_clients, num_workers) < 0) {
+            exit(1);
         }
+    } else {
+        pthread_t threads[MAX_CLIENTS];
+        int client_count = 0;
         
-        printf("Client %d connected\n", client_count + 1);
+        // Accept clients
+        while (client_count < max_clients) {
+            int client_fd = accept(server_fd, (struct sockaddr*)&client_addr, &addr_len);
+            if (client_fd < 0) {
+                perror("accept");
+                continue;
+            }
+            
+            printf("Client %d connected\n", client_count + 1);
+            
+            // Create thread arguments
+            ThreadArgs *args = (ThreadArgs*)malloc(sizeof(ThreadArgs));
+            args->client_fd = client_fd;
+            args->client_id = client_count + 1;
+            args->message_size = message_size;
+            args->num_messages = num_messages;
+            
+            // Create thread
+            if (pthread_create(&threads[client_count], NULL, handle_client, args) != 0) {
+                perror("pthread_create");
+                close(client_fd);
+                free(args);
+                continue;
+            }
+            
+            client_count++;
+        }
         
-        // Create thread arguments
-        ThreadArgs *args = (ThreadArgs*)malloc(sizeof(ThreadArgs));
-        args->client_fd = client_fd;
-        args->message_size = message_size;
-        args->num_messages = num_messages;
+        printf("All %d clients accepted. Waiting for transfers to complete...\n", client_count);
+        gate_release(client_count);
         
-        // Create thread
-        if (pthread_create(&threads[client_count], NULL, handle_client, args) != 0) {
-            perror("pthread_create");
-            close(client_fd);
-            free(args);
-            continue;
+        // Exit as soon as every handler has finished (no fixed sleep)
+        for (int i = 0; i < client_count; i++) {
+            pthread_join(threads[i], NULL);
         }
-        
-        pthread_detach(threads[client_count]);
-        client_count++;
     }
     
-    printf("All %d clients accepted. Waiting for transfers to complete...\n", client_count);
-    
-    // Simple wait (in production, use barriers or condition variables)
-    sleep(5);
-    
     // Print final statistics
     printf("\n=== Final Statistics ===\n");
     printf("Total bytes sent: %ld\n", global_stats.total_bytes_sent);
@@ -304,6 +311,7 @@ int main(int argc, char *argv[]) {
                (global_stats.total_bytes_sent * 8.0) / (global_stats.total_time_sec * 1e6));
     }
     
+    arena_destroy();
     close(server_fd);
     pthread_mutex_destroy(&global_stats.lock);
     
@@ -15,11 +15,16 @@
 #include <sys/uio.h>
 #include <sys/time.h>
 #include <errno.h>
+#include <getopt.h>
+#include <poll.h>
 #include <linux/errqueue.h>
 
+#include "MT25067_Message.h"
+#include "MT25067_ServerCommon.h"
+
 #define PORT 8082  // Different port from A1 and A2
 #define MAX_CLIENTS 100
-#define NUM_STRING_FIELDS 8
+#define ZC_WINDOW 32      // default zero-copy sends in flight per connection (-w)
 
 // MSG_ZEROCOPY might not be defined on all systems
 #ifndef MSG_ZEROCOPY
@@ -30,21 +35,10 @@
 #define SO_ZEROCOPY 60
 #endif
 
-// Message structure with 8 dynamically allocated string fields
-typedef struct {
-    char *field1;
-    char *field2;
-    char *field3;
-    char *field4;
-    char *field5;
-    char *field6;
-    char *field7;
-    char *field8;
-} Message;
-
 // Thread arguments
 typedef struct {
     int client_fd;
+    int client_id;
     int message_size;
     int num_messages;
 } ThreadArgs;
@@ -60,110 +54,47 @@ typedef struct {
 
 Stats global_stats = {0, 0.0, 0, 0, PTHREAD_MUTEX_INITIALIZER};
 
-/*
- * Allocate and initialize a message structure
- */
-Message* create_message(int message_size) {
-    Message *msg = (Message*)malloc(sizeof(Message));
-    if (!msg) {
-        perror("malloc message");
-        return NULL;
-    }
-    
-    int field_size = message_size / NUM_STRING_FIELDS;
-    if (field_size < 1) field_size = 1;
-    
-    // Allocate each field on heap
-    msg->field1 = (char*)malloc(field_size);
-    msg->field2 = (char*)malloc(field_size);
-    msg->field3 = (char*)malloc(field_size);
-    msg->field4 = (char*)malloc(field_size);
-    msg->field5 = (char*)malloc(field_size);
-    msg->field6 = (char*)malloc(field_size);
-    msg->field7 = (char*)malloc(field_size);
-    msg->field8 = (char*)malloc(field_size);
-    
-    if (!msg->field1 || !msg->field2 || !msg->field3 || !msg->field4 ||
-        !msg->field5 || !msg->field6 || !msg->field7 || !msg->field8) {
-        perror("malloc fields");
-        return NULL;
-    }
-    
-    // Fill with dummy data
-    memset(msg->field1, 'A', field_size - 1); msg->field1[field_size-1] = '\0';
-    memset(msg->field2, 'B', field_size - 1); msg->field2[field_size-1] = '\0';
-    memset(msg->field3, 'C', field_size - 1); msg->field3[field_size-1] = '\0';
-    memset(msg->field4, 'D', field_size - 1); msg->field4[field_size-1] = '\0';
-    memset(msg->field5, 'E', field_size - 1); msg->field5[field_size-1] = '\0';
-    memset(msg->field6, 'F', field_size - 1); msg->field6[field_size-1] = '\0';
-    memset(msg->field7, 'G', field_size - 1); msg->field7[field_size-1] = '\0';
-    memset(msg->field8, 'H', field_size - 1); msg->field8[field_size-1] = '\0';
-    
-    return msg;
-}
+// Per-thread zero-copy counters, merged into global_stats once per thread
+typedef struct {
+    long completions;     // sends whose completion notification arrived
+    long copied;          // ...of which the kernel fell back to copying
+} ZcStats;
 
 /*
- * Free message structure
+ * Bounded in-flight window: send id N uses buffer slot N % size, and a
+ * slot is reused only after the kernel has reported its completion.
+ * size is a power of two so slots stay aligned when the 32-bit send id
+ * counter wraps.
  */
-void destroy_message(Message *msg) {
-    if (msg) {
-        free(msg->field1);
-        free(msg->field2);
-        free(msg->field3);
-        free(msg->field4);
-        free(msg->field5);
-        free(msg->field6);
-        free(msg->field7);
-        free(msg->field8);
-        free(msg);
-    }
-}
+typedef struct {
+    unsigned int size;
+    unsigned char *busy;  // slot's buffers still pinned by the kernel
+    long pending;
+} ZcWindow;
 
-/*
- * Setup iovec array for scatter-gather I/O
- */
-void setup_iovec(Message *msg, struct iovec *iov, int field_size) {
-    iov[0].iov_base = msg->field1;
-    iov[0].iov_len = field_size;
-    iov[1].iov_base = msg->field2;
-    iov[1].iov_len = field_size;
-    iov[2].iov_base = msg->field3;
-    iov[2].iov_len = field_size;
-    iov[3].iov_base = msg->field4;
-    iov[3].iov_len = field_size;
-    iov[4].iov_base = msg->field5;
-    iov[4].iov_len = field_size;
-    iov[5].iov_base = msg->field6;
-    iov[5].iov_len = field_size;
-    iov[6].iov_base = msg->field7;
-    iov[6].iov_len = field_size;
-    iov[7].iov_base = msg->field8;
-    iov[7].iov_len = field_size;
-}
+static int zc_window = ZC_WINDOW;
 
 /*
  * Read zerocopy completion notifications from error queue
- * Returns number of completions processed
+ * One notification covers the coalesced send id range ee_info..ee_data.
+ * Counts go to the caller's ZcStats (no lock); with a window, the slots of
+ * the completed sends are released.
+ * Returns number of completed sends
  */
-int receive_zerocopy_completions(int sock_fd) {
+int receive_zerocopy_completions(int sock_fd, ZcStats *stats, ZcWindow *win) {
     int completions = 0;
     char control[100];
     struct msghdr msg = {};
     struct cmsghdr *cm;
     struct sock_extended_err *serr;
     
-    msg.msg_control = control;
-    msg.msg_controllen = sizeof(control);
-    
     // Non-blocking read from error queue
     while (1) {
+        msg.msg_control = control;
+        msg.msg_controllen = sizeof(control);
         int ret = recvmsg(sock_fd, &msg, MSG_ERRQUEUE | MSG_DONTWAIT);
         if (ret == -1) {
-            if (errno == EAGAIN || errno == EWOULDBLOCK) {
-                // No more completions
-                break;
-            }
-            // Other error
+            // EAGAIN: no more completions
             break;
         }
         
@@ -174,22 +105,39 @@ int receive_zerocopy_completions(int sock_fd) {
         if (cm->cmsg_level == SOL_IP && cm->cmsg_type == IP_RECVERR) {
             serr = (struct sock_extended_err *)CMSG_DATA(cm);
             if (serr->ee_origin == SO_EE_ORIGIN_ZEROCOPY) {
-                // This is a zerocopy completion
-                completions++;
+                uint32_t lo = serr->ee_info, hi = serr->ee_data;
+                int range = (int)(hi - lo + 1);
+                completions += range;
                 
-                // Check if kernel fell back to copy
+                // The copied flag applies to the whole range
                 if (serr->ee_code & SO_EE_CODE_ZEROCOPY_COPIED) {
-                    pthread_mutex_lock(&global_stats.lock);
-                    global_stats.copy_fallbacks++;
-                    pthread_mutex_unlock(&global_stats.lock);
+                    stats->copied += range;
+                }
+                
+                if (win) {
+                    for (uint32_t id = lo; ; id++) {
+                        win->busy[id & (win->size - 1)] = 0;
+                        if (id == hi) break;
+                    }
+                    win->pending -= range;
                 }
             }
         }
     }
     
+    stats->completions += completions;
     return completions;
 }
 
+/*
+ * Block until the error queue has notifications (POLLERR), then reap them
+ */
+static int wait_zerocopy_completions(int sock_fd, ZcStats *stats, ZcWindow *win) {
+    struct pollfd pfd = {sock_fd, 0, 0};
+    poll(&pfd, 1, 100);
+    return receive_zerocopy_completions(sock_fd, stats, win);
+}
+
 /*
  * Client handler thread
  * Sends messages using sendmsg() with MSG_ZEROCOPY
@@ -199,103 +147,116 @@ void* handle_client(void *arg) {
     int client_fd = args->client_fd;
     int message_size = args->message_size;
     int num_messages = args->num_messages;
-    int field_size = message_size / NUM_STRING_FIELDS;
+    
+    // Park until the profiler has attached (no-op without -g)
+    name_handler_thread("A3", args->client_id);
+    place_handler(args->client_id, client_fd);
+    gate_wait();
+    int nfields = message_field_count(message_size);
     
     printf("[Thread %lu] Handling client, sending %d messages of %d bytes\n",
            pthread_self(), num_messages, message_size);
     
     // Enable SO_ZEROCOPY on socket
     int optval = 1;
+    int zerocopy = 1;
     if (setsockopt(client_fd, SOL_SOCKET, SO_ZEROCOPY, &optval, sizeof(optval)) < 0) {
         perror("setsockopt SO_ZEROCOPY");
         printf("[Thread %lu] Warning: MSG_ZEROCOPY not supported, will use regular copy\n",
                pthread_self());
+        zerocopy = 0;
     }
     
-    // Create message
-    Message *msg = create_message(message_size);
-    if (!msg) {
+    // One message (and iovec) per window slot
+    ZcWindow win = {(unsigned int)zc_window, NULL, 0};
+    win.busy = (unsigned char*)calloc(win.size, 1);
+    Message **msgs = (Message**)calloc(win.size, sizeof(Message*));
+    struct iovec *iovs = (struct iovec*)malloc(win.size * nfields * sizeof(struct iovec));
+    int ok = win.busy && msgs && iovs;
+    for (unsigned int s = 0; ok && s < win.size; s++) {
+        msgs[s] = create_message(message_size);
+        if (!msgs[s]) {
+            ok = 0;
+            break;
+        }
+        setup_iovec(msgs[s], &iovs[s * nfields]);
+    }
+    if (!ok) {
+        for (unsigned int s = 0; msgs && s < win.size; s++) destroy_message(msgs[s]);
+        free(msgs);
+        free(iovs);
+        free(win.busy);
         close(client_fd);
         free(args);
         return NULL;
     }
     
-    // Setup iovec
-    struct iovec iov[NUM_STRING_FIELDS];
-    setup_iovec(msg, iov, field_size);
-    
     // Setup msghdr
     struct msghdr msghdr;
     memset(&msghdr, 0, sizeof(msghdr));
-    msghdr.msg_iov = iov;
-    msghdr.msg_iovlen = NUM_STRING_FIELDS;
+    msghdr.msg_iovlen = nfields;
     
     struct timeval start, end;
     gettimeofday(&start, NULL);
     
     long bytes_sent_total = 0;
-    int pending_completions = 0;
+    ZcStats zc = {0, 0};
+    uint32_t next_id = 0;    // kernel numbers zero-copy sends 0, 1, 2, ...
     
     // Send messages with MSG_ZEROCOPY
     for (int i = 0; i < num_messages; i++) {
+        unsigned int slot = next_id & (win.size - 1);
+        
+        // Reuse a slot's buffers only after its previous send completed
+        while (zerocopy && win.busy[slot]) {
+            wait_zerocopy_completions(client_fd, &zc, &win);
+        }
+        msghdr.msg_iov = &iovs[slot * nfields];
+        
         // ZERO-COPY: sendmsg() with MSG_ZEROCOPY flag
         // Kernel will DMA directly from user buffers
-        ssize_t sent = sendmsg(client_fd, &msghdr, MSG_ZEROCOPY);
+        ssize_t sent = sendmsg(client_fd, &msghdr, zerocopy ? MSG_ZEROCOPY : 0);
         
         if (sent < 0) {
-            if (errno == ENOBUFS || errno == ENOMEM) {
-                // Too many pending, wait for completions
-                int completed = receive_zerocopy_completions(client_fd);
-                pending_completions -= completed;
-                
-                // Retry
-                sent = sendmsg(client_fd, &msghdr, MSG_ZEROCOPY);
-                if (sent < 0) {
-                    perror("sendmsg retry");
-                    break;
-                }
-            } else {
-                perror("sendmsg");
-                break;
+            if (zerocopy && (errno == ENOBUFS || errno == ENOMEM) && win.pending > 0) {
+                // Too many pinned pages: wait for completions and retry
+                wait_zerocopy_completions(client_fd, &zc, &win);
+                i--;
+                continue;
             }
+            perror("sendmsg");
+            break;
         }
         
         bytes_sent_total += sent;
-        pending_completions++;
+        sampler_add(sent, 1);
+        if (zerocopy) {
+            win.busy[slot] = 1;
+            win.pending++;
+            next_id++;
+        }
         
-        // Periodically check for completions (every 100 messages)
-        if (i % 100 == 0 && pending_completions > 0) {
-            int completed = receive_zerocopy_completions(client_fd);
-            pending_completions -= completed;
-            
-            pthread_mutex_lock(&global_stats.lock);
-            global_stats.zerocopy_completions += completed;
-            pthread_mutex_unlock(&global_stats.lock);
+        // Reap whatever has completed so far (non-blocking)
+        if (win.pending > 0 && (i & 15) == 0) {
+            receive_zerocopy_completions(client_fd, &zc, &win);
         }
     }
     
     // Wait for all remaining completions
-    while (pending_completions > 0) {
-        int completed = receive_zerocopy_completions(client_fd);
-        if (completed == 0) {
-            usleep(1000); // Wait 1ms
-            continue;
-        }
-        pending_completions -= completed;
-        
-        pthread_mutex_lock(&global_stats.lock);
-        global_stats.zerocopy_completions += completed;
-        pthread_mutex_unlock(&global_stats.lock);
+    while (win.pending > 0) {
+        wait_zerocopy_completions(client_fd, &zc, &win);
     }
     
     gettimeofday(&end, NULL);
     double elapsed = (end.tv_sec - start.tv_sec) + 
                      (end.tv_usec - start.tv_usec) / 1e6;
     
-    // Update global stats
+    // Merge this thread's stats (the only lock taken by a handler)
     pthread_mutex_lock(&global_stats.lock);
     global_stats.total_bytes_sent += bytes_sent_total;
     global_stats.total_time_sec += elapsed;
+    global_stats.zerocopy_completions += zc.completions;
+    global_stats.copy_fallbacks += zc.copied;
     pthread_mutex_unlock(&global_stats.lock);
     
     printf("[Thread %lu] Sent %ld bytes in %.3f sec (%.2f Mbps)\n",
@@ -303,29 +264,178 @@ void* handle_client(void *arg) {
            (bytes_sent_total * 8.0) / (elapsed * 1e6));
     
     // Cleanup
-    destroy_message(msg);
+    for (unsigned int s = 0; s < win.size; s++) destroy_message(msgs[s]);
+    free(msgs);
+    free(iovs);
+    free(win.busy);
     close(client_fd);
     free(args);
     
     return NULL;
 }
 
+/*
+ * Event-driven send path (-e): MSG_ZEROCOPY sendmsg() of the shared fields.
+ * Completions arrive as EPOLLERR on the socket error queue; at most
+ * zc_window sends per connection are in flight, and a connection is
+ * finished only when every zero-copy send has completed. The payload is
+ * shared and never modified, so the window bounds pinned pages rather than
+ * rotating buffers. A connection without SO_ZEROCOPY is sent with regular
+ * copies, as in the thread-per-client path.
+ */
+static int payload_iovcnt;
+
+static int epoll_on_accept(Conn *c) {
+    int optval = 1;
+    c->zerocopy = 1;
+    if (setsockopt(c->fd, SOL_SOCKET, SO_ZEROCOPY, &optval, sizeof(optval)) < 0) {
+        // Without SO_ZEROCOPY the kernel ignores MSG_ZEROCOPY and never
+        // reports completions: send this connection with regular copies
+        perror("setsockopt SO_ZEROCOPY");
+        printf("[Client %d] Warning: MSG_ZEROCOPY not supported, will use regular copy\n",
+               c->id);
+        c->zerocopy = 0;
+    }
+    return 0;
+}
+
+static int epoll_reap(EpollWorker *w, Conn *c) {
+    ZcStats zc = {0, 0};
+    int completed = receive_zerocopy_completions(c->fd, &zc, NULL);
+    c->pending -= completed;
+    w->zc_completions += zc.completions;
+    w->zc_copied += zc.copied;
+    return completed;
+}
+
+static ssize_t epoll_send_some(EpollWorker *w, Conn *c) {
+    if (c->zerocopy && c->pending >= zc_window && epoll_reap(w, c) == 0) {
+        errno = EAGAIN;   // window full: resume on the next EPOLLERR
+        return -1;
+    }
+    
+    struct iovec iov[MAX_STRING_FIELDS];
+    struct msghdr msghdr;
+    memset(&msghdr, 0, sizeof(msghdr));
+    msghdr.msg_iov = iov;
+    msghdr.msg_iovlen = iov_advance((const struct iovec*)w->ops->payload,
+                                    payload_iovcnt, c->offset, iov);
+    // ZERO-COPY: pages stay pinned until the completion notification
+    ssize_t sent = sendmsg(c->fd, &msghdr, (c->zerocopy ? MSG_ZEROCOPY : 0) | MSG_NOSIGNAL);
+    if (sent > 0 && c->zerocopy) {
+        c->pending++;
+    } else if (sent < 0 && c->zerocopy && errno == ENOBUFS && epoll_reap(w, c) > 0) {
+        errno = EINTR;    // completions freed room: let the loop retry
+    }
+    return sent;
+}
+
+static void epoll_on_error_queue(EpollWorker *w, Conn *c) {
+    epoll_reap(w, c);
+}
+
+/*
+ * Serve max_clients connections from a fixed pool of epoll workers
+ */
+static int serve_epoll(int server_fd, int message_size, int num_messages,
+                       int max_clients, int num_workers) {
+    Message *msg = create_message(message_size);
+    if (!msg) {
+        return -1;
+    }
+    struct iovec iov[MAX_STRING_FIELDS];
+    payload_iovcnt = setup_iovec(msg, iov);
+    
+    EpollOps ops = {"A3", message_size, num_messages, iov,
+                    epoll_on_accept, epoll_send_some, epoll_on_error_queue};
+    EpollTotals totals;
+    int ret = run_epoll_server(server_fd, max_clients, num_workers, &ops, &totals);
+    
+    global_stats.total_bytes_sent = totals.bytes_sent;
+    global_stats.total_time_sec = totals.total_time_sec;
+    global_stats.zerocopy_completions = totals.zc_completions;
+    global_stats.copy_fallbacks = totals.zc_copied;
+    
+    destroy_message(msg);
+    return ret;
+}
+
+static void usage(const char *prog) {
+    fprintf(stderr, "Usage: %s [-p port] [-g] [-S ring [-I ms]] [-e workers] [-w window] [-f fields] [-a|-A] [-C policy[@n]] [-B usec] [-K bytes] <message_size> <num_messages> <max_clients>\n", prog);
+    fprintf(stderr, "  -e  event-driven mode: <workers> epoll threads instead of a thread per client\n");
+    fprintf(stderr, "  -w  zero-copy sends in flight per connection (default %d)\n", ZC_WINDOW);
+    fprintf(stderr, "  -f  string fields per message (default %d, max %d)\n",
+            NUM_STRING_FIELDS, MAX_STRING_FIELDS);
+    fprintf(stderr, "  -a  contiguous messages from a page-aligned slab arena (-A: huge pages)\n");
+    fprintf(stderr, "  -g  hold handlers until a line is read on stdin (per-thread profiling)\n");
+    fprintf(stderr, "  -C  pin handler/worker threads: compact, spread, irq or a core list (0-3,8); @n starts at entry n\n");
+    fprintf(stderr, "  -B  SO_BUSY_POLL microseconds on every connection\n");
+    fprintf(stderr, "  -K  SO_SNDBUF bytes of every connection\n");
+    fprintf(stderr, "  -S  write bytes/messages sent per -I ms slice (default %d) to ring file <ring>\n",
+            SAMPLER_INTERVAL_MS);
+    fprintf(stderr, "Example: %s 1024 10000 4\n", prog);
+    exit(1);
+}
+
 int main(int argc, char *argv[]) {
-    if (argc != 4) {
-        fprintf(stderr, "Usage: %s <message_size> <num_messages> <max_clients>\n", argv[0]);
-        fprintf(stderr, "Example: %s 1024 10000 4\n", argv[0]);
-        exit(1);
+    int port = PORT;
+    int num_workers = 0;  // -e: epoll worker threads (0 = thread per client)
+    const char *sample_path = NULL;  // -S: interval sampler ring
+    double sample_ms = SAMPLER_INTERVAL_MS;
+    int c;
+    while ((c = getopt(argc, argv, "p:ge:w:f:aAS:I:C:B:K:")) != -1) {
+        switch (c) {
+        case 'p': port = atoi(optarg); break;
+        case 'g': start_gate.enabled = 1; break;
+        case 'C': if (placement_parse(optarg) < 0) usage(argv[0]); break;
+        case 'B': placement.busy_poll_us = atoi(optarg); break;
+        case 'K': placement.sock_buf = atoi(optarg); break;
+        case 'S': sample_path = optarg; break;
+        case 'I': sample_ms = atof(optarg); break;
+        case 'f': message_fields = atoi(optarg); break;
+        case 'a': msg_arena.enabled = 1; break;
+        case 'A': msg_arena.enabled = msg_arena.huge_pages = 1; break;
+        case 'e': num_workers = atoi(optarg); break;
+        case 'w': zc_window = atoi(optarg); break;
+        default: usage(argv[0]);
+        }
+    }
+    if (argc - optind != 3) {
+        usage(argv[0]);
     }
     
-    int message_size = atoi(argv[1]);
-    int num_messages = atoi(argv[2]);
-    int max_clients = atoi(argv[3]);
+    // Line-buffered so the orchestrator sees readiness lines immediately
+    setvbuf(stdout, NULL, _IOLBF, 0);
+    
+    int message_size = atoi(argv[optind]);
+    int num_messages = atoi(argv[optind + 1]);
+    int max_clients = atoi(argv[optind + 2]);
+    
+    // Round the window up to a power of two (slot = send id & (size - 1))
+    if (zc_window < 1) zc_window = 1;
+    int window = 1;
+    while (window < zc_window) window <<= 1;
+    zc_window = window;
+    
+    int client_limit = num_workers > 0 ? MAX_EPOLL_CLIENTS : MAX_CLIENTS;
+    if (max_clients < 1 || max_clients > client_limit) {
+        fprintf(stderr, "max_clients must be between 1 and %d\n", client_limit);
+        exit(1);
+    }
     
     printf("=== Part A3: Zero-Copy Server (MSG_ZEROCOPY) ===\n");
     printf("Message size: %d bytes\n", message_size);
     printf("Messages per client: %d\n", num_messages);
     printf("Max clients: %d\n", max_clients);
+    placement_print("SO_SNDBUF");
     printf("Optimization: True zero-copy with DMA\n");
+    printf("In-flight window: %d sends per connection\n", zc_window);
+    if (message_layout_init(message_size) < 0) {
+        exit(1);
+    }
+    if (sample_path && sampler_start(sample_path, sample_ms) < 0) {
+        exit(1);
+    }
     
     int server_fd;
     struct sockaddr_in server_addr, client_addr;
@@ -349,7 +459,7 @@ int main(int argc, char *argv[]) {
         perror("inet_pton");
         exit(1);
     }
-    server_addr.sin_port = htons(PORT);
+    server_addr.sin_port = htons(port);
     
     if (bind(server_fd, (struct sockaddr*)&server_addr, sizeof(server_addr)) < 0) {
         perror("bind");
@@ -362,44 +472,54 @@ int main(int argc, char *argv[]) {
         exit(1);
     }
     
-    printf("Server listening on port %d...\n", PORT);
+    printf("Server listening on port %d...\n", port);
     
-    pthread_t threads[MAX_CLIENTS];
-    int client_count = 0;
-    
-    // Accept clients
-    while (client_count < max_clients) {
-        int client_fd = accept(server_fd, (struct sockaddr*)&client_addr, &addr_len);
-        if (client_fd < 0) {
-            perror("accept");
-            continue;
+    if (num_workers > 0) {
+        // Event-driven: fixed epoll worker pool, non-blocking sockets
+        if (serve_epoll(server_fd, message_size, num_messages, max_clients, num_workers) < 0) {
+            exit(1);
         }
+    } else {
+        pthread_t threads[MAX_CLIENTS];
+        int client_count = 0;
         
-        printf("Client %d connected\n", client_count + 1);
+        // Accept clients
+        while (client_count < max_clients) {
+            int client_fd = accept(server_fd, (struct sockaddr*)&client_addr, &addr_len);
+            if (client_fd < 0) {
+                perror("accept");
+                continue;
+            }
+            
+            printf("Client %d connected\n", client_count + 1);
+            
+            // Create thread arguments
+            ThreadArgs *args = (ThreadArgs*)malloc(sizeof(ThreadArgs));
+            args->client_fd = client_fd;
+            args->client_id = client_count + 1;
+            args->message_size = message_size;
+            args->num_messages = num_messages;
+            
+            // Create thread
+            if (pthread_create(&threads[client_count], NULL, handle_client, args) != 0) {
+                perror("pthread_create");
+                close(client_fd);
+                free(args);
+                continue;
+            }
+            
+            client_count++;
+        }
         
-        // Create thread arguments
-        ThreadArgs *args = (ThreadArgs*)malloc(sizeof(ThreadArgs));
-        args->client_fd = client_fd;
-        args->message_size = message_size;
-        args->num_messages = num_messages;
+        printf("All %d clients accepted. Waiting for transfers to complete...\n", client_count);
+        gate_release(client_count);
         
-        // Create thread
-        if (pthread_create(&threads[client_count], NULL, handle_client, args) != 0) {
-            perror("pthread_create");
-            close(client_fd);
-            free(args);
-            continue;
+        // Exit as soon as every handler has finished (no fixed sleep)
+        for (int i = 0; i < client_count; i++) {
+            pthread_join(threads[i], NULL);
         }
-        
-        pthread_detach(threads[client_count]);
-        client_count++;
     }
     
-    printf("All %d clients accepted. Waiting for transfers to complete...\n", client_count);
-    
-    // Wait for completion
-    sleep(5);
-    
     // Print final statistics
     printf("\n=== Final Statistics ===\n");
     printf("Total bytes sent: %ld\n", global_stats.total_bytes_sent);
@@ -414,6 +534,7 @@ int main(int argc, char *argv[]) {
            (global_stats.zerocopy_completions > 0) ? 
                (global_stats.copy_fallbacks * 100.0 / global_stats.zerocopy_completions) : 0.0);
     
+    arena_destroy();
     close(server_fd);
     pthread_mutex_destroy(&global_stats.lock);
     
@@ -0,0 +1,267 @@
+/*
+ * MT25067
+ * Part A4: io_uring TCP Client
+ * Receives through io_uring: one io_uring_enter() submits a linked chain of
+ * up to <batch> IORING_OP_RECV (MSG_WAITALL, one message each) and reaps
+ * their completions
+ */
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <unistd.h>
+#include <arpa/inet.h>
+#include <sys/time.h>
+#include <getopt.h>
+
+#include "MT25067_LatencyHist.h"
+#include "MT25067_MultiClient.h"
+#include "MT25067_Uring.h"
+
+#define PORT 8083  // Match Part A4 server port
+#define SERVER_IP "10.0.0.1"
+#define URING_BATCH 16    // default receives per io_uring_enter() (-b)
+
+static void usage(const char *prog) {
+    fprintf(stderr, "Usage: %s [-p port] [-H hist_file] [-S ring [-I ms]] [-n conns] [-b batch] [-C policy[@n]] [-B usec] [-K bytes] <message_size> <num_messages>\n", prog);
+    fprintf(stderr, "  -b  receives submitted per io_uring_enter() (default %d)\n", URING_BATCH);
+    fprintf(stderr, "  -n  open <conns> connections from this process (epoll receive loop)\n");
+    fprintf(stderr, "  -C  pin the receiving thread: compact, spread, irq or a core list (0-3,8); @n picks entry n\n");
+    fprintf(stderr, "  -B  SO_BUSY_POLL microseconds on every connection\n");
+    fprintf(stderr, "  -K  SO_RCVBUF bytes of every connection (set before connect)\n");
+    fprintf(stderr, "  -S  write bytes/messages received per -I ms slice (default %d) to ring file <ring>\n",
+            SAMPLER_INTERVAL_MS);
+    fprintf(stderr, "Example: %s 1024 10000\n", prog);
+    exit(1);
+}
+
+int main(int argc, char *argv[]) {
+    int port = PORT;
+    const char *hist_path = NULL;  // -H: per-message latency histogram file
+    const char *sample_path = NULL;  // -S: interval sampler ring
+    double sample_ms = SAMPLER_INTERVAL_MS;
+    int num_conns = 1;             // -n: connections opened by this process
+    int batch = URING_BATCH;       // -b: receives per io_uring_enter()
+    int c;
+    while ((c = getopt(argc, argv, "p:H:n:b:S:I:C:B:K:")) != -1) {
+        switch (c) {
+        case 'p': port = atoi(optarg); break;
+        case 'H': hist_path = optarg; break;
+        case 'S': sample_path = optarg; break;
+        case 'I': sample_ms = atof(optarg); break;
+        case 'n': num_conns = atoi(optarg); break;
+        case 'C': if (placement_parse(optarg) < 0) usage(argv[0]); break;
+        case 'B': placement.busy_poll_us = atoi(optarg); break;
+        case 'K': placement.sock_buf = atoi(optarg); break;
+        case 'b': batch = atoi(optarg); break;
+        default: usage(argv[0]);
+        }
+    }
+    if (argc - optind != 2 || batch < 1 || batch > 4096) {
+        usage(argv[0]);
+    }
+    
+    setvbuf(stdout, NULL, _IOLBF, 0);
+    
+    int message_size = atoi(argv[optind]);
+    int num_messages = atoi(argv[optind + 1]);
+    
+    printf("=== Part A4: io_uring Client ===\n");
+    printf("Expecting %d messages of %d bytes\n", num_messages, message_size);
+    placement_print("SO_RCVBUF");
+    if (sample_path && sampler_start(sample_path, sample_ms) < 0) {
+        exit(1);
+    }
+    
+    // Many connections from one process (large fan-out sweeps)
+    if (num_conns > 1) {
+        LatencyHist *multi_hist = NULL;
+        if (hist_path) {
+            multi_hist = (LatencyHist*)malloc(sizeof(LatencyHist));
+            if (!multi_hist) {
+                perror("malloc histogram");
+                exit(1);
+            }
+            hist_init(multi_hist);
+        }
+        int ret = run_multi_client(SERVER_IP, port, message_size, num_messages,
+                                   num_conns, multi_hist);
+        if (multi_hist) {
+            hist_write(multi_hist, hist_path);
+            free(multi_hist);
+        }
+        return ret == 0 ? 0 : 1;
+    }
+    
+    int sock_fd;
+    struct sockaddr_in server_addr;
+    
+    // Create socket
+    sock_fd = socket(AF_INET, SOCK_STREAM, 0);
+    if (sock_fd < 0) {
+        perror("socket");
+        exit(1);
+    }
+    placement_tune_socket(sock_fd, SO_RCVBUF);
+    
+    // Configure server address
+    memset(&server_addr, 0, sizeof(server_addr));
+    server_addr.sin_family = AF_INET;
+    server_addr.sin_port = htons(port);
+    
+    if (inet_pton(AF_INET, SERVER_IP, &server_addr.sin_addr) <= 0) {
+        perror("inet_pton");
+        exit(1);
+    }
+    
+    // Connect to server
+    if (connect(sock_fd, (struct sockaddr*)&server_addr, sizeof(server_addr)) < 0) {
+        perror("connect");
+        exit(1);
+    }
+    
+    printf("Connected to server at %s:%d\n", SERVER_IP, port);
+    placement_pin(0, sock_fd);
+    
+    // One receive slot per message of a batch
+    Uring ring;
+    if (uring_init(&ring, batch) < 0) {
+        perror("io_uring_setup");
+        exit(1);
+    }
+    char *recv_buffer = (char*)malloc((size_t)batch * message_size);
+    long *results = (long*)malloc(batch * sizeof(long));
+    if (!recv_buffer || !results) {
+        perror("malloc");
+        exit(1);
+    }
+    
+    // Optional per-message latency histogram (fixed size, no per-sample storage)
+    LatencyHist *hist = NULL;
+    if (hist_path) {
+        hist = (LatencyHist*)malloc(sizeof(LatencyHist));
+        if (!hist) {
+            perror("malloc histogram");
+            exit(1);
+        }
+        hist_init(hist);
+    }
+    
+    struct timeval start, end;
+    gettimeofday(&start, NULL);
+    uint64_t last_ns = hist ? hist_now_ns() : 0;
+    
+    long total_bytes_received = 0;
+    int messages_received = 0;
+    int status = 0;
+    
+    // Receive messages
+    int done = 0;
+    while (messages_received < num_messages && !done) {
+        int n = num_messages - messages_received;
+        if (n > batch) n = batch;
+        
+        // Linked chain: the receives complete in stream order
+        for (int i = 0; i < n; i++) {
+            struct io_uring_sqe *sqe = uring_get_sqe(&ring);
+            sqe->opcode = IORING_OP_RECV;
+            sqe->fd = sock_fd;
+            sqe->addr = (unsigned long)(recv_buffer + (size_t)i * message_size);
+            sqe->len = message_size;
+            sqe->msg_flags = MSG_WAITALL;
+            sqe->user_data = i;
+            if (i < n - 1) {
+                sqe->flags = IOSQE_IO_LINK;
+            }
+        }
+        
+        // BATCHED: one syscall submits n receives and waits for all of them
+        if (uring_submit(&ring, n) < 0) {
+            perror("io_uring_enter");
+            status = 1;
+            break;
+        }
+        for (int i = 0; i < n; i++) {
+            struct io_uring_cqe *cqe = uring_wait_cqe(&ring);
+            if (!cqe) {
+                perror("io_uring_enter");
+                status = 1;
+                goto cleanup;
+            }
+            results[cqe->user_data] = cqe->res;
+            uring_cqe_seen(&ring);
+        }
+        
+        int completed = messages_received;
+        for (int i = 0; i < n; i++) {
+            if (results[i] == -ECANCELED || results[i] == -EINTR) {
+                break;          // requeued in the next batch
+            }
+            if (results[i] < 0) {
+                errno = -results[i];
+                perror("io_uring recv");
+                status = 1;
+                goto cleanup;
+            }
+            if (results[i] < message_size) {
+                // Connection closed (MSG_WAITALL only returns short at EOF)
+                total_bytes_received += results[i];
+                sampler_add(results[i], 0);
+                printf("Server closed connection\n");
+                done = 1;
+                break;
+            }
+            
+            total_bytes_received += results[i];
+            messages_received++;
+            sampler_add(results[i], 1);
+            
+            // Print progress every 1000 messages
+            if (messages_received % 1000 == 0) {
+                printf("Received %d messages...\n", messages_received);
+            }
+        }
+        
+        // Per-message latency: the whole batch is reaped at once, so the time
+        // since the previous batch is shared evenly between its messages
+        int finished = messages_received - completed;
+        if (hist && finished > 0) {
+            uint64_t now_ns = hist_now_ns();
+            uint64_t gap_ns = (now_ns - last_ns) / finished;
+            for (int k = 0; k < finished; k++) {
+                hist_record(hist, gap_ns);
+            }
+            last_ns = now_ns;
+        }
+    }
+    
+    gettimeofday(&end, NULL);
+    double elapsed = (end.tv_sec - start.tv_sec) + 
+                     (end.tv_usec - start.tv_usec) / 1e6;
+    
+    // Calculate metrics
+    double throughput_mbps = (total_bytes_received * 8.0) / (elapsed * 1e6);
+    double avg_latency_us = (elapsed * 1e6) / messages_received;
+    
+    printf("\n=== Results ===\n");
+    printf("Messages received: %d\n", messages_received);
+    printf("Total bytes: %ld\n", total_bytes_received);
+    printf("Time elapsed: %.3f sec\n", elapsed);
+    printf("Throughput: %.2f Mbps\n", throughput_mbps);
+    printf("Average latency: %.2f µs\n", avg_latency_us);
+    // Wall-clock window, used to aggregate concurrent clients
+    printf("Start time: %ld.%06ld\n", (long)start.tv_sec, (long)start.tv_usec);
+    printf("End time: %ld.%06ld\n", (long)end.tv_sec, (long)end.tv_usec);
+    
+cleanup:
+    if (hist) {
+        hist_write(hist, hist_path);
+        free(hist);
+    }
+    uring_exit(&ring);
+    free(results);
+    free(recv_buffer);
+    close(sock_fd);
+    
+    return status;
+}
\ No newline at end of file
@@ -0,0 +1,448 @@
+/*
+ * MT25067
+ * Part A4: io_uring TCP Server
+ * Batched sends through io_uring: one io_uring_enter() submits a linked
+ * chain of up to <batch> sends from a registered buffer and reaps their
+ * completions. Uses IORING_OP_SEND_ZC (kernel 6.0+) when available,
+ * otherwise IORING_OP_WRITE_FIXED (plain copying send).
+ * Multithreaded - one thread (and one ring) per client
+ */
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <unistd.h>
+#include <pthread.h>
+#include <arpa/inet.h>
+#include <sys/socket.h>
+#include <sys/uio.h>
+#include <sys/time.h>
+#include <errno.h>
+#include <getopt.h>
+
+#include "MT25067_Message.h"
+#include "MT25067_ServerCommon.h"
+#include "MT25067_Uring.h"
+
+#define PORT 8083  // Different port from A1, A2 and A3
+#define MAX_CLIENTS 100
+#define URING_BATCH 16    // default sends per io_uring_enter() (-b)
+
+// Thread arguments
+typedef struct {
+    int client_fd;
+    int client_id;
+    int message_size;
+    int num_messages;
+} ThreadArgs;
+
+// Global statistics
+typedef struct {
+    long total_bytes_sent;
+    double total_time_sec;
+    long submissions;           // io_uring_enter() calls that submitted sends
+    long sends;                 // send SQEs completed
+    long zerocopy_completions;
+    long copy_fallbacks;
+    pthread_mutex_t lock;
+} Stats;
+
+Stats global_stats = {0, 0.0, 0, 0, 0, 0, PTHREAD_MUTEX_INITIALIZER};
+
+static int uring_batch = URING_BATCH;
+static int allow_send_zc = 1;   // -c clears: plain sends even if SEND_ZC works
+
+/*
+ * Queue one send of len bytes from the registered buffer. With SEND_ZC the
+ * kernel pins the registered pages instead of copying them; MSG_WAITALL
+ * makes it retry short sends internally. zc_flags carries
+ * IORING_SEND_ZC_REPORT_USAGE so the notification says whether the kernel
+ * copied after all.
+ */
+static void queue_send(Uring *ring, int fd, const char *data, size_t len,
+                       int zerocopy, unsigned zc_flags, int index, int link) {
+    struct io_uring_sqe *sqe = uring_get_sqe(ring);
+    sqe->fd = fd;
+    sqe->addr = (unsigned long)data;
+    sqe->len = len;
+    sqe->buf_index = 0;
+    sqe->user_data = index;
+    if (zerocopy) {
+        sqe->opcode = IORING_OP_SEND_ZC;
+        sqe->msg_flags = MSG_WAITALL | MSG_NOSIGNAL;
+        sqe->ioprio = IORING_RECVSEND_FIXED_BUF | zc_flags;
+    } else {
+        // A socket write from a registered buffer is a plain copying send
+        sqe->opcode = IORING_OP_WRITE_FIXED;
+        sqe->off = -1;
+    }
+    // Linked: the batch executes in order, a short send cancels the rest
+    if (link) {
+        sqe->flags = IOSQE_IO_LINK;
+    }
+}
+
+/*
+ * Client handler thread
+ * Streams num_messages messages through the thread's own ring
+ */
+void* handle_client(void *arg) {
+    ThreadArgs *args = (ThreadArgs*)arg;
+    int client_fd = args->client_fd;
+    int message_size = args->message_size;
+    int num_messages = args->num_messages;
+    
+    // Park until the profiler has attached (no-op without -g)
+    name_handler_thread("A4", args->client_id);
+    place_handler(args->client_id, client_fd);
+    gate_wait();
+    
+    printf("[Thread %lu] Handling client, sending %d messages of %d bytes\n",
+           pthread_self(), num_messages, message_size);
+    
+    Uring ring;
+    if (uring_init(&ring, uring_batch) < 0) {
+        perror("io_uring_setup");
+        close(client_fd);
+        free(args);
+        return NULL;
+    }
+    
+    // Create message and serialize it once into the registered buffer
+    Message *msg = create_message(message_size);
+    char *send_buffer = (char*)malloc(message_size);
+    long *results = (long*)malloc(uring_batch * sizeof(long));
+    size_t *lengths = (size_t*)malloc(uring_batch * sizeof(size_t));
+    if (!msg || !send_buffer || !results || !lengths) {
+        perror("malloc");
+        destroy_message(msg);
+        free(send_buffer);
+        free(results);
+        free(lengths);
+        uring_exit(&ring);
+        close(client_fd);
+        free(args);
+        return NULL;
+    }
+    serialize_message(msg, send_buffer, message_size);
+    
+    struct iovec reg = {send_buffer, (size_t)message_size};
+    if (uring_register_buffers(&ring, &reg, 1) < 0) {
+        perror("io_uring_register buffers");
+        destroy_message(msg);
+        free(send_buffer);
+        free(results);
+        free(lengths);
+        uring_exit(&ring);
+        close(client_fd);
+        free(args);
+        return NULL;
+    }
+    
+    int zerocopy = allow_send_zc && uring_op_supported(&ring, IORING_OP_SEND_ZC);
+    unsigned zc_flags = IORING_SEND_ZC_REPORT_USAGE;
+    if (allow_send_zc && !zerocopy) {
+        printf("[Thread %lu] Warning: IORING_OP_SEND_ZC not supported, will use regular copy\n",
+               pthread_self());
+    }
+    
+    struct timeval start, end;
+    gettimeofday(&start, NULL);
+    
+    // The stream is num_messages back-to-back copies of send_buffer;
+    // `sent` is the stream offset confirmed by completions
+    long total_bytes = (long)num_messages * message_size;
+    long sent = 0;
+    long submissions = 0, sends = 0;
+    long notifs_pending = 0, zc_completions = 0, zc_copied = 0;
+    int failed = 0;
+    
+    while (sent < total_bytes && !failed) {
+        // Queue a linked chain of up to uring_batch sends
+        int n = 0;
+        for (long off = sent; n < uring_batch && off < total_bytes; n++) {
+            size_t pos = off % message_size;
+            lengths[n] = message_size - pos;
+            off += lengths[n];
+        }
+        long off = sent;
+        for (int i = 0; i < n; i++) {
+            queue_send(&ring, client_fd, send_buffer + off % message_size, lengths[i],
+                       zerocopy, zc_flags, i, i < n - 1);
+            off += lengths[i];
+        }
+        
+        // BATCHED: one syscall submits n sends and waits for all of them
+        if (uring_submit(&ring, n) < 0) {
+            perror("io_uring_enter");
+            break;
+        }
+        submissions++;
+        
+        // Reap the n send results; SEND_ZC notifications may interleave
+        int reaped = 0;
+        while (reaped < n) {
+            struct io_uring_cqe *cqe = uring_wait_cqe(&ring);
+            if (!cqe) {
+                perror("io_uring_enter");
+                failed = 1;
+                break;
+            }
+            if (cqe->flags & IORING_CQE_F_NOTIF) {
+                // Buffer released; the kernel reports whether it copied
+                notifs_pending--;
+                zc_completions++;
+                if (cqe->res & IORING_NOTIF_USAGE_ZC_COPIED) zc_copied++;
+            } else {
+                results[cqe->user_data] = cqe->res;
+                if (cqe->flags & IORING_CQE_F_MORE) notifs_pending++;
+                reaped++;
+            }
+            uring_cqe_seen(&ring);
+        }
+        
+        // Advance over the in-order prefix that went out completely
+        for (int i = 0; i < reaped && !failed; i++) {
+            if (results[i] == -ECANCELED || results[i] == -EINTR || results[i] == -EAGAIN) {
+                break;          // resubmitted from `sent` in the next batch
+            }
+            if (results[i] < 0) {
+                if (zerocopy && sent == 0 && zc_flags && results[i] == -EINVAL) {
+                    zc_flags = 0;   // kernel < 6.2: no copied/zero-copy report
+                    break;
+                }
+                if (zerocopy && sent == 0 &&
+                    (results[i] == -EOPNOTSUPP || results[i] == -EINVAL)) {
+                    printf("[Thread %lu] Warning: SEND_ZC rejected, will use regular copy\n",
+                           pthread_self());
+                    zerocopy = 0;
+                    break;
+                }
+                errno = -results[i];
+                perror("io_uring send");
+                failed = 1;
+                break;
+            }
+            // Messages completed by this result: boundaries crossed
+            sampler_add(results[i], (sent + results[i]) / message_size - sent / message_size);
+            sent += results[i];
+            sends++;
+            if ((size_t)results[i] < lengths[i]) {
+                break;
+            }
+        }
+    }
+    
+    // Wait for the remaining zero-copy notifications
+    while (notifs_pending > 0) {
+        struct io_uring_cqe *cqe = uring_wait_cqe(&ring);
+        if (!cqe) {
+            perror("io_uring_enter");
+            break;
+        }
+        if (cqe->flags & IORING_CQE_F_NOTIF) {
+            notifs_pending--;
+            zc_completions++;
+            if (cqe->res & IORING_NOTIF_USAGE_ZC_COPIED) zc_copied++;
+        }
+        uring_cqe_seen(&ring);
+    }
+    
+    gettimeofday(&end, NULL);
+    double elapsed = (end.tv_sec - start.tv_sec) + 
+                     (end.tv_usec - start.tv_usec) / 1e6;
+    
+    // Merge this thread's stats
+    pthread_mutex_lock(&global_stats.lock);
+    global_stats.total_bytes_sent += sent;
+    global_stats.total_time_sec += elapsed;
+    global_stats.submissions += submissions;
+    global_stats.sends += sends;
+    global_stats.zerocopy_completions += zc_completions;
+    global_stats.copy_fallbacks += zc_copied;
+    pthread_mutex_unlock(&global_stats.lock);
+    
+    printf("[Thread %lu] Sent %ld bytes in %.3f sec (%.2f Mbps)\n",
+           pthread_self(), sent, elapsed,
+           (sent * 8.0) / (elapsed * 1e6));
+    
+    // Cleanup
+    uring_exit(&ring);
+    free(lengths);
+    free(results);
+    free(send_buffer);
+    destroy_message(msg);
+    close(client_fd);
+    free(args);
+    
+    return NULL;
+}
+
+static void usage(const char *prog) {
+    fprintf(stderr, "Usage: %s [-p port] [-g] [-S ring [-I ms]] [-b batch] [-c] [-f fields] [-a|-A] [-C policy[@n]] [-B usec] [-K bytes] <message_size> <num_messages> <max_clients>\n", prog);
+    fprintf(stderr, "  -b  sends submitted per io_uring_enter() (default %d)\n", URING_BATCH);
+    fprintf(stderr, "  -c  plain copying sends even when IORING_OP_SEND_ZC is supported\n");
+    fprintf(stderr, "  -f  string fields per message (default %d, max %d)\n",
+            NUM_STRING_FIELDS, MAX_STRING_FIELDS);
+    fprintf(stderr, "  -a  contiguous messages from a page-aligned slab arena (-A: huge pages)\n");
+    fprintf(stderr, "  -g  hold handlers until a line is read on stdin (per-thread profiling)\n");
+    fprintf(stderr, "  -C  pin handler/worker threads: compact, spread, irq or a core list (0-3,8); @n starts at entry n\n");
+    fprintf(stderr, "  -B  SO_BUSY_POLL microseconds on every connection\n");
+    fprintf(stderr, "  -K  SO_SNDBUF bytes of every connection\n");
+    fprintf(stderr, "  -S  write bytes/messages sent per -I ms slice (default %d) to ring file <ring>\n",
+            SAMPLER_INTERVAL_MS);
+    fprintf(stderr, "Example: %s 1024 10000 4\n", prog);
+    exit(1);
+}
+
+int main(int argc, char *argv[]) {
+    int port = PORT;
+    const char *sample_path = NULL;  // -S: interval sampler ring
+    double sample_ms = SAMPLER_INTERVAL_MS;
+    int c;
+    while ((c = getopt(argc, argv, "p:gb:cf:aAS:I:C:B:K:")) != -1) {
+        switch (c) {
+        case 'p': port = atoi(optarg); break;
+        case 'g': start_gate.enabled = 1; break;
+        case 'C': if (placement_parse(optarg) < 0) usage(argv[0]); break;
+        case 'B': placement.busy_poll_us = atoi(optarg); break;
+        case 'K': placement.sock_buf = atoi(optarg); break;
+        case 'S': sample_path = optarg; break;
+        case 'I': sample_ms = atof(optarg); break;
+        case 'f': message_fields = atoi(optarg); break;
+        case 'a': msg_arena.enabled = 1; break;
+        case 'A': msg_arena.enabled = msg_arena.huge_pages = 1; break;
+        case 'b': uring_batch = atoi(optarg); break;
+        case 'c': allow_send_zc = 0; break;
+        default: usage(argv[0]);
+        }
+    }
+    if (argc - optind != 3 || uring_batch < 1 || uring_batch > 4096) {
+        usage(argv[0]);
+    }
+    
+    // Line-buffered so the orchestrator sees readiness lines immediately
+    setvbuf(stdout, NULL, _IOLBF, 0);
+    
+    int message_size = atoi(argv[optind]);
+    int num_messages = atoi(argv[optind + 1]);
+    int max_clients = atoi(argv[optind + 2]);
+    
+    if (max_clients < 1 || max_clients > MAX_CLIENTS) {
+        fprintf(stderr, "max_clients must be between 1 and %d\n", MAX_CLIENTS);
+        exit(1);
+    }
+    
+    printf("=== Part A4: io_uring Server ===\n");
+    printf("Message size: %d bytes\n", message_size);
+    printf("Messages per client: %d\n", num_messages);
+    printf("Max clients: %d\n", max_clients);
+    placement_print("SO_SNDBUF");
+    printf("Batch: %d sends per io_uring_enter()\n", uring_batch);
+    if (message_layout_init(message_size) < 0) {
+        exit(1);
+    }
+    if (sample_path && sampler_start(sample_path, sample_ms) < 0) {
+        exit(1);
+    }
+    
+    int server_fd;
+    struct sockaddr_in server_addr, client_addr;
+    socklen_t addr_len = sizeof(client_addr);
+    
+    // Create socket
+    server_fd = socket(AF_INET, SOCK_STREAM, 0);
+    if (server_fd < 0) {
+        perror("socket");
+        exit(1);
+    }
+    
+    // SO_REUSEADDR to avoid "Address already in use" error
+    int opt = 1;
+    setsockopt(server_fd, SOL_SOCKET, SO_REUSEADDR, &opt, sizeof(opt));
+    
+    // Bind
+    memset(&server_addr, 0, sizeof(server_addr));
+    server_addr.sin_family = AF_INET;
+    if (inet_pton(AF_INET, "10.0.0.1", &server_addr.sin_addr) <= 0) {
+        perror("inet_pton");
+        exit(1);
+    }
+    server_addr.sin_port = htons(port);
+    
+    if (bind(server_fd, (struct sockaddr*)&server_addr, sizeof(server_addr)) < 0) {
+        perror("bind");
+        exit(1);
+    }
+    
+    // Listen
+    if (listen(server_fd, max_clients) < 0) {
+        perror("listen");
+        exit(1);
+    }
+    
+    printf("Server listening on port %d...\n", port);
+    
+    pthread_t threads[MAX_CLIENTS];
+    int client_count = 0;
+    
+    // Accept clients
+    while (client_count < max_clients) {
+        int client_fd = accept(server_fd, (struct sockaddr*)&client_addr, &addr_len);
+        if (client_fd < 0) {
+            perror("accept");
+            continue;
+        }
+        
+        printf("Client %d connected\n", client_count + 1);
+        
+        // Create thread arguments
+        ThreadArgs *args = (ThreadArgs*)malloc(sizeof(ThreadArgs));
+        args->client_fd = client_fd;
+        args->client_id = client_count + 1;
+        args->message_size = message_size;
+        args->num_messages = num_messages;
+        
+        // Create thread
+        if (pthread_create(&threads[client_count], NULL, handle_client, args) != 0) {
+            perror("pthread_create");
+            close(client_fd);
+            free(args);
+            continue;
+        }
+        
+        client_count++;
+    }
+    
+    printf("All %d clients accepted. Waiting for transfers to complete...\n", client_count);
+    gate_release(client_count);
+    
+    for (int i = 0; i < client_count; i++) {
+        pthread_join(threads[i], NULL);
+    }
+    
+    // Print final statistics
+    printf("\n=== Final Statistics ===\n");
+    printf("Total bytes sent: %ld\n", global_stats.total_bytes_sent);
+    printf("Total time: %.3f sec\n", global_stats.total_time_sec);
+    if (global_stats.total_time_sec > 0) {
+        printf("Average throughput: %.2f Mbps\n",
+               (global_stats.total_bytes_sent * 8.0) / (global_stats.total_time_sec * 1e6));
+    }
+    printf("Submissions: %ld io_uring_enter() calls for %ld sends (%.2f sends/call)\n",
+           global_stats.submissions, global_stats.sends,
+           global_stats.submissions > 0 ?
+               (double)global_stats.sends / global_stats.submissions : 0.0);
+    if (global_stats.zerocopy_completions > 0) {
+        printf("Zerocopy completions: %ld\n", global_stats.zerocopy_completions);
+        printf("Copy fallbacks: %ld (%.2f%%)\n",
+               global_stats.copy_fallbacks,
+               global_stats.copy_fallbacks * 100.0 / global_stats.zerocopy_completions);
+    }
+    
+    arena_destroy();
+    close(server_fd);
+    pthread_mutex_destroy(&global_stats.lock);
+    
+    return 0;
+}
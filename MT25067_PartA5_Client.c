@@ -0,0 +1,267 @@
+/*
+ * MT25067
+ * Part A5: File-Backed Zero-Copy TCP Client
+ * Receives from the sendfile()/splice() server without copying the data to
+ * user space, so the client is not the bottleneck of the copy-free path:
+ * - splice (default): socket -> pipe -> /dev/null, page references only
+ * - trunc: recv(MSG_TRUNC), the kernel frees the bytes without copying them
+ * The multi-connection loop (-n) always uses MSG_TRUNC.
+ */
+
+#define _GNU_SOURCE
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <unistd.h>
+#include <fcntl.h>
+#include <arpa/inet.h>
+#include <sys/socket.h>
+#include <sys/time.h>
+#include <errno.h>
+#include <getopt.h>
+
+#include "MT25067_LatencyHist.h"
+#include "MT25067_MultiClient.h"
+
+#define PORT 8084  // Match Part A5 server port
+#define SERVER_IP "10.0.0.1"
+
+typedef enum { RECV_SPLICE, RECV_TRUNC } RecvMode;
+
+/*
+ * Consume up to len bytes from the socket without copying them.
+ * Returns the bytes consumed, 0 when the server closed, -1 on error.
+ */
+static ssize_t discard_some(int sock_fd, RecvMode mode, int pipe_fd[2], int null_fd,
+                            size_t len) {
+    if (mode == RECV_TRUNC) {
+        // ZERO-COPY: MSG_TRUNC on TCP drops the bytes, the buffer is not used
+        return recv(sock_fd, NULL, len, MSG_TRUNC);
+    }
+    ssize_t in = splice(sock_fd, NULL, pipe_fd[1], NULL, len, SPLICE_F_MOVE);
+    for (ssize_t left = in; left > 0; ) {
+        ssize_t out = splice(pipe_fd[0], NULL, null_fd, NULL, left, SPLICE_F_MOVE);
+        if (out < 0) {
+            if (errno == EINTR) continue;
+            return -1;
+        }
+        left -= out;
+    }
+    return in;
+}
+
+static void usage(const char *prog) {
+    fprintf(stderr, "Usage: %s [-p port] [-H hist_file] [-S ring [-I ms]] [-n conns] [-r splice|trunc] [-C policy[@n]] [-B usec] [-K bytes] <message_size> <num_messages>\n", prog);
+    fprintf(stderr, "  -r  splice: socket -> pipe -> /dev/null (default); trunc: recv(MSG_TRUNC)\n");
+    fprintf(stderr, "  -n  open <conns> connections from this process (epoll receive loop, MSG_TRUNC)\n");
+    fprintf(stderr, "  -C  pin the receiving thread: compact, spread, irq or a core list (0-3,8); @n picks entry n\n");
+    fprintf(stderr, "  -B  SO_BUSY_POLL microseconds on every connection\n");
+    fprintf(stderr, "  -K  SO_RCVBUF bytes of every connection (set before connect)\n");
+    fprintf(stderr, "  -S  write bytes/messages received per -I ms slice (default %d) to ring file <ring>\n",
+            SAMPLER_INTERVAL_MS);
+    fprintf(stderr, "Example: %s 65536 10000\n", prog);
+    exit(1);
+}
+
+int main(int argc, char *argv[]) {
+    int port = PORT;
+    const char *hist_path = NULL;  // -H: per-message latency histogram file
+    const char *sample_path = NULL;  // -S: interval sampler ring
+    double sample_ms = SAMPLER_INTERVAL_MS;
+    int num_conns = 1;             // -n: connections opened by this process
+    RecvMode mode = RECV_SPLICE;   // -r: how received bytes are discarded
+    int c;
+    while ((c = getopt(argc, argv, "p:H:n:S:I:r:C:B:K:")) != -1) {
+        switch (c) {
+        case 'p': port = atoi(optarg); break;
+        case 'H': hist_path = optarg; break;
+        case 'S': sample_path = optarg; break;
+        case 'I': sample_ms = atof(optarg); break;
+        case 'n': num_conns = atoi(optarg); break;
+        case 'C': if (placement_parse(optarg) < 0) usage(argv[0]); break;
+        case 'B': placement.busy_poll_us = atoi(optarg); break;
+        case 'K': placement.sock_buf = atoi(optarg); break;
+        case 'r':
+            if (strcmp(optarg, "splice") == 0) {
+                mode = RECV_SPLICE;
+            } else if (strcmp(optarg, "trunc") == 0) {
+                mode = RECV_TRUNC;
+            } else {
+                usage(argv[0]);
+            }
+            break;
+        default: usage(argv[0]);
+        }
+    }
+    if (argc - optind != 2) {
+        usage(argv[0]);
+    }
+    
+    setvbuf(stdout, NULL, _IOLBF, 0);
+    
+    int message_size = atoi(argv[optind]);
+    int num_messages = atoi(argv[optind + 1]);
+    
+    printf("=== Part A5: File-Backed Zero-Copy Client ===\n");
+    printf("Expecting %d messages of %d bytes\n", num_messages, message_size);
+    placement_print("SO_RCVBUF");
+    if (sample_path && sampler_start(sample_path, sample_ms) < 0) {
+        exit(1);
+    }
+    
+    // Many connections from one process (large fan-out sweeps)
+    if (num_conns > 1) {
+        LatencyHist *multi_hist = NULL;
+        if (hist_path) {
+            multi_hist = (LatencyHist*)malloc(sizeof(LatencyHist));
+            if (!multi_hist) {
+                perror("malloc histogram");
+                exit(1);
+            }
+            hist_init(multi_hist);
+        }
+        multi_recv_flags = MSG_TRUNC;
+        int ret = run_multi_client(SERVER_IP, port, message_size, num_messages,
+                                   num_conns, multi_hist);
+        if (multi_hist) {
+            hist_write(multi_hist, hist_path);
+            free(multi_hist);
+        }
+        return ret == 0 ? 0 : 1;
+    }
+    
+    int sock_fd;
+    struct sockaddr_in server_addr;
+    
+    // Create socket
+    sock_fd = socket(AF_INET, SOCK_STREAM, 0);
+    if (sock_fd < 0) {
+        perror("socket");
+        exit(1);
+    }
+    placement_tune_socket(sock_fd, SO_RCVBUF);
+    
+    // Configure server address
+    memset(&server_addr, 0, sizeof(server_addr));
+    server_addr.sin_family = AF_INET;
+    server_addr.sin_port = htons(port);
+    
+    if (inet_pton(AF_INET, SERVER_IP, &server_addr.sin_addr) <= 0) {
+        perror("inet_pton");
+        exit(1);
+    }
+    
+    // Connect to server
+    if (connect(sock_fd, (struct sockaddr*)&server_addr, sizeof(server_addr)) < 0) {
+        perror("connect");
+        exit(1);
+    }
+    
+    printf("Connected to server at %s:%d\n", SERVER_IP, port);
+    placement_pin(0, sock_fd);
+    
+    // splice() sink: a pipe sized to one message, drained into /dev/null
+    int pipe_fd[2] = {-1, -1};
+    int null_fd = -1;
+    if (mode == RECV_SPLICE) {
+        null_fd = open("/dev/null", O_WRONLY);
+        if (null_fd < 0 || pipe(pipe_fd) < 0) {
+            perror("splice setup");
+            exit(1);
+        }
+        fcntl(pipe_fd[1], F_SETPIPE_SZ, message_size);
+    }
+    printf("Receive mode: %s\n", mode == RECV_SPLICE ? "splice to /dev/null" : "recv(MSG_TRUNC)");
+    
+    // Optional per-message latency histogram (fixed size, no per-sample storage)
+    LatencyHist *hist = NULL;
+    if (hist_path) {
+        hist = (LatencyHist*)malloc(sizeof(LatencyHist));
+        if (!hist) {
+            perror("malloc histogram");
+            exit(1);
+        }
+        hist_init(hist);
+    }
+    
+    struct timeval start, end;
+    gettimeofday(&start, NULL);
+    uint64_t last_ns = hist ? hist_now_ns() : 0;
+    
+    long total_bytes_received = 0;
+    int messages_received = 0;
+    
+    // Receive messages
+    while (messages_received < num_messages) {
+        int bytes_to_recv = message_size;
+        int total_recv = 0;
+        
+        // Never consume past the message, so message boundaries stay exact
+        while (total_recv < bytes_to_recv) {
+            ssize_t received = discard_some(sock_fd, mode, pipe_fd, null_fd,
+                                            bytes_to_recv - total_recv);
+            
+            if (received < 0) {
+                if (errno == EINTR) continue;
+                perror(mode == RECV_SPLICE ? "splice" : "recv");
+                goto cleanup;
+            } else if (received == 0) {
+                // Connection closed
+                printf("Server closed connection\n");
+                goto cleanup;
+            }
+            
+            total_recv += received;
+            sampler_add(received, total_recv == bytes_to_recv);
+        }
+        
+        total_bytes_received += total_recv;
+        messages_received++;
+        
+        // Per-message latency: time since the previous message completed
+        if (hist) {
+            uint64_t now_ns = hist_now_ns();
+            hist_record(hist, now_ns - last_ns);
+            last_ns = now_ns;
+        }
+        
+        // Print progress every 1000 messages
+        if (messages_received % 1000 == 0) {
+            printf("Received %d messages...\n", messages_received);
+        }
+    }
+    
+    gettimeofday(&end, NULL);
+    double elapsed = (end.tv_sec - start.tv_sec) +
+                     (end.tv_usec - start.tv_usec) / 1e6;
+    
+    // Calculate metrics
+    double throughput_mbps = (total_bytes_received * 8.0) / (elapsed * 1e6);
+    double avg_latency_us = (elapsed * 1e6) / messages_received;
+    
+    printf("\n=== Results ===\n");
+    printf("Messages received: %d\n", messages_received);
+    printf("Total bytes: %ld\n", total_bytes_received);
+    printf("Time elapsed: %.3f sec\n", elapsed);
+    printf("Throughput: %.2f Mbps\n", throughput_mbps);
+    printf("Average latency: %.2f µs\n", avg_latency_us);
+    // Wall-clock window, used to aggregate concurrent clients
+    printf("Start time: %ld.%06ld\n", (long)start.tv_sec, (long)start.tv_usec);
+    printf("End time: %ld.%06ld\n", (long)end.tv_sec, (long)end.tv_usec);
+
+cleanup:
+    if (hist) {
+        hist_write(hist, hist_path);
+        free(hist);
+    }
+    if (pipe_fd[0] >= 0) {
+        close(pipe_fd[0]);
+        close(pipe_fd[1]);
+    }
+    if (null_fd >= 0) {
+        close(null_fd);
+    }
+    close(sock_fd);
+    
+    return 0;
+}
@@ -0,0 +1,506 @@
+/*
+ * MT25067
+ * Part A5: File-Backed Zero-Copy TCP Server
+ * Serves the payload from the page cache with sendfile() (default) or
+ * splice() through a pipe. The payload lives in a memfd the message is
+ * serialized into through a shared mapping, or in an existing file (-F)
+ * that is mapped and faulted in before the run. Either way the kernel
+ * hands page references to the socket: no user buffer is ever copied,
+ * so unlike MSG_ZEROCOPY there is no per-send completion and no copy
+ * fallback on veth.
+ * Multithreaded - one thread per client
+ */
+
+#define _GNU_SOURCE
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <unistd.h>
+#include <fcntl.h>
+#include <pthread.h>
+#include <arpa/inet.h>
+#include <sys/mman.h>
+#include <sys/sendfile.h>
+#include <sys/stat.h>
+#include <sys/time.h>
+#include <errno.h>
+#include <getopt.h>
+
+#include "MT25067_Message.h"
+#include "MT25067_ServerCommon.h"
+
+#define PORT 8084  // Different port from A1-A4
+#define MAX_CLIENTS 100
+
+typedef enum { SEND_SENDFILE, SEND_SPLICE } SendMode;
+
+// Thread arguments
+typedef struct {
+    int client_fd;
+    int client_id;
+    int message_size;
+    int num_messages;
+} ThreadArgs;
+
+// Global statistics
+typedef struct {
+    long total_bytes_sent;
+    double total_time_sec;
+    long syscalls;              // sendfile() calls, or splice() calls into the socket
+    pthread_mutex_t lock;
+} Stats;
+
+Stats global_stats = {0, 0.0, 0, PTHREAD_MUTEX_INITIALIZER};
+
+/*
+ * Read-only payload shared by every connection: <slots> back-to-back
+ * messages of message_size bytes at the start of fd. Message i of a
+ * connection is served from slot i % slots, so a large -F file streams
+ * through the page cache instead of resending one hot page range.
+ */
+typedef struct {
+    int fd;
+    char *map;
+    size_t map_len;
+    int slots;
+} Payload;
+
+static Payload payload = {-1, NULL, 0, 1};
+static SendMode send_mode = SEND_SENDFILE;
+
+/*
+ * Serialize one message into a memfd through a MAP_SHARED mapping: the
+ * mapping's pages are the page-cache pages sendfile()/splice() read from
+ */
+static int payload_from_memfd(int message_size) {
+    payload.fd = memfd_create("MT25067_payload", 0);
+    if (payload.fd < 0) {
+        perror("memfd_create");
+        return -1;
+    }
+    if (ftruncate(payload.fd, message_size) < 0) {
+        perror("ftruncate");
+        return -1;
+    }
+    payload.map_len = message_size;
+    payload.map = (char*)mmap(NULL, payload.map_len, PROT_READ | PROT_WRITE,
+                              MAP_SHARED, payload.fd, 0);
+    if (payload.map == MAP_FAILED) {
+        perror("mmap");
+        return -1;
+    }
+    
+    Message *msg = create_message(message_size);
+    if (!msg) {
+        return -1;
+    }
+    serialize_message(msg, payload.map, message_size);
+    destroy_message(msg);
+    payload.slots = 1;
+    return 0;
+}
+
+/*
+ * Map an existing file and fault every page in, so the timed sends are
+ * served from the page cache (a cached object) rather than the disk
+ */
+static int payload_from_file(const char *path, int message_size) {
+    payload.fd = open(path, O_RDONLY);
+    if (payload.fd < 0) {
+        perror(path);
+        return -1;
+    }
+    struct stat st;
+    if (fstat(payload.fd, &st) < 0) {
+        perror("fstat");
+        return -1;
+    }
+    if (st.st_size < message_size) {
+        fprintf(stderr, "%s: %ld bytes, smaller than one %d byte message\n",
+                path, (long)st.st_size, message_size);
+        return -1;
+    }
+    payload.slots = st.st_size / message_size;
+    payload.map_len = (size_t)payload.slots * message_size;
+    payload.map = (char*)mmap(NULL, payload.map_len, PROT_READ, MAP_SHARED, payload.fd, 0);
+    if (payload.map == MAP_FAILED) {
+        perror("mmap");
+        return -1;
+    }
+    madvise(payload.map, payload.map_len, MADV_WILLNEED);
+    
+    volatile char sink = 0;
+    long page = sysconf(_SC_PAGESIZE);
+    for (size_t off = 0; off < payload.map_len; off += page) {
+        sink ^= payload.map[off];
+    }
+    (void)sink;
+    return 0;
+}
+
+static void payload_destroy(void) {
+    if (payload.map && payload.map != MAP_FAILED) {
+        munmap(payload.map, payload.map_len);
+    }
+    if (payload.fd >= 0) {
+        close(payload.fd);
+    }
+}
+
+static inline off_t payload_offset(int message_index, int message_size) {
+    return (off_t)(message_index % payload.slots) * message_size;
+}
+
+/*
+ * splice() path: page cache -> pipe -> socket, in chunks of the pipe size.
+ * Only page references move through the pipe. Returns bytes sent, -1 on error.
+ */
+static ssize_t splice_message(int client_fd, int pipe_fd[2], off_t offset,
+                              size_t len, long *syscalls) {
+    size_t done = 0;
+    while (done < len) {
+        loff_t in_off = offset + done;
+        ssize_t in = splice(payload.fd, &in_off, pipe_fd[1], NULL, len - done,
+                            SPLICE_F_MOVE | SPLICE_F_MORE);
+        if (in < 0) {
+            if (errno == EINTR) continue;
+            perror("splice (file -> pipe)");
+            return -1;
+        }
+        if (in == 0) {
+            break;
+        }
+        while (in > 0) {
+            ssize_t out = splice(pipe_fd[0], NULL, client_fd, NULL, in,
+                                 SPLICE_F_MOVE | SPLICE_F_MORE);
+            if (out < 0) {
+                if (errno == EINTR) continue;
+                perror("splice (pipe -> socket)");
+                return -1;
+            }
+            (*syscalls)++;
+            in -= out;
+            done += out;
+            sampler_add(out, done == len);
+        }
+    }
+    return done;
+}
+
+/*
+ * Client handler thread
+ * Sends messages straight from the page cache with sendfile() or splice()
+ */
+void* handle_client(void *arg) {
+    ThreadArgs *args = (ThreadArgs*)arg;
+    int client_fd = args->client_fd;
+    int message_size = args->message_size;
+    int num_messages = args->num_messages;
+    
+    // Park until the profiler has attached (no-op without -g)
+    name_handler_thread("A5", args->client_id);
+    place_handler(args->client_id, client_fd);
+    gate_wait();
+    
+    printf("[Thread %lu] Handling client, sending %d messages of %d bytes\n",
+           pthread_self(), num_messages, message_size);
+    
+    // splice() needs a pipe; size it to one message (capped by pipe-max-size)
+    int pipe_fd[2] = {-1, -1};
+    if (send_mode == SEND_SPLICE) {
+        if (pipe(pipe_fd) < 0) {
+            perror("pipe");
+            close(client_fd);
+            free(args);
+            return NULL;
+        }
+        fcntl(pipe_fd[1], F_SETPIPE_SZ, message_size);
+    }
+    
+    struct timeval start, end;
+    gettimeofday(&start, NULL);
+    
+    // Send messages repeatedly
+    long bytes_sent_total = 0;
+    long syscalls = 0;
+    for (int i = 0; i < num_messages; i++) {
+        off_t offset = payload_offset(i, message_size);
+        ssize_t sent;
+        if (send_mode == SEND_SPLICE) {
+            sent = splice_message(client_fd, pipe_fd, offset, message_size, &syscalls);
+        } else {
+            // ZERO-COPY: the socket takes references to the page-cache pages
+            sent = 0;
+            while (sent < message_size) {
+                ssize_t n = sendfile(client_fd, payload.fd, &offset, message_size - sent);
+                if (n < 0) {
+                    if (errno == EINTR) continue;
+                    perror("sendfile");
+                    sent = -1;
+                    break;
+                }
+                if (n == 0) {
+                    break;
+                }
+                syscalls++;
+                sent += n;
+                sampler_add(n, sent == message_size);
+            }
+        }
+        if (sent < 0) {
+            break;
+        }
+        bytes_sent_total += sent;
+        if (sent < message_size) {
+            break;
+        }
+    }
+    
+    gettimeofday(&end, NULL);
+    double elapsed = (end.tv_sec - start.tv_sec) +
+                     (end.tv_usec - start.tv_usec) / 1e6;
+    
+    // Update global stats
+    pthread_mutex_lock(&global_stats.lock);
+    global_stats.total_bytes_sent += bytes_sent_total;
+    global_stats.total_time_sec += elapsed;
+    global_stats.syscalls += syscalls;
+    pthread_mutex_unlock(&global_stats.lock);
+    
+    printf("[Thread %lu] Sent %ld bytes in %.3f sec (%.2f Mbps)\n",
+           pthread_self(), bytes_sent_total, elapsed,
+           (bytes_sent_total * 8.0) / (elapsed * 1e6));
+    
+    // Cleanup
+    if (pipe_fd[0] >= 0) {
+        close(pipe_fd[0]);
+        close(pipe_fd[1]);
+    }
+    close(client_fd);
+    free(args);
+    
+    return NULL;
+}
+
+/*
+ * Event-driven send path (-e): sendfile() from the connection's current
+ * slot, resuming at c->offset after a partial send
+ */
+static ssize_t epoll_send_some(EpollWorker *w, Conn *c) {
+    int message_size = w->ops->message_size;
+    int index = w->ops->num_messages - c->messages_left;
+    off_t offset = payload_offset(index, message_size) + c->offset;
+    // ZERO-COPY: the socket takes references to the page-cache pages
+    return sendfile(c->fd, payload.fd, &offset, message_size - c->offset);
+}
+
+/*
+ * Serve max_clients connections from a fixed pool of epoll workers
+ */
+static int serve_epoll(int server_fd, int message_size, int num_messages,
+                       int max_clients, int num_workers) {
+    EpollOps ops = {"A5", message_size, num_messages, payload.map,
+                    NULL, epoll_send_some, NULL};
+    EpollTotals totals;
+    int ret = run_epoll_server(server_fd, max_clients, num_workers, &ops, &totals);
+    
+    global_stats.total_bytes_sent = totals.bytes_sent;
+    global_stats.total_time_sec = totals.total_time_sec;
+    return ret;
+}
+
+static void usage(const char *prog) {
+    fprintf(stderr, "Usage: %s [-p port] [-g] [-S ring [-I ms]] [-e workers] [-m sendfile|splice] [-F file] [-f fields] [-a|-A] [-C policy[@n]] [-B usec] [-K bytes] <message_size> <num_messages> <max_clients>\n", prog);
+    fprintf(stderr, "  -e  event-driven mode: <workers> epoll threads instead of a thread per client (sendfile only)\n");
+    fprintf(stderr, "  -m  sendfile(): file -> socket (default); splice(): file -> pipe -> socket\n");
+    fprintf(stderr, "  -F  serve consecutive message-sized slices of <file> (default: one message in a memfd)\n");
+    fprintf(stderr, "  -f  string fields per message (default %d, max %d)\n",
+            NUM_STRING_FIELDS, MAX_STRING_FIELDS);
+    fprintf(stderr, "  -a  contiguous messages from a page-aligned slab arena (-A: huge pages)\n");
+    fprintf(stderr, "  -g  hold handlers until a line is read on stdin (per-thread profiling)\n");
+    fprintf(stderr, "  -C  pin handler/worker threads: compact, spread, irq or a core list (0-3,8); @n starts at entry n\n");
+    fprintf(stderr, "  -B  SO_BUSY_POLL microseconds on every connection\n");
+    fprintf(stderr, "  -K  SO_SNDBUF bytes of every connection\n");
+    fprintf(stderr, "  -S  write bytes/messages sent per -I ms slice (default %d) to ring file <ring>\n",
+            SAMPLER_INTERVAL_MS);
+    fprintf(stderr, "Example: %s 65536 10000 4\n", prog);
+    exit(1);
+}
+
+int main(int argc, char *argv[]) {
+    int port = PORT;
+    int num_workers = 0;  // -e: epoll worker threads (0 = thread per client)
+    const char *sample_path = NULL;  // -S: interval sampler ring
+    const char *payload_path = NULL;  // -F: serve this file instead of a memfd
+    double sample_ms = SAMPLER_INTERVAL_MS;
+    int c;
+    while ((c = getopt(argc, argv, "p:ge:m:F:f:aAS:I:C:B:K:")) != -1) {
+        switch (c) {
+        case 'p': port = atoi(optarg); break;
+        case 'g': start_gate.enabled = 1; break;
+        case 'C': if (placement_parse(optarg) < 0) usage(argv[0]); break;
+        case 'B': placement.busy_poll_us = atoi(optarg); break;
+        case 'K': placement.sock_buf = atoi(optarg); break;
+        case 'S': sample_path = optarg; break;
+        case 'I': sample_ms = atof(optarg); break;
+        case 'f': message_fields = atoi(optarg); break;
+        case 'a': msg_arena.enabled = 1; break;
+        case 'A': msg_arena.enabled = msg_arena.huge_pages = 1; break;
+        case 'e': num_workers = atoi(optarg); break;
+        case 'F': payload_path = optarg; break;
+        case 'm':
+            if (strcmp(optarg, "sendfile") == 0) {
+                send_mode = SEND_SENDFILE;
+            } else if (strcmp(optarg, "splice") == 0) {
+                send_mode = SEND_SPLICE;
+            } else {
+                usage(argv[0]);
+            }
+            break;
+        default: usage(argv[0]);
+        }
+    }
+    if (argc - optind != 3) {
+        usage(argv[0]);
+    }
+    if (num_workers > 0 && send_mode == SEND_SPLICE) {
+        fprintf(stderr, "-m splice needs a thread per client (no -e)\n");
+        exit(1);
+    }
+    
+    // Line-buffered so the orchestrator sees readiness lines immediately
+    setvbuf(stdout, NULL, _IOLBF, 0);
+    
+    int message_size = atoi(argv[optind]);
+    int num_messages = atoi(argv[optind + 1]);
+    int max_clients = atoi(argv[optind + 2]);
+    
+    int client_limit = num_workers > 0 ? MAX_EPOLL_CLIENTS : MAX_CLIENTS;
+    if (max_clients < 1 || max_clients > client_limit) {
+        fprintf(stderr, "max_clients must be between 1 and %d\n", client_limit);
+        exit(1);
+    }
+    
+    printf("=== Part A5: File-Backed Zero-Copy Server ===\n");
+    printf("Message size: %d bytes\n", message_size);
+    printf("Messages per client: %d\n", num_messages);
+    printf("Max clients: %d\n", max_clients);
+    placement_print("SO_SNDBUF");
+    if (message_layout_init(message_size) < 0) {
+        exit(1);
+    }
+    if ((payload_path ? payload_from_file(payload_path, message_size)
+                      : payload_from_memfd(message_size)) < 0) {
+        exit(1);
+    }
+    printf("Send mode: %s from %s (%d message slot%s mapped)\n",
+           send_mode == SEND_SPLICE ? "splice" : "sendfile",
+           payload_path ? payload_path : "memfd", payload.slots,
+           payload.slots == 1 ? "" : "s");
+    if (sample_path && sampler_start(sample_path, sample_ms) < 0) {
+        exit(1);
+    }
+    
+    int server_fd;
+    struct sockaddr_in server_addr, client_addr;
+    socklen_t addr_len = sizeof(client_addr);
+    
+    // Create socket
+    server_fd = socket(AF_INET, SOCK_STREAM, 0);
+    if (server_fd < 0) {
+        perror("socket");
+        exit(1);
+    }
+    
+    // SO_REUSEADDR to avoid "Address already in use" error
+    int opt = 1;
+    setsockopt(server_fd, SOL_SOCKET, SO_REUSEADDR, &opt, sizeof(opt));
+    
+    // Bind
+    memset(&server_addr, 0, sizeof(server_addr));
+    server_addr.sin_family = AF_INET;
+    if (inet_pton(AF_INET, "10.0.0.1", &server_addr.sin_addr) <= 0) {
+        perror("inet_pton");
+        exit(1);
+    }
+    server_addr.sin_port = htons(port);
+    
+    if (bind(server_fd, (struct sockaddr*)&server_addr, sizeof(server_addr)) < 0) {
+        perror("bind");
+        exit(1);
+    }
+    
+    // Listen
+    if (listen(server_fd, max_clients) < 0) {
+        perror("listen");
+        exit(1);
+    }
+    
+    printf("Server listening on port %d...\n", port);
+    
+    if (num_workers > 0) {
+        // Event-driven: fixed epoll worker pool, non-blocking sockets
+        if (serve_epoll(server_fd, message_size, num_messages, max_clients, num_workers) < 0) {
+            exit(1);
+        }
+    } else {
+        pthread_t threads[MAX_CLIENTS];
+        int client_count = 0;
+        
+        // Accept clients
+        while (client_count < max_clients) {
+            int client_fd = accept(server_fd, (struct sockaddr*)&client_addr, &addr_len);
+            if (client_fd < 0) {
+                perror("accept");
+                continue;
+            }
+            
+            printf("Client %d connected\n", client_count + 1);
+            
+            // Create thread arguments
+            ThreadArgs *args = (ThreadArgs*)malloc(sizeof(ThreadArgs));
+            args->client_fd = client_fd;
+            args->client_id = client_count + 1;
+            args->message_size = message_size;
+            args->num_messages = num_messages;
+            
+            // Create thread
+            if (pthread_create(&threads[client_count], NULL, handle_client, args) != 0) {
+                perror("pthread_create");
+                close(client_fd);
+                free(args);
+                continue;
+            }
+            
+            client_count++;
+        }
+        
+        printf("All %d clients accepted. Waiting for transfers to complete...\n", client_count);
+        gate_release(client_count);
+        
+        // Exit as soon as every handler has finished (no fixed sleep)
+        for (int i = 0; i < client_count; i++) {
+            pthread_join(threads[i], NULL);
+        }
+    }
+    
+    // Print final statistics
+    printf("\n=== Final Statistics ===\n");
+    printf("Total bytes sent: %ld\n", global_stats.total_bytes_sent);
+    printf("Total time: %.3f sec\n", global_stats.total_time_sec);
+    if (global_stats.total_time_sec > 0) {
+        printf("Average throughput: %.2f Mbps\n",
+               (global_stats.total_bytes_sent * 8.0) / (global_stats.total_time_sec * 1e6));
+    }
+    if (global_stats.syscalls > 0) {
+        printf("Send calls: %ld %s() calls into the socket\n", global_stats.syscalls,
+               send_mode == SEND_SPLICE ? "splice" : "sendfile");
+    }
+    
+    payload_destroy();
+    arena_destroy();
+    close(server_fd);
+    pthread_mutex_destroy(&global_stats.lock);
+    
+    return 0;
+}
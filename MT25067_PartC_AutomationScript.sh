@@ -17,13 +17,34 @@ set -e  # Exit on error
 MESSAGE_SIZES=(256 1024 4096 16384)
 THREAD_COUNTS=(1 2 4 8)
 NUM_MESSAGES=5000  # FIXED: Increased for stable profiling (was 1000)
-IMPLEMENTATIONS=("A1" "A2" "A3")
-PORTS=(8080 8081 8082)  # Corresponding ports for A1, A2, A3
+IMPLEMENTATIONS=("A1" "A2" "A3" "A4" "A5")
+PORTS=(8080 8081 8082 8083 8084)  # Corresponding ports for A1, A2, A3, A4, A5
+# Thread placement / busy poll / socket buffer variants, as label suffixes
+# (see MT25067_PartC_Grid.py), e.g. ("" "+compact" "+spread" "+spread+bp50")
+PLACEMENTS=("")
 
 # Output directory for temporary files
 TEMP_DIR="experiment_results"
+# Merged per-cell latency histograms (kept for Part D CDF plots)
+HIST_DIR="latency_histograms"
+# Merged per-cell throughput series (kept for Part D time-series plots)
+SERIES_DIR="throughput_series"
+# Interval sampler rings (-S), in shared memory when available
+RING_DIR="/dev/shm"
+[ -d "$RING_DIR" ] || RING_DIR="$TEMP_DIR"
 # CSV file in main directory (no subfolders as per assignment requirement)
 CSV_FILE="MT25067_ExperimentData.csv"
+# Per-cell trial counts, means and 95% confidence intervals
+SUMMARY_FILE="MT25067_TrialSummary.csv"
+# Columns of one trial's row (the CSV adds Trial,Outlier)
+ROW_HEADER="Implementation,MessageSize,NumThreads,Throughput_Gbps,Latency_us,TotalBytes,CPU_Cycles,Instructions,LLC_Misses,L1_Misses,ContextSwitches,TimeElapsed_sec,Latency_p50_us,Latency_p99_us,Latency_p999_us,AggThroughput_Gbps,MinClient_Gbps,MaxClient_Gbps,JainFairness,PerfRunning_pct,ZeroCopyCopied_pct,SteadyThroughput_Gbps,WarmupTrimmed_ms,SteadyCV,Stable"
+
+# Adaptive trials: every cell runs at least MIN_TRIALS times, then is repeated
+# until the 95% CI of throughput and latency is within CI_TARGET of the mean
+# (or MAX_TRIALS runs); see MT25067_PartC_Trials.py
+MIN_TRIALS=3
+MAX_TRIALS=10
+CI_TARGET=0.05
 
 # Colors for output
 RED='\033[0;31m'
@@ -97,7 +118,7 @@ validate_perf_output() {
         return 1
     fi
     
-    # Check if it has required metrics
+    # Check if it has required metrics (perf stat -x, rows: value,unit,event,...)
     if ! grep -q "cycles" "$perf_file"; then
         log_error "Perf output missing 'cycles' metric for $exp_name"
         return 1
@@ -109,8 +130,8 @@ validate_perf_output() {
     fi
     
     # Check for suspiciously low cache miss counts (< 5 is likely an error)
-    local cache_misses=$(grep "cache-misses" "$perf_file" | awk '{print $1}' | tr -d ',' | head -1)
-    if [ ! -z "$cache_misses" ] && [ "$cache_misses" -lt 5 ]; then
+    local cache_misses=$(grep ",cache-misses" "$perf_file" | cut -d, -f1 | cut -d. -f1 | head -1)
+    if [[ "$cache_misses" =~ ^[0-9]+$ ]] && [ "$cache_misses" -lt 5 ]; then
         log_warn "Suspiciously low cache misses ($cache_misses) for $exp_name - data may be incomplete"
     fi
     
@@ -118,67 +139,40 @@ validate_perf_output() {
 }
 
 # Function to parse perf output and extract metrics
-# Function to parse perf output and extract metrics
+# Reads the machine-readable perf stat -x, output via MT25067_PartC_Perf.py
+# ("<not counted>" rows are skipped, multiplexed counts keep their ratio)
 parse_perf_output() {
     local perf_file=$1
     local csv_line=$2
     
-    # FIX: Pipe to 'tr -d ,' BEFORE 'awk' to handle large numbers correctly
-    
-    # Extract cycles
-    local cycles=$(grep "cycles" $perf_file | tr -d ',' | awk '{sum += $1} END {print sum}')
-    
-    # Extract instructions
-    local instructions=$(grep "instructions" $perf_file | tr -d ',' | awk '{sum += $1} END {print sum}')
-    
-    # Extract cache-misses
-    local cache_misses=$(grep "cache-misses" $perf_file | tr -d ',' | awk '{sum += $1} END {print sum}')
-    
-    # Extract L1-dcache-load-misses
-    local l1_misses=$(grep "L1-dcache-load-misses" $perf_file | tr -d ',' | awk '{sum += $1} END {print sum}')
-    
-    # Extract context-switches
-    local ctx_switches=$(grep "context-switches" $perf_file | tr -d ',' | awk '{sum += $1} END {print sum}')
-    
-    # Extract time elapsed (usually has no commas, but order is fine)
-    local time_elapsed=$(grep "seconds time elapsed" $perf_file | awk '{print $1}')
+    # cycles,instructions,cache-misses,L1-dcache-load-misses,context-switches,
+    # time elapsed (duration_time)
+    local metrics=$(python3 MT25067_PartC_Perf.py --fields "$perf_file" 2>/dev/null)
     
     # Handle empty values
-    cycles=${cycles:-0}
-    instructions=${instructions:-0}
-    cache_misses=${cache_misses:-0}
-    l1_misses=${l1_misses:-0}
-    ctx_switches=${ctx_switches:-0}
-    time_elapsed=${time_elapsed:-0}
+    metrics=${metrics:-0,0,0,0,0,0}
     
     # Append to CSV line
-    echo "${csv_line},${cycles},${instructions},${cache_misses},${l1_misses},${ctx_switches},${time_elapsed}"
+    echo "${csv_line},${metrics}"
 }
 
 # Function to parse client output for throughput and latency
-# Function to parse client output for throughput and latency
+# Merges ALL client output files of one experiment (not just client #1)
+# Usage: parse_client_output <base|aggregate> <client_file>...
 parse_client_output() {
-    local client_file=$1
-    
-    # Extract throughput (Mbps) from client output
-    local throughput_mbps=$(grep "Throughput:" "$client_file" | awk '{print $2}')
-    
-    # NEW: Convert Mbps to Gbps (divide by 1000)
-    # Using awk for floating point division
-    local throughput_gbps=$(echo "$throughput_mbps" | awk '{printf "%.5f", $1/1000}')
-    
-    # Extract latency (µs)
-    local latency=$(grep "Average latency:" "$client_file" | awk '{print $3}')
+    local fields=$1
+    shift
     
-    # Extract total bytes
-    local total_bytes=$(grep "Total bytes:" "$client_file" | awk '{print $3}')
+    # base:      Throughput_Gbps (mean per client), Latency_us, TotalBytes (sum)
+    # aggregate: AggThroughput_Gbps, MinClient_Gbps, MaxClient_Gbps, JainFairness
+    local metrics=$(python3 MT25067_PartC_Collect.py --fields "$fields" "$@" 2>/dev/null)
     
     # Handle empty values
-    throughput_gbps=${throughput_gbps:-0}
-    latency=${latency:-0}
-    total_bytes=${total_bytes:-0}
+    if [ -z "$metrics" ]; then
+        if [ "$fields" = "base" ]; then metrics="0,0,0"; else metrics=",,,"; fi
+    fi
     
-    echo "${throughput_gbps},${latency},${total_bytes}"
+    echo "$metrics"
 }
 
 # Function to run a single experiment
@@ -187,15 +181,22 @@ run_experiment() {
     local impl_idx=$2
     local msg_size=$3
     local num_threads=$4
+    local placement=$5
+    local row_file=${6:-$CSV_FILE}
+    local trial=${7:-1}
     local port=${PORTS[$impl_idx]}
+    local label="${impl}${placement}"
     
-    local exp_name="${impl}_${msg_size}B_${num_threads}T"
+    local exp_name="${label}_${msg_size}B_${num_threads}T"
     log_info "Running experiment: $exp_name"
     
     # File names (all in temp directory)
     local perf_output="${TEMP_DIR}/perf_${exp_name}.txt"
     local server_output="${TEMP_DIR}/server_${exp_name}.txt"
     local client_output="${TEMP_DIR}/client_${exp_name}.txt"
+    local ring_prefix="${RING_DIR}/MT25067_$$_${exp_name}"
+    # -C/-B/-K of the placement variant (server threads take entries 0..)
+    local server_args=$(python3 MT25067_PartC_Grid.py --server-args "$label")
     
     # Clean up any existing processes on this port IN SERVER_NS
     kill_on_port $port
@@ -204,10 +205,10 @@ run_experiment() {
     
     # Start server with perf IN SERVER NAMESPACE
     log_info "Starting server for $exp_name on port $port in server_ns"
-    sudo ip netns exec server_ns perf stat \
-        -e cycles,instructions,cache-misses,L1-dcache-load-misses,context-switches \
+    sudo ip netns exec server_ns perf stat -x, \
+        -e cycles,instructions,cache-misses,L1-dcache-load-misses,context-switches,duration_time \
         -o "$perf_output" \
-        ./MT25067_Part${impl}_Server $msg_size $NUM_MESSAGES $num_threads \
+        ./MT25067_Part${impl}_Server $server_args -S "${ring_prefix}_server.ring" $msg_size $NUM_MESSAGES $num_threads \
         > "$server_output" 2>&1 &
     
     local server_pid=$!
@@ -227,7 +228,12 @@ run_experiment() {
     # Start clients IN CLIENT NAMESPACE
     local client_pids=()
     for ((i=1; i<=$num_threads; i++)); do
-        sudo ip netns exec client_ns ./MT25067_Part${impl}_Client $msg_size $NUM_MESSAGES \
+        # Client i takes the placement entry after the server's handlers
+        local client_args=$(python3 MT25067_PartC_Grid.py --client-args "$label" \
+            --slot $((num_threads + i - 1)))
+        sudo ip netns exec client_ns ./MT25067_Part${impl}_Client $client_args \
+            -H "${TEMP_DIR}/hist_${exp_name}_${i}.hist" -S "${ring_prefix}_${i}.ring" \
+            $msg_size $NUM_MESSAGES \
             > "${TEMP_DIR}/client_${exp_name}_${i}.txt" 2>&1 &
         client_pids+=($!)
     done
@@ -263,28 +269,90 @@ run_experiment() {
         return 1
     fi
     
-    # Parse results from first client
-    if [ ! -f "${TEMP_DIR}/client_${exp_name}_1.txt" ]; then
+    # Parse results from all clients
+    local client_files=("${TEMP_DIR}"/client_${exp_name}_*.txt)
+    if [ ! -f "${client_files[0]}" ]; then
         log_error "Client output file not found for $exp_name"
         return 1
     fi
     
-    local client_metrics=$(parse_client_output "${TEMP_DIR}/client_${exp_name}_1.txt")
+    local client_metrics=$(parse_client_output base "${client_files[@]}")
     
     # Build CSV line
-    local csv_line="${impl},${msg_size},${num_threads},${client_metrics}"
+    local csv_line="${label},${msg_size},${num_threads},${client_metrics}"
     
     # Parse perf output and complete CSV line
     local complete_line=$(parse_perf_output "$perf_output" "$csv_line")
     
-    # Append to CSV
-    echo "$complete_line" >> "$CSV_FILE"
+    # Merge all clients' latency histograms; append this trial's p50,p99,p99.9
+    # (the cell's histogram accumulates every trial, the first starts it afresh)
+    local hist_mode="--add"
+    [ "$trial" -eq 1 ] && hist_mode="--merge"
+    local tail_latency=$(python3 MT25067_PartD_Latency.py --csv \
+        $hist_mode "${HIST_DIR}/${exp_name}.hist" "${TEMP_DIR}"/hist_${exp_name}_*.hist 2>/dev/null)
+    complete_line="${complete_line},${tail_latency:-,,}"
+    
+    # Aggregate throughput, per-client spread and fairness across all clients
+    complete_line="${complete_line},$(parse_client_output aggregate "${client_files[@]}")"
+    
+    # Lowest enabled/running ratio of the perf counters (100 = not multiplexed)
+    complete_line="${complete_line},$(python3 MT25067_PartC_Perf.py --running "$perf_output" 2>/dev/null)"
+    
+    # Copied vs true zero-copy share of zero-copy sends (A3/A4 only)
+    complete_line="${complete_line},$(python3 MT25067_PartC_Collect.py --fields server "$server_output" 2>/dev/null)"
+    
+    # Warm-up-trimmed steady state of the clients' throughput series (one
+    # series file per trial)
+    [ "$trial" -eq 1 ] && rm -f "${SERIES_DIR}/${exp_name}"_t*.npz "${SERIES_DIR}/${exp_name}.npz"
+    local steady=$(python3 MT25067_PartD_Timeseries.py --fields \
+        --merge "${SERIES_DIR}/${exp_name}_t${trial}.npz" --server "${ring_prefix}_server.ring" \
+        "${ring_prefix}"_[0-9]*.ring 2>/dev/null)
+    complete_line="${complete_line},${steady:-,,,}"
+    sudo rm -f "${ring_prefix}"_*.ring
+    
+    # Append to the cell's trial file (or the CSV)
+    echo "$complete_line" >> "$row_file"
     
     log_info "✓ Experiment $exp_name completed successfully"
     
     return 0
 }
 
+# Function to repeat one cell until its confidence intervals are narrow enough
+run_trials() {
+    local impl=$1
+    local impl_idx=$2
+    local msg_size=$3
+    local num_threads=$4
+    local placement=$5
+    local trial_file="${TEMP_DIR}/trials_${impl}${placement}_${msg_size}B_${num_threads}T.csv"
+    local limits="--min-trials $MIN_TRIALS --max-trials $MAX_TRIALS --ci-target $CI_TARGET"
+    local trials=0
+    local failures=0
+    
+    echo "$ROW_HEADER" > "$trial_file"
+    while [ $((trials + failures)) -lt $MAX_TRIALS ]; do
+        log_info "Trial $((trials + failures + 1)) (max $MAX_TRIALS)"
+        if run_experiment "$impl" "$impl_idx" "$msg_size" "$num_threads" "$placement" \
+            "$trial_file" $((trials + 1)); then
+            trials=$((trials + 1))
+        else
+            failures=$((failures + 1))
+            [ $trials -eq 0 ] && return 1
+            log_warn "Trial failed, continuing..."
+        fi
+        
+        if python3 MT25067_PartC_Trials.py --done $limits "$trial_file"; then
+            break
+        fi
+        sleep 2
+    done
+    
+    # Trial rows with their final Outlier flags, and the cell's summary
+    python3 MT25067_PartC_Trials.py --finish $limits "$trial_file" \
+        --csv "$CSV_FILE" --summary "$SUMMARY_FILE"
+}
+
 # Main execution
 main() {
     echo ""
@@ -303,7 +371,7 @@ main() {
     echo ""
 
     # Create temp directory for intermediate files
-    mkdir -p "$TEMP_DIR"
+    mkdir -p "$TEMP_DIR" "$HIST_DIR" "$SERIES_DIR"
     
     # Check if binaries exist
     log_info "Compiling all implementations..."
@@ -322,24 +390,27 @@ main() {
     log_info "Compilation successful ✓"
         
     # Create CSV header in main directory
-    echo "Implementation,MessageSize,NumThreads,Throughput_Gbps,Latency_us,TotalBytes,CPU_Cycles,Instructions,LLC_Misses,L1_Misses,ContextSwitches,TimeElapsed_sec" > "$CSV_FILE"    
+    echo "${ROW_HEADER},Trial,Outlier" > "$CSV_FILE"
+    rm -f "$SUMMARY_FILE"
     log_info "CSV file: $CSV_FILE (main directory)"
     log_info "Temp directory: $TEMP_DIR"
     echo ""
     
     # Count total experiments
-    local total_experiments=$((${#IMPLEMENTATIONS[@]} * ${#MESSAGE_SIZES[@]} * ${#THREAD_COUNTS[@]}))
+    local total_experiments=$((${#IMPLEMENTATIONS[@]} * ${#PLACEMENTS[@]} * ${#MESSAGE_SIZES[@]} * ${#THREAD_COUNTS[@]}))
     local current_experiment=0
     local failed_experiments=0
     
     log_info "Configuration:"
     log_info "  Message sizes: ${MESSAGE_SIZES[*]} bytes"
     log_info "  Thread counts: ${THREAD_COUNTS[*]}"
+    log_info "  Placements: ${PLACEMENTS[*]:-default}"
     log_info "  Messages per client: $NUM_MESSAGES (FIXED: increased for stability)"
+    log_info "  Trials per cell: $MIN_TRIALS-$MAX_TRIALS (95% CI within $CI_TARGET of the mean)"
     log_info "  Total experiments: $total_experiments"
     echo ""
     
-    log_warn "NOTE: This will take approximately $(( (total_experiments * 30) / 60 )) minutes"
+    log_warn "NOTE: This will take approximately $(( (total_experiments * MIN_TRIALS * 30) / 60 )) minutes or more"
     log_warn "Press Ctrl+C within 5 seconds to cancel..."
     sleep 5
     echo ""
@@ -348,22 +419,24 @@ main() {
     for impl_idx in "${!IMPLEMENTATIONS[@]}"; do
         local impl="${IMPLEMENTATIONS[$impl_idx]}"
         
-        for msg_size in "${MESSAGE_SIZES[@]}"; do
-            for num_threads in "${THREAD_COUNTS[@]}"; do
-                current_experiment=$((current_experiment + 1))
-                
-                echo ""
-                log_info "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-                log_info "Progress: $current_experiment / $total_experiments"
-                log_info "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-                
-                if ! run_experiment "$impl" "$impl_idx" "$msg_size" "$num_threads"; then
-                    log_warn "Experiment failed, continuing..."
-                    failed_experiments=$((failed_experiments + 1))
-                fi
-                
-                # Brief pause between experiments
-                sleep 2
+        for placement in "${PLACEMENTS[@]}"; do
+            for msg_size in "${MESSAGE_SIZES[@]}"; do
+                for num_threads in "${THREAD_COUNTS[@]}"; do
+                    current_experiment=$((current_experiment + 1))
+                    
+                    echo ""
+                    log_info "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+                    log_info "Progress: $current_experiment / $total_experiments"
+                    log_info "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+                    
+                    if ! run_trials "$impl" "$impl_idx" "$msg_size" "$num_threads" "$placement"; then
+                        log_warn "Experiment failed, continuing..."
+                        failed_experiments=$((failed_experiments + 1))
+                    fi
+                    
+                    # Brief pause between experiments
+                    sleep 2
+                done
             done
         done
     done
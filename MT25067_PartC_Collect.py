@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+MT25067
+Part C: Multi-Client Result Collector
+Merges the output of every client process of one experiment cell instead
+of reading only client #1.
+
+A client started with -n <conns> prints one "Connection <k>:" line per
+connection; each connection then counts as a separate client below.
+
+Per cell it reports:
+- Throughput_Gbps / Latency_us: mean over clients (comparable to the
+  historical single-client columns)
+- TotalBytes: bytes received by all clients (matches the process-wide
+  perf counters, so CyclesPerByte is per byte actually moved)
+- AggThroughput_Gbps: all bytes / (last client end - first client start)
+- MinClient_Gbps / MaxClient_Gbps: slowest and fastest client
+- JainFairness: (sum x)^2 / (n * sum x^2) over per-client throughput,
+  1.0 = perfectly fair, 1/n = one client got everything
+
+From the server output (zero-copy servers only, empty otherwise):
+- ZeroCopyCopied_pct: share of completed MSG_ZEROCOPY sends the kernel
+  fell back to copying (100 - this = true zero-copy)
+
+Usage (prints CSV fields for the shell runner):
+    python3 MT25067_PartC_Collect.py --fields base client_1.txt client_2.txt ...
+    python3 MT25067_PartC_Collect.py --fields aggregate client_*.txt
+    python3 MT25067_PartC_Collect.py --fields server server.txt
+"""
+
+import argparse
+import re
+import sys
+
+BASE_COLUMNS = ['Throughput_Gbps', 'Latency_us', 'TotalBytes']
+AGGREGATE_COLUMNS = ['AggThroughput_Gbps', 'MinClient_Gbps', 'MaxClient_Gbps',
+                     'JainFairness']
+SERVER_COLUMNS = ['ZeroCopyCopied_pct']
+
+# "<prefix>" -> (dict key, field index, type)
+_CLIENT_FIELDS = {
+    'Throughput:': ('throughput_mbps', 1, float),
+    'Average latency:': ('latency_us', 2, float),
+    'Total bytes:': ('total_bytes', 2, int),
+    'Start time:': ('start', 2, float),
+    'End time:': ('end', 2, float),
+}
+
+_COPY_FALLBACK_LINE = re.compile(r'^Copy fallbacks: (\d+) \(([\d.]+)%\)')
+_CONNECTION_LINE = re.compile(
+    r'^Connection \d+: messages=(\d+) bytes=(\d+) start=([\d.]+) end=([\d.]+)')
+
+
+def parse_client_output(client_file):
+    """Return the metrics one client printed, or None if it did not finish."""
+    result = {}
+    try:
+        with open(client_file) as f:
+            for line in f:
+                for prefix, (key, idx, cast) in _CLIENT_FIELDS.items():
+                    if line.startswith(prefix):
+                        result[key] = cast(line.split()[idx])
+    except (OSError, ValueError, IndexError):
+        return None
+    return result if 'throughput_mbps' in result else None
+
+
+def parse_connections(client_file):
+    """
+    Per-connection metrics of one client file: the "Connection" lines of a
+    multi-connection client, or the single Results block otherwise.
+    """
+    connections = []
+    try:
+        with open(client_file) as f:
+            for line in f:
+                m = _CONNECTION_LINE.match(line)
+                if not m:
+                    continue
+                messages, total_bytes = int(m.group(1)), int(m.group(2))
+                start, end = float(m.group(3)), float(m.group(4))
+                elapsed = end - start
+                if messages == 0 or elapsed <= 0:
+                    continue
+                connections.append({
+                    'throughput_mbps': total_bytes * 8 / elapsed / 1e6,
+                    'latency_us': elapsed * 1e6 / messages,
+                    'total_bytes': total_bytes,
+                    'start': start,
+                    'end': end,
+                })
+    except (OSError, ValueError):
+        return []
+    if connections:
+        return connections
+    single = parse_client_output(client_file)
+    return [single] if single else []
+
+
+def parse_server_output(server_file):
+    """SERVER_COLUMNS metrics from a server's final statistics, or None."""
+    try:
+        with open(server_file) as f:
+            for line in f:
+                m = _COPY_FALLBACK_LINE.match(line)
+                if m:
+                    return {'ZeroCopyCopied_pct': float(m.group(2))}
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def jain_index(values):
+    """Jain's fairness index of a list of non-negative values."""
+    if not values:
+        return 0.0
+    total = sum(values)
+    squares = sum(v * v for v in values)
+    return (total * total) / (len(values) * squares) if squares > 0 else 0.0
+
+
+def aggregate_clients(client_files):
+    """
+    Merge all clients of one cell. Returns a dict keyed by BASE_COLUMNS and
+    AGGREGATE_COLUMNS, or None when no client produced results.
+    """
+    clients = [c for f in client_files for c in parse_connections(f)]
+    if not clients:
+        return None
+
+    per_client_gbps = [c['throughput_mbps'] / 1000 for c in clients]
+    total_bytes = sum(c.get('total_bytes', 0) for c in clients)
+
+    # Aggregate over the union of the clients' wall-clock windows
+    if all('start' in c and 'end' in c for c in clients):
+        window = max(c['end'] for c in clients) - min(c['start'] for c in clients)
+        agg_gbps = total_bytes * 8 / window / 1e9 if window > 0 else 0.0
+    else:
+        agg_gbps = sum(per_client_gbps)
+
+    return {
+        'Throughput_Gbps': sum(per_client_gbps) / len(clients),
+        'Latency_us': sum(c.get('latency_us', 0.0) for c in clients) / len(clients),
+        'TotalBytes': total_bytes,
+        'AggThroughput_Gbps': agg_gbps,
+        'MinClient_Gbps': min(per_client_gbps),
+        'MaxClient_Gbps': max(per_client_gbps),
+        'JainFairness': jain_index(per_client_gbps),
+    }
+
+
+def format_fields(metrics, columns):
+    """CSV fields for the given columns (empty when metrics is None)."""
+    if metrics is None:
+        return [''] * len(columns)
+    fmt = {'Throughput_Gbps': '{:.5f}', 'Latency_us': '{:.2f}', 'TotalBytes': '{:d}',
+           'AggThroughput_Gbps': '{:.5f}', 'MinClient_Gbps': '{:.5f}',
+           'MaxClient_Gbps': '{:.5f}', 'JainFairness': '{:.4f}',
+           'ZeroCopyCopied_pct': '{:.2f}'}
+    return [fmt[c].format(metrics[c]) for c in columns]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MT25067 multi-client collector')
+    parser.add_argument('--fields', choices=['base', 'aggregate', 'server'], default='base')
+    parser.add_argument('files', nargs='+',
+                        help='client output files of one cell (server: the server output)')
+    args = parser.parse_args()
+
+    if args.fields == 'server':
+        print(','.join(format_fields(parse_server_output(args.files[0]), SERVER_COLUMNS)))
+        return
+    columns = BASE_COLUMNS if args.fields == 'base' else AGGREGATE_COLUMNS
+    print(','.join(format_fields(aggregate_clients(args.files), columns)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
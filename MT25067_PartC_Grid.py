@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+MT25067
+Part C: Sweep Grid
+Every configuration a sweep varies besides message size and thread count is
+encoded in the implementation label, so each combination is its own series
+in the CSV, the plots and the comparator:
+
+    A2EPF32+spread+bp50+sb256k
+    |  ||  |  |      |    `---- SO_SNDBUF / SO_RCVBUF 256 KB (-K)
+    |  ||  |  |      `--------- SO_BUSY_POLL 50 µs (-B)
+    |  ||  |  `---------------- thread placement (-C): compact, spread, irq
+    |  ||  |                    or an explicit core list, cpu0-3.8 = 0-3,8
+    |  ||  `------------------- 32 string fields per message (-f)
+    |  |`---------------------- arena-pooled messages (-a / -A)
+    |  `----------------------- epoll workers (-e)
+    `-------------------------- server / client binary (A1..A5)
+
+Labels never contain commas, so they stay single CSV fields. The server's
+threads take placement entries 0.. and each client process the entries
+after them (see MT25067_Placement.h), so both share one ordering.
+
+Usage (shell runner):
+    python3 MT25067_PartC_Grid.py --expand A2 --pin none spread --busy-poll 0 50
+    python3 MT25067_PartC_Grid.py --server-args A2+spread+bp50
+    python3 MT25067_PartC_Grid.py --client-args A2+spread+bp50 --slot 3
+"""
+
+import argparse
+import itertools
+import re
+import sys
+from collections import namedtuple
+
+DEFAULT_FIELDS = 8
+PIN_POLICIES = ('compact', 'spread', 'irq')
+LABEL = re.compile(r'^(A\d+)(E?)(P?)(?:F(\d+))?((?:\+[a-z][a-z0-9.\-]*)*)$')
+CORE_LIST = re.compile(r'^\d+(?:-\d+)?(?:[.,]\d+(?:-\d+)?)*$')
+SIZE_SUFFIXES = (('m', 1 << 20), ('k', 1 << 10))
+
+# Dimensions a sweep can facet on, with their display names
+DIMENSIONS = {'arena': 'Message layout', 'fields': 'Fields per message',
+              'pin': 'CPU placement', 'busy_poll': 'Busy poll',
+              'sock_buf': 'Socket buffer'}
+
+
+def parse_size(text):
+    """'256k' -> 262144 (k/m suffixes, plain bytes otherwise)."""
+    text = str(text).strip().lower()
+    for suffix, scale in SIZE_SUFFIXES:
+        if text.endswith(suffix):
+            return int(text[:-1]) * scale
+    return int(text)
+
+
+def size_text(size):
+    for suffix, scale in SIZE_SUFFIXES:
+        if size % scale == 0:
+            return f'{size // scale}{suffix}'
+    return str(size)
+
+
+def pin_token(policy):
+    """--pin value -> label token ('0-3,8' -> 'cpu0-3.8', 'none' -> None)."""
+    if policy in (None, '', 'none'):
+        return None
+    if policy in PIN_POLICIES:
+        return policy
+    if CORE_LIST.match(policy):
+        return 'cpu' + policy.replace(',', '.')
+    raise ValueError(f"bad placement policy: {policy}")
+
+
+class Variant(namedtuple('Variant', 'base epoll arena fields pin busy_poll sock_buf')):
+    """One point of the sweep grid (everything but message size and threads)."""
+
+    @property
+    def label(self):
+        text = (self.base + ('E' if self.epoll else '') + ('P' if self.arena else '')
+                + (f'F{self.fields}' if self.fields else ''))
+        if self.pin:
+            text += '+' + self.pin
+        if self.busy_poll:
+            text += f'+bp{self.busy_poll}'
+        if self.sock_buf:
+            text += '+sb' + size_text(self.sock_buf)
+        return text
+
+    @property
+    def placement(self):
+        """The label's placement tokens ('' when none)."""
+        return self.label[len(without_placement(self).label):]
+
+
+def parse_variant(label):
+    """'A2EPF32+spread+bp50' -> Variant; ValueError for a malformed label."""
+    m = LABEL.match(label)
+    if not m:
+        raise ValueError(f"bad implementation label: {label}")
+    base, epoll, arena, fields, extra = m.groups()
+    pin = busy_poll = sock_buf = None
+    for token in filter(None, extra.split('+')):
+        if token in PIN_POLICIES or (token.startswith('cpu') and CORE_LIST.match(token[3:])):
+            pin = token
+        elif re.match(r'^bp\d+$', token):
+            busy_poll = int(token[2:]) or None
+        elif re.match(r'^sb\d+[km]?$', token):
+            sock_buf = parse_size(token[2:]) or None
+        else:
+            raise ValueError(f"bad token {token!r} in implementation label: {label}")
+    return Variant(base, bool(epoll), bool(arena),
+                   int(fields) if fields and int(fields) != DEFAULT_FIELDS else None,
+                   pin, busy_poll, sock_buf)
+
+
+def without_placement(variant):
+    return variant._replace(pin=None, busy_poll=None, sock_buf=None)
+
+
+def grid_variants(impls, fields=None, arena=False, pins=None, busy_polls=None, sock_bufs=None):
+    """
+    Each impl once per combination of the requested dimensions
+    ("A2" x --arena x --pin none spread -> A2, A2+spread, A2P, A2P+spread).
+    """
+    labels = []
+    for impl in impls:
+        v = parse_variant(impl)
+        for pooled, n, pin, bp, sb in itertools.product(
+                [v.arena, True] if arena else [v.arena],
+                fields or [v.fields],
+                [pin_token(p) for p in pins] if pins else [v.pin],
+                busy_polls or [v.busy_poll],
+                [parse_size(s) for s in sock_bufs] if sock_bufs else [v.sock_buf]):
+            labels.append(v._replace(arena=pooled,
+                                     fields=n if n != DEFAULT_FIELDS else None,
+                                     pin=pin, busy_poll=bp or None,
+                                     sock_buf=sb or None).label)
+    return list(dict.fromkeys(labels))
+
+
+def _pin_arg(variant, slot):
+    if variant.pin == 'irq':
+        return 'irq'
+    spec = variant.pin[3:].replace('.', ',') if variant.pin.startswith('cpu') else variant.pin
+    return f'{spec}@{slot}'
+
+
+def placement_args(variant, slot=0):
+    """-C/-B/-K options of a variant, with placement starting at entry `slot`."""
+    argv = ['-C', _pin_arg(variant, slot)] if variant.pin else []
+    if variant.busy_poll:
+        argv += ['-B', str(variant.busy_poll)]
+    if variant.sock_buf:
+        argv += ['-K', str(variant.sock_buf)]
+    return argv
+
+
+def server_args(variant, huge_pages=False):
+    """Server options selecting a variant's message layout and placement."""
+    if isinstance(variant, str):
+        variant = parse_variant(variant)
+    argv = ['-A' if huge_pages else '-a'] if variant.arena else []
+    if variant.fields:
+        argv += ['-f', str(variant.fields)]
+    return argv + placement_args(variant)
+
+
+def client_args(variant, slot):
+    """Client options of a variant; `slot` is the client's first placement entry."""
+    if isinstance(variant, str):
+        variant = parse_variant(variant)
+    return placement_args(variant, slot)
+
+
+def dimension_value(variant, dim):
+    """Display text of one dimension of a variant."""
+    value = getattr(variant, dim)
+    if dim == 'arena':
+        return 'arena' if value else 'per-message'
+    if dim == 'fields':
+        return f'{value or DEFAULT_FIELDS} fields'
+    if dim == 'pin':
+        return value.replace('.', ',') if value else 'unpinned'
+    if dim == 'busy_poll':
+        return f'busy poll {value} µs' if value else 'no busy poll'
+    return f'{size_text(value)}B buffers' if value else 'default buffers'
+
+
+def without(variant, dim):
+    """The variant with one dimension reset to its default (its facet group)."""
+    return variant._replace(**{dim: False if dim == 'arena' else None})
+
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='MT25067 sweep grid labels')
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument('--expand', nargs='+', metavar='IMPL',
+                        help='print every label of the grid over these implementations')
+    action.add_argument('--server-args', metavar='LABEL', help="print a label's server options")
+    action.add_argument('--client-args', metavar='LABEL', help="print a label's client options")
+    parser.add_argument('--slot', type=int, default=0,
+                        help='first placement entry of the client (after the server threads)')
+    parser.add_argument('--huge-pages', action='store_true')
+    parser.add_argument('--fields', nargs='+', type=int)
+    parser.add_argument('--arena', action='store_true')
+    parser.add_argument('--pin', nargs='+')
+    parser.add_argument('--busy-poll', nargs='+', type=int)
+    parser.add_argument('--sock-buf', nargs='+')
+    args = parser.parse_args()
+
+    try:
+        if args.expand:
+            print(' '.join(grid_variants(args.expand, args.fields, args.arena,
+                                         args.pin, args.busy_poll, args.sock_buf)))
+        elif args.server_args:
+            print(' '.join(server_args(args.server_args, args.huge_pages)))
+        else:
+            print(' '.join(client_args(args.client_args, args.slot)))
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
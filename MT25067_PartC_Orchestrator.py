@@ -0,0 +1,737 @@
+#!/usr/bin/env python3
+"""
+MT25067
+Part C: Asyncio Experiment Orchestrator
+Event-driven replacement for the sequential loop in
+MT25067_PartC_AutomationScript.sh.
+
+- Readiness is detected from events (the server's "listening" line and
+  process exit) instead of fixed sleeps and port polling.
+- Independent impl/size/thread cells run concurrently on separate lanes.
+  A lane is a port range and/or a server_nsN/client_nsN pair
+  (see MT25067_Setup_Netns.sh) plus a disjoint CPU set.
+- Each CSV row is flushed to disk as soon as its cell finishes, so a crash
+  keeps every completed result (use --resume to continue a sweep).
+- --scale adds the event-driven servers (A1E/A2E/A3E = A1/A2/A3 started
+  with -e <workers>) and hundreds to thousands of connections, spread over
+  a few multi-connection client processes (-n).
+- --arena / --fields vary the servers' message layout (arena-pooled
+  contiguous messages, scatter-gather width); each variant is its own
+  implementation label, e.g. A2PF32 = A2 -a -f 32.
+- --pin / --busy-poll / --sock-buf sweep thread placement, SO_BUSY_POLL
+  and socket buffer sizes the same way (A2+spread+bp50, see
+  MT25067_PartC_Grid.py). The server's threads take the first entries of
+  the placement ordering and each client process the entries after them.
+- Every client and server samples its throughput into a ring buffer in
+  /dev/shm (-S/-I, see MT25067_Sampler.h); the merged series of each cell
+  goes to throughput_series/ and its warm-up-trimmed steady state into the
+  row. --live prints each running cell's throughput as it goes.
+- Every cell is repeated (--min-trials .. --max-trials) until the 95%
+  confidence intervals of its throughput and latency are within
+  --ci-target of the mean (see MT25067_PartC_Trials.py). Each trial is a
+  CSV row; outlier trials are flagged (Outlier=1) and the per-cell means
+  and intervals go to MT25067_TrialSummary.csv.
+
+Usage: sudo python3 MT25067_PartC_Orchestrator.py [--concurrency N] [--pairs N]
+"""
+
+import argparse
+import asyncio
+import csv
+import glob
+import os
+import re
+import shutil
+import signal
+import sys
+import time
+from collections import namedtuple
+
+from MT25067_PartC_Collect import (AGGREGATE_COLUMNS, BASE_COLUMNS, SERVER_COLUMNS,
+                                   aggregate_clients, format_fields, parse_server_output)
+from MT25067_PartC_Grid import (DEFAULT_FIELDS, client_args, grid_variants, parse_variant,
+                                server_args)
+from MT25067_PartC_Trials import (CI_TARGET, MAX_TRIALS, MIN_TRIALS, SUMMARY_COLUMNS,
+                                  SUMMARY_FILE, TRIAL_COLUMNS, TrialSet)
+from MT25067_PartC_Perf import (THREAD_COLUMNS, parse_perf_file,
+                                perf_fields, perf_stat_argv, running_field,
+                                summarize, thread_rows)
+from MT25067_PartD_Latency import (HIST_DIR, add_histogram, cell_hist_path,
+                                   load_histogram, merge_histograms, percentiles,
+                                   write_histogram)
+from MT25067_PartD_Timeseries import (SERIES_DIR, STEADY_COLUMNS, RingTail, cell_series_path,
+                                      merge_series, read_ring, steady_fields, steady_state,
+                                      write_cell_series)
+
+# Configuration (mirrors MT25067_PartC_AutomationScript.sh)
+MESSAGE_SIZES = [256, 1024, 4096, 16384]
+THREAD_COUNTS = [1, 2, 4, 8]
+NUM_MESSAGES = 5000
+IMPLEMENTATIONS = ['A1', 'A2', 'A3', 'A4', 'A5']
+PORTS = {'A1': 8080, 'A2': 8081, 'A3': 8082, 'A4': 8083, 'A5': 8084}
+# Event-driven variants: same binary and send path, fixed epoll worker pool
+EPOLL_IMPLEMENTATIONS = ['A1E', 'A2E', 'A3E', 'A5E']
+# Connection counts added by --scale (with fewer messages per connection)
+SCALE_CONNECTIONS = [64, 256, 1024, 4096]
+SCALE_NUM_MESSAGES = 200
+EPOLL_WORKERS = 4
+# Client processes per cell; above this, each process opens several connections
+CLIENT_PROCS = 8
+# Thread-per-client servers refuse more clients than this (MAX_CLIENTS)
+MAX_THREAD_CLIENTS = 100
+
+TEMP_DIR = 'experiment_results'
+CSV_FILE = 'MT25067_ExperimentData.csv'
+THREAD_CSV_FILE = 'MT25067_PerfThreads.csv'
+CSV_HEADER = ['Implementation', 'MessageSize', 'NumThreads', 'Throughput_Gbps',
+              'Latency_us', 'TotalBytes', 'CPU_Cycles', 'Instructions',
+              'LLC_Misses', 'L1_Misses', 'ContextSwitches', 'TimeElapsed_sec',
+              'Latency_p50_us', 'Latency_p99_us', 'Latency_p999_us'] + AGGREGATE_COLUMNS + \
+             ['PerfRunning_pct'] + SERVER_COLUMNS + STEADY_COLUMNS + TRIAL_COLUMNS
+# Throughput sampler rings (shared memory when available) and slice length
+RING_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else TEMP_DIR
+SAMPLE_MS = 10
+# Seconds between --live throughput lines
+LIVE_PERIOD = 1.0
+
+# Port offset between lanes sharing one namespace pair
+PORT_STRIDE = 100
+# Line printed by every server once listen() has succeeded
+READY_PATTERN = re.compile(r'Server listening on port (\d+)')
+# Line printed by a server started with -g once every handler is parked
+GATE_PATTERN = re.compile(r'Start gate: \d+ handlers ready \(pid (\d+)\)')
+# Seconds to wait for readiness / for a whole cell before giving up
+READY_TIMEOUT = 15
+PERF_ATTACH_TIMEOUT = 10
+CELL_TIMEOUT = 300
+
+Cell = namedtuple('Cell', 'impl msg_size threads')
+Lane = namedtuple('Lane', 'index server_ns client_ns port_offset cpus')
+
+SUDO = [] if os.geteuid() == 0 else ['sudo']
+
+# Colors for output
+RED = '\033[0;31m'
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+def log_info(msg):
+    print(f"{GREEN}[INFO]{NC} {msg}", flush=True)
+
+def log_warn(msg):
+    print(f"{YELLOW}[WARN]{NC} {msg}", flush=True)
+
+def log_error(msg):
+    print(f"{RED}[ERROR]{NC} {msg}", flush=True)
+
+def log_debug(msg):
+    print(f"{BLUE}[DEBUG]{NC} {msg}", flush=True)
+
+# =============================================================================
+# LANES (port ranges / namespace pairs / CPU sets)
+# =============================================================================
+
+def pair_names(pair):
+    """Namespace names for pair N, matching MT25067_Setup_Netns.sh."""
+    sfx = '' if pair == 0 else str(pair)
+    return f'server_ns{sfx}', f'client_ns{sfx}'
+
+def build_lanes(concurrency, pairs, isolate):
+    """
+    Spread `concurrency` lanes over the namespace pairs. Lanes that share a
+    pair get distinct port ranges. With isolation, each lane also gets a
+    disjoint, contiguous slice of the CPUs this process may run on.
+    """
+    cpus = sorted(os.sched_getaffinity(0))
+    if isolate and concurrency > max(1, len(cpus) // 2):
+        limit = max(1, len(cpus) // 2)
+        log_warn(f"CPU isolation: {len(cpus)} CPUs only allow {limit} lane(s) "
+                 f"of >= 2 CPUs; reducing concurrency from {concurrency}")
+        concurrency = limit
+
+    lanes = []
+    per_lane = len(cpus) // concurrency
+    for i in range(concurrency):
+        server_ns, client_ns = pair_names(i % pairs)
+        lane_cpus = tuple(cpus[i * per_lane:(i + 1) * per_lane]) if isolate else ()
+        lanes.append(Lane(i, server_ns, client_ns, (i // pairs) * PORT_STRIDE, lane_cpus))
+    return lanes
+
+class LanePool:
+    """
+    Hands out lanes to cells. A cell that needs more CPUs than one lane owns
+    runs exclusively: it waits for every lane and uses all of their CPUs.
+    Pending exclusive requests block new shared acquisitions so they cannot
+    starve.
+    """
+
+    def __init__(self, lanes):
+        self.lanes = list(lanes)
+        self.free = list(lanes)
+        self.exclusive_waiting = 0
+        self.cond = asyncio.Condition()
+
+    async def acquire(self, exclusive=False):
+        async with self.cond:
+            if exclusive:
+                self.exclusive_waiting += 1
+                try:
+                    await self.cond.wait_for(lambda: len(self.free) == len(self.lanes))
+                finally:
+                    self.exclusive_waiting -= 1
+                taken, self.free = self.free, []
+            else:
+                await self.cond.wait_for(lambda: self.free and not self.exclusive_waiting)
+                taken = [self.free.pop(0)]
+            return taken
+
+    async def release(self, taken):
+        async with self.cond:
+            self.free.extend(taken)
+            self.free.sort(key=lambda lane: lane.index)
+            self.cond.notify_all()
+
+def base_impl(impl):
+    """Binary / port family of an implementation label ("A1E+spread" -> "A1")."""
+    return parse_variant(impl).base
+
+def is_epoll(impl):
+    return parse_variant(impl).epoll
+
+def sample_args(ring, sample_ms):
+    """Options starting the throughput sampler (none with --sample-ms 0)."""
+    return ['-S', ring, '-I', f'{sample_ms:g}'] if sample_ms else []
+
+def client_split(cell, procs=CLIENT_PROCS):
+    """Connections opened by each client process of a cell."""
+    n = min(cell.threads, procs)
+    return [cell.threads // n + (i < cell.threads % n) for i in range(n)]
+
+def server_threads(cell, workers=EPOLL_WORKERS):
+    if is_epoll(cell.impl):
+        return min(workers, cell.threads)
+    return cell.threads
+
+def cell_messages(cell, args):
+    """Messages per connection (fewer for --scale connection counts)."""
+    return args.num_messages if cell.threads <= max(THREAD_COUNTS) else args.scale_messages
+
+def cpus_needed(cell, args):
+    """One CPU per server handler/worker thread plus one per client process."""
+    return (server_threads(cell, args.epoll_workers)
+            + len(client_split(cell, args.client_procs)))
+
+# =============================================================================
+# OUTPUT PARSING
+# =============================================================================
+
+def merge_cell_histograms(client_hists, cell, trial=1):
+    """
+    Merge the per-client latency histograms of one trial and return its
+    p50/p99/p99.9 (µs) as CSV fields. The cell's histogram in HIST_DIR
+    accumulates every trial (the first one starts it afresh).
+    """
+    hists = [load_histogram(p) for p in client_hists if os.path.exists(p)]
+    if not hists:
+        return [''] * 3
+    merged = merge_histograms(hists)
+    os.makedirs(HIST_DIR, exist_ok=True)
+    path = cell_hist_path(cell.impl, cell.msg_size, cell.threads)
+    if trial == 1:
+        write_histogram(merged, path)
+    else:
+        add_histogram(merged, path)
+    return [f'{v:.2f}' for v in percentiles([merged])[0]]
+
+def merge_cell_series(client_rings, server_ring, cell, trial=1):
+    """
+    Merge the per-client throughput rings of one trial into SERIES_DIR (one
+    file per trial, with the server's series alongside) and return its
+    steady-state CSV fields.
+    """
+    def series(paths):
+        rings = []
+        for p in paths:
+            try:
+                rings.append(read_ring(p))
+            except (OSError, ValueError):
+                pass            # writer failed before sampling started
+        return merge_series(rings)
+
+    client = series(client_rings)
+    if client is None:
+        return steady_fields(None)
+    os.makedirs(SERIES_DIR, exist_ok=True)
+    if trial == 1:
+        # Trials of an earlier sweep of this cell (and its untagged series)
+        stale = cell_series_path(cell.impl, cell.msg_size, cell.threads, trial='*')
+        remove_files(glob.glob(stale) + [stale.replace('_t*.npz', '.npz')])
+    write_cell_series(cell_series_path(cell.impl, cell.msg_size, cell.threads, trial=trial),
+                      client, series([server_ring]))
+    return steady_fields(steady_state(client))
+
+class ResultWriter:
+    """Appends one row per finished cell and forces it to disk immediately."""
+
+    def __init__(self, path, resume, header=CSV_HEADER):
+        self.path = path
+        fresh = not resume or not os.path.exists(path) or os.path.getsize(path) == 0
+        self.f = open(path, 'w' if fresh else 'a', newline='')
+        self.writer = csv.writer(self.f)
+        if fresh:
+            self.writer.writerow(header)
+            self._sync()
+
+    def write(self, row):
+        self.writer.writerow(row)
+        self._sync()
+
+    def write_many(self, rows):
+        self.writer.writerows(rows)
+        self._sync()
+
+    def _sync(self):
+        self.f.flush()
+        os.fsync(self.f.fileno())
+
+    def close(self):
+        self.f.close()
+
+def completed_cells(path):
+    """Cells already present in an existing CSV (for --resume)."""
+    done = set()
+    try:
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                done.add(Cell(row['Implementation'], int(row['MessageSize']),
+                              int(row['NumThreads'])))
+    except (OSError, KeyError, ValueError):
+        pass
+    return done
+
+# =============================================================================
+# PROCESS HELPERS
+# =============================================================================
+
+def in_netns(ns, cpus, argv):
+    """Command prefix: enter a namespace and optionally pin to a CPU set."""
+    cmd = SUDO + ['ip', 'netns', 'exec', ns]
+    if cpus:
+        cmd += ['taskset', '-c', ','.join(map(str, cpus))]
+    return cmd + argv
+
+async def spawn(argv, stdout, stdin=asyncio.subprocess.DEVNULL):
+    # New session so the whole tree (ip -> perf -> server) can be killed
+    return await asyncio.create_subprocess_exec(
+        *argv, stdin=stdin, stdout=stdout, stderr=asyncio.subprocess.STDOUT,
+        start_new_session=True)
+
+def remove_files(paths):
+    for path in paths:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+def kill_tree(proc):
+    if proc.returncode is None:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+async def pump_output(stream, path, ready, gate=None):
+    """
+    Copy server stdout to its log file; set `ready` on the listening line and
+    resolve `gate` with the server pid on the start-gate line.
+    """
+    with open(path, 'wb') as log:
+        while True:
+            line = await stream.readline()
+            if not line:
+                break
+            log.write(line)
+            text = line.decode(errors='replace')
+            if not ready.is_set() and READY_PATTERN.search(text):
+                ready.set()
+            m = GATE_PATTERN.search(text) if gate and not gate.done() else None
+            if m:
+                gate.set_result(int(m.group(1)))
+
+async def follow_rings(paths, exp_name, period=LIVE_PERIOD):
+    """Log a running cell's client throughput every `period` seconds (--live)."""
+    tails = [RingTail(p) for p in paths]
+    while True:
+        await asyncio.sleep(period)
+        received = sum(int(t.poll()['bytes'].sum()) for t in tails)
+        log_info(f"  {exp_name}: {received * 8 / period / 1e9:.3f} Gbps")
+
+async def attach_perf(pid, perf_output, exp_name, fmt):
+    """
+    Attach perf stat --per-thread to a gated server and wait until its
+    counters are enabled (perf's control FIFO acknowledges "enable").
+    Returns the perf process, or None if it could not be attached.
+    """
+    ctl = os.path.join(TEMP_DIR, f"perf_{exp_name}.ctl")
+    ack = os.path.join(TEMP_DIR, f"perf_{exp_name}.ack")
+    for fifo in (ctl, ack):
+        if os.path.exists(fifo):
+            os.unlink(fifo)
+        os.mkfifo(fifo)
+    # O_RDWR: neither open blocks and neither end sees EOF before perf opens
+    # its side, so "enable" is queued until perf has attached to every thread
+    ctl_fd = os.open(ctl, os.O_RDWR | os.O_NONBLOCK)
+    ack_file = os.fdopen(os.open(ack, os.O_RDWR | os.O_NONBLOCK), 'rb', buffering=0)
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    transport, _ = await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), ack_file)
+    try:
+        os.write(ctl_fd, b'enable\n')
+        with open(os.path.join(TEMP_DIR, f"perf_{exp_name}.log"), 'wb') as log:
+            perf = await spawn(SUDO + perf_stat_argv(perf_output, fmt, pid=pid,
+                                                     control=(ctl, ack)), log)
+        try:
+            reply = await asyncio.wait_for(reader.readline(), PERF_ATTACH_TIMEOUT)
+        except asyncio.TimeoutError:
+            reply = b''
+        if not reply.startswith(b'ack'):
+            log_warn(f"perf did not attach to {exp_name} (see perf_{exp_name}.log)")
+            kill_tree(perf)
+            return None
+        return perf
+    finally:
+        transport.close()
+        os.close(ctl_fd)
+
+# =============================================================================
+# EXPERIMENT EXECUTION
+# =============================================================================
+
+async def run_cell(cell, lanes, args, trial=1):
+    """Run one trial of an impl/size/thread cell on the given lane(s); return a CSV row or None."""
+    lane = lanes[0]
+    cpus = tuple(c for l in lanes for c in l.cpus)
+    port = PORTS[base_impl(cell.impl)] + lane.port_offset
+    exp_name = f"{cell.impl}_{cell.msg_size}B_{cell.threads}T"
+    num_messages = cell_messages(cell, args)
+    conns = client_split(cell, args.client_procs)
+
+    perf_output = os.path.join(TEMP_DIR, f"perf_{exp_name}.txt")
+    server_output = os.path.join(TEMP_DIR, f"server_{exp_name}.txt")
+    client_hists = [os.path.join(TEMP_DIR, f"hist_{exp_name}_{i}.hist")
+                    for i in range(1, len(conns) + 1)]
+    # Unique per orchestrator: /dev/shm is shared by every namespace
+    ring_prefix = os.path.join(RING_DIR, f"MT25067_{os.getpid()}_{exp_name}")
+    server_ring = f"{ring_prefix}_server.ring"
+    client_rings = [f"{ring_prefix}_{i}.ring" for i in range(1, len(conns) + 1)]
+
+    server_argv = [f'./MT25067_Part{base_impl(cell.impl)}_Server', '-p', str(port),
+                   str(cell.msg_size), str(num_messages), str(cell.threads)]
+    server_argv[1:1] = (server_args(cell.impl, args.huge_pages)
+                        + sample_args(server_ring, args.sample_ms))
+    if is_epoll(cell.impl):
+        server_argv[1:1] = ['-e', str(args.epoll_workers)]
+    per_thread = args.perf and args.per_thread
+    if per_thread:
+        # Handlers park until perf is attached to each of them
+        server_argv.insert(1, '-g')
+    elif args.perf:
+        server_argv = perf_stat_argv(perf_output, args.perf_format) + ['--'] + server_argv
+
+    log_info(f"Running {exp_name} on lane {lane.index} "
+             f"({lane.server_ns}, port {port}, cpus {','.join(map(str, cpus)) or 'any'})")
+    started = time.monotonic()
+
+    server = await spawn(in_netns(lane.server_ns, cpus, server_argv), asyncio.subprocess.PIPE,
+                         stdin=asyncio.subprocess.PIPE if per_thread else asyncio.subprocess.DEVNULL)
+    ready = asyncio.Event()
+    gate = asyncio.get_running_loop().create_future() if per_thread else None
+    pump = asyncio.create_task(pump_output(server.stdout, server_output, ready, gate))
+    clients = []
+    perf = None
+    released = None
+    live = None
+    try:
+        # Readiness: whichever comes first, the listening line or an early exit
+        ready_wait = asyncio.create_task(ready.wait())
+        exit_wait = asyncio.create_task(server.wait())
+        done, _ = await asyncio.wait({ready_wait, exit_wait}, timeout=READY_TIMEOUT,
+                                     return_when=asyncio.FIRST_COMPLETED)
+        ready_wait.cancel()
+        if not ready.is_set():
+            exit_wait.cancel()
+            log_error(f"Server for {exp_name} did not start on port {port}")
+            return None
+
+        for i, n in enumerate(conns, 1):
+            client_argv = ([f'./MT25067_Part{base_impl(cell.impl)}_Client', '-p', str(port),
+                            '-H', client_hists[i - 1], '-n', str(n)]
+                           + client_args(cell.impl, server_threads(cell, args.epoll_workers) + i - 1)
+                           + sample_args(client_rings[i - 1], args.sample_ms)
+                           + [str(cell.msg_size), str(num_messages)])
+            with open(os.path.join(TEMP_DIR, f"client_{exp_name}_{i}.txt"), 'wb') as out:
+                clients.append(await spawn(in_netns(lane.client_ns, cpus, client_argv), out))
+        if args.live and args.sample_ms:
+            live = asyncio.create_task(follow_rings(client_rings, exp_name))
+
+        if per_thread:
+            pid = await asyncio.wait_for(gate, READY_TIMEOUT)
+            perf = await attach_perf(pid, perf_output, exp_name, args.perf_format)
+            released = time.monotonic()
+            server.stdin.write(b'go\n')
+            await server.stdin.drain()
+
+        # Completion: every client exits, then the server exits on its own
+        await asyncio.wait_for(asyncio.gather(*(c.wait() for c in clients)), CELL_TIMEOUT)
+        await asyncio.wait_for(exit_wait, CELL_TIMEOUT)
+        if perf:
+            # perf -p exits (and writes its output) once the server is gone
+            await asyncio.wait_for(perf.wait(), READY_TIMEOUT)
+    except asyncio.TimeoutError:
+        log_error(f"Timed out waiting for {exp_name}")
+        return None
+    finally:
+        if live:
+            live.cancel()
+        for proc in clients + [server] + ([perf] if perf else []):
+            kill_tree(proc)
+        await pump
+    gated_elapsed = time.monotonic() - released if released else None
+
+    if any(c.returncode != 0 for c in clients):
+        log_error(f"A client failed for {exp_name}")
+        return None
+    counts = parse_perf_file(perf_output) if args.perf else []
+    if args.perf and not counts:
+        log_error(f"Perf output missing for {exp_name}")
+        return None
+
+    # Merge every client of the cell (not just client #1)
+    client_metrics = aggregate_clients([os.path.join(TEMP_DIR, f"client_{exp_name}_{i}.txt")
+                                        for i in range(1, len(conns) + 1)])
+    if args.perf:
+        perf_summary = summarize(counts)
+        perf_metrics = perf_fields(perf_summary, gated_elapsed)
+        perf_running = [running_field(perf_summary)]
+    else:
+        perf_metrics, perf_running = [''] * 6, ['']
+    tail_metrics = merge_cell_histograms(client_hists, cell, trial)
+    # The series goes to SERIES_DIR; the rings themselves are not kept
+    steady_metrics = merge_cell_series(client_rings, server_ring, cell, trial)
+    remove_files(client_rings + [server_ring])
+    log_info(f"✓ {exp_name} completed in {time.monotonic() - started:.1f}s")
+    key = [cell.impl, cell.msg_size, cell.threads]
+    return (key + format_fields(client_metrics, BASE_COLUMNS) + perf_metrics + tail_metrics
+            + format_fields(client_metrics, AGGREGATE_COLUMNS) + perf_running
+            + format_fields(parse_server_output(server_output), SERVER_COLUMNS) + steady_metrics,
+            thread_rows(key, counts))
+
+async def run_sweep(cells, args):
+    lanes = build_lanes(args.concurrency, args.pairs, args.isolate)
+    pool = LanePool(lanes)
+    lane_cpus = min(len(l.cpus) for l in lanes) if args.isolate else None
+    writer = ResultWriter(args.csv, args.resume)
+    summary_writer = ResultWriter(args.summary_csv, args.resume, SUMMARY_COLUMNS)
+    thread_writer = (ResultWriter(args.thread_csv, args.resume, THREAD_COLUMNS)
+                     if args.perf and args.per_thread else None)
+    stats = {'done': 0, 'failed': 0}
+
+    log_info(f"Lanes: {len(lanes)} (pairs: {args.pairs}, CPU isolation: "
+             f"{'on' if args.isolate else 'off'})")
+
+    async def worker(cell):
+        exclusive = lane_cpus is not None and cpus_needed(cell, args) > lane_cpus
+        trials = TrialSet(CSV_HEADER, args.min_trials, args.max_trials, args.ci_target)
+        per_thread_rows = []
+        failures = 0
+        # Lanes are taken per trial, so other cells interleave with the repeats
+        while not trials.done() and len(trials) + failures < trials.max_trials:
+            taken = await pool.acquire(exclusive=exclusive)
+            try:
+                result = await run_cell(cell, taken, args, len(trials) + 1)
+            finally:
+                await pool.release(taken)
+            if result is None:
+                failures += 1
+                if not len(trials):
+                    break
+                log_warn(f"Trial {len(trials) + failures} failed, continuing...")
+                continue
+            row, rows = result
+            trials.add(row)
+            per_thread_rows += rows
+        if not len(trials):
+            stats['failed'] += 1
+            log_warn("Experiment failed, continuing...")
+        else:
+            # Outlier flags are final only once the cell's last trial is in
+            writer.write_many(trials.trial_rows())
+            summary_writer.write(trials.summary_row())
+            if thread_writer:
+                thread_writer.write_many(per_thread_rows)
+            intervals = ', '.join(f"{m} {mean:.3f} ±{hw:.3f}"
+                                  for m, (mean, hw) in trials.intervals().items())
+            log_info(f"{cell.impl} {cell.msg_size}B {cell.threads}T: {len(trials)} trial(s), "
+                     f"{int(trials.outliers().sum())} outlier(s), {intervals}")
+        stats['done'] += 1
+        log_info(f"Progress: {stats['done']} / {len(cells)}")
+
+    try:
+        await asyncio.gather(*(worker(cell) for cell in cells))
+    finally:
+        writer.close()
+        summary_writer.close()
+        if thread_writer:
+            thread_writer.close()
+    return stats
+
+async def build_binaries():
+    proc = await asyncio.create_subprocess_exec('make', 'all')
+    return await proc.wait() == 0
+
+async def namespaces_exist(pairs):
+    proc = await asyncio.create_subprocess_exec(
+        *SUDO, 'ip', 'netns', 'list', stdout=asyncio.subprocess.PIPE)
+    out, _ = await proc.communicate()
+    present = {line.split()[0] for line in out.decode().splitlines() if line.strip()}
+    return all(ns in present for p in range(pairs) for ns in pair_names(p))
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='MT25067 asyncio experiment orchestrator')
+    parser.add_argument('--impls', nargs='+', default=IMPLEMENTATIONS)
+    parser.add_argument('--sizes', nargs='+', type=int, default=MESSAGE_SIZES)
+    parser.add_argument('--threads', nargs='+', type=int, default=THREAD_COUNTS)
+    parser.add_argument('--num-messages', type=int, default=NUM_MESSAGES)
+    parser.add_argument('--scale', action='store_true',
+                        help=f'add {"/".join(EPOLL_IMPLEMENTATIONS)} and '
+                             f'{", ".join(map(str, SCALE_CONNECTIONS))} connections')
+    parser.add_argument('--scale-messages', type=int, default=SCALE_NUM_MESSAGES,
+                        help=f'messages per connection above {max(THREAD_COUNTS)} connections')
+    parser.add_argument('--fields', nargs='+', type=int,
+                        help=f'string fields (iovecs) per message to sweep (default {DEFAULT_FIELDS})')
+    parser.add_argument('--arena', action='store_true',
+                        help='add arena-pooled (P) variants with contiguous messages')
+    parser.add_argument('--huge-pages', action='store_true',
+                        help='back the arena with huge pages (server -A)')
+    parser.add_argument('--pin', nargs='+', metavar='POLICY',
+                        help='thread placements to sweep: none, compact, spread, irq '
+                             'or a core list such as 0-3,8 (server/client -C)')
+    parser.add_argument('--busy-poll', nargs='+', type=int, metavar='USEC',
+                        help='SO_BUSY_POLL values to sweep, 0 = off (-B)')
+    parser.add_argument('--sock-buf', nargs='+', metavar='BYTES',
+                        help='SO_SNDBUF/SO_RCVBUF sizes to sweep, e.g. 0 256k 4m (-K)')
+    parser.add_argument('--epoll-workers', type=int, default=EPOLL_WORKERS,
+                        help='worker threads of the event-driven (E) servers')
+    parser.add_argument('--client-procs', type=int, default=CLIENT_PROCS,
+                        help='client processes per cell (connections are spread over them)')
+    parser.add_argument('-c', '--concurrency', type=int, default=1,
+                        help='cells to run at the same time (default: 1)')
+    parser.add_argument('--pairs', type=int, default=1,
+                        help='namespace pairs created by MT25067_Setup_Netns.sh')
+    parser.add_argument('--no-isolate', dest='isolate', action='store_false',
+                        help='do not pin concurrent cells to disjoint CPU sets')
+    parser.add_argument('--csv', default=CSV_FILE)
+    parser.add_argument('--resume', action='store_true',
+                        help='append to --csv and skip cells already in it')
+    parser.add_argument('--min-trials', type=int, default=MIN_TRIALS,
+                        help='trials per cell before the confidence intervals are checked')
+    parser.add_argument('--max-trials', type=int, default=MAX_TRIALS,
+                        help='trial budget per cell (1: a single run, no intervals)')
+    parser.add_argument('--ci-target', type=float, default=CI_TARGET,
+                        help='stop once the 95%% CI half-width of throughput and latency '
+                             'is within this fraction of the mean')
+    parser.add_argument('--summary-csv', default=SUMMARY_FILE,
+                        help='per-cell trial counts, means and confidence intervals')
+    parser.add_argument('--no-perf', dest='perf', action='store_false',
+                        help='run without perf stat (perf columns left empty)')
+    parser.add_argument('--perf-format', choices=['csv', 'json'], default='csv',
+                        help='perf stat output mode: -x, (default) or -j (perf >= 6.2)')
+    parser.add_argument('--per-thread', action='store_true',
+                        help='attach perf to each server handler thread '
+                             f'(rows in --thread-csv, default {THREAD_CSV_FILE})')
+    parser.add_argument('--thread-csv', default=THREAD_CSV_FILE)
+    parser.add_argument('--no-build', dest='build', action='store_false')
+    parser.add_argument('--sample-ms', type=float, default=SAMPLE_MS,
+                        help='throughput sampling interval in ms (0: no sampler thread, '
+                             'steady-state columns left empty)')
+    parser.add_argument('--live', action='store_true',
+                        help=f'log each running cell\'s throughput every {LIVE_PERIOD:g}s')
+    parser.add_argument('--keep-temp', action='store_true',
+                        help=f'keep per-run logs in {TEMP_DIR}/')
+    return parser.parse_args(argv)
+
+async def main_async(args):
+    log_info("==========================================")
+    log_info("MT25067 Asyncio Experiment Orchestrator")
+    log_info("==========================================")
+
+    if not await namespaces_exist(args.pairs):
+        log_error("Network namespaces not found!")
+        log_error(f"Please run: sudo ./MT25067_Setup_Netns.sh {args.pairs}")
+        return 1
+    log_info("✓ Network namespaces detected")
+
+    if args.perf and shutil.which('perf') is None:
+        log_warn("perf not found; running with --no-perf")
+        args.perf = False
+
+    if args.build:
+        log_info("Compiling all implementations...")
+        if not await build_binaries():
+            log_error("Compilation failed! Check your Makefile.")
+            return 1
+        log_info("Compilation successful ✓")
+
+    os.makedirs(TEMP_DIR, exist_ok=True)
+
+    if args.scale:
+        args.impls = list(dict.fromkeys(args.impls + EPOLL_IMPLEMENTATIONS))
+        args.threads = sorted(set(args.threads) | set(SCALE_CONNECTIONS))
+    try:
+        args.impls = grid_variants(args.impls, args.fields, args.arena,
+                                   args.pin, args.busy_poll, args.sock_buf)
+    except ValueError as e:
+        log_error(str(e))
+        return 1
+    cells = [Cell(impl, size, threads) for impl in args.impls
+             for size in args.sizes for threads in args.threads]
+    too_many = [c for c in cells
+                if not is_epoll(c.impl) and c.threads > MAX_THREAD_CLIENTS]
+    if too_many:
+        log_warn(f"Skipping {len(too_many)} thread-per-client cell(s) above "
+                 f"{MAX_THREAD_CLIENTS} connections (use the E variants)")
+        cells = [c for c in cells if c not in too_many]
+    if args.resume:
+        done = completed_cells(args.csv)
+        cells = [c for c in cells if c not in done]
+        log_info(f"Resuming: {len(done)} cell(s) already in {args.csv}")
+
+    log_info(f"Total experiments: {len(cells)} (concurrency {args.concurrency})")
+    started = time.monotonic()
+    stats = await run_sweep(cells, args)
+
+    log_info("==========================================")
+    log_info(f"All experiments completed in {time.monotonic() - started:.1f}s")
+    log_info(f"Results saved to: {args.csv}")
+    log_info(f"Successful: {len(cells) - stats['failed']} / {len(cells)}")
+    if stats['failed']:
+        log_warn(f"Failed: {stats['failed']} / {len(cells)}")
+
+    if not args.keep_temp:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+    # Rings of cells that failed or timed out
+    remove_files(glob.glob(os.path.join(RING_DIR, f"MT25067_{os.getpid()}_*.ring")))
+    return 0 if not stats['failed'] else 2
+
+def main():
+    sys.exit(asyncio.run(main_async(parse_args())))
+
+if __name__ == "__main__":
+    main()
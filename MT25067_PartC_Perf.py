@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+MT25067
+Part C: Machine-Readable perf stat Ingestion
+Replaces grepping the human-readable `perf stat` text (locale-dependent
+thousands separators, "<not counted>" rows and multiplexing annotations
+were silently summed as garbage) with parsing of `perf stat -x,` (CSV) or
+`perf stat -j` (JSON) output.
+
+- Every row keeps perf's enabled/running ratio. perf already scales a
+  multiplexed count by enabled/running; PerfRunning_pct reports the lowest
+  ratio of a cell so estimated counts can be spotted (100 = exact).
+- "<not counted>" / "<not supported>" rows are skipped, not summed as 0.
+- With --per-thread (attach to a server started with -g, see
+  MT25067_ServerCommon.h) each handle_client thread ("A1-conn-3") gets its
+  own cycles, instructions, LLC and L1 misses.
+
+Usage:
+    python3 MT25067_PartC_Perf.py perf_A1_16384B_4T.txt       # per-thread table
+    python3 MT25067_PartC_Perf.py --fields perf_A1_16384B_4T.txt   # CSV fields
+    python3 MT25067_PartC_Perf.py --running perf_A1_16384B_4T.txt  # PerfRunning_pct
+"""
+
+import argparse
+import json
+import sys
+from collections import namedtuple
+
+# perf event -> CSV column (order matches the CSV header)
+PERF_EVENTS = ['cycles', 'instructions', 'cache-misses',
+               'L1-dcache-load-misses', 'context-switches']
+PERF_COLUMNS = ['CPU_Cycles', 'Instructions', 'LLC_Misses', 'L1_Misses',
+                'ContextSwitches']
+# Wall-clock tool event, replaces the "seconds time elapsed" footer that
+# perf omits in CSV/JSON mode
+DURATION_EVENT = 'duration_time'
+
+THREAD_COLUMNS = ['Implementation', 'MessageSize', 'NumThreads', 'Thread', 'TID'] + \
+                 PERF_COLUMNS + ['PerfRunning_pct']
+
+PerfCount = namedtuple('PerfCount', 'thread tid event value running_pct')
+
+_NOT_COUNTED = ('<not counted>', '<not supported>')
+
+
+def perf_stat_argv(output, fmt='csv', events=PERF_EVENTS, pid=None, control=None):
+    """
+    perf stat command prefix writing machine-readable output to `output`.
+    Without `pid` the workload command is appended by the caller; with `pid`
+    perf attaches per thread and starts disabled until `control` (a
+    (ctl_fifo, ack_fifo) pair) receives "enable".
+    """
+    argv = ['perf', 'stat', '-j' if fmt == 'json' else '-x,', '-o', output]
+    if pid is None:
+        argv += ['-e', ','.join(list(events) + [DURATION_EVENT])]
+    else:
+        argv += ['-e', ','.join(events), '--per-thread', '-p', str(pid)]
+        if control:
+            argv += ['-D', '-1', '--control', f'fifo:{control[0]},{control[1]}']
+    return argv
+
+
+def _event_name(raw):
+    """Normalize "cpu_core/cycles/", "cycles:u" etc. to the plain event name."""
+    raw = raw.strip()
+    if '/' in raw:
+        parts = [p for p in raw.split('/') if p]
+        raw = parts[1] if len(parts) > 1 else parts[0]
+    return raw.split(':')[0]
+
+
+def _split_thread(label):
+    """perf prints threads as "<comm>-<tid>"; comm itself may contain '-'."""
+    comm, _, tid = label.strip().rpartition('-')
+    return (comm, int(tid)) if comm and tid.isdigit() else (label.strip(), None)
+
+
+def _parse_csv_line(line, per_thread):
+    fields = line.rstrip('\n').split(',')
+    thread, tid = None, None
+    if per_thread:
+        thread, tid = _split_thread(fields[0])
+        fields = fields[1:]
+    if len(fields) < 3 or fields[0].strip() in _NOT_COUNTED:
+        return None
+    try:
+        value = float(fields[0])
+        running = float(fields[4]) if len(fields) > 4 and fields[4] else 100.0
+    except ValueError:
+        return None
+    return PerfCount(thread, tid, _event_name(fields[2]), value, running)
+
+
+def _parse_json_line(line):
+    try:
+        row = json.loads(line)
+        value = row['counter-value']
+        if isinstance(value, str) and value.strip() in _NOT_COUNTED:
+            return None
+        thread, tid = _split_thread(row['thread']) if 'thread' in row else (None, None)
+        return PerfCount(thread, tid, _event_name(row['event']), float(value),
+                         float(row.get('pcnt-running', 100.0)))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def parse_perf_file(path):
+    """All counter rows of a perf stat -x, or -j output file."""
+    try:
+        with open(path) as f:
+            lines = [l for l in f if l.strip() and not l.startswith('#')]
+    except OSError:
+        return []
+    if lines and lines[0].lstrip().startswith('{'):
+        rows = map(_parse_json_line, lines)
+    else:
+        # Per-thread rows carry one extra leading "<comm>-<tid>" field
+        per_thread = bool(lines) and _split_thread(lines[0].split(',')[0])[1] is not None
+        rows = (_parse_csv_line(l, per_thread) for l in lines)
+    return [r for r in rows if r is not None]
+
+
+def summarize(counts):
+    """
+    Process-wide totals: {event: value, 'elapsed': sec, 'running_pct': min}.
+    Events that were never counted stay None (an empty CSV field, not 0).
+    """
+    totals = {event: None for event in PERF_EVENTS}
+    summary = {'elapsed': None, 'running_pct': None}
+    for c in counts:
+        if c.event == DURATION_EVENT:
+            summary['elapsed'] = c.value / 1e9
+        elif c.event in totals:
+            totals[c.event] = (totals[c.event] or 0.0) + c.value
+            if summary['running_pct'] is None or c.running_pct < summary['running_pct']:
+                summary['running_pct'] = c.running_pct
+    summary.update(totals)
+    return summary
+
+
+def per_thread(counts):
+    """{(thread, tid): summary} for --per-thread output, in tid order."""
+    groups = {}
+    for c in counts:
+        if c.tid is not None:
+            groups.setdefault((c.thread, c.tid), []).append(c)
+    return {key: summarize(groups[key]) for key in sorted(groups, key=lambda k: k[1])}
+
+
+def perf_fields(summary, elapsed=None):
+    """CSV fields: PERF_COLUMNS, TimeElapsed_sec (perf's or the given wall time)."""
+    fields = [_fmt(summary[e], '.0f') for e in PERF_EVENTS]
+    seconds = summary['elapsed'] if summary['elapsed'] is not None else elapsed
+    fields.append(_fmt(seconds, '.6f'))
+    return fields
+
+
+def running_field(summary):
+    return _fmt(summary['running_pct'], '.2f')
+
+
+def _fmt(value, spec):
+    return format(value, spec) if value is not None else ''
+
+
+def thread_rows(key, counts):
+    """THREAD_COLUMNS rows (one per server thread) for one cell."""
+    return [list(key) + [thread, tid] + perf_fields(s)[:-1] + [running_field(s)]
+            for (thread, tid), s in per_thread(counts).items()]
+
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='MT25067 perf stat ingestion')
+    parser.add_argument('file', help='perf stat -x, or -j output file')
+    parser.add_argument('--fields', action='store_true',
+                        help='print "cycles,...,context-switches,elapsed" for the shell runner')
+    parser.add_argument('--running', action='store_true',
+                        help='print the lowest enabled/running percentage')
+    args = parser.parse_args()
+
+    counts = parse_perf_file(args.file)
+    if not counts:
+        print(f"{args.file}: no counters found", file=sys.stderr)
+        return 1
+
+    total = summarize(counts)
+    if args.fields:
+        print(','.join(perf_fields(total)))
+        return 0
+    if args.running:
+        print(running_field(total))
+        return 0
+
+    threads = per_thread(counts)
+    print(f"{'thread':<20} {'tid':>8} {'cycles':>14} {'instr':>14} {'IPC':>6} "
+          f"{'LLC miss':>12} {'L1 miss':>12} {'ctx sw':>8} {'run%':>7}")
+    rows = list(threads.items()) + [(('(total)', ''), total)]
+    for (thread, tid), s in rows:
+        ipc = s['instructions'] / s['cycles'] if s['cycles'] and s['instructions'] else None
+        print(f"{thread:<20} {tid:>8} {_fmt(s['cycles'], '.0f'):>14} "
+              f"{_fmt(s['instructions'], '.0f'):>14} {_fmt(ipc, '.2f'):>6} "
+              f"{_fmt(s['cache-misses'], '.0f'):>12} {_fmt(s['L1-dcache-load-misses'], '.0f'):>12} "
+              f"{_fmt(s['context-switches'], '.0f'):>8} {running_field(s):>7}")
+    if threads:
+        worst = max(threads, key=lambda k: threads[k]['cache-misses'] or 0)
+        print(f"Most LLC misses: {worst[0]} (tid {worst[1]})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+MT25067
+Part C: Adaptive Trial Scheduler
+Decides how often a sweep cell is repeated. A cell runs at least
+min_trials times; after that it is repeated until the 95% confidence
+interval of every TRIAL_METRICS mean is within target (relative half-width)
+or max_trials is reached. Trials whose throughput or latency is an outlier
+(modified z-score, see MT25067_PartD_Stats.py) are kept in the CSV with
+Outlier=1 but do not count towards the intervals.
+
+The experiment CSV gets one row per trial (Trial, Outlier columns); the
+summary CSV one row per cell with the means, interval half-widths and
+whether the target was met.
+
+Usage (shell runner, per cell):
+    python3 MT25067_PartC_Trials.py --done trials.csv      # exit 0: stop
+    python3 MT25067_PartC_Trials.py --finish trials.csv \\
+        --csv MT25067_ExperimentData.csv --summary MT25067_TrialSummary.csv
+"""
+
+import argparse
+import csv
+import os
+import sys
+
+import numpy as np
+
+from MT25067_PartD_Stats import CONFIDENCE, mean_ci, outlier_mask
+
+# Metrics whose confidence intervals decide when a cell is done
+TRIAL_METRICS = ('Throughput_Gbps', 'Latency_us')
+MIN_TRIALS = 3
+MAX_TRIALS = 10
+CI_TARGET = 0.05                 # half-width / mean
+
+TRIAL_COLUMNS = ['Trial', 'Outlier']
+SUMMARY_FILE = 'MT25067_TrialSummary.csv'
+SUMMARY_COLUMNS = (['Implementation', 'MessageSize', 'NumThreads', 'Trials', 'Outliers']
+                   + [f'{m}_{stat}' for m in TRIAL_METRICS for stat in ('mean', 'ci95', 'relci')]
+                   + ['Converged'])
+
+
+def _float(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class TrialSet:
+    """The trials of one cell, as CSV rows (lists aligned to `header`)."""
+
+    def __init__(self, header, min_trials=MIN_TRIALS, max_trials=MAX_TRIALS,
+                 target=CI_TARGET):
+        self.header = list(header)
+        self.max_trials = max(1, max_trials)
+        self.min_trials = max(1, min(min_trials, self.max_trials))
+        self.target = target
+        self.rows = []
+
+    def add(self, row):
+        self.rows.append(list(row))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def values(self, metric):
+        i = self.header.index(metric)
+        return np.array([_float(r[i]) if i < len(r) else np.nan for r in self.rows])
+
+    def outliers(self):
+        """Per-trial mask: outlier in any TRIAL_METRICS metric."""
+        mask = np.zeros(len(self.rows), dtype=bool)
+        for metric in TRIAL_METRICS:
+            if metric in self.header:
+                mask |= outlier_mask(self.values(metric))
+        return mask
+
+    def intervals(self):
+        """{metric: (mean, half-width)} over the trials that are not outliers."""
+        keep = ~self.outliers()
+        return {m: mean_ci(self.values(m)[keep]) for m in TRIAL_METRICS if m in self.header}
+
+    def converged(self):
+        for mean, hw in self.intervals().values():
+            if not np.isfinite(hw) or (hw > self.target * abs(mean)):
+                return False
+        return True
+
+    def done(self):
+        """Whether no further trial is needed."""
+        if len(self) < self.min_trials:
+            return False
+        return len(self) >= self.max_trials or self.converged()
+
+    def trial_rows(self):
+        """Rows with their Trial number and final Outlier flag appended."""
+        return [row + [str(i), str(int(out))]
+                for i, (row, out) in enumerate(zip(self.rows, self.outliers()), 1)]
+
+    def summary_row(self):
+        key = self.rows[0][:3]
+        fields = [str(len(self)), str(int(self.outliers().sum()))]
+        for mean, hw in self.intervals().values():
+            rel = hw / abs(mean) if mean else np.nan
+            fields += [f'{mean:.5f}', '' if np.isnan(hw) else f'{hw:.5f}',
+                       '' if np.isnan(rel) else f'{rel:.4f}']
+        return key + fields + [str(int(len(self) > 1 and self.converged()))]
+
+
+def read_trials(path, **limits):
+    """TrialSet from a CSV of one cell's trials (header line first)."""
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        trials = TrialSet(next(reader), **limits)
+        for row in reader:
+            if row:
+                trials.add(row)
+    return trials
+
+
+def append_rows(path, header, rows):
+    """Append rows to a CSV, writing the header if the file is new or empty."""
+    fresh = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if fresh:
+            writer.writerow(header)
+        writer.writerows(rows)
+
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='MT25067 adaptive trial scheduler')
+    parser.add_argument('trials', help="CSV with one cell's trials so far (header first)")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument('--done', action='store_true',
+                        help='exit 0 if the cell needs no further trial, 1 otherwise')
+    action.add_argument('--finish', action='store_true',
+                        help='append the trial rows to --csv and the summary to --summary')
+    parser.add_argument('--csv', help='experiment CSV (rows without Trial/Outlier columns)')
+    parser.add_argument('--summary', default=SUMMARY_FILE)
+    parser.add_argument('--min-trials', type=int, default=MIN_TRIALS)
+    parser.add_argument('--max-trials', type=int, default=MAX_TRIALS)
+    parser.add_argument('--ci-target', type=float, default=CI_TARGET,
+                        help=f'{CONFIDENCE:.0%} CI half-width relative to the mean')
+    args = parser.parse_args()
+
+    trials = read_trials(args.trials, min_trials=args.min_trials,
+                         max_trials=args.max_trials, target=args.ci_target)
+    if args.done:
+        return 0 if trials.done() else 1
+    if not len(trials):
+        return 1
+    if args.csv:
+        append_rows(args.csv, trials.header + TRIAL_COLUMNS, trials.trial_rows())
+    append_rows(args.summary, SUMMARY_COLUMNS, [trials.summary_row()])
+    intervals = ', '.join(f'{m} {mean:.3f} ±{hw:.3f}' for m, (mean, hw) in trials.intervals().items())
+    print(f"{len(trials)} trial(s), {int(trials.outliers().sum())} outlier(s): {intervals}",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
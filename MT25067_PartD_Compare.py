@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+MT25067
+Part D: Regression Comparator
+Compares a candidate sweep against a baseline sweep (e.g. before and after
+a kernel, driver or build-flag change). Each side is one or more
+MT25067_ExperimentData.csv files; repeated rows (trials, several sweeps)
+are reduced per cell by MT25067_PartD_Results.py, outlier trials skipped.
+
+Cells are aligned on (Implementation, MessageSize, NumThreads). For every
+metric both sides have, the tool reports the delta and a Welch t-test on
+the per-cell trials. p-values are Holm-corrected over the gated cells.
+
+A gated cell regresses when it is worse by more than its threshold
+(relative to the baseline) and the difference is significant at --alpha.
+A cell that cannot be tested is judged on the threshold alone: that is a
+side with a single trial, or a derived metric such as CyclesPerByte.
+The exit status is 1 if any cell regressed, 0 otherwise.
+
+Delta heatmaps (Plot 8, one per gated metric) go to MT25067_Plot8_Regression/.
+
+Usage:
+    python3 MT25067_PartD_Compare.py -b baseline.csv -c candidate.csv
+    python3 MT25067_PartD_Compare.py -b old1.csv old2.csv -c new.csv \\
+        --threshold Latency_us=0.10 --report MT25067_Comparison.csv
+"""
+
+import argparse
+import csv
+import functools
+import hashlib
+import os
+import sys
+
+import numpy as np
+
+from MT25067_PartD_Plots import REGRESSION_DIR, plot_regression_heatmap, render_figures
+from MT25067_PartD_Results import load_results
+from MT25067_PartD_Stats import holm, welch_test
+
+# Which way is better: +1 higher, -1 lower (metrics not listed are reported only)
+DIRECTIONS = {
+    'Throughput_Gbps': +1, 'AggThroughput_Gbps': +1, 'SteadyThroughput_Gbps': +1,
+    'MinClient_Gbps': +1, 'JainFairness': +1,
+    'Latency_us': -1, 'Latency_p50_us': -1, 'Latency_p99_us': -1, 'Latency_p999_us': -1,
+    'CyclesPerByte': -1, 'CPU_Cycles': -1, 'LLC_Misses': -1, 'L1_Misses': -1,
+    'ContextSwitches': -1,
+}
+# Metrics that fail the comparison by default, and their allowed slowdown
+GATE_METRICS = ['Throughput_Gbps', 'Latency_us', 'CyclesPerByte']
+DEFAULT_THRESHOLD = 0.05
+ALPHA = 0.05
+
+REPORT_COLUMNS = ['Implementation', 'MessageSize', 'NumThreads', 'Metric',
+                  'Baseline', 'Candidate', 'Delta', 'DeltaPct', 'BaselineN', 'CandidateN',
+                  'p_value', 'p_holm', 'Verdict']
+
+
+class Comparison:
+    """
+    Baseline vs candidate over the cells and metrics both sides have.
+    Arrays are (impl, size, threads, metric); `worse` is the relative change
+    signed so that positive means worse (NaN for undirected metrics).
+    """
+
+    def __init__(self, impls, sizes, threads, metrics, base, cand, gated, thresholds,
+                 alpha=ALPHA, names=('baseline', 'candidate')):
+        self.impls, self.sizes, self.threads = list(impls), list(sizes), list(threads)
+        self.metrics = list(metrics)
+        self.base_mean, self.base_std, self.base_n = base
+        self.cand_mean, self.cand_std, self.cand_n = cand
+        self.gated = [m for m in self.metrics if m in gated]
+        self.thresholds = dict(thresholds)
+        self.alpha = alpha
+        self.names = tuple(names)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.delta = self.cand_mean - self.base_mean
+            self.rel = self.delta / np.abs(self.base_mean)
+        direction = np.array([DIRECTIONS.get(m, np.nan) for m in self.metrics])
+        self.worse = -direction * self.rel
+        _, _, self.p = welch_test(self.base_mean, self.base_std, self.base_n,
+                                  self.cand_mean, self.cand_std, self.cand_n)
+        # One Holm family: every tested gated cell
+        gate = np.array([m in self.gated for m in self.metrics])
+        self.p_holm = np.full(self.p.shape, np.nan)
+        self.p_holm[..., gate] = holm(self.p[..., gate])
+
+        limit = np.array([self.thresholds.get(m, np.nan) for m in self.metrics])
+        compared = np.isfinite(self.rel) & gate
+        # Untestable cells count on the threshold alone
+        evident = np.isnan(self.p_holm) | (self.p_holm < alpha)
+        self.regression = compared & evident & (self.worse > limit)
+        self.improvement = compared & evident & (-self.worse > limit)
+
+    def only(self, metric):
+        """The comparison restricted to one metric (input of a Plot 8 figure)."""
+        i = self.metrics.index(metric)
+        view = object.__new__(Comparison)
+        view.__dict__.update(self.__dict__)
+        for name, value in self.__dict__.items():
+            if isinstance(value, np.ndarray) and value.shape[-1:] == (len(self.metrics),):
+                setattr(view, name, value[..., i:i + 1])
+        view.metrics = [metric]
+        view.gated = [metric] if metric in self.gated else []
+        return view
+
+    def verdict(self, index):
+        if self.regression[index]:
+            return 'regression'
+        if self.improvement[index]:
+            return 'improvement'
+        return 'ok' if self.metrics[index[-1]] in self.gated else ''
+
+    def rows(self):
+        """REPORT_COLUMNS rows for every cell both sides measured."""
+        for index in zip(*np.nonzero(np.isfinite(self.delta))):
+            i, s, t, m = index
+            yield [self.impls[i], self.sizes[s], self.threads[t], self.metrics[m],
+                   _fmt(self.base_mean[index]), _fmt(self.cand_mean[index]),
+                   _fmt(self.delta[index]), _fmt(100 * self.rel[index], '.2f'),
+                   int(self.base_n[index]), int(self.cand_n[index]),
+                   _fmt(self.p[index], '.4g'), _fmt(self.p_holm[index], '.4g'),
+                   self.verdict(index)]
+
+    def digest(self):
+        """Content hash, used to key the cached Plot 8 figures."""
+        h = hashlib.sha256()
+        h.update(repr((self.impls, self.sizes, self.threads, self.metrics, self.gated,
+                       sorted(self.thresholds.items()), self.alpha, self.names)).encode())
+        for arr in (self.base_mean, self.base_std, self.base_n,
+                    self.cand_mean, self.cand_std, self.cand_n):
+            h.update(np.ascontiguousarray(arr).tobytes())
+        return h.hexdigest()
+
+
+def _fmt(value, spec='.6g'):
+    return '' if not np.isfinite(value) else format(value, spec)
+
+
+def compare(base_cube, cand_cube, gated=GATE_METRICS, thresholds=None,
+            alpha=ALPHA, names=('baseline', 'candidate')):
+    """Align two ResultCubes on their common cells and metrics; None if disjoint."""
+    common = {axis: [label for label in base_cube.labels(axis) if label in cand_cube.labels(axis)]
+              for axis in ('impl', 'size', 'threads', 'metric')}
+    # Metrics one side never measured (e.g. perf columns of a --no-perf sweep)
+    common['metric'] = [m for m in common['metric']
+                        if np.isfinite(base_cube.values(m)).any()
+                        and np.isfinite(cand_cube.values(m)).any()]
+    if not all(common.values()):
+        return None
+    base = base_cube.subset(**common)
+    cand = cand_cube.subset(**common)
+    limits = {m: DEFAULT_THRESHOLD for m in gated}
+    limits.update(thresholds or {})
+    return Comparison(common['impl'], common['size'], common['threads'], common['metric'],
+                      (base.mean, base.std, base.count), (cand.mean, cand.std, cand.count),
+                      gated, limits, alpha, names)
+
+
+def regression_figures(comp, directory=REGRESSION_DIR):
+    """One Plot 8 entry per gated metric."""
+    return [(plot_regression_heatmap,
+             os.path.join(directory, f'MT25067_Plot8_Regression_{metric}.png'),
+             functools.partial(comp.only, metric))
+            for metric in comp.gated]
+
+
+def print_summary(comp):
+    print(f"{'Metric':<18} {'Cells':>5} {'Worse':>6} {'Better':>6} {'Worst':>9}  Threshold")
+    for m in comp.gated:
+        k = comp.metrics.index(m)
+        worse = comp.worse[..., k]
+        cells = int(np.isfinite(worse).sum())
+        worst = f"{100 * np.nanmax(worse):+.1f}%" if cells else '-'
+        print(f"{m:<18} {cells:>5} {int(comp.regression[..., k].sum()):>6} "
+              f"{int(comp.improvement[..., k].sum()):>6} {worst:>9}  "
+              f"{100 * comp.thresholds[m]:.1f}%")
+
+    flagged = [row for row in comp.rows() if row[-1] == 'regression']
+    if flagged:
+        print(f"\nRegressions ({len(flagged)}):")
+        for impl, size, threads, metric, base, cand, _, pct, _, _, p, p_holm, _ in flagged:
+            test = f"p={p_holm}" if p_holm else 'untested'
+            print(f"  {impl} {size}B {threads}T {metric}: {base} -> {cand} ({pct}%, {test})")
+
+
+def parse_threshold(text):
+    metric, sep, value = text.partition('=')
+    try:
+        if not sep:
+            raise ValueError
+        return metric, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected METRIC=FRACTION, got {text!r}") from None
+
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='MT25067 sweep regression comparator')
+    parser.add_argument('-b', '--baseline', nargs='+', required=True,
+                        help='baseline experiment CSV file(s)')
+    parser.add_argument('-c', '--candidate', nargs='+', required=True,
+                        help='candidate experiment CSV file(s)')
+    parser.add_argument('-m', '--metrics', nargs='+', default=GATE_METRICS,
+                        help=f'metrics that can fail the comparison (default: {" ".join(GATE_METRICS)})')
+    parser.add_argument('-t', '--threshold', type=parse_threshold, action='append', default=[],
+                        help=f'METRIC=FRACTION allowed slowdown (default {DEFAULT_THRESHOLD}); '
+                             'repeatable')
+    parser.add_argument('--alpha', type=float, default=ALPHA,
+                        help='significance level after Holm correction')
+    parser.add_argument('--report', help='write every delta to this CSV')
+    parser.add_argument('--plot-dir', default=REGRESSION_DIR, help='Plot 8 output directory')
+    parser.add_argument('--no-plots', dest='plots', action='store_false')
+    args = parser.parse_args()
+
+    thresholds = dict(args.threshold)
+    gated = list(dict.fromkeys(args.metrics + list(thresholds)))
+    undirected = [m for m in gated if m not in DIRECTIONS]
+    if undirected:
+        parser.error(f"no better/worse direction known for: {', '.join(undirected)}")
+    names = (', '.join(map(os.path.basename, args.baseline)),
+             ', '.join(map(os.path.basename, args.candidate)))
+
+    comp = compare(load_results(args.baseline), load_results(args.candidate),
+                   gated, thresholds, args.alpha, names)
+    if comp is None:
+        print("No cells or metrics in common", file=sys.stderr)
+        return 2
+    missing = [m for m in gated if m not in comp.gated]
+    if missing:
+        print(f"Not in both data sets (skipped): {', '.join(missing)}", file=sys.stderr)
+
+    print(f"Baseline:  {names[0]}\nCandidate: {names[1]}\n")
+    print_summary(comp)
+
+    if args.report:
+        with open(args.report, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(REPORT_COLUMNS)
+            writer.writerows(comp.rows())
+        print(f"\nDeltas written to {args.report}")
+
+    if args.plots and comp.gated:
+        os.makedirs(args.plot_dir, exist_ok=True)
+        figures = regression_figures(comp, args.plot_dir)
+        print()
+        render_figures(None, figures)
+
+    regressions = int(comp.regression.sum())
+    print(f"\n{'FAIL' if regressions else 'PASS'}: {regressions} regression(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+MT25067
+Part D: Per-Message Latency Histogram Analyzer
+Reads the histogram files written by the Part A clients (-H <file>, see
+MT25067_LatencyHist.h) through np.memmap and computes percentiles for many
+histograms at once with vectorized cumulative sums.
+
+Usage:
+    python3 MT25067_PartD_Latency.py client_1.hist client_2.hist ...
+    python3 MT25067_PartD_Latency.py --merge cell.hist client_*.hist
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import re
+import sys
+
+import numpy as np
+
+HIST_MAGIC = b'MT25HIST'
+HIST_VERSION = 1
+
+# Mirrors HistHeader in MT25067_LatencyHist.h (64 bytes)
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('sub_bits', '<u4'),
+    ('max_exp', '<u4'),
+    ('num_buckets', '<u4'),
+    ('total_count', '<u8'),
+    ('min_ns', '<u8'),
+    ('max_ns', '<u8'),
+    ('sum_ns', '<u8'),
+    ('reserved', '<u8'),
+])
+
+# Percentiles reported in the CSV and the tail-latency plot
+TAIL_PERCENTILES = (50.0, 99.0, 99.9)
+
+# Directory where the sweep keeps one merged histogram per cell
+HIST_DIR = 'latency_histograms'
+# <impl label>_<size>B_<threads>T; grid labels contain + (MT25067_PartC_Grid.py)
+_CELL_NAME = re.compile(r'^(?P<impl>[A-Za-z0-9.+\-]+?)_(?P<size>\d+)B_(?P<threads>\d+)T\.hist$')
+
+
+def bucket_bounds(sub_bits, max_exp):
+    """Lower bound and width (ns) of every bucket, as in hist_bucket()."""
+    sub_count = 1 << sub_bits
+    half = sub_count // 2
+    low = [np.arange(sub_count, dtype=np.float64)]
+    width = [np.ones(sub_count)]
+    for msb in range(sub_bits, max_exp):
+        step = float(1 << (msb - sub_bits + 1))
+        low.append((1 << msb) + step * np.arange(half))
+        width.append(np.full(half, step))
+    return np.concatenate(low), np.concatenate(width)
+
+
+class Histogram:
+    """One latency histogram: header fields plus a memory-mapped counts array."""
+
+    def __init__(self, header, counts, path=None):
+        self.header = header
+        self.counts = counts
+        self.path = path
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    @property
+    def mean_us(self):
+        total = int(self.header['total_count'])
+        return self.header['sum_ns'] / total / 1e3 if total else np.nan
+
+
+def load_histogram(path):
+    """Memory-map a histogram file written by hist_write()."""
+    header = np.memmap(path, dtype=HEADER_DTYPE, mode='r', shape=(1,))[0]
+    if header['magic'] != HIST_MAGIC or header['version'] != HIST_VERSION:
+        raise ValueError(f"{path}: not a version {HIST_VERSION} latency histogram")
+    counts = np.memmap(path, dtype='<u8', mode='r', offset=HEADER_DTYPE.itemsize,
+                       shape=(int(header['num_buckets']),))
+    return Histogram(header, counts, path)
+
+
+def merge_histograms(hists):
+    """Sum counts (and combine min/max/sum) of histograms with equal layout."""
+    first = hists[0].header
+    for h in hists[1:]:
+        if (h.header['sub_bits'], h.header['max_exp']) != (first['sub_bits'], first['max_exp']):
+            raise ValueError(f"{h.path}: incompatible bucket layout")
+    header = np.zeros((), dtype=HEADER_DTYPE)
+    for field in ('magic', 'version', 'sub_bits', 'max_exp', 'num_buckets'):
+        header[field] = first[field]
+    header['total_count'] = sum(int(h.header['total_count']) for h in hists)
+    header['sum_ns'] = sum(int(h.header['sum_ns']) for h in hists)
+    header['min_ns'] = min(int(h.header['min_ns']) for h in hists)
+    header['max_ns'] = max(int(h.header['max_ns']) for h in hists)
+    counts = np.sum([np.asarray(h.counts) for h in hists], axis=0, dtype=np.uint64)
+    return Histogram(header, counts)
+
+
+def write_histogram(hist, path):
+    """Write a histogram in the same binary layout the clients use."""
+    with open(path, 'wb') as f:
+        f.write(np.asarray(hist.header, dtype=HEADER_DTYPE).tobytes())
+        f.write(np.asarray(hist.counts, dtype='<u8').tobytes())
+
+
+def add_histogram(hist, path):
+    """Add a histogram's counts to the one stored at path (created if missing)."""
+    if os.path.exists(path):
+        stored = load_histogram(path)
+        hist = merge_histograms([stored, hist])
+        del stored          # release the mapping before the file is rewritten
+    write_histogram(hist, path)
+
+
+def percentiles(hists, qs=TAIL_PERCENTILES):
+    """
+    Percentiles (µs) for a batch of histograms: returns an array of shape
+    (len(hists), len(qs)). Each value is linearly interpolated inside its
+    bucket and clamped to the recorded min/max.
+    """
+    if not hists:
+        return np.empty((0, len(qs)))
+    hdr = hists[0].header
+    low, width = bucket_bounds(int(hdr['sub_bits']), int(hdr['max_exp']))
+    counts = np.vstack([np.asarray(h.counts, dtype=np.float64) for h in hists])
+    cum = np.cumsum(counts, axis=1)
+    total = cum[:, -1:]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        targets = total * (np.asarray(qs, dtype=np.float64) / 100.0)[None, :]
+    # First bucket whose cumulative count reaches the target, per row
+    idx = np.sum(cum[:, :, None] < targets[:, None, :], axis=1)
+    idx = np.clip(idx, 0, counts.shape[1] - 1)
+    rows = np.arange(len(hists))[:, None]
+    before = np.where(idx > 0, cum[rows, idx - 1], 0.0)
+    in_bucket = counts[rows, idx]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        frac = np.where(in_bucket > 0, (targets - before) / in_bucket, 0.0)
+    values = low[idx] + np.clip(frac, 0.0, 1.0) * width[idx]
+    mins = np.array([float(h.header['min_ns']) for h in hists])[:, None]
+    maxs = np.array([float(h.header['max_ns']) for h in hists])[:, None]
+    values = np.clip(values, mins, maxs) / 1e3
+    values[total[:, 0] == 0] = np.nan
+    return values
+
+
+def cdf(hist):
+    """(latency_us, cumulative fraction) points at each non-empty bucket's upper edge."""
+    hdr = hist.header
+    low, width = bucket_bounds(int(hdr['sub_bits']), int(hdr['max_exp']))
+    counts = np.asarray(hist.counts, dtype=np.float64)
+    nonzero = counts > 0
+    cum = np.cumsum(counts)
+    if not cum.size or cum[-1] == 0:
+        return np.empty(0), np.empty(0)
+    return (low + width)[nonzero] / 1e3, cum[nonzero] / cum[-1]
+
+
+# =============================================================================
+# PER-CELL HISTOGRAM SET (input to the Part D latency figures)
+# =============================================================================
+
+class HistogramSet:
+    """
+    Merged histograms of a whole sweep, keyed by (impl, size, threads).
+    Counts are copied out of the memory maps so the set can be pickled to
+    render worker processes.
+    """
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    @classmethod
+    def from_dir(cls, directory=HIST_DIR):
+        cells = {}
+        for path in sorted(glob.glob(os.path.join(directory, '*.hist'))):
+            m = _CELL_NAME.match(os.path.basename(path))
+            if not m:
+                continue
+            h = load_histogram(path)
+            key = (m.group('impl'), int(m.group('size')), int(m.group('threads')))
+            cells[key] = Histogram(np.array(h.header), np.array(h.counts))
+        return cls(cells) if cells else None
+
+    def keys(self):
+        return sorted(self.cells)
+
+    def digest(self):
+        h = hashlib.sha256()
+        for key in self.keys():
+            h.update(repr(key).encode())
+            h.update(np.asarray(self.cells[key].counts).tobytes())
+        return h.hexdigest()
+
+
+def cell_hist_path(impl, msg_size, threads, directory=HIST_DIR):
+    return os.path.join(directory, f"{impl}_{msg_size}B_{threads}T.hist")
+
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='MT25067 latency histogram analyzer')
+    parser.add_argument('files', nargs='+', help='histogram files')
+    parser.add_argument('--merge', metavar='OUT',
+                        help='merge all inputs into OUT and report the merged result')
+    parser.add_argument('--add', metavar='OUT',
+                        help='add the merged inputs to OUT (e.g. one more trial of a cell)')
+    parser.add_argument('--csv', action='store_true',
+                        help='print only "p50,p99,p99.9" (µs) of the merged inputs')
+    args = parser.parse_args()
+
+    hists = [load_histogram(p) for p in args.files]
+    merged = merge_histograms(hists)
+    if args.merge:
+        write_histogram(merged, args.merge)
+    if args.add:
+        add_histogram(merged, args.add)
+
+    if args.csv:
+        print(','.join(f'{v:.2f}' for v in percentiles([merged])[0]))
+        return
+
+    qs = (50.0, 90.0, 99.0, 99.9)
+    names = [os.path.basename(p) for p in args.files] + ['(merged)']
+    table = percentiles(hists + [merged], qs)
+    print(f"{'histogram':<32} {'count':>10} {'mean':>9} " +
+          ' '.join(f"{'p' + format(q, 'g'):>9}" for q in qs) + f" {'max':>9}")
+    for name, h, row in zip(names, hists + [merged], table):
+        print(f"{name:<32} {h.total:>10} {h.mean_us:>9.2f} " +
+              ' '.join(f'{v:>9.2f}' for v in row) +
+              f" {h.header['max_ns'] / 1e3:>9.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
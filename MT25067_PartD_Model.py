@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+MT25067
+Part D: Analytical Cost Model
+Fits an alpha-beta model to each implementation's sweep so that untested
+message sizes and thread counts can be predicted:
+
+    Latency_us(s, n) = (alpha + alpha_c (n - 1)) + (beta + beta_c (n - 1)) s
+
+alpha is the fixed per-message cost (syscalls, wake-ups, completion
+handling) and beta the per-byte cost (copies, page pinning), both in µs.
+alpha_c / beta_c are how much each grows per additional concurrent thread
+(contention). A client's throughput is 8 s / Latency_us (bits per µs), which
+is exactly how the clients report Throughput_Gbps.
+
+The model is linear in its four parameters and is fitted by least squares on
+relative error, since latency spans orders of magnitude across the sweep.
+Every parameter is constrained to be >= 0 (a cost never shrinks with more
+bytes or threads), so predictions stay positive however far they reach.
+The leave-one-out error says how far to trust predictions between the
+measured points; predictions outside the measured sizes and thread counts
+are flagged as extrapolated. Crossovers are the message sizes where one implementation
+(e.g. A3 zero-copy) starts to beat another (A2 one-copy) at a thread count.
+They are only predicted when both models' LOO error is within MAX_LOO_ERROR,
+and each is checked against the measured cells on either side of it.
+
+Usage:
+    python3 MT25067_PartD_Model.py [results.csv ...]
+    python3 MT25067_PartD_Model.py --predict 65536 16 --pair A2 A3
+"""
+
+import argparse
+import csv
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from MT25067_PartD_Results import load_results
+
+# Fewest measured cells for a fit (one per parameter)
+MIN_POINTS = 4
+# Largest LOO error of a model whose crossovers are still predicted
+MAX_LOO_ERROR = 0.25
+# Default crossover pairs: (incumbent, challenger)
+CROSSOVER_PAIRS = [('A2', 'A3'), ('A1', 'A2'), ('A2', 'A4'), ('A2', 'A5')]
+# Prediction grid written by --grid
+GRID_SIZES = [2 ** k for k in range(6, 21)]          # 64 B .. 1 MB
+GRID_THREADS = [1, 2, 4, 8, 16, 32, 64]
+GRID_FILE = 'MT25067_ModelPredictions.csv'
+GRID_COLUMNS = ['Implementation', 'MessageSize', 'NumThreads', 'Latency_us',
+                'Throughput_Gbps', 'AggThroughput_Gbps', 'Measured', 'Extrapolated']
+
+PARAMS = ('alpha_us', 'beta_us_per_byte', 'alpha_contention_us', 'beta_contention_us_per_byte')
+
+
+def _design(sizes, threads):
+    s = np.asarray(sizes, dtype=np.float64)
+    extra = np.asarray(threads, dtype=np.float64) - 1.0
+    s, extra = np.broadcast_arrays(s, extra)
+    return np.stack([np.ones_like(s), s, extra, s * extra], axis=-1)
+
+
+class CostModel(namedtuple('CostModel', PARAMS + ('points', 'mape', 'loo_mape',
+                                                   'size_range', 'thread_range'))):
+    """Fitted alpha-beta-contention model of one implementation."""
+
+    @property
+    def coef(self):
+        return np.array(self[:len(PARAMS)])
+
+    def latency(self, sizes, threads):
+        """Predicted per-message latency (µs), broadcast over sizes x threads."""
+        return _design(sizes, threads) @ self.coef
+
+    def throughput(self, sizes, threads):
+        """Predicted per-client throughput (Gbps)."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lat = self.latency(sizes, threads)
+            return np.where(lat > 0, 8.0 * np.asarray(sizes, dtype=np.float64) / lat / 1000.0,
+                            np.nan)
+
+    def extrapolated(self, sizes, threads):
+        """True where (size, threads) lies outside the measured ranges."""
+        s = np.asarray(sizes, dtype=np.float64)
+        n = np.asarray(threads, dtype=np.float64)
+        return ((s < self.size_range[0]) | (s > self.size_range[1])
+                | (n < self.thread_range[0]) | (n > self.thread_range[1]))
+
+    def bandwidth_gbps(self, threads=1):
+        """Asymptotic per-client throughput for large messages (8 / beta)."""
+        beta = self.beta_us_per_byte + self.beta_contention_us_per_byte * (threads - 1)
+        return 8.0 / beta / 1000.0 if beta > 0 else np.inf
+
+    def half_size(self, threads=1):
+        """n_1/2: the message size reaching half the asymptotic throughput (alpha / beta)."""
+        alpha = self.alpha_us + self.alpha_contention_us * (threads - 1)
+        beta = self.beta_us_per_byte + self.beta_contention_us_per_byte * (threads - 1)
+        return alpha / beta if beta > 0 else np.inf
+
+
+def _lstsq_relative(X, y):
+    """
+    Non-negative least squares on relative residuals (rows scaled by 1/y).
+    With four parameters every active set is tried: the best fit whose
+    coefficients are all >= 0, with the dropped terms fixed at zero.
+    """
+    A = X / y[:, None]
+    b = np.ones_like(y)
+    best, best_err = np.zeros(X.shape[1]), np.sum(b ** 2)
+    for mask in range(1, 1 << X.shape[1]):
+        cols = [j for j in range(X.shape[1]) if mask >> j & 1]
+        sub, *_ = np.linalg.lstsq(A[:, cols], b, rcond=None)
+        if (sub < 0).any():
+            continue
+        err = np.sum((A[:, cols] @ sub - b) ** 2)
+        if err < best_err:
+            best, best_err = np.zeros(X.shape[1]), err
+            best[cols] = sub
+    return best
+
+
+def fit_model(sizes, threads, latency):
+    """
+    Fit one implementation from flat arrays of measured cells; None when
+    there are too few cells or they do not vary in both size and threads.
+    """
+    s, n, y = (np.asarray(a, dtype=np.float64).ravel() for a in (sizes, threads, latency))
+    ok = np.isfinite(y) & (y > 0)
+    s, n, y = s[ok], n[ok], y[ok]
+    if y.size < MIN_POINTS:
+        return None
+    X = _design(s, n)
+    if np.linalg.matrix_rank(X) < X.shape[1]:
+        return None
+    coef = _lstsq_relative(X, y)
+    mape = float(np.mean(np.abs(X @ coef / y - 1.0)))
+
+    # Leave-one-out: predict each cell from a fit without it
+    errors = []
+    for i in range(y.size):
+        keep = np.arange(y.size) != i
+        if np.linalg.matrix_rank(X[keep]) < X.shape[1]:
+            continue
+        errors.append(abs(X[i] @ _lstsq_relative(X[keep], y[keep]) / y[i] - 1.0))
+    loo = float(np.mean(errors)) if errors else np.nan
+    return CostModel(*coef, points=int(y.size), mape=mape, loo_mape=loo,
+                     size_range=(s.min(), s.max()), thread_range=(n.min(), n.max()))
+
+
+def fit_models(cube, metric='Latency_us'):
+    """{impl: CostModel} for every implementation with enough cells."""
+    sizes, threads = np.meshgrid(cube.sizes, cube.threads, indexing='ij')
+    models = {}
+    for impl in cube.impls:
+        model = fit_model(sizes, threads, cube.sel(metric=metric, impl=impl))
+        if model is not None:
+            models[impl] = model
+    return models
+
+
+def crossover(incumbent, challenger, threads):
+    """
+    Message size above (or below) which `challenger` has the lower latency.
+    Returns (size, 'above' | 'below'), or (None, 'always' | 'never') when
+    the lines do not cross at a positive size.
+    """
+    d0 = (challenger.latency(0, threads) - incumbent.latency(0, threads)).item()
+    d1 = (challenger.latency(1, threads) - incumbent.latency(1, threads)).item() - d0
+    if d1 == 0:
+        return None, 'always' if d0 < 0 else 'never'
+    size = -d0 / d1
+    if size <= 0:
+        return None, 'always' if d1 < 0 else 'never'
+    return size, 'above' if d1 < 0 else 'below'
+
+
+def crossover_text(size, side):
+    if size is None:
+        return side
+    return f"{side} {size_text(size)}"
+
+
+def size_text(size):
+    return f"{size / 1024:.1f} KB" if size >= 1024 else f"{size:.0f} B"
+
+
+def reliable(model, max_loo=MAX_LOO_ERROR):
+    """Whether the model predicts unseen cells well enough to place a crossover."""
+    return bool(np.isfinite(model.loo_mape) and model.loo_mape <= max_loo)
+
+
+def measured_wins(cube, incumbent, challenger, threads):
+    """
+    (sizes, wins): the sizes both implementations measured at `threads`, and
+    whether the challenger's measured latency was lower at each.
+    """
+    if threads not in cube.threads or not {incumbent, challenger} <= set(cube.impls):
+        return np.array([]), np.array([], dtype=bool)
+    lat = cube.sel(metric='Latency_us', threads=threads)
+    a, b = lat[cube.impls.index(incumbent)], lat[cube.impls.index(challenger)]
+    ok = np.isfinite(a) & np.isfinite(b)
+    return np.asarray(cube.sizes, dtype=np.float64)[ok], (b < a)[ok]
+
+
+def check_crossover(cube, incumbent, challenger, threads, size, side):
+    """
+    Measured sizes that contradict a predicted crossover: of the cells on
+    either side of `size` (every measured cell for 'always' / 'never'), those
+    whose measured winner is not the predicted one.
+    """
+    sizes, wins = measured_wins(cube, incumbent, challenger, threads)
+    if size is None:
+        checked = np.ones(sizes.shape, dtype=bool)
+        predicted = np.full(sizes.shape, side == 'always')
+    else:
+        below, above = sizes < size, sizes >= size
+        checked = np.zeros(sizes.shape, dtype=bool)
+        if below.any():
+            checked[np.flatnonzero(below)[-1]] = True
+        if above.any():
+            checked[np.flatnonzero(above)[0]] = True
+        predicted = above if side == 'above' else below
+    return sizes[checked & (wins != predicted)]
+
+
+def measured_text(cube, incumbent, challenger, threads):
+    """Where the challenger measured lower latency at `threads`."""
+    sizes, wins = measured_wins(cube, incumbent, challenger, threads)
+    if not sizes.size:
+        return 'not measured'
+    if wins.all():
+        return 'always'
+    if not wins.any():
+        return 'never'
+    return 'at ' + ', '.join(size_text(s) for s in sizes[wins])
+
+
+def crossover_report(cube, models, incumbent, challenger, threads):
+    """One thread count of a pair: the predicted crossover, or what was measured."""
+    a, b = models[incumbent], models[challenger]
+    if not (reliable(a) and reliable(b)):
+        return f"{threads}T measured {measured_text(cube, incumbent, challenger, threads)}"
+    size, side = crossover(a, b, threads)
+    text = f"{threads}T {crossover_text(size, side)}"
+    contradicted = check_crossover(cube, incumbent, challenger, threads, size, side)
+    if contradicted.size:
+        text += f" (measured disagrees at {', '.join(size_text(s) for s in contradicted)})"
+    return text
+
+
+def write_grid(models, cube, path=GRID_FILE, sizes=GRID_SIZES, threads=GRID_THREADS):
+    """
+    Predictions over a size x thread grid (Measured=1 where the sweep has the
+    cell, Extrapolated=1 outside the measured sizes / thread counts).
+    """
+    measured = np.isfinite(cube.values('Latency_us'))
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(GRID_COLUMNS)
+        for impl, model in models.items():
+            for s in sizes:
+                for n in threads:
+                    lat = model.latency(s, n).item()
+                    thr = model.throughput(s, n).item()
+                    seen = (s in cube.sizes and n in cube.threads and
+                            measured[cube.impls.index(impl), cube.sizes.index(s),
+                                     cube.threads.index(n)])
+                    writer.writerow([impl, s, n, f'{lat:.3f}', f'{thr:.5f}',
+                                     f'{thr * n:.5f}', int(seen),
+                                     int(model.extrapolated(s, n))])
+
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='MT25067 analytical cost model')
+    parser.add_argument('csv', nargs='*', default=['MT25067_ExperimentData.csv'])
+    parser.add_argument('--predict', nargs=2, type=int, action='append', default=[],
+                        metavar=('SIZE', 'THREADS'), help='predict one configuration (repeatable)')
+    parser.add_argument('--pair', nargs=2, action='append', metavar=('INCUMBENT', 'CHALLENGER'),
+                        help='crossover pair (default: A2 A3, A1 A2, A2 A4, A2 A5)')
+    parser.add_argument('--grid', nargs='?', const=GRID_FILE,
+                        help=f'write predictions over a size x thread grid (default {GRID_FILE})')
+    args = parser.parse_args()
+
+    cube = load_results(args.csv)
+    models = fit_models(cube)
+    if not models:
+        print("Not enough measured cells to fit any implementation", file=sys.stderr)
+        return 1
+
+    print("Latency_us = (alpha + alpha_c (n-1)) + (beta + beta_c (n-1)) * bytes\n")
+    print(f"{'Impl':<8} {'alpha µs':>9} {'beta ns/B':>10} {'alpha_c µs':>10} {'beta_c ns/B':>11} "
+          f"{'peak Gbps':>9} {'n1/2 B':>8} {'fit err':>8} {'LOO err':>8}")
+    for impl, m in models.items():
+        print(f"{impl:<8} {m.alpha_us:>9.3f} {1e3 * m.beta_us_per_byte:>10.4f} "
+              f"{m.alpha_contention_us:>10.3f} {1e3 * m.beta_contention_us_per_byte:>11.4f} "
+              f"{m.bandwidth_gbps():>9.2f} {m.half_size():>8.0f} "
+              f"{m.mape:>8.1%} {m.loo_mape:>8.1%}")
+
+    efficiency = [m for m in ('IPC', 'CyclesPerByte', 'LLCMissesPerKB', 'ContextSwitchesPerMessage')
+                  if cube.has_metric(m)]
+    if efficiency:
+        print("\nEfficiency (mean over the sweep):")
+        print(f"{'Impl':<8} " + ' '.join(f'{m:>25}' for m in efficiency))
+        for i, impl in enumerate(cube.impls):
+            print(f"{impl:<8} " + ' '.join(
+                f'{np.nanmean(cube.values(m)[i]):>25.4g}' for m in efficiency))
+
+    pairs = args.pair or [p for p in CROSSOVER_PAIRS if p[0] in models and p[1] in models]
+    if pairs:
+        print("\nCrossovers (challenger has lower latency):")
+        for incumbent, challenger in pairs:
+            if incumbent not in models or challenger not in models:
+                print(f"  {challenger} vs {incumbent}: not fitted")
+                continue
+            unfit = [f"{impl} {models[impl].loo_mape:.0%}" for impl in (incumbent, challenger)
+                     if not reliable(models[impl])]
+            spots = '; '.join(crossover_report(cube, models, incumbent, challenger, n)
+                              for n in sorted(set(cube.threads) | {1}))
+            if unfit:
+                print(f"  {challenger} vs {incumbent}: unreliable fit (LOO error "
+                      f"{' / '.join(unfit)} > {MAX_LOO_ERROR:.0%}), not predicted")
+                print(f"    {spots}")
+            else:
+                print(f"  {challenger} vs {incumbent}: {spots}")
+
+    for size, threads in args.predict:
+        print(f"\nPredicted at {size} B, {threads} thread(s):")
+        for impl, m in models.items():
+            flag = '  (extrapolated)' if m.extrapolated(size, threads) else ''
+            print(f"  {impl:<8} {m.latency(size, threads).item():9.3f} µs  "
+                  f"{m.throughput(size, threads).item():8.3f} Gbps per client{flag}")
+
+    if args.grid:
+        write_grid(models, cube, args.grid)
+        print(f"\nPredictions written to {args.grid}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,8 +2,16 @@
 """
 MT25067
 Part D: Plotting and Visualization
-Uses HARDCODED experimental data (as per assignment constraints)
-Generates PNG plots only.
+Loads experimental data from one or more MT25067_ExperimentData.csv sweeps
+into a columnar ResultCube (see MT25067_PartD_Results.py).
+Generates PNG plots only; the per-run throughput time series (Plot 7) go to
+MT25067_Plot7_Timeseries/, one figure per cell in throughput_series/, and
+the regression heatmaps of MT25067_PartD_Compare.py (Plot 8) to
+MT25067_Plot8_Regression/. Sweeps over a grid dimension (placement, busy
+poll, socket buffers, message layout; see MT25067_PartC_Grid.py) get one
+faceted Plot 10 per dimension that varies.
+
+Usage: python3 MT25067_PartD_Plots.py [results.csv ...]
 
 System Configuration:
 - OS: Ubuntu 22.04.5 LTS
@@ -11,15 +19,41 @@ System Configuration:
 - Date: February 6, 2026
 """
 
-import matplotlib.pyplot as plt
+import argparse
+import functools
+import glob
+import hashlib
+import inspect
+import json
+import os
+import sys
+import zlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from MT25067_PartC_Grid import DIMENSIONS, LABEL, dimension_value, parse_variant, without
+from MT25067_PartD_Latency import HistogramSet, cdf
+from MT25067_PartD_Model import (CROSSOVER_PAIRS, crossover, crossover_text, fit_model,
+                                 fit_models, reliable)
+from MT25067_PartD_Results import load_results
+from MT25067_PartD_Stats import ci_half_width
+from MT25067_PartD_Timeseries import SERIES_DIR, SeriesSet, mser_cut, steady_state
+
+# Publication-quality plot style (applied lazily, see _pyplot())
+PLOT_STYLE = 'seaborn-v0_8-darkgrid'
+PLOT_RCPARAMS = {
+    'figure.figsize': (12, 9),
+    'font.size': 11,
+    'axes.labelsize': 12,
+    'axes.titlesize': 14,
+    'legend.fontsize': 10,
+}
+PLOT_DPI = 300
 
-# Set publication-quality plot style
-plt.style.use('seaborn-v0_8-darkgrid')
-plt.rcParams['figure.figsize'] = (12, 9)
-plt.rcParams['font.size'] = 11
-plt.rcParams['axes.labelsize'] = 12
-plt.rcParams['axes.titlesize'] = 14
-plt.rcParams['legend.fontsize'] = 10
+# Manifest of content hashes for already-rendered figures
+CACHE_MANIFEST = '.MT25067_plot_cache.json'
 
 # System configuration string for plot annotations
 SYSTEM_CONFIG = """System: Ubuntu 22.04.5 LTS
@@ -29,235 +63,214 @@ Network: Localhost
 Data: Feb 6, 2026"""
 
 # =============================================================================
-# HARDCODED EXPERIMENTAL DATA
-# Data Source: MT25067_ExperimentData.csv
+# EXPERIMENTAL DATA
+# Data Source: MT25067_ExperimentData.csv (one or more sweeps)
 # =============================================================================
-# Structure: data[implementation][message_size][num_threads] = {metrics}
-# Note: 'cycles' are stored in Millions (1e6) to match plotting logic
-
-# --- DATA START ---
-data = {
-    'A1': {
-        256: {
-            1: {'throughput': 1.35, 'latency': 1.51, 'total_bytes': 1280000, 'cycles': 57.611533, 'cache_misses': 340306, 'l1_misses': 180721},
-            2: {'throughput': 1.67, 'latency': 1.23, 'total_bytes': 1280000, 'cycles': 86.368053, 'cache_misses': 69890, 'l1_misses': 192025},
-            4: {'throughput': 2.13, 'latency': 0.96, 'total_bytes': 1280000, 'cycles': 147.068045, 'cache_misses': 210172, 'l1_misses': 319146},
-            8: {'throughput': 2.43, 'latency': 0.84, 'total_bytes': 1280000, 'cycles': 285.403107, 'cache_misses': 168499, 'l1_misses': 658348},
-        },
-        1024: {
-            1: {'throughput': 2.98, 'latency': 2.75, 'total_bytes': 5120000, 'cycles': 116.827023, 'cache_misses': 85493, 'l1_misses': 307551},
-            2: {'throughput': 4.26, 'latency': 1.92, 'total_bytes': 5120000, 'cycles': 153.748252, 'cache_misses': 136064, 'l1_misses': 426639},
-            4: {'throughput': 4.37, 'latency': 1.87, 'total_bytes': 5120000, 'cycles': 353.304692, 'cache_misses': 98099, 'l1_misses': 985857},
-            8: {'throughput': 3.58, 'latency': 2.29, 'total_bytes': 5120000, 'cycles': 712.122390, 'cache_misses': 188990, 'l1_misses': 2365953},
-        },
-        4096: {
-            1: {'throughput': 10.45, 'latency': 3.13, 'total_bytes': 20480000, 'cycles': 128.215704, 'cache_misses': 80490, 'l1_misses': 523278},
-            2: {'throughput': 9.52, 'latency': 3.44, 'total_bytes': 20480000, 'cycles': 273.870669, 'cache_misses': 159785, 'l1_misses': 1100013},
-            4: {'throughput': 9.91, 'latency': 3.31, 'total_bytes': 20480000, 'cycles': 525.781881, 'cache_misses': 147943, 'l1_misses': 2110699},
-            8: {'throughput': 8.45, 'latency': 3.88, 'total_bytes': 20480000, 'cycles': 1158.825163, 'cache_misses': 318518, 'l1_misses': 6094991},
-        },
-        16384: {
-            1: {'throughput': 30.23, 'latency': 4.34, 'total_bytes': 81920000, 'cycles': 175.746499, 'cache_misses': 199269, 'l1_misses': 2513201},
-            2: {'throughput': 33.44, 'latency': 3.92, 'total_bytes': 81920000, 'cycles': 309.458403, 'cache_misses': 781304, 'l1_misses': 4648122},
-            4: {'throughput': 33.34, 'latency': 3.93, 'total_bytes': 81920000, 'cycles': 655.119355, 'cache_misses': 286684, 'l1_misses': 9497289},
-            8: {'throughput': 31.94, 'latency': 4.10, 'total_bytes': 81920000, 'cycles': 1315.622332, 'cache_misses': 871905, 'l1_misses': 20386406},
-        },
-    },
-    'A2': {
-        256: {
-            1: {'throughput': 1.31, 'latency': 1.56, 'total_bytes': 1280000, 'cycles': 67.137710, 'cache_misses': 60051, 'l1_misses': 119992},
-            2: {'throughput': 1.88, 'latency': 1.09, 'total_bytes': 1280000, 'cycles': 113.789584, 'cache_misses': 62466, 'l1_misses': 237242},
-            4: {'throughput': 1.84, 'latency': 1.11, 'total_bytes': 1280000, 'cycles': 178.447407, 'cache_misses': 413252, 'l1_misses': 391251},
-            8: {'throughput': 1.81, 'latency': 1.13, 'total_bytes': 1280000, 'cycles': 364.125717, 'cache_misses': 162576, 'l1_misses': 773582},
-        },
-        1024: {
-            1: {'throughput': 3.99, 'latency': 2.05, 'total_bytes': 5120000, 'cycles': 82.736829, 'cache_misses': 367536, 'l1_misses': 237910},
-            2: {'throughput': 3.22, 'latency': 2.55, 'total_bytes': 5120000, 'cycles': 183.701345, 'cache_misses': 65821, 'l1_misses': 520070},
-            4: {'throughput': 3.96, 'latency': 2.07, 'total_bytes': 5120000, 'cycles': 366.350476, 'cache_misses': 145928, 'l1_misses': 1025830},
-            8: {'throughput': 3.08, 'latency': 2.66, 'total_bytes': 5120000, 'cycles': 794.646097, 'cache_misses': 218243, 'l1_misses': 2569589},
-        },
-        4096: {
-            1: {'throughput': 9.65, 'latency': 3.39, 'total_bytes': 20480000, 'cycles': 135.747322, 'cache_misses': 259867, 'l1_misses': 536715},
-            2: {'throughput': 8.14, 'latency': 4.03, 'total_bytes': 20480000, 'cycles': 297.524319, 'cache_misses': 154883, 'l1_misses': 1152800},
-            4: {'throughput': 8.95, 'latency': 3.66, 'total_bytes': 20480000, 'cycles': 577.519490, 'cache_misses': 161508, 'l1_misses': 2471170},
-            8: {'throughput': 7.04, 'latency': 4.65, 'total_bytes': 20480000, 'cycles': 1305.706294, 'cache_misses': 469137, 'l1_misses': 6760988},
-        },
-        16384: {
-            1: {'throughput': 31.85, 'latency': 4.12, 'total_bytes': 81920000, 'cycles': 159.875443, 'cache_misses': 829295, 'l1_misses': 2369198},
-            2: {'throughput': 27.83, 'latency': 4.71, 'total_bytes': 81920000, 'cycles': 365.550165, 'cache_misses': 174552, 'l1_misses': 5020981},
-            4: {'throughput': 23.26, 'latency': 5.64, 'total_bytes': 81920000, 'cycles': 764.280684, 'cache_misses': 147239, 'l1_misses': 10725239},
-            8: {'throughput': 25.35, 'latency': 5.17, 'total_bytes': 81920000, 'cycles': 1682.051140, 'cache_misses': 520076, 'l1_misses': 23141904},
-        },
-    },
-    'A3': {
-        256: {
-            1: {'throughput': 0.61, 'latency': 3.35, 'total_bytes': 1280000, 'cycles': 275.906484, 'cache_misses': 92969, 'l1_misses': 233140},
-            2: {'throughput': 0.72, 'latency': 2.84, 'total_bytes': 1280000, 'cycles': 403.716202, 'cache_misses': 237522, 'l1_misses': 686090},
-            4: {'throughput': 0.86, 'latency': 2.38, 'total_bytes': 1280000, 'cycles': 496.320886, 'cache_misses': 127017, 'l1_misses': 1773010},
-            8: {'throughput': 0.54, 'latency': 3.77, 'total_bytes': 1280000, 'cycles': 1631.574085, 'cache_misses': 394502, 'l1_misses': 6002859},
-        },
-        1024: {
-            1: {'throughput': 2.38, 'latency': 3.44, 'total_bytes': 5120000, 'cycles': 311.283216, 'cache_misses': 228203, 'l1_misses': 428987},
-            2: {'throughput': 2.55, 'latency': 3.21, 'total_bytes': 5120000, 'cycles': 363.551702, 'cache_misses': 163698, 'l1_misses': 1478164},
-            4: {'throughput': 2.98, 'latency': 2.75, 'total_bytes': 5120000, 'cycles': 849.382398, 'cache_misses': 168416, 'l1_misses': 2083929},
-            8: {'throughput': 2.29, 'latency': 3.58, 'total_bytes': 5120000, 'cycles': 2148.750000, 'cache_misses': 527819, 'l1_misses': 6487124},
-        },
-        4096: {
-            1: {'throughput': 6.00, 'latency': 5.46, 'total_bytes': 20480000, 'cycles': 390.806322, 'cache_misses': 252125, 'l1_misses': 714221},
-            2: {'throughput': 6.83, 'latency': 4.80, 'total_bytes': 20480000, 'cycles': 762.318916, 'cache_misses': 1238875, 'l1_misses': 1740911},
-            4: {'throughput': 6.75, 'latency': 4.86, 'total_bytes': 20480000, 'cycles': 991.037715, 'cache_misses': 481666, 'l1_misses': 3786128},
-            8: {'throughput': 5.25, 'latency': 6.25, 'total_bytes': 20480000, 'cycles': 3078.580000, 'cache_misses': 367014, 'l1_misses': 9439266},
-        },
-        16384: {
-            1: {'throughput': 21.88, 'latency': 5.99, 'total_bytes': 81920000, 'cycles': 281.083876, 'cache_misses': 189835, 'l1_misses': 3223257},
-            2: {'throughput': 19.37, 'latency': 6.77, 'total_bytes': 81920000, 'cycles': 719.137500, 'cache_misses': 205013, 'l1_misses': 5605023},
-            4: {'throughput': 22.12, 'latency': 5.93, 'total_bytes': 81920000, 'cycles': 1037.526424, 'cache_misses': 648181, 'l1_misses': 12981869},
-            8: {'throughput': 16.46, 'latency': 7.96, 'total_bytes': 81920000, 'cycles': 2805.570000, 'cache_misses': 635733, 'l1_misses': 27453971},
-        },
-    },
-}
-# --- DATA END ---
+# Loaded into a ResultCube: cube.sel(metric=..., impl=..., size=..., threads=...)
+# returns a NumPy array over the remaining (impl, size, threads) axes.
+
+DEFAULT_CSV = 'MT25067_ExperimentData.csv'
+# Per-run time-series figures (one per cell, too many for the top level)
+TIMESERIES_DIR = 'MT25067_Plot7_Timeseries'
+# Baseline vs candidate delta heatmaps (MT25067_PartD_Compare.py)
+REGRESSION_DIR = 'MT25067_Plot8_Regression'
 
-# Experimental parameters
-MESSAGE_SIZES = [256, 1024, 4096, 16384]
-THREAD_COUNTS = [1, 2, 4, 8]
-IMPLEMENTATIONS = ['A1', 'A2', 'A3']
+# Per-implementation series styling
+IMPL_COLORS = {'A1': 'blue', 'A2': 'orange', 'A3': 'green', 'A4': 'red', 'A5': 'purple',
+               'A1E': 'navy', 'A2E': 'saddlebrown', 'A3E': 'darkgreen', 'A5E': 'indigo'}
+IMPL_MARKERS = {'A1': 'o', 'A2': 's', 'A3': '^', 'A4': 'X', 'A5': '*',
+                'A1E': 'D', 'A2E': 'P', 'A3E': 'v', 'A5E': 'h'}
+IMPL_LABELS = {'A1': 'A1 (Two-Copy)', 'A2': 'A2 (One-Copy)', 'A3': 'A3 (Zero-Copy)',
+               'A4': 'A4 (io_uring)', 'A5': 'A5 (sendfile/splice)',
+               'A1E': 'A1E (Two-Copy, epoll)', 'A2E': 'A2E (One-Copy, epoll)',
+               'A3E': 'A3E (Zero-Copy, epoll)', 'A5E': 'A5E (sendfile, epoll)'}
+# Message-layout variants from the orchestrator (--arena / --fields):
+# "A2PF32" = A2 with arena-pooled messages (P) of 32 fields (F32). They
+# share their base series' color and marker and differ in line style.
+VARIANT_LINESTYLES = [':', '-.', (0, (5, 2)), (0, (3, 1, 1, 1))]
+# Placement variants ("A2+spread+bp50"): thinner, dash pattern per suffix
+PLACEMENT_LINESTYLES = [(0, (1, 1)), (0, (6, 2)), (0, (3, 1, 1, 1, 1, 1)),
+                        (0, (8, 2, 2, 2)), (0, (2, 3)), (0, (4, 1, 1, 1))]
+# Plot 10 rows (the metrics a placement change should move)
+FACET_METRICS = ['Throughput_Gbps', 'LLCMissesPerKB']
+FACET_MARKERS = ['o', 's', 'D', '^', 'v', 'P', 'X', '*']
 
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
+_plt = None
+
+def _pyplot():
+    """
+    Import matplotlib on first use with the headless Agg backend and the
+    report style applied. Runs inside each render worker, so a run where
+    every figure is cached never imports matplotlib at all.
+    """
+    global _plt
+    if _plt is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        plt.style.use(PLOT_STYLE)
+        plt.rcParams.update(PLOT_RCPARAMS)
+        _plt = plt
+    return _plt
+
 def add_footer(fig):
     """Adds a standard footer with system configuration to the figure."""
     # Reserve space at the bottom (left, bottom, right, top)
     fig.subplots_adjust(bottom=0.15)
-    
+
     # Add text in the reserved space
-    fig.text(0.5, 0.04, SYSTEM_CONFIG, 
-             ha='center', va='center', fontsize=10, 
+    fig.text(0.5, 0.04, SYSTEM_CONFIG,
+             ha='center', va='center', fontsize=10,
              bbox=dict(facecolor='#f0f0f0', edgecolor='gray', boxstyle='round,pad=0.5', alpha=0.8))
-    
+
+def series_style(impl, short_label=False):
+    """Line style kwargs for one implementation series."""
+    base, variant = impl, None
+    if impl not in IMPL_COLORS:
+        try:
+            variant = parse_variant(impl)
+            base = variant.base + ('E' if variant.epoll else '')
+        except ValueError:
+            pass
+    style = dict(marker=IMPL_MARKERS.get(base, 'x'),
+                 color=IMPL_COLORS.get(base, 'gray'),
+                 linewidth=2, markersize=8,
+                 label=impl if short_label else IMPL_LABELS.get(impl, impl))
+    if base != impl:
+        arena, fields = variant.arena, variant.fields
+        extras = ((['arena'] if arena else []) + ([f'{fields} fields'] if fields else [])
+                  + [dimension_value(variant, dim) for dim in ('pin', 'busy_poll', 'sock_buf')
+                     if getattr(variant, dim)])
+        if not short_label:
+            style['label'] = f"{IMPL_LABELS.get(base, base)} [{', '.join(extras)}]"
+        if arena or fields:
+            style['linestyle'] = ('--' if not fields else
+                                  VARIANT_LINESTYLES[fields.bit_length() % len(VARIANT_LINESTYLES)])
+        if arena and fields:
+            style['markerfacecolor'] = 'none'
+        if variant.placement:
+            key = zlib.crc32(variant.placement.encode())
+            style['linestyle'] = PLACEMENT_LINESTYLES[key % len(PLACEMENT_LINESTYLES)]
+            style['linewidth'] = 1.5
+    return style
+
+def set_thread_axis(ax, threads):
+    """Thread/connection x axis; log2 scale once the sweep spans 1 to thousands."""
+    if threads[-1] / threads[0] > 16:
+        ax.set_xscale('log', base=2)
+    ax.set_xticks(threads)
+    ax.set_xticklabels([str(t) for t in threads])
+
+def ci_band(ax, x, mean, half, color):
+    """Shaded 95% confidence band around a series (cells with < 2 trials get none)."""
+    ok = np.isfinite(mean) & np.isfinite(half)
+    if ok.any():
+        x = np.asarray(x)
+        ax.fill_between(x[ok], (mean - half)[ok], (mean + half)[ok],
+                        color=color, alpha=0.2, linewidth=0)
+
+def save_figure(fig, filename):
+    """Footer, layout and PNG export shared by every figure."""
+    plt = _pyplot()
+    add_footer(fig)
+    fig.tight_layout(rect=[0, 0.08, 1, 0.96])
+    fig.savefig(filename, dpi=PLOT_DPI, bbox_inches='tight')
+    plt.close(fig)
+
 # =============================================================================
 # PLOTTING FUNCTIONS
 # =============================================================================
 
-def plot_throughput_vs_message_size():
+def plot_throughput_vs_message_size(cube, output='MT25067_Plot1_Throughput_vs_MessageSize.png'):
     """Plot 1: Throughput vs Message Size for different thread counts"""
+    plt = _pyplot()
     fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-    fig.suptitle('Throughput vs Message Size\n(Different Thread Counts)', 
+    fig.suptitle('Throughput vs Message Size\n(Different Thread Counts)',
                  fontsize=16, fontweight='bold')
-    
-    colors = {'A1': 'blue', 'A2': 'orange', 'A3': 'green'}
-    markers = {'A1': 'o', 'A2': 's', 'A3': '^'}
-    labels = {'A1': 'A1 (Two-Copy)', 'A2': 'A2 (One-Copy)', 'A3': 'A3 (Zero-Copy)'}
-    
-    for idx, threads in enumerate(THREAD_COUNTS):
+
+    sizes = cube.sizes
+    for idx, threads in enumerate(cube.threads[:4]):
         ax = axes[idx // 2, idx % 2]
-        
-        for impl in IMPLEMENTATIONS:
-            throughputs = [data[impl][size][threads]['throughput'] 
-                          for size in MESSAGE_SIZES]
-            
-            ax.plot(MESSAGE_SIZES, throughputs, 
-                   marker=markers[impl], 
-                   color=colors[impl],
-                   linewidth=2, markersize=8, 
-                   label=labels[impl])
-            
+        # (impl, size) slice for this thread count
+        throughput = cube.sel(metric='Throughput_Gbps', threads=threads)
+        ci = cube.sel(field='ci95', metric='Throughput_Gbps', threads=threads)
+
+        for impl, row, half in zip(cube.impls, throughput, ci):
+            style = series_style(impl)
+            ax.plot(sizes, row, **style)
+            ci_band(ax, sizes, row, half, style['color'])
+
             # Add value annotations
-            for size, thr in zip(MESSAGE_SIZES, throughputs):
-                ax.annotate(f'{thr:.1f}', (size, thr),  # Changed to 1 decimal for Gbps
-                           textcoords="offset points", xytext=(0,5), 
+            for size, thr in zip(sizes, row):
+                ax.annotate(f'{thr:.1f}', (size, thr),
+                           textcoords="offset points", xytext=(0,5),
                            ha='center', fontsize=8)
-        
+
         ax.set_xlabel('Message Size (bytes)', fontweight='bold')
-        ax.set_ylabel('Throughput (Gbps)', fontweight='bold') # <--- FIXED HERE
+        ax.set_ylabel('Throughput (Gbps)', fontweight='bold')
         ax.set_title(f'{threads} Thread(s)', fontweight='bold')
         ax.set_xscale('log', base=2)
         ax.grid(True, alpha=0.3)
         ax.legend()
-    
-    add_footer(fig)
 
-    plt.tight_layout(rect=[0, 0.08, 1, 0.96])
-    plt.savefig('MT25067_Plot1_Throughput_vs_MessageSize.png', dpi=300, bbox_inches='tight')
-    print("✓ Saved: MT25067_Plot1_Throughput_vs_MessageSize.png")
-    plt.close()
+    save_figure(fig, output)
 
-def plot_latency_vs_thread_count():
+def plot_latency_vs_thread_count(cube, output='MT25067_Plot2_Latency_vs_ThreadCount.png'):
     """Plot 2: Latency vs Thread Count for different message sizes"""
+    plt = _pyplot()
     fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-    fig.suptitle('Latency vs Thread Count\n(Different Message Sizes)', 
+    fig.suptitle('Latency vs Thread Count\n(Different Message Sizes)',
                  fontsize=16, fontweight='bold')
-    
-    colors = {'A1': 'blue', 'A2': 'orange', 'A3': 'green'}
-    markers = {'A1': 'o', 'A2': 's', 'A3': '^'}
-    labels = {'A1': 'A1 (Two-Copy)', 'A2': 'A2 (One-Copy)', 'A3': 'A3 (Zero-Copy)'}
-    
-    for idx, msg_size in enumerate(MESSAGE_SIZES):
+
+    threads = cube.threads
+    for idx, msg_size in enumerate(cube.sizes[:4]):
         ax = axes[idx // 2, idx % 2]
-        
-        for impl in IMPLEMENTATIONS:
-            latencies = [data[impl][msg_size][t]['latency'] 
-                        for t in THREAD_COUNTS]
-            
-            ax.plot(THREAD_COUNTS, latencies, 
-                   marker=markers[impl],
-                   color=colors[impl],
-                   linewidth=2, markersize=8, 
-                   label=labels[impl])
-        
+        latency = cube.sel(metric='Latency_us', size=msg_size)
+        ci = cube.sel(field='ci95', metric='Latency_us', size=msg_size)
+
+        for impl, row, half in zip(cube.impls, latency, ci):
+            style = series_style(impl)
+            ax.plot(threads, row, **style)
+            ci_band(ax, threads, row, half, style['color'])
+
         ax.set_xlabel('Number of Threads', fontweight='bold')
         ax.set_ylabel('Average Latency (µs)', fontweight='bold')
         ax.set_title(f'Message Size: {msg_size} bytes', fontweight='bold')
-        ax.set_xticks(THREAD_COUNTS)
+        set_thread_axis(ax, threads)
         ax.grid(True, alpha=0.3)
         ax.legend()
-        
-    add_footer(fig)
-    plt.tight_layout(rect=[0, 0.08, 1, 0.96])
-    plt.savefig('MT25067_Plot2_Latency_vs_ThreadCount.png', dpi=300, bbox_inches='tight')
-    print("✓ Saved: MT25067_Plot2_Latency_vs_ThreadCount.png")
-    plt.close()
 
-def plot_cache_misses_vs_message_size():
-    """Plot 3: Cache Misses (LLC and L1) vs Message Size for 1 thread"""
+    save_figure(fig, output)
+
+def plot_cache_misses_vs_message_size(cube, output='MT25067_Plot3_CacheMisses_vs_MessageSize.png'):
+    """Plot 3: Cache Misses (LLC and L1) vs Message Size at the lowest thread count"""
+    plt = _pyplot()
+    threads = min(cube.threads)
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
-    fig.suptitle('Cache Misses vs Message Size (1 Thread)', 
+    fig.suptitle(f"Cache Misses vs Message Size ({threads} Thread{'s' if threads > 1 else ''})",
                  fontsize=16, fontweight='bold')
-    
-    colors = {'A1': 'blue', 'A2': 'orange', 'A3': 'green'}
-    markers = {'A1': 'o', 'A2': 's', 'A3': '^'}
-    labels = {'A1': 'A1 (Two-Copy)', 'A2': 'A2 (One-Copy)', 'A3': 'A3 (Zero-Copy)'}
-    threads = 1
-    
+
+    sizes = cube.sizes
+
     # LLC Cache Misses
-    for impl in IMPLEMENTATIONS:
-        cache_misses = [data[impl][size][threads]['cache_misses'] 
-                       for size in MESSAGE_SIZES]
-        ax1.plot(MESSAGE_SIZES, cache_misses, 
-                marker=markers[impl],
-                color=colors[impl],
-                linewidth=2, markersize=8, 
-                label=labels[impl])
-    
+    for impl, row in zip(cube.impls, cube.sel(metric='LLC_Misses', threads=threads)):
+        ax1.plot(sizes, row, **series_style(impl))
+
     ax1.set_xlabel('Message Size (bytes)', fontweight='bold')
     ax1.set_ylabel('LLC Cache Misses', fontweight='bold')
     ax1.set_title('Last Level Cache Misses', fontweight='bold')
     ax1.set_xscale('log', base=2)
     ax1.grid(True, alpha=0.3)
     ax1.legend()
-    
+
     # L1 Cache Misses
-    for impl in IMPLEMENTATIONS:
-        l1_misses = [data[impl][size][threads]['l1_misses'] 
-                    for size in MESSAGE_SIZES]
-        ax2.plot(MESSAGE_SIZES, l1_misses, 
-                marker=markers[impl],
-                color=colors[impl],
-                linewidth=2, markersize=8, 
-                label=labels[impl])
-    
+    for impl, row in zip(cube.impls, cube.sel(metric='L1_Misses', threads=threads)):
+        ax2.plot(sizes, row, **series_style(impl))
+
     ax2.set_xlabel('Message Size (bytes)', fontweight='bold')
     ax2.set_ylabel('L1 D-Cache Misses', fontweight='bold')
     ax2.set_title('L1 Data Cache Misses', fontweight='bold')
@@ -265,150 +278,642 @@ def plot_cache_misses_vs_message_size():
     ax2.grid(True, alpha=0.3)
     ax2.legend()
 
-    add_footer(fig)
-    plt.tight_layout(rect=[0, 0.08, 1, 0.96])
-    plt.savefig('MT25067_Plot3_CacheMisses_vs_MessageSize.png', dpi=300, bbox_inches='tight')
-    print("✓ Saved: MT25067_Plot3_CacheMisses_vs_MessageSize.png")
-    plt.close()
+    save_figure(fig, output)
 
-def plot_cpu_cycles_per_byte():
+def plot_cpu_cycles_per_byte(cube, output='MT25067_Plot4_CPUCycles_per_Byte.png'):
     """Plot 4: CPU Cycles per Byte Transferred for different thread counts"""
+    plt = _pyplot()
     fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-    fig.suptitle('CPU Cycles per Byte Transferred\n(Different Thread Counts)', 
+    fig.suptitle('CPU Cycles per Byte Transferred\n(Different Thread Counts)',
                  fontsize=16, fontweight='bold')
-    
-    colors = {'A1': 'blue', 'A2': 'orange', 'A3': 'green'}
-    markers = {'A1': 'o', 'A2': 's', 'A3': '^'}
-    labels = {'A1': 'A1 (Two-Copy)', 'A2': 'A2 (One-Copy)', 'A3': 'A3 (Zero-Copy)'}
-    
-    for idx, threads in enumerate(THREAD_COUNTS):
+
+    sizes = cube.sizes
+    for idx, threads in enumerate(cube.threads[:4]):
         ax = axes[idx // 2, idx % 2]
-        
-        for impl in IMPLEMENTATIONS:
-            cpb = []
-            for size in MESSAGE_SIZES:
-                d = data[impl][size][threads]
-                cycles = d['cycles'] * 1e6  # Convert back to actual cycles
-                total_bytes = d['total_bytes']
-                cpb.append(cycles / total_bytes if total_bytes > 0 else 0)
-            
-            ax.plot(MESSAGE_SIZES, cpb, 
-                   marker=markers[impl], 
-                   color=colors[impl],
-                   linewidth=2, markersize=8, 
-                   label=labels[impl])
-        
+        # CyclesPerByte is derived vectorially by the loader (cycles / bytes)
+        cpb = cube.sel(metric='CyclesPerByte', threads=threads)
+
+        for impl, row in zip(cube.impls, cpb):
+            ax.plot(sizes, row, **series_style(impl))
+
         ax.set_xlabel('Message Size (bytes)', fontweight='bold')
         ax.set_ylabel('CPU Cycles per Byte', fontweight='bold')
         ax.set_title(f'{threads} Thread(s)', fontweight='bold')
         ax.set_xscale('log', base=2)
         ax.grid(True, alpha=0.3)
         ax.legend()
-    
-    add_footer(fig)
-    plt.tight_layout(rect=[0, 0.08, 1, 0.96])
-    plt.savefig('MT25067_Plot4_CPUCycles_per_Byte.png', dpi=300, bbox_inches='tight')
-    print("✓ Saved: MT25067_Plot4_CPUCycles_per_Byte.png")
-    plt.close()
 
-def plot_overall_comparison():
+    save_figure(fig, output)
+
+def plot_efficiency_vs_message_size(cube, output='MT25067_Plot4b_Efficiency_vs_MessageSize.png'):
+    """Plot 4b: IPC, cycles/byte, LLC misses/KB and context switches/message (fewest threads)"""
+    plt = _pyplot()
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+    threads = cube.threads[0]
+    fig.suptitle(f'Efficiency vs Message Size ({threads} Thread(s))\n'
+                 '(from Instructions, CPU_Cycles, LLC_Misses and ContextSwitches)',
+                 fontsize=16, fontweight='bold')
+
+    sizes = cube.sizes
+    panels = [
+        (ax1, 'IPC', 'Instructions per Cycle', 'IPC', False),
+        (ax2, 'CyclesPerByte', 'CPU Cycles per Byte', 'Cycles per Byte', True),
+        (ax3, 'LLCMissesPerKB', 'LLC Misses per KB', 'LLC Misses per KB Sent', True),
+        (ax4, 'ContextSwitchesPerMessage', 'Context Switches per Message',
+         'Context Switches per Message', True),
+    ]
+    for ax, metric, ylabel, title, log in panels:
+        vals = cube.sel(metric=metric, threads=threads)
+        for impl, row in zip(cube.impls, vals):
+            ax.plot(sizes, row, **series_style(impl))
+        ax.set_xlabel('Message Size (bytes)', fontweight='bold')
+        ax.set_ylabel(ylabel, fontweight='bold')
+        ax.set_title(title, fontweight='bold')
+        ax.set_xscale('log', base=2)
+        # Not without perf counters (a --no-perf sweep has no positive values)
+        if log and (vals[np.isfinite(vals)] > 0).any():
+            ax.set_yscale('log')
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+
+    save_figure(fig, output)
+
+def plot_overall_comparison(cube, output='MT25067_Plot5_Overall_Comparison.png'):
     """Plot 5: Overall Comparison for largest message size (16KB)"""
+    plt = _pyplot()
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
-    msg_size = 16384
-    
-    fig.suptitle(f'Comprehensive Comparison - {msg_size}B Messages\nAll Metrics vs Thread Count', 
+    msg_size = 16384 if 16384 in cube.sizes else cube.sizes[-1]
+
+    fig.suptitle(f'Comprehensive Comparison - {msg_size}B Messages\nAll Metrics vs Thread Count',
                  fontsize=16, fontweight='bold')
-    
-    colors = {'A1': 'blue', 'A2': 'orange', 'A3': 'green'}
-    markers = {'A1': 'o', 'A2': 's', 'A3': '^'}
-    
-    # Throughput
-    for impl in IMPLEMENTATIONS:
-        vals = [data[impl][msg_size][t]['throughput'] for t in THREAD_COUNTS]
-        ax1.plot(THREAD_COUNTS, vals, marker=markers[impl], color=colors[impl],
-                linewidth=2, markersize=8, label=impl)
-    ax1.set_xlabel('Threads', fontweight='bold')
-    ax1.set_ylabel('Throughput (Gbps)', fontweight='bold') # <--- FIXED HERE
-    ax1.set_title('Throughput', fontweight='bold')
-    ax1.legend()
-    ax1.grid(True, alpha=0.3)
-    ax1.set_xticks(THREAD_COUNTS)
-    
-    # Latency
-    for impl in IMPLEMENTATIONS:
-        vals = [data[impl][msg_size][t]['latency'] for t in THREAD_COUNTS]
-        ax2.plot(THREAD_COUNTS, vals, marker=markers[impl], color=colors[impl],
-                linewidth=2, markersize=8, label=impl)
-    ax2.set_xlabel('Threads', fontweight='bold')
-    ax2.set_ylabel('Latency (µs)', fontweight='bold')
-    ax2.set_title('Latency', fontweight='bold')
-    ax2.legend()
-    ax2.grid(True, alpha=0.3)
-    ax2.set_xticks(THREAD_COUNTS)
-    
-    # CPU Cycles
-    for impl in IMPLEMENTATIONS:
-        vals = [data[impl][msg_size][t]['cycles'] for t in THREAD_COUNTS]
-        ax3.plot(THREAD_COUNTS, vals, marker=markers[impl], color=colors[impl],
-                linewidth=2, markersize=8, label=impl)
-    ax3.set_xlabel('Threads', fontweight='bold')
-    ax3.set_ylabel('CPU Cycles (Millions)', fontweight='bold')
-    ax3.set_title('CPU Cycles', fontweight='bold')
-    ax3.legend()
-    ax3.grid(True, alpha=0.3)
-    ax3.set_xticks(THREAD_COUNTS)
-    
-    # Cache Misses
-    for impl in IMPLEMENTATIONS:
-        vals = [data[impl][msg_size][t]['cache_misses'] for t in THREAD_COUNTS]
-        ax4.plot(THREAD_COUNTS, vals, marker=markers[impl], color=colors[impl],
-                linewidth=2, markersize=8, label=impl)
-    ax4.set_xlabel('Threads', fontweight='bold')
-    ax4.set_ylabel('Cache Misses', fontweight='bold')
-    ax4.set_title('LLC Cache Misses', fontweight='bold')
-    ax4.legend()
-    ax4.grid(True, alpha=0.3)
-    ax4.set_xticks(THREAD_COUNTS)
-    
-    add_footer(fig)
-    plt.tight_layout(rect=[0, 0.08, 1, 0.96])
-    plt.savefig('MT25067_Plot5_Overall_Comparison.png', dpi=300, bbox_inches='tight')
-    print("✓ Saved: MT25067_Plot5_Overall_Comparison.png")
-    plt.close()
+
+    threads = cube.threads
+    panels = [
+        (ax1, 'Throughput_Gbps', 1.0, 'Throughput (Gbps)', 'Throughput'),
+        (ax2, 'Latency_us', 1.0, 'Latency (µs)', 'Latency'),
+        (ax3, 'CPU_Cycles', 1e-6, 'CPU Cycles (Millions)', 'CPU Cycles'),
+        (ax4, 'LLC_Misses', 1.0, 'Cache Misses', 'LLC Cache Misses'),
+    ]
+
+    for ax, metric, scale, ylabel, title in panels:
+        # (impl, threads) slice at the chosen message size
+        vals = cube.sel(metric=metric, size=msg_size) * scale
+        ci = cube.sel(field='ci95', metric=metric, size=msg_size) * scale
+        for impl, row, half in zip(cube.impls, vals, ci):
+            style = series_style(impl, short_label=True)
+            ax.plot(threads, row, **style)
+            ci_band(ax, threads, row, half, style['color'])
+        ax.set_xlabel('Threads', fontweight='bold')
+        ax.set_ylabel(ylabel, fontweight='bold')
+        ax.set_title(title, fontweight='bold')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        set_thread_axis(ax, threads)
+
+    save_figure(fig, output)
+
+def plot_latency_cdf(hset, output='MT25067_Plot2b_Latency_CDF.png'):
+    """Plot 2b: Per-message latency CDF for each message size"""
+    plt = _pyplot()
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('Per-Message Latency CDF\n(solid: 1 thread, dashed: most threads)',
+                 fontsize=16, fontweight='bold')
+
+    keys = hset.keys()
+    impls = sorted({k[0] for k in keys})
+    sizes = sorted({k[1] for k in keys})
+    threads = sorted({k[2] for k in keys})
+    shown = list(dict.fromkeys((threads[0], threads[-1])))
+
+    for idx, msg_size in enumerate(sizes[:4]):
+        ax = axes[idx // 2, idx % 2]
+        for impl in impls:
+            for t, linestyle in zip(shown, ('-', '--')):
+                hist = hset.cells.get((impl, msg_size, t))
+                if hist is None:
+                    continue
+                x, y = cdf(hist)
+                style = series_style(impl)
+                ax.step(x, y, where='post', color=style['color'], linestyle=linestyle,
+                        linewidth=1.5, label=f"{style['label']}, {t}T")
+
+        ax.set_xlabel('Per-Message Latency (µs)', fontweight='bold')
+        ax.set_ylabel('Cumulative Fraction', fontweight='bold')
+        ax.set_title(f'Message Size: {msg_size} bytes', fontweight='bold')
+        ax.set_xscale('log')
+        ax.set_ylim(0, 1.01)
+        ax.grid(True, alpha=0.3)
+        ax.legend(fontsize=8)
+
+    save_figure(fig, output)
+
+def plot_tail_latency_vs_thread_count(cube, output='MT25067_Plot2c_TailLatency_vs_ThreadCount.png'):
+    """Plot 2c: p50 / p99 / p99.9 latency vs Thread Count for different message sizes"""
+    plt = _pyplot()
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('Tail Latency vs Thread Count\n(dotted: p50, solid: p99, dashed: p99.9)',
+                 fontsize=16, fontweight='bold')
+
+    threads = cube.threads
+    percentiles = [('Latency_p50_us', ':', 'p50'),
+                   ('Latency_p99_us', '-', 'p99'),
+                   ('Latency_p999_us', '--', 'p99.9')]
+    for idx, msg_size in enumerate(cube.sizes[:4]):
+        ax = axes[idx // 2, idx % 2]
+        for metric, linestyle, name in percentiles:
+            vals = cube.sel(metric=metric, size=msg_size)
+            for impl, row in zip(cube.impls, vals):
+                style = series_style(impl, short_label=True)
+                style.update(linestyle=linestyle, label=f"{impl} {name}")
+                ax.plot(threads, row, **style)
+
+        ax.set_xlabel('Number of Threads', fontweight='bold')
+        ax.set_ylabel('Per-Message Latency (µs)', fontweight='bold')
+        ax.set_title(f'Message Size: {msg_size} bytes', fontweight='bold')
+        set_thread_axis(ax, threads)
+        ax.set_yscale('log')
+        ax.grid(True, alpha=0.3)
+        ax.legend(fontsize=8, ncol=3)
+
+    save_figure(fig, output)
+
+def plot_aggregate_scaling(cube, output='MT25067_Plot6_Aggregate_Scaling.png'):
+    """Plot 6: Aggregate throughput of all clients vs Thread Count (with ideal scaling)"""
+    plt = _pyplot()
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('Aggregate Throughput Scaling (All Clients)\n(dotted: ideal linear scaling from 1 thread)',
+                 fontsize=16, fontweight='bold')
+
+    threads = cube.threads
+    for idx, msg_size in enumerate(cube.sizes[:4]):
+        ax = axes[idx // 2, idx % 2]
+        agg = cube.sel(metric='AggThroughput_Gbps', size=msg_size)
+        lo = cube.sel(metric='MinClient_Gbps', size=msg_size)
+        hi = cube.sel(metric='MaxClient_Gbps', size=msg_size)
+
+        for impl, row, row_lo, row_hi in zip(cube.impls, agg, lo, hi):
+            style = series_style(impl)
+            ax.plot(threads, row, **style)
+            # Ideal: the 1-thread throughput multiplied by the thread count
+            ax.plot(threads, row[0] * np.asarray(threads) / threads[0],
+                    color=style['color'], linestyle=':', linewidth=1)
+            # Per-client spread, scaled to "if every client ran at this rate"
+            ax.fill_between(threads, row_lo * np.asarray(threads), row_hi * np.asarray(threads),
+                            color=style['color'], alpha=0.12)
+
+        ax.set_xlabel('Number of Threads (Clients)', fontweight='bold')
+        ax.set_ylabel('Aggregate Throughput (Gbps)', fontweight='bold')
+        ax.set_title(f'Message Size: {msg_size} bytes', fontweight='bold')
+        set_thread_axis(ax, threads)
+        if threads[-1] / threads[0] > 16:
+            # Ideal scaling to thousands of connections dwarfs the measurements
+            ax.set_yscale('log')
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+
+    save_figure(fig, output)
+
+def plot_fairness_vs_thread_count(cube, output='MT25067_Plot6b_Fairness_vs_ThreadCount.png'):
+    """Plot 6b: Jain's fairness index across clients vs Thread Count"""
+    plt = _pyplot()
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle("Per-Client Fairness (Jain's Index)\n(1.0 = every client got the same throughput)",
+                 fontsize=16, fontweight='bold')
+
+    threads = cube.threads
+    for idx, msg_size in enumerate(cube.sizes[:4]):
+        ax = axes[idx // 2, idx % 2]
+        for impl, row in zip(cube.impls, cube.sel(metric='JainFairness', size=msg_size)):
+            ax.plot(threads, row, **series_style(impl))
+
+        ax.set_xlabel('Number of Threads (Clients)', fontweight='bold')
+        ax.set_ylabel("Jain's Fairness Index", fontweight='bold')
+        ax.set_title(f'Message Size: {msg_size} bytes', fontweight='bold')
+        set_thread_axis(ax, threads)
+        ax.set_ylim(0, 1.05)
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+
+    save_figure(fig, output)
+
+def plot_throughput_timeseries(sset, output):
+    """Plot 7: Throughput per sampling interval of one run, warm-up shaded"""
+    plt = _pyplot()
+    key = sset.keys()[0]
+    impl, msg_size, threads, trial = key
+    client = sset.series(key)
+    server = sset.series(key, 'server')
+    stats = steady_state(client)
+
+    fig, (ax, ax_msgs) = plt.subplots(2, 1, figsize=(14, 10), sharex=True,
+                                      gridspec_kw=dict(height_ratios=[3, 1]))
+    verdict = ('no data' if stats is None else
+               f"{'stable' if stats['Stable'] else 'NOT stable'} after warm-up: "
+               f"{stats['SteadyThroughput_Gbps']:.2f} Gbps, CV {stats['SteadyCV']:.3f}")
+    fig.suptitle(f"Throughput over Time: {IMPL_LABELS.get(impl, impl)}, {msg_size} bytes, "
+                 f"{threads} thread(s), trial {trial}\n({verdict})", fontsize=16, fontweight='bold')
+
+    slice_ms = client.interval_ns / 1e6
+    t = client.times_ms
+    style = series_style(impl)
+    ax.plot(t, client.gbps(), color=style['color'], linewidth=1.5, drawstyle='steps-post',
+            label='Clients (received)')
+    if server is not None:
+        ax.plot(t, server.gbps(), color='gray', linewidth=1, linestyle='--',
+                drawstyle='steps-post', label='Server (sent)')
+    if stats is not None:
+        steady_from, steady_to = stats['start'] * slice_ms, stats['stop'] * slice_ms
+        ax.axvspan(steady_from - stats['WarmupTrimmed_ms'], steady_from, color='gray',
+                   alpha=0.2, label=f"Warm-up ({stats['WarmupTrimmed_ms']:.0f} ms trimmed)")
+        ax.hlines(stats['SteadyThroughput_Gbps'], steady_from, steady_to, colors='black',
+                  linestyles=':', linewidth=2, label='Steady-state mean')
+    ax.set_ylabel('Throughput (Gbps)', fontweight='bold')
+    ax.set_ylim(bottom=0)
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+
+    ax_msgs.plot(t, client.messages / (slice_ms * 1e3), color=style['color'], linewidth=1.5,
+                 drawstyle='steps-post')
+    ax_msgs.set_xlabel(f'Time (ms, {slice_ms:g} ms slices)', fontweight='bold')
+    ax_msgs.set_ylabel('Messages/s (millions)', fontweight='bold')
+    ax_msgs.set_ylim(bottom=0)
+    ax_msgs.grid(True, alpha=0.3)
+
+    save_figure(fig, output)
+
+def plot_cost_model(cube, output='MT25067_Plot9_Cost_Model.png'):
+    """Plot 9: Alpha-beta model fit, predictions between and beyond the sweep, crossovers"""
+    plt = _pyplot()
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('Alpha-Beta Cost Model: Predicted Throughput vs Message Size\n'
+                 '(markers: measured, lines: model, dotted: crossovers of well-fitting models)',
+                 fontsize=16, fontweight='bold')
+
+    models = fit_models(cube)
+    sizes = np.geomspace(cube.sizes[0] / 4, cube.sizes[-1] * 16, 200)
+    for idx, threads in enumerate(cube.threads[:4]):
+        ax = axes[idx // 2, idx % 2]
+        measured = cube.sel(metric='Throughput_Gbps', threads=threads)
+        for impl, row in zip(cube.impls, measured):
+            style = series_style(impl)
+            model = models.get(impl)
+            ax.plot(cube.sizes, row, linestyle='none', marker=style['marker'],
+                    color=style['color'], markersize=8)
+            if model is not None:
+                ax.plot(sizes, model.throughput(sizes, threads), color=style['color'],
+                        linewidth=2, linestyle=style.get('linestyle', '-'),
+                        label=f"{style['label']} (LOO err {model.loo_mape:.0%})")
+        # Crossovers only between models that predict unseen cells well
+        for incumbent, challenger in CROSSOVER_PAIRS:
+            if (incumbent in models and challenger in models
+                    and reliable(models[incumbent]) and reliable(models[challenger])):
+                size, side = crossover(models[incumbent], models[challenger], threads)
+                if size is not None and sizes[0] <= size <= sizes[-1]:
+                    ax.axvline(size, color=series_style(challenger)['color'], linestyle=':',
+                               linewidth=1.5)
+                    ax.annotate(f"{challenger} vs {incumbent}:\n{crossover_text(size, side)}",
+                                (size, 0.97), xycoords=('data', 'axes fraction'),
+                                ha='center', va='top', fontsize=8,
+                                bbox=dict(facecolor='white', alpha=0.7, edgecolor='none'))
+
+        ax.set_xlabel('Message Size (bytes)', fontweight='bold')
+        ax.set_ylabel('Per-Client Throughput (Gbps)', fontweight='bold')
+        ax.set_title(f'{threads} Thread(s)', fontweight='bold')
+        ax.set_xscale('log', base=2)
+        ax.set_ylim(bottom=0)
+        ax.grid(True, alpha=0.3)
+        ax.legend(fontsize=8)
+
+    save_figure(fig, output)
+
+class FacetSet(namedtuple('FacetSet', 'dim cube')):
+    """Plot 10 input: one grid dimension and the variants it separates."""
+
+    def digest(self):
+        return self.dim + self.cube.digest()
+
+def facet_groups(impls, dim):
+    """
+    Variants that differ only in `dim`, grouped by the rest of their label:
+    {"A2+spread": [("busy poll 50 µs", "A2+spread+bp50"), ...], ...}.
+    """
+    groups = {}
+    for impl in impls:
+        try:
+            variant = parse_variant(impl)
+        except ValueError:
+            continue
+        groups.setdefault(without(variant, dim).label, []).append(
+            (dimension_value(variant, dim), impl))
+    return {rest: members for rest, members in groups.items() if len(members) > 1}
+
+def plot_dimension_facets(facets, output):
+    """Plot 10: Throughput and LLC misses vs Thread Count across one grid dimension"""
+    plt = _pyplot()
+    cube, dim = facets.cube, facets.dim
+    groups = facet_groups(cube.impls, dim)
+    metrics = cube.metrics
+    msg_size = cube.sizes[-1]
+    # One color and marker per value, the same in every panel
+    values = list(dict.fromkeys(value for members in groups.values() for value, _ in members))
+    colors = plt.rcParams['axes.prop_cycle'].by_key()['color']
+
+    ncols = len(groups)
+    fig, axes = plt.subplots(len(metrics), ncols, figsize=(5.5 * ncols + 2, 5 * len(metrics) + 2.5),
+                             squeeze=False, sharey='row')
+    shown = 'Throughput and Cache Misses' if len(metrics) > 1 else 'Throughput'
+    fig.suptitle(f"{DIMENSIONS[dim]}: {shown} vs Thread Count\n"
+                 f"({msg_size} bytes; one panel per configuration, one line per setting)",
+                 fontsize=16, fontweight='bold')
+
+    ylabels = {'Throughput_Gbps': 'Per-Client Throughput (Gbps)',
+               'LLCMissesPerKB': 'LLC Misses per KB'}
+    for col, (rest, members) in enumerate(groups.items()):
+        for row, metric in enumerate(metrics):
+            ax = axes[row, col]
+            for value, impl in members:
+                k = values.index(value)
+                ax.plot(cube.threads, cube.sel(metric=metric, impl=impl, size=msg_size),
+                        color=colors[k % len(colors)], marker=FACET_MARKERS[k % len(FACET_MARKERS)],
+                        linewidth=2, markersize=7, label=value)
+            if row == 0:
+                ax.set_title(series_style(rest)['label'], fontweight='bold')
+            if row == len(metrics) - 1:
+                ax.set_xlabel('Number of Threads (Clients)', fontweight='bold')
+            if col == 0:
+                ax.set_ylabel(ylabels.get(metric, metric), fontweight='bold')
+            set_thread_axis(ax, cube.threads)
+            ax.set_ylim(bottom=0)
+            ax.grid(True, alpha=0.3)
+            ax.legend(fontsize=9)
+
+    save_figure(fig, output)
+
+def plot_regression_heatmap(comp, output):
+    """Plot 8: Relative change of one metric per cell, candidate vs baseline"""
+    plt = _pyplot()
+    metric = comp.metrics[0]
+    threshold = comp.thresholds.get(metric, np.nan)
+    # Color by improvement (green) / regression (red), label with the raw change
+    better = -100 * comp.worse[..., 0]
+    change = 100 * comp.rel[..., 0]
+    limit = np.nanmax(np.abs(better), initial=0)
+    limit = max(limit, 2 * 100 * threshold if np.isfinite(threshold) else 1.0)
+
+    ncols = min(len(comp.impls), 4)
+    nrows = -(-len(comp.impls) // ncols)
+    fig, axes = plt.subplots(nrows, ncols, figsize=(4.5 * ncols + 2, 4 * nrows + 2.5),
+                             squeeze=False)
+    fig.suptitle(f"{metric}: Change vs Baseline (▲/▼ beyond {100 * threshold:.1f}%, "
+                 f"α = {comp.alpha:g} Holm)\nbaseline: {comp.names[0]}   candidate: {comp.names[1]}",
+                 fontsize=14, fontweight='bold')
+
+    cmap = plt.get_cmap('RdYlGn').copy()
+    cmap.set_bad('lightgray')
+    for ax, (i, impl) in zip(axes.flat, enumerate(comp.impls)):
+        image = ax.imshow(np.ma.masked_invalid(better[i]), cmap=cmap, vmin=-limit, vmax=limit,
+                          aspect='auto', origin='lower')
+        for s, t in np.ndindex(better[i].shape):
+            if not np.isfinite(change[i, s, t]):
+                ax.text(t, s, 'n/a', ha='center', va='center', fontsize=8, color='gray')
+                continue
+            p = comp.p_holm[i, s, t, 0]
+            flag = ('▼' if comp.regression[i, s, t, 0] else
+                    '▲' if comp.improvement[i, s, t, 0] else '')
+            ax.text(t, s, f"{change[i, s, t]:+.1f}%{flag}\n"
+                          f"{f'p={p:.2g}' if np.isfinite(p) else 'untested'}",
+                    ha='center', va='center', fontsize=8,
+                    color='white' if abs(better[i, s, t]) > 0.6 * limit else 'black',
+                    fontweight='bold' if flag else 'normal')
+        ax.set_xticks(range(len(comp.threads)))
+        ax.set_xticklabels([str(t) for t in comp.threads])
+        ax.set_yticks(range(len(comp.sizes)))
+        ax.set_yticklabels([str(s) for s in comp.sizes])
+        ax.set_xlabel('Threads', fontweight='bold')
+        ax.set_ylabel('Message Size (bytes)', fontweight='bold')
+        ax.set_title(IMPL_LABELS.get(impl, impl), fontweight='bold')
+        ax.grid(False)
+        fig.colorbar(image, ax=ax, use_gridspec=True,
+                     label='Improvement (%)' if i % ncols == ncols - 1 else None)
+    for ax in axes.flat[len(comp.impls):]:
+        ax.set_visible(False)
+
+    save_figure(fig, output)
+
+# =============================================================================
+# RENDER PIPELINE
+# =============================================================================
+# Each figure declares its input: a list of cube metrics, or a loader that
+# returns another data set with a digest() (None when there is no data).
+# The figure is keyed on a hash of that input, the plot style and the
+# plotting code, and is only re-rendered (in a worker process) when the key
+# changes or the PNG is gone.
+
+FIGURES = [
+    (plot_throughput_vs_message_size, 'MT25067_Plot1_Throughput_vs_MessageSize.png',
+     ['Throughput_Gbps']),
+    (plot_latency_vs_thread_count, 'MT25067_Plot2_Latency_vs_ThreadCount.png',
+     ['Latency_us']),
+    (plot_latency_cdf, 'MT25067_Plot2b_Latency_CDF.png',
+     HistogramSet.from_dir),
+    (plot_tail_latency_vs_thread_count, 'MT25067_Plot2c_TailLatency_vs_ThreadCount.png',
+     ['Latency_p50_us', 'Latency_p99_us', 'Latency_p999_us']),
+    (plot_cache_misses_vs_message_size, 'MT25067_Plot3_CacheMisses_vs_MessageSize.png',
+     ['LLC_Misses', 'L1_Misses']),
+    (plot_cpu_cycles_per_byte, 'MT25067_Plot4_CPUCycles_per_Byte.png',
+     ['CyclesPerByte']),
+    (plot_efficiency_vs_message_size, 'MT25067_Plot4b_Efficiency_vs_MessageSize.png',
+     ['IPC', 'CyclesPerByte', 'LLCMissesPerKB', 'ContextSwitchesPerMessage']),
+    (plot_overall_comparison, 'MT25067_Plot5_Overall_Comparison.png',
+     ['Throughput_Gbps', 'Latency_us', 'CPU_Cycles', 'LLC_Misses']),
+    (plot_aggregate_scaling, 'MT25067_Plot6_Aggregate_Scaling.png',
+     ['AggThroughput_Gbps', 'MinClient_Gbps', 'MaxClient_Gbps']),
+    (plot_fairness_vs_thread_count, 'MT25067_Plot6b_Fairness_vs_ThreadCount.png',
+     ['JainFairness']),
+    (plot_cost_model, 'MT25067_Plot9_Cost_Model.png',
+     ['Latency_us', 'Throughput_Gbps']),
+]
+
+def facet_figures(cube):
+    """One Plot 10 entry per grid dimension that varies between otherwise equal variants."""
+    metrics = [m for m in FACET_METRICS
+               if cube.has_metric(m) and np.isfinite(cube.values(m)).any()]
+    figures = []
+    for dim in DIMENSIONS:
+        groups = facet_groups(cube.impls, dim)
+        if not groups or not metrics:
+            continue
+        impls = [impl for members in groups.values() for _, impl in members]
+        figures.append((plot_dimension_facets, f'MT25067_Plot10_{dim}.png',
+                        functools.partial(FacetSet, dim, cube.subset(impl=impls, metric=metrics))))
+    return figures
+
+def timeseries_figures(directory=SERIES_DIR):
+    """One Plot 7 entry per cell with a throughput series in `directory`."""
+    figures = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.npz'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        figures.append((plot_throughput_timeseries,
+                        os.path.join(TIMESERIES_DIR, f'MT25067_Plot7_{name}.png'),
+                        functools.partial(SeriesSet.from_files, [path])))
+    return figures
+
+# Helpers whose code affects every figure's pixels
+_SHARED_RENDER_CODE = (_pyplot, add_footer, series_style, parse_variant, dimension_value,
+                       set_thread_axis, save_figure)
+# Analysis code that only some figures draw from
+_FIGURE_CODE = {plot_throughput_vs_message_size: (ci_band, ci_half_width),
+                plot_latency_vs_thread_count: (ci_band, ci_half_width),
+                plot_overall_comparison: (ci_band, ci_half_width),
+                plot_latency_cdf: (cdf,),
+                plot_throughput_timeseries: (steady_state, mser_cut),
+                plot_cost_model: (fit_models, fit_model, crossover, crossover_text, reliable),
+                plot_dimension_facets: (facet_groups, without)}
+
+def select_input(spec, cube):
+    """Resolve a figure's input spec to (data, reason it is unavailable)."""
+    if callable(spec):
+        data = spec()
+        return data, None if data is not None else 'no input data'
+    missing = [m for m in spec if not cube.has_metric(m)]
+    if missing:
+        return None, f"missing metrics: {', '.join(missing)}"
+    return cube.subset(metric=spec), None
+
+def figure_key(fn, data):
+    """Content hash of a figure's input slice, style settings and code."""
+    h = hashlib.sha256()
+    h.update(data.digest().encode())
+    h.update(repr((PLOT_STYLE, sorted(PLOT_RCPARAMS.items()), PLOT_DPI, SYSTEM_CONFIG,
+                   IMPL_COLORS, IMPL_MARKERS, IMPL_LABELS, LABEL.pattern,
+                   VARIANT_LINESTYLES, PLACEMENT_LINESTYLES, DIMENSIONS, FACET_MARKERS)).encode())
+    for code in (fn,) + _SHARED_RENDER_CODE + _FIGURE_CODE.get(fn, ()):
+        h.update(inspect.getsource(code).encode())
+    return h.hexdigest()
+
+def load_manifest(path=CACHE_MANIFEST):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest, path=CACHE_MANIFEST):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def _render_one(fn_name, data, output):
+    """Worker entry point: render a single figure (runs in a child process)."""
+    globals()[fn_name](data, output=output)
+    return output
+
+def render_figures(cube, figures=FIGURES, jobs=None, force=False):
+    """
+    Render every stale figure in a process pool and return (rendered, skipped,
+    failed).
+
+    A figure is stale when its PNG is missing or its content key differs from
+    the one recorded in CACHE_MANIFEST. A figure that raises is reported and
+    left stale; the others still render and are recorded in the manifest.
+    """
+    manifest = load_manifest()
+    pending = []
+    skipped = []
+    for fn, output, spec in figures:
+        data, reason = select_input(spec, cube)
+        if data is None:
+            print(f"- Skipped: {output} ({reason})")
+            continue
+        key = figure_key(fn, data)
+        if not force and manifest.get(output) == key and os.path.exists(output):
+            print(f"= Cached: {output}")
+            skipped.append(output)
+            continue
+        pending.append((fn.__name__, data, output, key))
+
+    rendered = []
+    failed = []
+    if not pending:
+        return rendered, skipped, failed
+
+    def finish(output, key, render):
+        try:
+            render()
+        except Exception as e:
+            manifest.pop(output, None)
+            failed.append(output)
+            print(f"✗ Failed: {output} ({type(e).__name__}: {e})", file=sys.stderr)
+            return
+        manifest[output] = key
+        rendered.append(output)
+        print(f"✓ Saved: {output}")
+
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(pending)))
+    if workers == 1:
+        for fn_name, data, output, key in pending:
+            finish(output, key, lambda: _render_one(fn_name, data, output))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_render_one, fn_name, data, output): (output, key)
+                       for fn_name, data, output, key in pending}
+            for future in as_completed(futures):
+                output, key = futures[future]
+                finish(output, key, future.result)
+
+    save_manifest(manifest)
+    return rendered, skipped, failed
 
 # =============================================================================
 # MAIN EXECUTION
 # =============================================================================
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='MT25067 Part D plot generator')
+    parser.add_argument('csv', nargs='*', default=[DEFAULT_CSV],
+                        help='experiment CSV file(s); repeated cells are averaged')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='render worker processes (default: one per CPU)')
+    parser.add_argument('-f', '--force', action='store_true',
+                        help='re-render every figure, ignoring the cache')
+    return parser.parse_args(argv)
+
 def main():
+    args = parse_args()
+    csv_paths = args.csv
+
     print("=" * 70)
     print("MT25067 - Part D: Plotting and Visualization")
     print("=" * 70)
     print(SYSTEM_CONFIG)
     print("\n" + "=" * 70)
-    print("Using HARDCODED experimental data (no CSV reading)")
-    print("Data extracted from valid experimental run (Millions of cycles)")
+    print(f"Loading experimental data from: {', '.join(csv_paths)}")
     print("=" * 70)
-    
+
+    cube = load_results(csv_paths)
+
     print(f"\nData summary:")
-    print(f"  Implementations: {IMPLEMENTATIONS}")
-    print(f"  Message sizes: {MESSAGE_SIZES} bytes")
-    print(f"  Thread counts: {THREAD_COUNTS}")
-    
+    print(f"  Implementations: {cube.impls}")
+    print(f"  Message sizes: {cube.sizes} bytes")
+    print(f"  Thread counts: {cube.threads}")
+    print(f"  Sweeps per cell: {int(cube.count.max())}")
+
     print("\nGenerating plots...")
     print()
-    
-    # Generate all plots
-    plot_throughput_vs_message_size()
-    plot_latency_vs_thread_count()
-    plot_cache_misses_vs_message_size()
-    plot_cpu_cycles_per_byte()
-    plot_overall_comparison()
-    
+
+    series = timeseries_figures()
+    if series:
+        os.makedirs(TIMESERIES_DIR, exist_ok=True)
+    figures = FIGURES + facet_figures(cube) + series
+    rendered, skipped, failed = render_figures(cube, figures, jobs=args.jobs, force=args.force)
+
     print()
     print("=" * 70)
-    print("All plots generated successfully!")
+    print(f"Plots up to date: {len(rendered)} rendered, {len(skipped)} cached"
+          + (f", {len(failed)} FAILED" if failed else ""))
     print("=" * 70)
+    return 1 if failed else 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+MT25067
+Part D: Columnar Results Engine
+Streams one or more MT25067_ExperimentData.csv files (e.g. repeated sweeps)
+into a NumPy array with named axes:
+
+    impl x message size x threads x metric
+
+Repeated rows for the same (impl, size, threads) cell are reduced to a mean,
+standard deviation and sample count, so every plot and derived metric is a
+vectorized slice over the cube instead of a nested dict lookup. Trials
+flagged Outlier=1 by the adaptive trial runner are left out.
+"""
+
+import csv
+import hashlib
+import sys
+from array import array
+
+import numpy as np
+
+from MT25067_PartD_Stats import ci_half_width
+
+# Columns that identify a sweep cell (everything else is a metric)
+KEY_COLUMNS = ('Implementation', 'MessageSize', 'NumThreads')
+# Per-trial bookkeeping written by MT25067_PartC_Trials.py (not metrics)
+TRIAL_COLUMNS = ('Trial', 'Outlier')
+
+# Axis names, in storage order
+AXES = ('impl', 'size', 'threads', 'metric')
+
+# Derived metrics computed from the per-cell means
+# name -> function(cube) returning an (impl, size, threads) array
+DERIVED_METRICS = {
+    'CyclesPerByte': lambda c: _safe_div(c.values('CPU_Cycles'), c.values('TotalBytes')),
+    'IPC': lambda c: _safe_div(c.values('Instructions'), c.values('CPU_Cycles')),
+    'LLCMissesPerKB': lambda c: _safe_div(c.values('LLC_Misses'), c.values('TotalBytes') / 1024),
+    'ContextSwitchesPerMessage': lambda c: _safe_div(c.values('ContextSwitches'), _messages(c)),
+}
+
+
+def _messages(cube):
+    """Messages sent per cell: TotalBytes (all clients) / message size."""
+    return cube.values('TotalBytes') / np.asarray(cube.sizes, dtype=np.float64)[None, :, None]
+
+
+def _safe_div(num, den):
+    """Element-wise num/den with NaN wherever den is zero or missing."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = num / den
+    out[~np.isfinite(out)] = np.nan
+    return out
+
+
+def _to_float(text):
+    """Parse a CSV field, returning NaN for blanks and non-numeric values."""
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _impl_sort_key(label):
+    """Sort A1, A2, ..., A10 numerically rather than lexically."""
+    head = label.rstrip('0123456789')
+    tail = label[len(head):]
+    return (head, int(tail) if tail else -1, label)
+
+
+class ResultCube:
+    """
+    Experiment results as dense arrays of shape (impl, size, threads, metric).
+
+    mean/std/count hold the per-cell reduction over all rows that mapped to
+    the same (impl, size, threads) key. Cells never measured are NaN with a
+    count of zero.
+    """
+
+    def __init__(self, impls, sizes, threads, metrics, mean, std, count):
+        self.impls = list(impls)
+        self.sizes = list(sizes)
+        self.threads = list(threads)
+        self.metrics = list(metrics)
+        self.mean = mean
+        self.std = std
+        self.count = count
+
+    # -------------------------------------------------------------------------
+    # Axis helpers
+    # -------------------------------------------------------------------------
+
+    def labels(self, axis):
+        """Return the labels along a named axis."""
+        return {'impl': self.impls, 'size': self.sizes,
+                'threads': self.threads, 'metric': self.metrics}[axis]
+
+    def _index(self, axis, selector):
+        """Translate a label (or list of labels) into positional indices."""
+        labels = self.labels(axis)
+        if isinstance(selector, (list, tuple, np.ndarray)):
+            try:
+                return [labels.index(s) for s in selector]
+            except ValueError as e:
+                raise KeyError(f"{axis}: {e}") from None
+        if selector not in labels:
+            raise KeyError(f"{axis}={selector!r} not in {labels}")
+        return labels.index(selector)
+
+    def sel(self, field='mean', **selectors):
+        """
+        Label-based selection, e.g. cube.sel(metric='Throughput_Gbps', threads=4).
+
+        Scalar selectors drop their axis; list selectors keep it. Returns a
+        view/copy of the requested field ('mean', 'std' or 'count') with the
+        remaining axes in storage order. 'ci95' gives the half-width of the
+        95% confidence interval of the mean.
+        """
+        unknown = set(selectors) - set(AXES)
+        if unknown:
+            raise KeyError(f"Unknown axes: {sorted(unknown)}")
+        arr = getattr(self, field)
+        index = tuple(self._index(axis, selectors[axis]) if axis in selectors
+                      else slice(None) for axis in AXES)
+        # Apply list selectors one axis at a time so NumPy does not
+        # broadcast them together as a fancy index
+        out = arr
+        dim = 0
+        for idx in index:
+            if isinstance(idx, list):
+                out = np.take(out, idx, axis=dim)
+                dim += 1
+            elif isinstance(idx, slice):
+                dim += 1
+            else:
+                out = np.take(out, idx, axis=dim)
+        return out
+
+    @property
+    def ci95(self):
+        """95% confidence half-width of each cell mean (NaN below two rows)."""
+        return ci_half_width(self.std, self.count)
+
+    def values(self, metric, field='mean'):
+        """Shortcut for the full (impl, size, threads) array of one metric."""
+        return self.sel(field=field, metric=metric)
+
+    def has_metric(self, metric):
+        return metric in self.metrics
+
+    def subset(self, **selectors):
+        """
+        Return a smaller cube restricted to the given label lists, e.g.
+        cube.subset(metric=['Throughput_Gbps']). Axes are always kept.
+        """
+        selectors = {axis: [sel] if not isinstance(sel, (list, tuple)) else list(sel)
+                     for axis, sel in selectors.items()}
+        return ResultCube(
+            selectors.get('impl', self.impls),
+            selectors.get('size', self.sizes),
+            selectors.get('threads', self.threads),
+            selectors.get('metric', self.metrics),
+            self.sel('mean', **selectors),
+            self.sel('std', **selectors),
+            self.sel('count', **selectors),
+        )
+
+    def digest(self):
+        """Content hash of labels and values, used to key cached outputs."""
+        h = hashlib.sha256()
+        for labels in (self.impls, self.sizes, self.threads, self.metrics):
+            h.update(repr(labels).encode())
+        for arr in (self.mean, self.std, self.count):
+            h.update(np.ascontiguousarray(arr).tobytes())
+        return h.hexdigest()
+
+    # -------------------------------------------------------------------------
+    # Derived metrics
+    # -------------------------------------------------------------------------
+
+    def with_metric(self, name, mean, std=None):
+        """Return a new cube with an extra metric appended along the last axis."""
+        if std is None:
+            std = np.full_like(mean, np.nan)
+        count = np.where(np.isfinite(mean), self.count.max(axis=-1), 0)
+        return ResultCube(
+            self.impls, self.sizes, self.threads, self.metrics + [name],
+            np.concatenate([self.mean, mean[..., None]], axis=-1),
+            np.concatenate([self.std, std[..., None]], axis=-1),
+            np.concatenate([self.count, count[..., None]], axis=-1),
+        )
+
+    def with_derived(self, names=None):
+        """Append the DERIVED_METRICS whose inputs are present in this cube."""
+        cube = self
+        for name, fn in DERIVED_METRICS.items():
+            if names is not None and name not in names:
+                continue
+            if name in cube.metrics:
+                continue
+            try:
+                cube = cube.with_metric(name, fn(cube))
+            except KeyError:
+                continue
+        return cube
+
+    def __repr__(self):
+        return (f"ResultCube(impls={self.impls}, sizes={self.sizes}, "
+                f"threads={self.threads}, metrics={len(self.metrics)})")
+
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+def _iter_rows(paths):
+    """Yield (header, row) for every data row across all CSV files."""
+    for path in paths:
+        with open(path, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                continue
+            header = [h.strip() for h in header]
+            for row in reader:
+                if row:
+                    yield header, row
+
+
+def load_results(paths, derived=True):
+    """
+    Stream one or more experiment CSVs into a ResultCube.
+
+    Files may have different column sets (older sweeps lack newer columns);
+    missing values are treated as NaN and excluded from the reduction.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+
+    impl_ids, size_ids, thread_ids, metric_ids = {}, {}, {}, {}
+    # Flat, compact buffers: one entry per (row, metric) observation
+    key_impl, key_size, key_thread = array('l'), array('l'), array('l')
+    obs_row, obs_metric, obs_value = array('l'), array('l'), array('d')
+
+    last_header = None
+    row_no = 0
+    for header, row in _iter_rows(paths):
+        if header is not last_header:
+            missing = [k for k in KEY_COLUMNS if k not in header]
+            if missing:
+                raise ValueError(f"CSV header missing key columns: {missing}")
+            key_pos = [header.index(k) for k in KEY_COLUMNS]
+            metric_pos = [(i, metric_ids.setdefault(h, len(metric_ids)))
+                          for i, h in enumerate(header)
+                          if h not in KEY_COLUMNS and h not in TRIAL_COLUMNS]
+            outlier_pos = header.index('Outlier') if 'Outlier' in header else None
+            last_header = header
+
+        if outlier_pos is not None and outlier_pos < len(row) and _to_float(row[outlier_pos]) == 1:
+            continue
+
+        impl = row[key_pos[0]].strip()
+        size = int(float(row[key_pos[1]]))
+        threads = int(float(row[key_pos[2]]))
+        key_impl.append(impl_ids.setdefault(impl, len(impl_ids)))
+        key_size.append(size_ids.setdefault(size, len(size_ids)))
+        key_thread.append(thread_ids.setdefault(threads, len(thread_ids)))
+
+        for pos, m in metric_pos:
+            value = _to_float(row[pos]) if pos < len(row) else np.nan
+            if np.isfinite(value):
+                obs_row.append(row_no)
+                obs_metric.append(m)
+                obs_value.append(value)
+        row_no += 1
+
+    # Sorted axis labels and the permutation from first-seen id -> position
+    impls = sorted(impl_ids, key=_impl_sort_key)
+    sizes = sorted(size_ids)
+    threads = sorted(thread_ids)
+    metrics = list(metric_ids)
+
+    def remap(ids, labels):
+        lut = np.empty(len(ids), dtype=np.intp)
+        for pos, label in enumerate(labels):
+            lut[ids[label]] = pos
+        return lut
+
+    shape = (len(impls), len(sizes), len(threads), len(metrics))
+    total = np.zeros(shape)
+    total_sq = np.zeros(shape)
+    count = np.zeros(shape, dtype=np.int64)
+
+    if row_no:
+        ki = remap(impl_ids, impls)[np.frombuffer(key_impl, dtype=key_impl.typecode)]
+        ks = remap(size_ids, sizes)[np.frombuffer(key_size, dtype=key_size.typecode)]
+        kt = remap(thread_ids, threads)[np.frombuffer(key_thread, dtype=key_thread.typecode)]
+        rows = np.frombuffer(obs_row, dtype=obs_row.typecode)
+        index = (ki[rows], ks[rows], kt[rows], np.frombuffer(obs_metric, dtype=obs_metric.typecode))
+        values = np.frombuffer(obs_value, dtype=obs_value.typecode)
+        np.add.at(total, index, values)
+        np.add.at(total_sq, index, values * values)
+        np.add.at(count, index, 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(count > 0, total / count, np.nan)
+        var = np.where(count > 1, (total_sq - count * mean * mean) / (count - 1), np.nan)
+    std = np.sqrt(np.clip(var, 0.0, None))
+
+    cube = ResultCube(impls, sizes, threads, metrics, mean, std, count)
+    return cube.with_derived() if derived else cube
+
+
+def main():
+    paths = sys.argv[1:] or ['MT25067_ExperimentData.csv']
+    cube = load_results(paths)
+    print(cube)
+    print(f"Metrics: {cube.metrics}")
+    print(f"Rows per cell (max): {int(cube.count.max()) if cube.count.size else 0}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+MT25067
+Part D: Statistics Helpers
+Small-sample statistics for repeated sweep cells without a SciPy
+dependency: Student-t distribution (regularized incomplete beta), t-based
+confidence intervals, robust outlier rejection (modified z-score) and
+Welch's two-sample t-test with Holm's multiple-comparison correction.
+
+Usage:
+    python3 MT25067_PartD_Stats.py 4.37 4.12 4.51 3.58 4.40
+"""
+
+import math
+import sys
+from functools import lru_cache
+from statistics import NormalDist
+
+import numpy as np
+
+CONFIDENCE = 0.95
+# Iglewicz & Hoaglin: |0.6745 (x - median) / MAD| above this is an outlier
+OUTLIER_Z = 3.5
+# Fewest observations for which outliers are judged at all
+OUTLIER_MIN_N = 3
+
+
+def _betacf(a, b, x):
+    """Continued fraction of the incomplete beta function (modified Lentz)."""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c, d = 1.0, 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        for aa in (m * (b - m) * x / ((qam + m2) * (a + m2)),
+                   -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))):
+            d = 1.0 + aa * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + aa / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 1e-14:
+            break
+    return h
+
+
+def betainc(a, b, x):
+    """Regularized incomplete beta function I_x(a, b)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                     + a * math.log(x) + b * math.log1p(-x))
+    if x < (a + 1.0) / (a + b + 2.0):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1.0 - x) / b
+
+
+def t_cdf(t, df):
+    """P(T <= t) for Student's t with df degrees of freedom (df may be fractional)."""
+    if not np.isfinite(df):
+        return NormalDist().cdf(t)
+    tail = 0.5 * betainc(df / 2.0, 0.5, df / (df + t * t))
+    return 1.0 - tail if t > 0 else tail
+
+
+@lru_cache(maxsize=None)
+def t_quantile(p, df):
+    """Inverse of t_cdf (bisection); the normal quantile for very large df."""
+    if df > 1e6 or not np.isfinite(df):
+        return NormalDist().inv_cdf(p)
+    if p == 0.5:
+        return 0.0
+    if p < 0.5:
+        return -t_quantile(1.0 - p, df)
+    lo, hi = 0.0, 1.0
+    while t_cdf(hi, df) < p:
+        hi *= 2.0
+    for _ in range(200):
+        mid = 0.5 * (lo + hi)
+        if t_cdf(mid, df) < p:
+            lo = mid
+        else:
+            hi = mid
+        if hi - lo < 1e-12 * max(1.0, hi):
+            break
+    return 0.5 * (lo + hi)
+
+
+def ci_half_width(std, count, level=CONFIDENCE):
+    """
+    Half-width of the t confidence interval of a mean, element-wise over
+    arrays of sample standard deviations and counts (NaN below two samples).
+    """
+    std = np.asarray(std, dtype=np.float64)
+    count = np.asarray(count)
+    q = 0.5 + level / 2.0
+    t = np.array([t_quantile(q, int(n) - 1) if n > 1 else np.nan
+                  for n in count.ravel()]).reshape(count.shape)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return t * std / np.sqrt(count)
+
+
+def mean_ci(values, level=CONFIDENCE):
+    """(mean, CI half-width) of a 1-D sample; the half-width is NaN for n < 2."""
+    x = np.asarray(values, dtype=np.float64)
+    x = x[np.isfinite(x)]
+    if not x.size:
+        return np.nan, np.nan
+    std = x.std(ddof=1) if x.size > 1 else np.nan
+    return float(x.mean()), float(ci_half_width(std, x.size, level))
+
+
+def outlier_mask(values, z=OUTLIER_Z):
+    """
+    True for observations whose modified z-score (median / MAD based)
+    exceeds z. With a zero MAD (over half the values identical) the mean
+    absolute deviation is used instead; NaNs are never outliers.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    mask = np.zeros(x.shape, dtype=bool)
+    finite = np.isfinite(x)
+    if np.count_nonzero(finite) < OUTLIER_MIN_N:
+        return mask
+    med = np.median(x[finite])
+    dev = np.abs(x[finite] - med)
+    mad = np.median(dev)
+    if mad > 0:
+        score = 0.6745 * dev / mad
+    else:
+        mean_ad = dev.mean()
+        if mean_ad == 0:
+            return mask
+        score = dev / (1.253314 * mean_ad)
+    mask[finite] = score > z
+    return mask
+
+
+def welch_test(mean_a, std_a, n_a, mean_b, std_b, n_b):
+    """
+    Welch's unequal-variance t-test from summary statistics, element-wise.
+    Returns (t, df, two-sided p); NaN where either side has fewer than two
+    samples. Two identical zero-variance samples give p = 1.
+    """
+    arrays = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64)
+                                   for a in (mean_a, std_a, n_a, mean_b, std_b, n_b)))
+    mean_a, std_a, n_a, mean_b, std_b, n_b = arrays
+    with np.errstate(invalid='ignore', divide='ignore'):
+        va, vb = std_a ** 2 / n_a, std_b ** 2 / n_b
+        se = np.sqrt(va + vb)
+        t = (mean_b - mean_a) / se
+        df = (va + vb) ** 2 / (va ** 2 / (n_a - 1) + vb ** 2 / (n_b - 1))
+    valid = (n_a > 1) & (n_b > 1) & np.isfinite(mean_a) & np.isfinite(mean_b)
+    p = np.full(valid.shape, np.nan)
+    for i in np.ndindex(valid.shape):
+        if not valid[i]:
+            continue
+        if se[i] == 0:
+            # No spread on either side: equal means are not a difference
+            p[i] = 1.0 if mean_a[i] == mean_b[i] else 0.0
+        else:
+            p[i] = 2.0 * (1.0 - t_cdf(abs(t[i]), df[i]))
+    return np.where(valid, t, np.nan), np.where(valid, df, np.nan), p
+
+
+def holm(pvalues):
+    """Holm-Bonferroni adjusted p-values (same shape; NaNs stay NaN)."""
+    p = np.asarray(pvalues, dtype=np.float64)
+    flat = p.ravel()
+    tested = np.flatnonzero(np.isfinite(flat))
+    adjusted = np.full(flat.shape, np.nan)
+    order = tested[np.argsort(flat[tested], kind='stable')]
+    m = order.size
+    running = 0.0
+    for rank, i in enumerate(order):
+        running = max(running, min(1.0, (m - rank) * flat[i]))
+        adjusted[i] = running
+    return adjusted.reshape(p.shape)
+
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+def main():
+    values = [float(v) for v in sys.argv[1:]]
+    if not values:
+        print(__doc__.strip().splitlines()[-1].strip())
+        return 1
+    out = outlier_mask(values)
+    kept = [v for v, o in zip(values, out) if not o]
+    mean, hw = mean_ci(kept)
+    print(f"n={len(values)} outliers={[v for v, o in zip(values, out) if o]}")
+    print(f"mean={mean:.6g} ±{hw:.3g} ({CONFIDENCE:.0%} CI, "
+          f"{hw / abs(mean) if mean else np.nan:.2%} of the mean)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
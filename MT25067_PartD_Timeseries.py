@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+MT25067
+Part D: Interval Throughput Time Series
+Reads the ring buffers written by the Part A clients and servers
+(-S <ring> [-I <ms>], see MT25067_Sampler.h) through np.memmap, either live
+while the writer is still running or after it exited, and separates the
+warm-up (TCP slow start, cold caches, thread start-up) from steady state:
+- idle slices before the first and after the last byte are dropped, and so
+  are the partial first and last slices
+- the warm-up is truncated with MSER-5 (the cut that minimizes the standard
+  error of the remaining batch means, searched over the first half)
+- the remainder is stable when it spans at least MIN_STEADY_SLICES slices
+  and the means of its two halves differ by at most STABLE_DRIFT (the
+  per-slice coefficient of variation is reported too, but it mostly
+  measures burstiness and grows as the slices get shorter)
+
+Usage:
+    python3 MT25067_PartD_Timeseries.py client_1.ring client_2.ring ...
+    python3 MT25067_PartD_Timeseries.py --follow server.ring
+    python3 MT25067_PartD_Timeseries.py --fields --merge cell.npz \
+        --server server.ring client_*.ring
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+RING_MAGIC = b'MT25RING'
+RING_VERSION = 1
+
+# Mirrors RingHeader / RingSlot in MT25067_Sampler.h
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('num_slots', '<u4'),
+    ('interval_ns', '<u8'),
+    ('pid', '<u8'),
+    ('published', '<u8'),
+    ('done', '<u4'),
+    ('reserved0', '<u4'),
+    ('reserved', '<u8', (3,)),
+])
+SLOT_DTYPE = np.dtype([
+    ('seq', '<u8'),
+    ('slice', '<u8'),
+    ('bytes', '<u8'),
+    ('messages', '<u8'),
+])
+
+# Steady-state detection
+MSER_BATCH = 5
+MIN_STEADY_SLICES = 10
+STABLE_DRIFT = 0.10
+
+# CSV columns added to every sweep row
+STEADY_COLUMNS = ['SteadyThroughput_Gbps', 'WarmupTrimmed_ms', 'SteadyCV', 'Stable']
+
+# Directory where the sweep keeps one merged series per cell and trial
+SERIES_DIR = 'throughput_series'
+# <impl label>_<size>B_<threads>T[_t<trial>]; grid labels contain + (MT25067_PartC_Grid.py)
+_CELL_NAME = re.compile(r'^(?P<impl>[A-Za-z0-9.+\-]+?)_(?P<size>\d+)B_(?P<threads>\d+)T'
+                        r'(?:_t(?P<trial>\d+))?\.npz$')
+
+
+class RingTail:
+    """
+    Incremental reader of one ring file. poll() returns the slots published
+    since the previous call; a slot the writer overwrote before it was read
+    is counted in `lost` instead.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.header = None
+        self.slots = None
+        self.next = 0
+        self.lost = 0
+
+    def _open(self):
+        if os.path.getsize(self.path) < HEADER_DTYPE.itemsize:
+            return False
+        header = np.memmap(self.path, dtype=HEADER_DTYPE, mode='r', shape=(1,))
+        if header[0]['magic'] != RING_MAGIC:
+            return False            # writer has not finished the header yet
+        if header[0]['version'] != RING_VERSION:
+            raise ValueError(f"{self.path}: not a version {RING_VERSION} sampler ring")
+        self.header = header
+        self.slots = np.memmap(self.path, dtype=SLOT_DTYPE, mode='r',
+                               offset=HEADER_DTYPE.itemsize,
+                               shape=(int(header[0]['num_slots']),))
+        return True
+
+    @property
+    def interval_ns(self):
+        return int(self.header[0]['interval_ns']) if self.header is not None else 0
+
+    @property
+    def done(self):
+        return self.header is not None and bool(self.header[0]['done'])
+
+    def poll(self):
+        if self.header is None and (not os.path.exists(self.path) or not self._open()):
+            return np.empty(0, dtype=SLOT_DTYPE)
+        published = int(self.header[0]['published'])
+        num_slots = len(self.slots)
+        if published - self.next > num_slots:
+            self.lost += published - num_slots - self.next
+            self.next = published - num_slots
+        index = np.arange(self.next, published, dtype=np.uint64)
+        pos = index % num_slots
+        batch = np.array(self.slots[pos])
+        # Seqlock check: the slot still holds the same slice after the copy
+        valid = (batch['seq'] == index + 1) & (np.asarray(self.slots['seq'][pos]) == index + 1)
+        self.lost += int(np.count_nonzero(~valid))
+        self.next = published
+        return batch[valid]
+
+
+def read_ring(path):
+    """(interval_ns, slots) of a ring, everything published so far."""
+    tail = RingTail(path)
+    slots = tail.poll()
+    if tail.header is None:
+        raise ValueError(f"{path}: not a sampler ring")
+    return tail.interval_ns, slots
+
+
+class Series:
+    """Bytes and messages per slice, starting at absolute slice `first`."""
+
+    def __init__(self, interval_ns, first, nbytes, messages):
+        self.interval_ns = interval_ns
+        self.first = first
+        self.bytes = nbytes
+        self.messages = messages
+
+    def __len__(self):
+        return len(self.bytes)
+
+    @property
+    def times_ms(self):
+        return np.arange(len(self)) * self.interval_ns / 1e6
+
+    def gbps(self):
+        return self.bytes * 8.0 / self.interval_ns
+
+
+def merge_series(rings):
+    """
+    Sum rings of one cell, slice by slice (slices are wall-clock aligned
+    across processes); slices no writer published count as zero.
+    """
+    rings = [(i, s) for i, s in rings if len(s)]
+    if not rings:
+        return None
+    interval_ns = rings[0][0]
+    if any(i != interval_ns for i, _ in rings):
+        raise ValueError("rings sampled at different intervals")
+    first = min(int(s['slice'].min()) for _, s in rings)
+    last = max(int(s['slice'].max()) for _, s in rings)
+    nbytes = np.zeros(last - first + 1, dtype=np.float64)
+    messages = np.zeros_like(nbytes)
+    for _, s in rings:
+        offset = s['slice'].astype(np.int64) - first
+        np.add.at(nbytes, offset, s['bytes'].astype(np.float64))
+        np.add.at(messages, offset, s['messages'].astype(np.float64))
+    return Series(interval_ns, first, nbytes, messages)
+
+
+def mser_cut(x, batch=MSER_BATCH):
+    """
+    Warm-up length (in elements of x) chosen by MSER-m: the truncation point
+    over the first half that minimizes var(rest) / len(rest).
+    """
+    if len(x) >= 4 * batch:
+        n = len(x) // batch
+        y = x[:n * batch].reshape(n, batch).mean(axis=1)
+    else:
+        batch, n, y = 1, len(x), x
+    # Sums over every suffix y[d:], vectorized with reversed cumulative sums
+    s1 = np.cumsum(y[::-1])[::-1]
+    s2 = np.cumsum((y * y)[::-1])[::-1]
+    k = np.arange(n, 0, -1, dtype=np.float64)
+    mser = (s2 - s1 * s1 / k) / (k * k)
+    d = int(np.argmin(mser[:max(n // 2, 1)]))
+    return d * batch
+
+
+def steady_state(series, min_slices=MIN_STEADY_SLICES, max_drift=STABLE_DRIFT):
+    """
+    Steady-state throughput of a series: a dict keyed by STEADY_COLUMNS plus
+    the slice range used ('start', 'stop', indices into series.bytes) and
+    the half-to-half 'drift', or None when nothing was transferred.
+    """
+    if series is None:
+        return None
+    active = np.flatnonzero(series.bytes)
+    if not active.size:
+        return None
+    start, stop = int(active[0]), int(active[-1]) + 1
+    if stop - start > 2:
+        # The first and last slices only cover part of an interval
+        start, stop = start + 1, stop - 1
+    x = series.bytes[start:stop]
+    cut = mser_cut(x)
+    steady = x[cut:]
+    mean = float(steady.mean())
+    cv = float(steady.std() / mean) if mean > 0 else np.inf
+    half = len(steady) // 2
+    drift = (abs(float(steady[:half].mean() - steady[half:].mean())) / mean
+             if half and mean > 0 else np.inf)
+    return {
+        'SteadyThroughput_Gbps': mean * 8.0 / series.interval_ns,
+        'WarmupTrimmed_ms': (start - int(active[0]) + cut) * series.interval_ns / 1e6,
+        'SteadyCV': cv,
+        'Stable': int(len(steady) >= min_slices and drift <= max_drift),
+        'drift': drift,
+        'start': start + cut,
+        'stop': stop,
+    }
+
+
+def steady_fields(stats):
+    """CSV fields for STEADY_COLUMNS (empty when stats is None)."""
+    if stats is None:
+        return [''] * len(STEADY_COLUMNS)
+    return [f"{stats['SteadyThroughput_Gbps']:.5f}", f"{stats['WarmupTrimmed_ms']:.1f}",
+            f"{stats['SteadyCV']:.4f}", str(stats['Stable'])]
+
+
+# =============================================================================
+# PER-CELL SERIES SET (input to the Part D time-series figures)
+# =============================================================================
+
+def _padded(series, first, length):
+    """series.bytes / series.messages placed on slices [first, first + length)."""
+    nbytes, messages = np.zeros(length), np.zeros(length)
+    offset = series.first - first
+    nbytes[offset:offset + len(series)] = series.bytes
+    messages[offset:offset + len(series)] = series.messages
+    return nbytes, messages
+
+
+def write_cell_series(path, client, server=None):
+    """
+    Store a cell's merged client (and server) series as one .npz file, both
+    on the union of their slice ranges (the server may start a slice early).
+    """
+    sides = {'client': client}
+    if server is not None and server.interval_ns == client.interval_ns:
+        sides['server'] = server
+    first = min(s.first for s in sides.values())
+    length = max(s.first + len(s) for s in sides.values()) - first
+    arrays = {'interval_ns': client.interval_ns, 'first': first}
+    for side, series in sides.items():
+        arrays[f'{side}_bytes'], arrays[f'{side}_messages'] = _padded(series, first, length)
+    np.savez(path, **arrays)
+
+
+class SeriesSet:
+    """Merged series of a whole sweep, keyed by (impl, size, threads, trial)."""
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    @classmethod
+    def from_dir(cls, directory=SERIES_DIR):
+        return cls.from_files(sorted(glob.glob(os.path.join(directory, '*.npz'))))
+
+    @classmethod
+    def from_files(cls, paths):
+        cells = {}
+        for path in paths:
+            m = _CELL_NAME.match(os.path.basename(path))
+            if not m or not os.path.exists(path):
+                continue
+            with np.load(path) as data:
+                cells[(m.group('impl'), int(m.group('size')), int(m.group('threads')),
+                       int(m.group('trial') or 1))] = \
+                    {name: np.array(data[name]) for name in data.files}
+        return cls(cells) if cells else None
+
+    def keys(self):
+        return sorted(self.cells)
+
+    def series(self, key, side='client'):
+        data = self.cells[key]
+        if f'{side}_bytes' not in data:
+            return None
+        return Series(int(data['interval_ns']), int(data['first']),
+                      data[f'{side}_bytes'], data[f'{side}_messages'])
+
+    def digest(self):
+        h = hashlib.sha256()
+        for key in self.keys():
+            h.update(repr(key).encode())
+            for name in sorted(self.cells[key]):
+                h.update(name.encode())
+                h.update(np.asarray(self.cells[key][name]).tobytes())
+        return h.hexdigest()
+
+
+def cell_series_path(impl, msg_size, threads, directory=SERIES_DIR, trial=1):
+    return os.path.join(directory, f"{impl}_{msg_size}B_{threads}T_t{trial}.npz")
+
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+def follow(path, period):
+    """Print each new slice of a ring until its writer marks it done."""
+    tail = RingTail(path)
+    while True:
+        finished = tail.done
+        for s in tail.poll():
+            print(f"slice {int(s['slice'])}: {s['bytes'] * 8.0 / tail.interval_ns:9.3f} Gbps "
+                  f"{int(s['messages']):>8} msgs", flush=True)
+        if finished:
+            break
+        time.sleep(period)
+    if tail.lost:
+        print(f"({tail.lost} slices overwritten before they were read)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MT25067 interval throughput analyzer')
+    parser.add_argument('files', nargs='+', help='ring files of one cell')
+    parser.add_argument('--follow', action='store_true',
+                        help='tail the (single) ring live until its writer exits')
+    parser.add_argument('--period', type=float, default=0.2,
+                        help='seconds between polls with --follow')
+    parser.add_argument('--fields', action='store_true',
+                        help='print only the steady-state CSV fields of the merged inputs')
+    parser.add_argument('--merge', metavar='OUT',
+                        help='store the merged series (for the Part D plots) in OUT (.npz)')
+    parser.add_argument('--server', metavar='RING',
+                        help='server ring stored alongside the inputs with --merge')
+    args = parser.parse_args()
+
+    if args.follow:
+        follow(args.files[0], args.period)
+        return
+
+    series = merge_series([read_ring(p) for p in args.files])
+    stats = steady_state(series)
+    if args.merge and series is not None:
+        server = merge_series([read_ring(args.server)]) if args.server else None
+        write_cell_series(args.merge, series, server)
+    if args.fields:
+        print(','.join(steady_fields(stats)))
+        return
+    if stats is None:
+        print("no data in the given rings")
+        return 1
+    total = series.bytes.sum()
+    print(f"Slices: {len(series)} x {series.interval_ns / 1e6:g} ms "
+          f"({total:.0f} bytes, {series.messages.sum():.0f} messages)")
+    print(f"Whole-run throughput: {total * 8.0 / (len(series) * series.interval_ns):.3f} Gbps")
+    print(f"Warm-up trimmed: {stats['WarmupTrimmed_ms']:.1f} ms")
+    print(f"Steady throughput: {stats['SteadyThroughput_Gbps']:.3f} Gbps over "
+          f"{stats['stop'] - stats['start']} slices (CV {stats['SteadyCV']:.3f}, "
+          f"drift {stats['drift']:.3f}, "
+          f"{'stable' if stats['Stable'] else 'NOT stable'})")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
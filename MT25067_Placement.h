@@ -0,0 +1,270 @@
+/*
+ * MT25067
+ * Thread placement and socket tuning shared by the Part A clients and servers
+ *
+ * -C <policy>[@<first>] pins each handler / epoll worker thread (server) or
+ * the receiving thread (client) to one CPU of the process's allowed set
+ * (taskset still applies). Thread k takes entry first + k of an ordering:
+ *   compact  SMT siblings of a core, then the next core of the same node
+ *   spread   one thread per physical core, alternating NUMA nodes, before
+ *            any SMT sibling is used
+ *   irq      the CPU that processed the connection's incoming packets
+ *            (SO_INCOMING_CPU: the NIC IRQ / RPS core of the flow)
+ *   <list>   an explicit core list such as 0-3,8, in that order
+ * compact and spread take the highest-capacity cores first (cpu_capacity),
+ * so on hybrid CPUs the P-cores fill before the E-cores. Giving clients an
+ * offset past the server's threads (@<n>) puts both on one ordering.
+ *
+ * -B <usec> sets SO_BUSY_POLL (the receive path spins on the device queue
+ * instead of sleeping) and -K <bytes> SO_SNDBUF (server) or SO_RCVBUF
+ * (client; applied before connect() so the window scale matches).
+ *
+ * Affinity uses the raw syscalls, so no _GNU_SOURCE is required.
+ */
+
+#ifndef MT25067_PLACEMENT_H
+#define MT25067_PLACEMENT_H
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <dirent.h>
+#include <unistd.h>
+#include <sys/socket.h>
+#include <sys/syscall.h>
+
+#define PLACEMENT_MAX_CPUS 1024
+#define CPU_MASK_WORDS (PLACEMENT_MAX_CPUS / (8 * sizeof(unsigned long)))
+
+typedef enum { PIN_NONE, PIN_COMPACT, PIN_SPREAD, PIN_IRQ, PIN_LIST } PinPolicy;
+
+typedef struct {
+    PinPolicy policy;
+    int first;                  // ordering entry of thread 0 (-C policy@first)
+    int ncpus;
+    int cpus[PLACEMENT_MAX_CPUS];   // placement order
+    int busy_poll_us;           // -B: SO_BUSY_POLL, 0 = off
+    int sock_buf;               // -K: SO_SNDBUF / SO_RCVBUF bytes, 0 = kernel default
+} Placement;
+
+static Placement placement = {PIN_NONE, 0, 0, {0}, 0, 0};
+
+// Topology of one allowed CPU, read from sysfs
+typedef struct {
+    int cpu;
+    int node;
+    int package;
+    int core;
+    int rank;                   // SMT sibling index within its core
+    int ordinal;                // core index within its node
+    long capacity;
+} CpuInfo;
+
+static inline long cpu_sysfs_long(int cpu, const char *file, long fallback) {
+    char path[128];
+    snprintf(path, sizeof(path), "/sys/devices/system/cpu/cpu%d/%s", cpu, file);
+    FILE *f = fopen(path, "r");
+    long value = fallback;
+    if (f) {
+        if (fscanf(f, "%ld", &value) != 1) value = fallback;
+        fclose(f);
+    }
+    return value;
+}
+
+static inline int cpu_sysfs_node(int cpu) {
+    char path[64];
+    snprintf(path, sizeof(path), "/sys/devices/system/cpu/cpu%d", cpu);
+    DIR *dir = opendir(path);
+    int node = 0;
+    if (dir) {
+        struct dirent *e;
+        while ((e = readdir(dir)) != NULL) {
+            if (sscanf(e->d_name, "node%d", &node) == 1) break;
+        }
+        closedir(dir);
+    }
+    return node;
+}
+
+static int compare_compact(const void *a, const void *b) {
+    const CpuInfo *x = (const CpuInfo*)a, *y = (const CpuInfo*)b;
+    if (x->capacity != y->capacity) return x->capacity > y->capacity ? -1 : 1;
+    if (x->node != y->node) return x->node - y->node;
+    if (x->package != y->package) return x->package - y->package;
+    if (x->core != y->core) return x->core - y->core;
+    return x->rank - y->rank;
+}
+
+static int compare_spread(const void *a, const void *b) {
+    const CpuInfo *x = (const CpuInfo*)a, *y = (const CpuInfo*)b;
+    if (x->rank != y->rank) return x->rank - y->rank;
+    if (x->capacity != y->capacity) return x->capacity > y->capacity ? -1 : 1;
+    if (x->ordinal != y->ordinal) return x->ordinal - y->ordinal;
+    return x->node - y->node;
+}
+
+/*
+ * Fill placement.cpus with the allowed CPUs in compact or spread order
+ */
+static inline int placement_order(PinPolicy policy) {
+    unsigned long mask[CPU_MASK_WORDS];
+    memset(mask, 0, sizeof(mask));
+    if (syscall(SYS_sched_getaffinity, 0, sizeof(mask), mask) < 0) {
+        perror("sched_getaffinity");
+        return -1;
+    }
+    static CpuInfo info[PLACEMENT_MAX_CPUS];
+    int n = 0;
+    for (int cpu = 0; cpu < PLACEMENT_MAX_CPUS; cpu++) {
+        if (!(mask[cpu / (8 * sizeof(unsigned long))] >> (cpu % (8 * sizeof(unsigned long))) & 1)) {
+            continue;
+        }
+        CpuInfo *c = &info[n++];
+        c->cpu = cpu;
+        c->node = cpu_sysfs_node(cpu);
+        c->package = cpu_sysfs_long(cpu, "topology/physical_package_id", 0);
+        c->core = cpu_sysfs_long(cpu, "topology/core_id", cpu);
+        c->capacity = cpu_sysfs_long(cpu, "cpu_capacity", 1024);
+        c->rank = 0;
+        for (int i = 0; i < n - 1; i++) {
+            if (info[i].package == c->package && info[i].core == c->core) c->rank++;
+        }
+    }
+    // Core ordinals within each node, in compact order
+    qsort(info, n, sizeof(CpuInfo), compare_compact);
+    for (int i = 0; i < n; i++) {
+        info[i].ordinal = 0;
+        for (int j = 0; j < i; j++) {
+            if (info[j].node == info[i].node && info[j].rank == 0 &&
+                !(info[j].package == info[i].package && info[j].core == info[i].core)) {
+                info[i].ordinal++;
+            }
+        }
+    }
+    if (policy == PIN_SPREAD) {
+        qsort(info, n, sizeof(CpuInfo), compare_spread);
+    }
+    for (int i = 0; i < n; i++) {
+        placement.cpus[i] = info[i].cpu;
+    }
+    placement.ncpus = n;
+    return n > 0 ? 0 : -1;
+}
+
+/*
+ * Parse -C: compact | spread | irq | <core list>, each optionally @<first>
+ */
+static inline int placement_parse(const char *arg) {
+    char spec[256];
+    snprintf(spec, sizeof(spec), "%s", arg);
+    char *at = strchr(spec, '@');
+    if (at) {
+        *at = '\0';
+        placement.first = atoi(at + 1);
+    }
+    if (strcmp(spec, "compact") == 0 || strcmp(spec, "spread") == 0) {
+        placement.policy = spec[0] == 'c' ? PIN_COMPACT : PIN_SPREAD;
+        return placement_order(placement.policy);
+    }
+    if (strcmp(spec, "irq") == 0) {
+        placement.policy = PIN_IRQ;
+        return 0;
+    }
+
+    // Explicit list: comma-separated CPUs and lo-hi ranges
+    placement.policy = PIN_LIST;
+    placement.ncpus = 0;
+    char *p = spec;
+    while (*p) {
+        char *end;
+        long lo = strtol(p, &end, 10), hi = lo;
+        if (end == p) break;
+        if (*end == '-') {
+            p = end + 1;
+            hi = strtol(p, &end, 10);
+            if (end == p) break;
+        }
+        for (long cpu = lo; cpu <= hi && placement.ncpus < PLACEMENT_MAX_CPUS; cpu++) {
+            if (cpu >= 0 && cpu < PLACEMENT_MAX_CPUS) placement.cpus[placement.ncpus++] = cpu;
+        }
+        p = end;
+        if (*p == ',') p++;
+        else if (*p) break;
+    }
+    if (*p || placement.ncpus == 0) {
+        fprintf(stderr, "-C: expected compact, spread, irq or a core list like 0-3,8 (got %s)\n", arg);
+        return -1;
+    }
+    return 0;
+}
+
+/*
+ * Pin the calling thread to its CPU: entry first + slot of the ordering, or
+ * fd's SO_INCOMING_CPU for irq. Returns the CPU, -1 when not pinned.
+ */
+static inline int placement_pin(int slot, int fd) {
+    int cpu = -1;
+    if (placement.policy == PIN_NONE) {
+        return -1;
+    }
+    if (placement.policy == PIN_IRQ) {
+        socklen_t len = sizeof(cpu);
+        if (fd < 0 || getsockopt(fd, SOL_SOCKET, SO_INCOMING_CPU, &cpu, &len) < 0 || cpu < 0) {
+            return -1;
+        }
+    } else if (placement.ncpus > 0) {
+        cpu = placement.cpus[(placement.first + slot) % placement.ncpus];
+    }
+    if (cpu < 0 || cpu >= PLACEMENT_MAX_CPUS) {
+        return -1;
+    }
+
+    unsigned long mask[CPU_MASK_WORDS];
+    memset(mask, 0, sizeof(mask));
+    mask[cpu / (8 * sizeof(unsigned long))] = 1UL << (cpu % (8 * sizeof(unsigned long)));
+    // pid 0: the calling thread only
+    if (syscall(SYS_sched_setaffinity, 0, sizeof(mask), mask) < 0) {
+        perror("sched_setaffinity");
+        return -1;
+    }
+    return cpu;
+}
+
+/*
+ * Apply -B / -K to a socket; buf_opt is SO_SNDBUF or SO_RCVBUF
+ */
+static inline void placement_tune_socket(int fd, int buf_opt) {
+    if (placement.busy_poll_us > 0 &&
+        setsockopt(fd, SOL_SOCKET, SO_BUSY_POLL, &placement.busy_poll_us,
+                   sizeof(placement.busy_poll_us)) < 0) {
+        perror("setsockopt SO_BUSY_POLL");
+    }
+    if (placement.sock_buf > 0 &&
+        setsockopt(fd, SOL_SOCKET, buf_opt, &placement.sock_buf, sizeof(placement.sock_buf)) < 0) {
+        perror(buf_opt == SO_SNDBUF ? "setsockopt SO_SNDBUF" : "setsockopt SO_RCVBUF");
+    }
+}
+
+/*
+ * One "Placement:" line describing -C/-B/-K (nothing when none is set)
+ */
+static inline void placement_print(const char *buf_name) {
+    static const char *names[] = {"none", "compact", "spread", "irq", "list"};
+    if (placement.policy == PIN_NONE && !placement.busy_poll_us && !placement.sock_buf) {
+        return;
+    }
+    printf("Placement: %s", names[placement.policy]);
+    if (placement.policy != PIN_NONE && placement.policy != PIN_IRQ) {
+        printf(" from entry %d of cpus ", placement.first);
+        for (int i = 0; i < placement.ncpus && i < 16; i++) {
+            printf("%s%d", i ? "," : "", placement.cpus[i]);
+        }
+        if (placement.ncpus > 16) printf(",...");
+    }
+    if (placement.busy_poll_us) printf(", busy poll %d us", placement.busy_poll_us);
+    if (placement.sock_buf) printf(", %s %d", buf_name, placement.sock_buf);
+    printf("\n");
+}
+
+#endif /* MT25067_PLACEMENT_H */
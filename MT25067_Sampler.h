@@ -0,0 +1,199 @@
+/*
+ * MT25067
+ * Interval throughput sampler shared by the Part A clients and servers
+ *
+ * With -S <ring_file> (and optionally -I <interval_ms>, default 10, may be
+ * fractional down to 0.1 for runs that last only a few milliseconds) the
+ * send/receive paths count bytes and messages into two atomic counters.
+ * A sampler thread wakes on every wall-clock slice boundary and appends the
+ * slice's deltas to a ring buffer in a shared file mapping (normally under
+ * /dev/shm), which MT25067_PartD_Timeseries.py reads while the run is
+ * still going.
+ *
+ * Slices are numbered CLOCK_REALTIME / interval, so the rings of several
+ * processes of one cell line up slice by slice. Idle slices before the
+ * first byte are not recorded; from then on every slice is, and at exit
+ * the last partial slice is flushed and the header marked done.
+ *
+ * Slot protocol: seq is cleared, the fields are written, then seq is set
+ * to (slice number in this ring + 1) and `published` advanced, both with
+ * release stores. A reader accepts a slot only if seq matches before and
+ * after copying it.
+ */
+
+#ifndef MT25067_SAMPLER_H
+#define MT25067_SAMPLER_H
+
+#include <stdio.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include <string.h>
+#include <errno.h>
+#include <fcntl.h>
+#include <pthread.h>
+#include <time.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/prctl.h>
+
+#define SAMPLER_MAGIC "MT25RING"
+#define SAMPLER_VERSION 1
+#define SAMPLER_SLOTS 65536           // ~11 minutes at 10 ms
+#define SAMPLER_INTERVAL_MS 10
+
+// 64-byte file header (mirrored by HEADER_DTYPE in MT25067_PartD_Timeseries.py)
+typedef struct {
+    char magic[8];
+    uint32_t version;
+    uint32_t num_slots;
+    uint64_t interval_ns;
+    uint64_t pid;
+    uint64_t published;               // slots written so far
+    uint32_t done;                    // writer exited, ring is final
+    uint32_t reserved0;
+    uint64_t reserved[3];
+} RingHeader;
+
+typedef struct {
+    uint64_t seq;                     // index in this ring + 1, 0 while writing
+    uint64_t slice;                   // CLOCK_REALTIME / interval_ns
+    uint64_t bytes;
+    uint64_t messages;
+} RingSlot;
+
+typedef struct {
+    int enabled;
+    RingHeader *hdr;
+    RingSlot *slots;
+    size_t map_len;
+    uint64_t interval_ns;
+    pthread_t thread;
+    volatile int stop;
+    // Cumulative counters, updated by every send/receive path
+    uint64_t bytes;
+    uint64_t messages;
+    // Sampler thread state
+    uint64_t last_bytes;
+    uint64_t last_messages;
+    int active;                       // first byte seen
+} Sampler;
+
+static Sampler sampler;
+
+static inline void sampler_add(long bytes, long messages) {
+    if (sampler.enabled) {
+        __atomic_fetch_add(&sampler.bytes, (uint64_t)bytes, __ATOMIC_RELAXED);
+        __atomic_fetch_add(&sampler.messages, (uint64_t)messages, __ATOMIC_RELAXED);
+    }
+}
+
+static inline uint64_t sampler_now_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_REALTIME, &ts);
+    return (uint64_t)ts.tv_sec * 1000000000ull + ts.tv_nsec;
+}
+
+/*
+ * Append the deltas since the previous call as slice `slice`
+ */
+static inline void sampler_publish(uint64_t slice) {
+    uint64_t bytes = __atomic_load_n(&sampler.bytes, __ATOMIC_RELAXED);
+    uint64_t messages = __atomic_load_n(&sampler.messages, __ATOMIC_RELAXED);
+    uint64_t d_bytes = bytes - sampler.last_bytes;
+    uint64_t d_messages = messages - sampler.last_messages;
+    if (!sampler.active && d_bytes == 0) {
+        return;                       // still idle: nothing recorded yet
+    }
+    sampler.active = 1;
+    sampler.last_bytes = bytes;
+    sampler.last_messages = messages;
+
+    uint64_t index = sampler.hdr->published;
+    RingSlot *slot = &sampler.slots[index % sampler.hdr->num_slots];
+    __atomic_store_n(&slot->seq, 0, __ATOMIC_RELEASE);
+    slot->slice = slice;
+    slot->bytes = d_bytes;
+    slot->messages = d_messages;
+    __atomic_store_n(&slot->seq, index + 1, __ATOMIC_RELEASE);
+    __atomic_store_n(&sampler.hdr->published, index + 1, __ATOMIC_RELEASE);
+}
+
+static void* sampler_thread(void *arg) {
+    (void)arg;
+    prctl(PR_SET_NAME, "sampler", 0, 0, 0);
+    uint64_t next = (sampler_now_ns() / sampler.interval_ns + 1) * sampler.interval_ns;
+    while (!sampler.stop) {
+        struct timespec ts = {(time_t)(next / 1000000000ull), (long)(next % 1000000000ull)};
+        if (clock_nanosleep(CLOCK_REALTIME, TIMER_ABSTIME, &ts, NULL) == EINTR) {
+            continue;
+        }
+        // Catch up without publishing empty slices for missed wake-ups
+        uint64_t now_slice = sampler_now_ns() / sampler.interval_ns;
+        sampler_publish(now_slice - 1);
+        next = (now_slice + 1) * sampler.interval_ns;
+    }
+    return NULL;
+}
+
+/*
+ * Flush the partial last slice, mark the ring done and unmap it
+ * (registered with atexit by sampler_start)
+ */
+static void sampler_stop(void) {
+    if (!sampler.enabled) {
+        return;
+    }
+    sampler.stop = 1;
+    pthread_join(sampler.thread, NULL);
+    sampler_publish(sampler_now_ns() / sampler.interval_ns);
+    __atomic_store_n(&sampler.hdr->done, 1, __ATOMIC_RELEASE);
+    munmap(sampler.hdr, sampler.map_len);
+    sampler.enabled = 0;
+}
+
+/*
+ * Create the ring file and start sampling; 0 on success
+ */
+static inline int sampler_start(const char *path, double interval_ms) {
+    if (interval_ms < 0.1) {
+        fprintf(stderr, "sampler interval must be at least 0.1 ms\n");
+        return -1;
+    }
+    size_t len = sizeof(RingHeader) + SAMPLER_SLOTS * sizeof(RingSlot);
+    int fd = open(path, O_RDWR | O_CREAT | O_TRUNC, 0644);
+    if (fd < 0 || ftruncate(fd, len) < 0) {
+        perror("sampler ring");
+        if (fd >= 0) close(fd);
+        return -1;
+    }
+    void *map = mmap(NULL, len, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+    close(fd);
+    if (map == MAP_FAILED) {
+        perror("sampler mmap");
+        return -1;
+    }
+
+    sampler.hdr = (RingHeader*)map;
+    sampler.slots = (RingSlot*)((char*)map + sizeof(RingHeader));
+    sampler.map_len = len;
+    sampler.interval_ns = (uint64_t)(interval_ms * 1e6);
+    sampler.hdr->version = SAMPLER_VERSION;
+    sampler.hdr->num_slots = SAMPLER_SLOTS;
+    sampler.hdr->interval_ns = sampler.interval_ns;
+    sampler.hdr->pid = (uint64_t)getpid();
+    // Magic last: a reader ignores the file until the header is complete
+    __atomic_thread_fence(__ATOMIC_RELEASE);
+    memcpy(sampler.hdr->magic, SAMPLER_MAGIC, 8);
+
+    sampler.enabled = 1;
+    if (pthread_create(&sampler.thread, NULL, sampler_thread, NULL) != 0) {
+        perror("pthread_create sampler");
+        sampler.enabled = 0;
+        munmap(map, len);
+        return -1;
+    }
+    atexit(sampler_stop);
+    return 0;
+}
+
+#endif /* MT25067_SAMPLER_H */
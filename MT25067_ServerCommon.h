@@ -0,0 +1,392 @@
+/*
+ * MT25067
+ * Helpers shared by the Part A servers
+ *
+ * Event-driven mode (-e <workers>): instead of one thread per client, the
+ * accept loop hands non-blocking sockets round-robin to a fixed pool of
+ * worker threads, each running its own edge-triggered epoll loop. The
+ * server plugs its send path in through EpollOps, so the two-copy,
+ * one-copy and zero-copy variants share the loop.
+ *
+ * Start gate (-g): every handler thread names itself "<impl>-conn-<n>" and
+ * parks before its first send. Once all clients are accepted and every
+ * handler is parked, the server prints
+ *     Start gate: <n> handlers ready (pid <pid>)
+ * and waits for one line on stdin before releasing them. This lets a
+ * profiler attach to the already existing handler threads (perf stat
+ * --per-thread -p <pid>) so each connection's cost is counted separately.
+ *
+ * Placement (-C/-B/-K, see MT25067_Placement.h): handler k and epoll
+ * worker k take placement slot k; accepted sockets get the busy-poll and
+ * send-buffer settings.
+ */
+
+#ifndef MT25067_SERVER_COMMON_H
+#define MT25067_SERVER_COMMON_H
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <errno.h>
+#include <fcntl.h>
+#include <pthread.h>
+#include <unistd.h>
+#include <sys/epoll.h>
+#include <sys/prctl.h>
+#include <sys/resource.h>
+#include <sys/socket.h>
+#include <sys/time.h>
+#include <sys/uio.h>
+
+#include "MT25067_Placement.h"
+#include "MT25067_Sampler.h"
+
+#define MAX_EPOLL_CLIENTS 65536
+#define EPOLL_BATCH 256
+
+typedef struct {
+    pthread_mutex_t lock;
+    pthread_cond_t cond;
+    int enabled;
+    int open;
+    int parked;
+} StartGate;
+
+static StartGate start_gate = {PTHREAD_MUTEX_INITIALIZER, PTHREAD_COND_INITIALIZER, 0, 0, 0};
+
+/*
+ * Name the calling thread "<impl>-<kind>-<id>" (shows up as the perf
+ * --per-thread label; the kernel limits names to 15 characters)
+ */
+static inline void name_thread(const char *impl, const char *kind, int id) {
+    char name[16];
+    snprintf(name, sizeof(name), "%s-%s-%d", impl, kind, id);
+    prctl(PR_SET_NAME, name, 0, 0, 0);
+}
+
+static inline void name_handler_thread(const char *impl, int client_id) {
+    name_thread(impl, "conn", client_id);
+}
+
+/*
+ * Socket options and CPU of the handler of client client_id (-B/-K/-C)
+ */
+static inline void place_handler(int client_id, int fd) {
+    placement_tune_socket(fd, SO_SNDBUF);
+    placement_pin(client_id - 1, fd);
+}
+
+/*
+ * Called by a handler before its first send; returns immediately when the
+ * gate is disabled
+ */
+static inline void gate_wait(void) {
+    pthread_mutex_lock(&start_gate.lock);
+    if (start_gate.enabled) {
+        start_gate.parked++;
+        pthread_cond_broadcast(&start_gate.cond);
+        while (!start_gate.open) {
+            pthread_cond_wait(&start_gate.cond, &start_gate.lock);
+        }
+    }
+    pthread_mutex_unlock(&start_gate.lock);
+}
+
+/*
+ * Called by main after accepting num_handlers clients: wait until all are
+ * parked, announce it and release them on the first line read from stdin
+ */
+static inline void gate_release(int num_handlers) {
+    if (!start_gate.enabled) {
+        return;
+    }
+    pthread_mutex_lock(&start_gate.lock);
+    while (start_gate.parked < num_handlers) {
+        pthread_cond_wait(&start_gate.cond, &start_gate.lock);
+    }
+    pthread_mutex_unlock(&start_gate.lock);
+
+    printf("Start gate: %d handlers ready (pid %d)\n", num_handlers, (int)getpid());
+    char line[64];
+    if (!fgets(line, sizeof(line), stdin)) {
+        fprintf(stderr, "Start gate: stdin closed, releasing handlers\n");
+    }
+
+    pthread_mutex_lock(&start_gate.lock);
+    start_gate.open = 1;
+    pthread_cond_broadcast(&start_gate.cond);
+    pthread_mutex_unlock(&start_gate.lock);
+}
+
+/*
+ * Raise the open file limit so `needed` descriptors fit (thousands of
+ * connections exceed the usual soft limit of 1024)
+ */
+static inline int raise_fd_limit(long needed) {
+    struct rlimit rl;
+    if (getrlimit(RLIMIT_NOFILE, &rl) < 0) {
+        perror("getrlimit");
+        return -1;
+    }
+    if ((long)rl.rlim_cur >= needed) {
+        return 0;
+    }
+    rl.rlim_cur = ((long)rl.rlim_max >= needed || rl.rlim_max == RLIM_INFINITY)
+                  ? (rlim_t)needed : rl.rlim_max;
+    if (setrlimit(RLIMIT_NOFILE, &rl) < 0 || (long)rl.rlim_cur < needed) {
+        fprintf(stderr, "Open file limit too low for %ld descriptors\n", needed);
+        return -1;
+    }
+    return 0;
+}
+
+/*
+ * Copy the part of iov[0..iovcnt) that starts `offset` bytes in, for
+ * resuming a partially sent message. Returns the number of entries in dst.
+ */
+static inline int iov_advance(const struct iovec *iov, int iovcnt, size_t offset,
+                              struct iovec *dst) {
+    int n = 0;
+    for (int i = 0; i < iovcnt; i++) {
+        if (offset >= iov[i].iov_len) {
+            offset -= iov[i].iov_len;
+            continue;
+        }
+        dst[n].iov_base = (char *)iov[i].iov_base + offset;
+        dst[n].iov_len = iov[i].iov_len - offset;
+        offset = 0;
+        n++;
+    }
+    return n;
+}
+
+// =============================================================================
+// EVENT-DRIVEN MODE (-e <workers>)
+// =============================================================================
+
+// One client connection owned by a worker
+typedef struct {
+    int fd;
+    int id;
+    int messages_left;
+    size_t offset;              // bytes of the current message already sent
+    long bytes_sent;
+    long pending;               // zero-copy sends not yet completed
+    int zerocopy;               // SO_ZEROCOPY enabled (set by on_accept)
+    int started;
+    int done;
+    struct timeval start;
+} Conn;
+
+typedef struct EpollWorker EpollWorker;
+
+typedef struct {
+    const char *impl;
+    int message_size;
+    int num_messages;
+    const void *payload;        // read-only message shared by every connection
+    // Optional per-connection setup after accept (e.g. SO_ZEROCOPY); 0 on
+    // success, -1 refuses the connection
+    int (*on_accept)(Conn *c);
+    // Send from c->offset of the current message; bytes sent or -1 with errno
+    ssize_t (*send_some)(EpollWorker *w, Conn *c);
+    // Optional: drain the socket error queue (zero-copy completions)
+    void (*on_error_queue)(EpollWorker *w, Conn *c);
+} EpollOps;
+
+struct EpollWorker {
+    pthread_t thread;
+    int id;
+    int epfd;
+    const EpollOps *ops;
+    Conn *conns;
+    int expected;               // connections main will hand to this worker
+    int assigned;
+    int finished;
+    // Per-worker statistics, merged by main after join (no shared lock)
+    long bytes_sent;
+    double conn_time_sec;
+    long zc_completions;
+    long zc_copied;
+    int placed;                 // pinned (-C) on its first connection event
+};
+
+typedef struct {
+    long bytes_sent;
+    double total_time_sec;
+    long zc_completions;
+    long zc_copied;
+} EpollTotals;
+
+static inline void conn_finish(EpollWorker *w, Conn *c) {
+    struct timeval end;
+    gettimeofday(&end, NULL);
+    w->conn_time_sec += (end.tv_sec - c->start.tv_sec) +
+                        (end.tv_usec - c->start.tv_usec) / 1e6;
+    w->bytes_sent += c->bytes_sent;
+    epoll_ctl(w->epfd, EPOLL_CTL_DEL, c->fd, NULL);
+    close(c->fd);
+    c->done = 1;
+    w->finished++;
+}
+
+/*
+ * Send as much as the socket accepts. Returns 1 when the connection is
+ * finished (all messages sent and completed, or a fatal error), else 0.
+ */
+static inline int conn_pump(EpollWorker *w, Conn *c) {
+    const EpollOps *ops = w->ops;
+    while (c->messages_left > 0) {
+        ssize_t sent = ops->send_some(w, c);
+        if (sent < 0) {
+            if (errno == EAGAIN || errno == EWOULDBLOCK || errno == ENOBUFS) {
+                return 0;       // wait for EPOLLOUT (or EPOLLERR completions)
+            }
+            if (errno == EINTR) {
+                continue;
+            }
+            perror("send");
+            return 1;
+        }
+        c->bytes_sent += sent;
+        c->offset += sent;
+        int completed = c->offset >= (size_t)ops->message_size;
+        if (completed) {
+            c->offset = 0;
+            c->messages_left--;
+        }
+        sampler_add(sent, completed);
+    }
+    return c->pending <= 0;
+}
+
+static void* epoll_worker(void *arg) {
+    EpollWorker *w = (EpollWorker*)arg;
+    const EpollOps *ops = w->ops;
+    struct epoll_event events[EPOLL_BATCH];
+
+    name_thread(ops->impl, "wrk", w->id);
+    gate_wait();
+
+    while (w->finished < w->expected) {
+        int n = epoll_wait(w->epfd, events, EPOLL_BATCH, -1);
+        if (n < 0) {
+            if (errno == EINTR) continue;
+            perror("epoll_wait");
+            break;
+        }
+        for (int i = 0; i < n; i++) {
+            Conn *c = (Conn*)events[i].data.ptr;
+            if (c->done) continue;
+            if (!w->placed) {
+                // irq placement needs a connection that has seen traffic
+                placement_pin(w->id - 1, c->fd);
+                w->placed = 1;
+            }
+            if (!c->started) {
+                gettimeofday(&c->start, NULL);
+                c->started = 1;
+            }
+            if ((events[i].events & EPOLLERR) && ops->on_error_queue) {
+                ops->on_error_queue(w, c);
+            }
+            if (events[i].events & EPOLLHUP) {
+                conn_finish(w, c);
+            } else if (conn_pump(w, c)) {
+                conn_finish(w, c);
+            }
+        }
+    }
+    return NULL;
+}
+
+/*
+ * Accept max_clients connections and serve them from num_workers epoll
+ * loops. Returns 0 and fills *totals once every connection is done.
+ */
+static inline int run_epoll_server(int server_fd, int max_clients, int num_workers,
+                                   const EpollOps *ops, EpollTotals *totals) {
+    memset(totals, 0, sizeof(*totals));
+    if (num_workers > max_clients) num_workers = max_clients;
+    if (raise_fd_limit(max_clients + num_workers + 64) < 0) {
+        return -1;
+    }
+
+    EpollWorker *workers = (EpollWorker*)calloc(num_workers, sizeof(EpollWorker));
+    if (!workers) {
+        perror("calloc workers");
+        return -1;
+    }
+    for (int w = 0; w < num_workers; w++) {
+        workers[w].id = w + 1;
+        workers[w].ops = ops;
+        workers[w].expected = max_clients / num_workers + (w < max_clients % num_workers);
+        workers[w].conns = (Conn*)calloc(workers[w].expected, sizeof(Conn));
+        workers[w].epfd = epoll_create1(0);
+        if (!workers[w].conns || workers[w].epfd < 0) {
+            perror("epoll worker setup");
+            return -1;
+        }
+        if (pthread_create(&workers[w].thread, NULL, epoll_worker, &workers[w]) != 0) {
+            perror("pthread_create");
+            return -1;
+        }
+    }
+
+    printf("Event-driven mode: %d epoll workers\n", num_workers);
+
+    int client_count = 0;
+    while (client_count < max_clients) {
+        int client_fd = accept(server_fd, NULL, NULL);
+        if (client_fd < 0) {
+            if (errno != EINTR) perror("accept");
+            continue;
+        }
+        EpollWorker *w = &workers[client_count % num_workers];
+        Conn *c = &w->conns[w->assigned];
+        c->fd = client_fd;
+        c->id = client_count + 1;
+        c->messages_left = ops->num_messages;
+        if (ops->on_accept && ops->on_accept(c) < 0) {
+            close(client_fd);
+            memset(c, 0, sizeof(*c));
+            continue;
+        }
+        w->assigned++;
+        fcntl(client_fd, F_SETFL, fcntl(client_fd, F_GETFL) | O_NONBLOCK);
+        placement_tune_socket(client_fd, SO_SNDBUF);
+
+        // Edge-triggered: every event drains the socket until EAGAIN
+        struct epoll_event ev;
+        ev.events = EPOLLOUT | EPOLLET;
+        ev.data.ptr = c;
+        if (epoll_ctl(w->epfd, EPOLL_CTL_ADD, client_fd, &ev) < 0) {
+            perror("epoll_ctl");
+            close(client_fd);
+            return -1;
+        }
+        client_count++;
+        if (client_count % 1000 == 0) {
+            printf("Accepted %d clients...\n", client_count);
+        }
+    }
+
+    printf("All %d clients accepted. Waiting for transfers to complete...\n", client_count);
+    gate_release(num_workers);
+
+    for (int w = 0; w < num_workers; w++) {
+        pthread_join(workers[w].thread, NULL);
+        printf("[Worker %d] %d connections, %ld bytes\n",
+               workers[w].id, workers[w].finished, workers[w].bytes_sent);
+        totals->bytes_sent += workers[w].bytes_sent;
+        totals->total_time_sec += workers[w].conn_time_sec;
+        totals->zc_completions += workers[w].zc_completions;
+        totals->zc_copied += workers[w].zc_copied;
+        close(workers[w].epfd);
+        free(workers[w].conns);
+    }
+    free(workers);
+    return 0;
+}
+
+#endif /* MT25067_SERVER_COMMON_H */
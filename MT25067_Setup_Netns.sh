@@ -35,71 +35,91 @@ if [ "$EUID" -ne 0 ]; then
     exit 1
 fi
 
-log_info "Setting up network namespaces for PA02..."
-echo ""
+# Optional: number of independent server/client namespace pairs.
+# Pair 0 is server_ns/client_ns; pair N>0 is server_nsN/client_nsN.
+# Every pair uses the same 10.0.0.1 <-> 10.0.0.2 addresses in its own
+# network stack, so the orchestrator can run cells concurrently on them.
+NUM_PAIRS=${1:-1}
+
+pair_suffix() {
+    if [ "$1" -eq 0 ]; then echo ""; else echo "$1"; fi
+}
 
-# Cleanup any existing setup
-log_info "Cleaning up existing namespaces (if any)..."
-ip netns del server_ns 2>/dev/null || true
-ip netns del client_ns 2>/dev/null || true
-sleep 1
-
-# Create namespaces
-log_info "Creating network namespaces..."
-ip netns add server_ns
-ip netns add client_ns
-log_debug "Created: server_ns, client_ns"
-
-# Create veth pair (virtual ethernet cable)
-log_info "Creating veth pair..."
-ip link add veth_server type veth peer name veth_client
-log_debug "Created: veth_server <-> veth_client"
-
-# Move veth endpoints to respective namespaces
-log_info "Moving veth endpoints to namespaces..."
-ip link set veth_server netns server_ns
-ip link set veth_client netns client_ns
-log_debug "Moved endpoints to namespaces"
-
-# Configure IP addresses
-log_info "Configuring IP addresses..."
-ip netns exec server_ns ip addr add 10.0.0.1/24 dev veth_server
-ip netns exec client_ns ip addr add 10.0.0.2/24 dev veth_client
-log_debug "Server: 10.0.0.1/24, Client: 10.0.0.2/24"
-
-# Bring up interfaces
-log_info "Bringing up interfaces..."
-ip netns exec server_ns ip link set dev veth_server up
-ip netns exec client_ns ip link set dev veth_client up
-ip netns exec server_ns ip link set dev lo up
-ip netns exec client_ns ip link set dev lo up
-log_debug "All interfaces up"
-
-# Add routes (for completeness)
-log_info "Adding routes..."
-ip netns exec server_ns ip route add default via 10.0.0.2 dev veth_server 2>/dev/null || true
-ip netns exec client_ns ip route add default via 10.0.0.1 dev veth_client 2>/dev/null || true
-
-# Verify connectivity
+setup_pair() {
+    local sfx=$(pair_suffix $1)
+    local sns="server_ns${sfx}" cns="client_ns${sfx}"
+    local sveth="veth_server${sfx}" cveth="veth_client${sfx}"
+
+    # Cleanup any existing setup
+    log_info "Cleaning up existing namespaces (if any)..."
+    ip netns del $sns 2>/dev/null || true
+    ip netns del $cns 2>/dev/null || true
+    sleep 1
+
+    # Create namespaces
+    log_info "Creating network namespaces..."
+    ip netns add $sns
+    ip netns add $cns
+    log_debug "Created: $sns, $cns"
+
+    # Create veth pair (virtual ethernet cable)
+    log_info "Creating veth pair..."
+    ip link add $sveth type veth peer name $cveth
+    log_debug "Created: $sveth <-> $cveth"
+
+    # Move veth endpoints to respective namespaces
+    log_info "Moving veth endpoints to namespaces..."
+    ip link set $sveth netns $sns
+    ip link set $cveth netns $cns
+    log_debug "Moved endpoints to namespaces"
+
+    # Configure IP addresses
+    log_info "Configuring IP addresses..."
+    ip netns exec $sns ip addr add 10.0.0.1/24 dev $sveth
+    ip netns exec $cns ip addr add 10.0.0.2/24 dev $cveth
+    log_debug "Server: 10.0.0.1/24, Client: 10.0.0.2/24"
+
+    # Bring up interfaces
+    log_info "Bringing up interfaces..."
+    ip netns exec $sns ip link set dev $sveth up
+    ip netns exec $cns ip link set dev $cveth up
+    ip netns exec $sns ip link set dev lo up
+    ip netns exec $cns ip link set dev lo up
+    log_debug "All interfaces up"
+
+    # Add routes (for completeness)
+    log_info "Adding routes..."
+    ip netns exec $sns ip route add default via 10.0.0.2 dev $sveth 2>/dev/null || true
+    ip netns exec $cns ip route add default via 10.0.0.1 dev $cveth 2>/dev/null || true
+
+    # Verify connectivity
+    echo ""
+    log_info "Verifying connectivity..."
+    echo -n "  Ping test (client -> server): "
+    if ip netns exec $cns ping -c 2 -W 2 10.0.0.1 >/dev/null 2>&1; then
+        echo -e "${GREEN}✓ Success${NC}"
+    else
+        echo -e "${RED}✗ Failed${NC}"
+        log_error "Connectivity test failed!"
+        exit 1
+    fi
+
+    echo -n "  Ping test (server -> client): "
+    if ip netns exec $sns ping -c 2 -W 2 10.0.0.2 >/dev/null 2>&1; then
+        echo -e "${GREEN}✓ Success${NC}"
+    else
+        echo -e "${RED}✗ Failed${NC}"
+        log_error "Connectivity test failed!"
+        exit 1
+    fi
+}
+
+log_info "Setting up $NUM_PAIRS network namespace pair(s) for PA02..."
 echo ""
-log_info "Verifying connectivity..."
-echo -n "  Ping test (client -> server): "
-if ip netns exec client_ns ping -c 2 -W 2 10.0.0.1 >/dev/null 2>&1; then
-    echo -e "${GREEN}✓ Success${NC}"
-else
-    echo -e "${RED}✗ Failed${NC}"
-    log_error "Connectivity test failed!"
-    exit 1
-fi
 
-echo -n "  Ping test (server -> client): "
-if ip netns exec server_ns ping -c 2 -W 2 10.0.0.2 >/dev/null 2>&1; then
-    echo -e "${GREEN}✓ Success${NC}"
-else
-    echo -e "${RED}✗ Failed${NC}"
-    log_error "Connectivity test failed!"
-    exit 1
-fi
+for ((pair=0; pair<NUM_PAIRS; pair++)); do
+    setup_pair $pair
+done
 
 # Display configuration
 echo ""
@@ -117,6 +137,9 @@ echo "    - IP: 10.0.0.2/24"
 echo "    - Interface: veth_client"
 echo ""
 echo "  Connection: veth pair (virtual ethernet)"
+if [ "$NUM_PAIRS" -gt 1 ]; then
+    echo "  Additional pairs: server_ns1..$((NUM_PAIRS - 1)) / client_ns1..$((NUM_PAIRS - 1))"
+fi
 echo ""
 echo "Usage examples:"
 echo "  Server: sudo ip netns exec server_ns ./MT25067_PartA1_Server 4096 5000 1"
@@ -124,9 +147,10 @@ echo "  Client: sudo ip netns exec client_ns ./MT25067_PartA1_Client 4096 5000"
 echo ""
 echo "  Or run automated tests:"
 echo "    sudo ./MT25067_PartC_AutomationScript.sh"
+echo "    sudo python3 MT25067_PartC_Orchestrator.py --concurrency $NUM_PAIRS"
 echo ""
 echo "To cleanup:"
-echo "  sudo ./MT25067_Cleanup_Netns.sh"
+echo "  sudo ./MT25067_Cleanup_Netns.sh $NUM_PAIRS"
 echo ""
 
 # Verify namespaces exist
@@ -0,0 +1,205 @@
+/*
+ * MT25067
+ * Minimal io_uring ring shared by the Part A4 server and client
+ *
+ * Uses the raw io_uring_setup/io_uring_enter/io_uring_register syscalls and
+ * <linux/io_uring.h> (no liburing dependency). Only what A4 needs:
+ * - submit a batch of SQEs and wait for their completions in one syscall
+ * - register fixed buffers (IORING_REGISTER_BUFFERS)
+ * - probe whether an opcode (IORING_OP_SEND_ZC) is supported
+ */
+
+#ifndef MT25067_URING_H
+#define MT25067_URING_H
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <errno.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/syscall.h>
+#include <sys/uio.h>
+#include <linux/io_uring.h>
+
+typedef struct {
+    int fd;
+    unsigned sq_entries;
+    // Submission queue
+    unsigned *sq_head, *sq_tail, *sq_mask, *sq_array;
+    struct io_uring_sqe *sqes;
+    unsigned sqe_tail;          // local tail, published by uring_submit
+    // Completion queue
+    unsigned *cq_head, *cq_tail, *cq_mask;
+    struct io_uring_cqe *cqes;
+    // Mappings
+    void *sq_ptr, *cq_ptr;
+    size_t sq_len, cq_len, sqes_len;
+} Uring;
+
+static inline int uring_setup(unsigned entries, struct io_uring_params *p) {
+    return (int)syscall(__NR_io_uring_setup, entries, p);
+}
+
+static inline int uring_enter(int fd, unsigned to_submit, unsigned min_complete,
+                              unsigned flags) {
+    return (int)syscall(__NR_io_uring_enter, fd, to_submit, min_complete, flags, NULL, 0);
+}
+
+static inline int uring_register(int fd, unsigned opcode, void *arg, unsigned nr_args) {
+    return (int)syscall(__NR_io_uring_register, fd, opcode, arg, nr_args);
+}
+
+/*
+ * Create a ring with `entries` submission slots. Returns 0 or -1 with errno.
+ */
+static inline int uring_init(Uring *ring, unsigned entries) {
+    struct io_uring_params p;
+    memset(ring, 0, sizeof(*ring));
+    memset(&p, 0, sizeof(p));
+
+    ring->fd = uring_setup(entries, &p);
+    if (ring->fd < 0) {
+        return -1;
+    }
+
+    ring->sq_len = p.sq_off.array + p.sq_entries * sizeof(unsigned);
+    ring->cq_len = p.cq_off.cqes + p.cq_entries * sizeof(struct io_uring_cqe);
+    if (p.features & IORING_FEAT_SINGLE_MMAP) {
+        if (ring->cq_len > ring->sq_len) ring->sq_len = ring->cq_len;
+        ring->cq_len = ring->sq_len;
+    }
+    ring->sq_ptr = mmap(NULL, ring->sq_len, PROT_READ | PROT_WRITE,
+                        MAP_SHARED | MAP_POPULATE, ring->fd, IORING_OFF_SQ_RING);
+    if (ring->sq_ptr == MAP_FAILED) {
+        close(ring->fd);
+        return -1;
+    }
+    if (p.features & IORING_FEAT_SINGLE_MMAP) {
+        ring->cq_ptr = ring->sq_ptr;
+    } else {
+        ring->cq_ptr = mmap(NULL, ring->cq_len, PROT_READ | PROT_WRITE,
+                            MAP_SHARED | MAP_POPULATE, ring->fd, IORING_OFF_CQ_RING);
+        if (ring->cq_ptr == MAP_FAILED) {
+            munmap(ring->sq_ptr, ring->sq_len);
+            close(ring->fd);
+            return -1;
+        }
+    }
+    ring->sqes_len = p.sq_entries * sizeof(struct io_uring_sqe);
+    ring->sqes = (struct io_uring_sqe*)mmap(NULL, ring->sqes_len, PROT_READ | PROT_WRITE,
+                                            MAP_SHARED | MAP_POPULATE, ring->fd,
+                                            IORING_OFF_SQES);
+    if (ring->sqes == MAP_FAILED) {
+        if (ring->cq_ptr != ring->sq_ptr) munmap(ring->cq_ptr, ring->cq_len);
+        munmap(ring->sq_ptr, ring->sq_len);
+        close(ring->fd);
+        return -1;
+    }
+
+    char *sq = (char*)ring->sq_ptr, *cq = (char*)ring->cq_ptr;
+    ring->sq_entries = p.sq_entries;
+    ring->sq_head = (unsigned*)(sq + p.sq_off.head);
+    ring->sq_tail = (unsigned*)(sq + p.sq_off.tail);
+    ring->sq_mask = (unsigned*)(sq + p.sq_off.ring_mask);
+    ring->sq_array = (unsigned*)(sq + p.sq_off.array);
+    ring->sqe_tail = *ring->sq_tail;
+    ring->cq_head = (unsigned*)(cq + p.cq_off.head);
+    ring->cq_tail = (unsigned*)(cq + p.cq_off.tail);
+    ring->cq_mask = (unsigned*)(cq + p.cq_off.ring_mask);
+    ring->cqes = (struct io_uring_cqe*)(cq + p.cq_off.cqes);
+    return 0;
+}
+
+static inline void uring_exit(Uring *ring) {
+    munmap(ring->sqes, ring->sqes_len);
+    if (ring->cq_ptr != ring->sq_ptr) munmap(ring->cq_ptr, ring->cq_len);
+    munmap(ring->sq_ptr, ring->sq_len);
+    close(ring->fd);
+}
+
+/*
+ * Next free SQE (zeroed), or NULL when the submission queue is full
+ */
+static inline struct io_uring_sqe *uring_get_sqe(Uring *ring) {
+    unsigned head = __atomic_load_n(ring->sq_head, __ATOMIC_ACQUIRE);
+    if (ring->sqe_tail - head >= ring->sq_entries) {
+        return NULL;
+    }
+    unsigned idx = ring->sqe_tail & *ring->sq_mask;
+    struct io_uring_sqe *sqe = &ring->sqes[idx];
+    ring->sq_array[idx] = idx;
+    ring->sqe_tail++;
+    memset(sqe, 0, sizeof(*sqe));
+    return sqe;
+}
+
+/*
+ * Publish all queued SQEs and wait until at least wait_nr completions are
+ * available: one syscall for the whole batch. Returns SQEs submitted or -1.
+ */
+static inline int uring_submit(Uring *ring, unsigned wait_nr) {
+    unsigned to_submit = ring->sqe_tail - *ring->sq_tail;
+    __atomic_store_n(ring->sq_tail, ring->sqe_tail, __ATOMIC_RELEASE);
+    for (;;) {
+        int ret = uring_enter(ring->fd, to_submit, wait_nr,
+                              wait_nr ? IORING_ENTER_GETEVENTS : 0);
+        if (ret >= 0 || errno != EINTR) {
+            return ret;
+        }
+        to_submit = 0;  // already consumed before the signal
+    }
+}
+
+/*
+ * Next completion without blocking, or NULL; call uring_cqe_seen after use
+ */
+static inline struct io_uring_cqe *uring_peek_cqe(Uring *ring) {
+    unsigned head = *ring->cq_head;
+    if (head == __atomic_load_n(ring->cq_tail, __ATOMIC_ACQUIRE)) {
+        return NULL;
+    }
+    return &ring->cqes[head & *ring->cq_mask];
+}
+
+static inline void uring_cqe_seen(Uring *ring) {
+    __atomic_store_n(ring->cq_head, *ring->cq_head + 1, __ATOMIC_RELEASE);
+}
+
+/*
+ * Next completion, blocking until one arrives
+ */
+static inline struct io_uring_cqe *uring_wait_cqe(Uring *ring) {
+    struct io_uring_cqe *cqe;
+    while (!(cqe = uring_peek_cqe(ring))) {
+        if (uring_enter(ring->fd, 0, 1, IORING_ENTER_GETEVENTS) < 0 && errno != EINTR) {
+            return NULL;
+        }
+    }
+    return cqe;
+}
+
+/*
+ * Pin buffers for IORING_OP_*_FIXED / IORING_RECVSEND_FIXED_BUF (no
+ * per-request page lookup)
+ */
+static inline int uring_register_buffers(Uring *ring, const struct iovec *iov, unsigned n) {
+    return uring_register(ring->fd, IORING_REGISTER_BUFFERS, (void*)iov, n);
+}
+
+/*
+ * 1 if the running kernel supports opcode `op`, 0 otherwise
+ */
+static inline int uring_op_supported(Uring *ring, int op) {
+    size_t len = sizeof(struct io_uring_probe) + 256 * sizeof(struct io_uring_probe_op);
+    struct io_uring_probe *probe = (struct io_uring_probe*)calloc(1, len);
+    int supported = 0;
+    if (probe && uring_register(ring->fd, IORING_REGISTER_PROBE, probe, 256) == 0) {
+        supported = op <= probe->last_op &&
+                    (probe->ops[op].flags & IO_URING_OP_SUPPORTED);
+    }
+    free(probe);
+    return supported;
+}
+
+#endif /* MT25067_URING_H */
@@ -0,0 +1,50 @@
+"""
+MT25067
+Cell files named after sweep-grid labels (A2+spread+bp50) must load back
+under the same label.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from MT25067_PartC_Grid import grid_variants
+from MT25067_PartD_Latency import (HEADER_DTYPE, HIST_MAGIC, HIST_VERSION, Histogram,
+                                   HistogramSet, cell_hist_path, write_histogram)
+from MT25067_PartD_Timeseries import Series, SeriesSet, cell_series_path, write_cell_series
+
+LABELS = grid_variants(['A2', 'A3E'], fields=[32], arena=True,
+                       pins=['none', 'spread', '0-3,8'], busy_polls=[0, 50],
+                       sock_bufs=['0', '256k'])
+
+
+def _histogram():
+    header = np.zeros((), dtype=HEADER_DTYPE)
+    header['magic'], header['version'] = HIST_MAGIC, HIST_VERSION
+    header['num_buckets'] = 4
+    header['total_count'] = 3
+    return Histogram(header, np.array([0, 2, 1, 0], dtype=np.uint64))
+
+
+def test_labels_cover_placement_tokens():
+    assert 'A2PF32+cpu0-3.8+bp50+sb256k' in LABELS
+    assert any('+' in label for label in LABELS)
+
+
+def test_histograms_reload_under_grid_labels(tmp_path):
+    for label in LABELS:
+        write_histogram(_histogram(), cell_hist_path(label, 4096, 2, str(tmp_path)))
+    hists = HistogramSet.from_dir(str(tmp_path))
+    assert hists.keys() == sorted((label, 4096, 2) for label in LABELS)
+
+
+def test_series_reload_under_grid_labels(tmp_path):
+    client = Series(10 ** 7, 5, np.array([1.0, 2.0]), np.array([1.0, 1.0]))
+    for label in LABELS:
+        write_cell_series(cell_series_path(label, 4096, 2, str(tmp_path)), client)
+    series = SeriesSet.from_dir(str(tmp_path))
+    assert series.keys() == sorted((label, 4096, 2, 1) for label in LABELS)
+
@@ -0,0 +1,79 @@
+"""
+MT25067
+The comparator is a CI gate: exit 1 when a gated cell regressed, 0 when
+it did not, 2 when the two data sets share no cells.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import MT25067_PartD_Compare
+
+HEADER = "Implementation,MessageSize,NumThreads,Throughput_Gbps,Latency_us\n"
+
+BASELINE = HEADER + """\
+A2,4096,2,10.0,5.00
+A2,4096,2,10.1,5.05
+A2,4096,2,9.9,4.95
+"""
+
+# Same cells, throughput 20% lower
+SLOWER = HEADER + """\
+A2,4096,2,8.0,5.00
+A2,4096,2,8.1,5.05
+A2,4096,2,7.9,4.95
+"""
+
+# Same cells, within the 5% threshold
+NOISE = HEADER + """\
+A2,4096,2,9.8,5.02
+A2,4096,2,10.0,5.00
+A2,4096,2,9.9,4.97
+"""
+
+# A single trial cannot be tested: the threshold alone decides
+SINGLE = HEADER + "A2,4096,2,8.0,5.00\n"
+
+DISJOINT = HEADER + "A3,4096,2,8.0,5.00\n"
+
+
+def _run(tmp_path, monkeypatch, baseline, candidate, *extra):
+    paths = []
+    for name, text in (('baseline.csv', baseline), ('candidate.csv', candidate)):
+        path = tmp_path / name
+        path.write_text(text)
+        paths.append(str(path))
+    monkeypatch.setattr(sys, 'argv', ['MT25067_PartD_Compare.py', '-b', paths[0],
+                                      '-c', paths[1], '--no-plots'] + list(extra))
+    return MT25067_PartD_Compare.main()
+
+
+def test_regression_fails(tmp_path, monkeypatch):
+    assert _run(tmp_path, monkeypatch, BASELINE, SLOWER) == 1
+
+
+def test_noise_passes(tmp_path, monkeypatch):
+    assert _run(tmp_path, monkeypatch, BASELINE, NOISE) == 0
+
+
+def test_identical_data_passes(tmp_path, monkeypatch):
+    assert _run(tmp_path, monkeypatch, BASELINE, BASELINE) == 0
+
+
+def test_untested_cell_is_judged_on_the_threshold(tmp_path, monkeypatch):
+    assert _run(tmp_path, monkeypatch, BASELINE, SINGLE) == 1
+
+
+def test_threshold_can_be_raised(tmp_path, monkeypatch):
+    assert _run(tmp_path, monkeypatch, BASELINE, SLOWER,
+                '--threshold', 'Throughput_Gbps=0.25') == 0
+
+
+def test_improvement_passes(tmp_path, monkeypatch):
+    assert _run(tmp_path, monkeypatch, SLOWER, BASELINE) == 0
+
+
+def test_disjoint_data_sets(tmp_path, monkeypatch):
+    assert _run(tmp_path, monkeypatch, BASELINE, DISJOINT) == 2
@@ -0,0 +1,97 @@
+"""
+MT25067
+Cost model: the relative least-squares fit keeps every coefficient >= 0,
+and crossovers are only predicted from well-fitting models and checked
+against the measured cells around them.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from MT25067_PartD_Model import (_design, _lstsq_relative, check_crossover, crossover,
+                                 fit_models, reliable)
+from MT25067_PartD_Results import load_results
+
+SIZES = np.array([256, 1024, 4096, 16384] * 2, dtype=np.float64)
+THREADS = np.array([1] * 4 + [2] * 4, dtype=np.float64)
+
+# A2 = 1 + 0.001 s, A3 = 3 + 0.0005 s: A3 is faster above 4000 B
+SWEEP = """\
+Implementation,MessageSize,NumThreads,Throughput_Gbps,Latency_us
+A2,256,1,1.63,1.256
+A2,1024,1,4.05,2.024
+A2,4096,1,6.62,5.096
+A2,16384,1,7.53,17.384
+A2,256,2,1.63,1.256
+A2,1024,2,4.05,2.024
+A2,4096,2,6.62,5.096
+A2,16384,2,7.53,17.384
+A3,256,1,0.65,3.128
+A3,1024,1,2.36,3.512
+A3,4096,1,6.53,5.048
+A3,16384,1,11.9,11.192
+A3,256,2,0.65,3.128
+A3,1024,2,2.36,3.512
+A3,4096,2,6.53,5.048
+A3,16384,2,11.9,11.192
+"""
+
+
+def _cube(tmp_path, text=SWEEP):
+    path = tmp_path / 'sweep.csv'
+    path.write_text(text)
+    return load_results([str(path)])
+
+
+def test_lstsq_recovers_exact_coefficients():
+    coef = np.array([2.0, 0.01, 0.5, 0.001])
+    X = _design(SIZES, THREADS)
+    assert np.allclose(_lstsq_relative(X, X @ coef), coef)
+
+
+def test_lstsq_is_scale_invariant():
+    coef = np.array([2.0, 0.01, 0.5, 0.001])
+    X = _design(SIZES, THREADS)
+    assert np.allclose(_lstsq_relative(X, 10 * X @ coef), 10 * coef)
+
+
+def test_lstsq_keeps_coefficients_non_negative():
+    # Latency falling with threads would need a negative contention term
+    X = _design(SIZES, THREADS)
+    y = 5.0 + 0.01 * SIZES - 1.0 * (THREADS - 1)
+    unconstrained, *_ = np.linalg.lstsq(X / y[:, None], np.ones_like(y), rcond=None)
+    assert (unconstrained < 0).any()
+    coef = _lstsq_relative(X, y)
+    assert (coef >= 0).all()
+    assert (X @ coef > 0).all()
+
+
+def test_crossover_of_well_fitting_models(tmp_path):
+    cube = _cube(tmp_path)
+    models = fit_models(cube)
+    assert reliable(models['A2']) and reliable(models['A3'])
+    size, side = crossover(models['A2'], models['A3'], 1)
+    assert side == 'above'
+    assert abs(size - 4000) < 1
+    assert check_crossover(cube, 'A2', 'A3', 1, size, side).size == 0
+
+
+def test_check_flags_the_bracketing_cells_that_disagree(tmp_path):
+    cube = _cube(tmp_path)
+    # Predicted above 8 KB, but A3 already measured faster at 4 KB
+    assert check_crossover(cube, 'A2', 'A3', 1, 8000.0, 'above').tolist() == [4096]
+    # Only the cells on either side of the crossover are checked
+    assert check_crossover(cube, 'A2', 'A3', 1, 2000.0, 'below').tolist() == [1024, 4096]
+    # 'never' disagrees with every cell the challenger won
+    assert check_crossover(cube, 'A2', 'A3', 2, None, 'never').tolist() == [4096, 16384]
+
+
+def test_poorly_fitting_model_is_unreliable(tmp_path):
+    noisy = SWEEP.replace('A2,1024,2,4.05,2.024', 'A2,1024,2,4.05,10.0')
+    models = fit_models(_cube(tmp_path, noisy))
+    assert not reliable(models['A2'])
+    assert reliable(models['A3'])
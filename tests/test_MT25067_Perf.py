@@ -0,0 +1,78 @@
+"""
+MT25067
+perf stat -x, / -j ingestion: "<not counted>" rows are skipped rather than
+summed as 0, and the lowest enabled/running ratio of a cell is reported.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from MT25067_PartC_Perf import (parse_perf_file, perf_fields, running_field, summarize,
+                                thread_rows)
+
+PROCESS_CSV = """\
+# started on Mon Jan  1 00:00:00 2024
+
+1200000,,cycles,2000000,100.00,,
+900000,,instructions,2000000,100.00,0.75,insn per cycle
+<not counted>,,cache-misses,0,0.00,,
+4000,,L1-dcache-load-misses,1250000,62.50,,
+17,,context-switches,2000000,100.00,,
+1500000000,ns,duration_time,1500000000,100.00,,
+"""
+
+THREAD_CSV = """\
+A1-conn-1-4242,1000,,cpu_core/cycles/,500,100.00,,
+A1-conn-1-4242,800,,instructions,500,100.00,,
+A1-conn-2-4243,3000,,cycles:u,500,80.00,,
+A1-conn-2-4243,<not supported>,,instructions,0,0.00,,
+"""
+
+PROCESS_JSON = """\
+{"counter-value" : "5000.000000", "unit" : "", "event" : "cycles", "pcnt-running" : 50.00}
+{"counter-value" : "<not counted>", "unit" : "", "event" : "instructions", "pcnt-running" : 0.00}
+"""
+
+
+def _write(tmp_path, text, name='perf.txt'):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_not_counted_rows_are_skipped(tmp_path):
+    counts = parse_perf_file(_write(tmp_path, PROCESS_CSV))
+    assert [c.event for c in counts] == ['cycles', 'instructions', 'L1-dcache-load-misses',
+                                         'context-switches', 'duration_time']
+    summary = summarize(counts)
+    assert summary['cycles'] == 1200000
+    assert summary['cache-misses'] is None
+    assert summary['elapsed'] == 1.5
+
+
+def test_fields_leave_uncounted_events_empty(tmp_path):
+    summary = summarize(parse_perf_file(_write(tmp_path, PROCESS_CSV)))
+    assert perf_fields(summary) == ['1200000', '900000', '', '4000', '17', '1.500000']
+
+
+def test_running_pct_is_the_lowest_ratio(tmp_path):
+    summary = summarize(parse_perf_file(_write(tmp_path, PROCESS_CSV)))
+    assert running_field(summary) == '62.50'
+
+
+def test_per_thread_rows_split_comm_and_tid(tmp_path):
+    counts = parse_perf_file(_write(tmp_path, THREAD_CSV))
+    rows = thread_rows(['A1', 16384, 2], counts)
+    assert [row[3:5] for row in rows] == [['A1-conn-1', 4242], ['A1-conn-2', 4243]]
+    assert rows[0][5:7] == ['1000', '800']
+    assert rows[1][5:7] == ['3000', '']
+    assert rows[1][-1] == '80.00'
+
+
+def test_json_output(tmp_path):
+    summary = summarize(parse_perf_file(_write(tmp_path, PROCESS_JSON, 'perf.json')))
+    assert summary['cycles'] == 5000
+    assert summary['instructions'] is None
+    assert running_field(summary) == '50.00'
@@ -0,0 +1,51 @@
+"""
+MT25067
+Welch's t-test from summary statistics and the Holm-Bonferroni correction.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from MT25067_PartD_Stats import holm, welch_test
+
+
+def test_welch_matches_textbook_values():
+    t, df, p = welch_test(10.0, 1.0, 10, 11.0, 1.0, 10)
+    assert abs(t - np.sqrt(5.0)) < 1e-9
+    assert abs(df - 18.0) < 1e-9
+    assert abs(p - 0.0382) < 5e-4
+
+
+def test_welch_unequal_variances():
+    t, df, _ = welch_test(10.0, 1.0, 5, 12.0, 3.0, 8)
+    assert abs(t - 2.0 / np.sqrt(0.2 + 9.0 / 8)) < 1e-9
+    assert abs(df - 9.2012) < 1e-4
+
+
+def test_welch_is_elementwise_and_untestable_cells_are_nan():
+    _, _, p = welch_test([10.0, 10.0, 10.0], [1.0, 0.0, 1.0], [5, 3, 1],
+                         [10.0, 10.0, 11.0], [3.0, 0.0, 1.0], [8, 3, 5])
+    assert p[0] == 1.0
+    assert p[1] == 1.0
+    assert np.isnan(p[2])
+
+
+def test_welch_zero_variance_different_means():
+    _, _, p = welch_test(10.0, 0.0, 3, 11.0, 0.0, 3)
+    assert p == 0.0
+
+
+def test_holm_step_down_is_monotone():
+    adjusted = holm([0.01, 0.04, 0.03, np.nan])
+    assert np.allclose(adjusted[:3], [0.03, 0.06, 0.06])
+    assert np.isnan(adjusted[3])
+
+
+def test_holm_caps_at_one_and_keeps_shape():
+    adjusted = holm(np.array([[0.5, 0.9], [np.nan, 0.2]]))
+    assert adjusted.shape == (2, 2)
+    assert np.allclose(adjusted[[0, 0, 1], [0, 1, 1]], [1.0, 1.0, 0.6])
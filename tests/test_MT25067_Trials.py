@@ -0,0 +1,104 @@
+"""
+MT25067
+Adaptive trials: a cell stops once every interval is within the target (never
+before min_trials, always at max_trials), outlier trials are flagged but kept
+out of the intervals, and every trial's histogram and series are kept.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from MT25067_PartC_Trials import read_trials
+from MT25067_PartD_Latency import (HEADER_DTYPE, HIST_MAGIC, HIST_VERSION, Histogram,
+                                   add_histogram, cell_hist_path, load_histogram)
+from MT25067_PartD_Stats import outlier_mask
+from MT25067_PartD_Timeseries import Series, SeriesSet, cell_series_path, write_cell_series
+
+HEADER = "Implementation,MessageSize,NumThreads,Throughput_Gbps,Latency_us\n"
+
+TIGHT = HEADER + """\
+A2,4096,2,10.0,5.00
+A2,4096,2,10.1,5.05
+A2,4096,2,9.9,4.95
+"""
+
+SCATTERED = HEADER + """\
+A2,4096,2,10.0,5.0
+A2,4096,2,12.0,6.0
+A2,4096,2,8.0,4.0
+"""
+
+WITH_OUTLIER = TIGHT + """\
+A2,4096,2,10.05,5.02
+A2,4096,2,30.0,5.00
+"""
+
+
+def _trials(tmp_path, text, **limits):
+    path = tmp_path / 'trials.csv'
+    path.write_text(text)
+    return read_trials(str(path), **limits)
+
+
+def _histogram():
+    header = np.zeros((), dtype=HEADER_DTYPE)
+    header['magic'], header['version'] = HIST_MAGIC, HIST_VERSION
+    header['num_buckets'] = 4
+    header['total_count'] = 3
+    return Histogram(header, np.array([0, 2, 1, 0], dtype=np.uint64))
+
+
+def test_converged_cell_stops(tmp_path):
+    assert _trials(tmp_path, TIGHT).done()
+
+
+def test_min_trials_run_even_when_converged(tmp_path):
+    assert not _trials(tmp_path, TIGHT, min_trials=4).done()
+
+
+def test_scattered_cell_runs_until_max_trials(tmp_path):
+    assert not _trials(tmp_path, SCATTERED).done()
+    assert _trials(tmp_path, SCATTERED, max_trials=3).done()
+
+
+def test_outlier_is_flagged_and_left_out_of_the_interval(tmp_path):
+    trials = _trials(tmp_path, WITH_OUTLIER)
+    assert trials.outliers().tolist() == [False, False, False, False, True]
+    mean, _ = trials.intervals()['Throughput_Gbps']
+    assert abs(mean - 10.0125) < 1e-9
+    assert [row[-2:] for row in trials.trial_rows()][-1] == ['5', '1']
+    summary = trials.summary_row()
+    assert summary[3:5] == ['5', '1']
+    assert summary[-1] == '1'
+
+
+def test_outlier_mask_needs_three_values_and_ignores_nan():
+    assert not outlier_mask([1.0, 100.0]).any()
+    assert outlier_mask([1.0, 1.1, np.nan, 0.9, 50.0]).tolist() == [False, False, False,
+                                                                    False, True]
+
+
+def test_outlier_mask_with_zero_mad():
+    assert outlier_mask([5.0, 5.0, 5.0, 5.0, 9.0]).tolist() == [False] * 4 + [True]
+    assert not outlier_mask([5.0, 5.0, 5.0]).any()
+
+
+def test_trials_keep_their_own_series(tmp_path):
+    client = Series(10 ** 7, 5, np.array([1.0, 2.0]), np.array([1.0, 1.0]))
+    for trial in (1, 2, 3):
+        write_cell_series(cell_series_path('A2', 4096, 2, str(tmp_path), trial=trial), client)
+    series = SeriesSet.from_dir(str(tmp_path))
+    assert series.keys() == [('A2', 4096, 2, trial) for trial in (1, 2, 3)]
+
+
+def test_trials_add_up_in_the_cell_histogram(tmp_path):
+    path = cell_hist_path('A2', 4096, 2, str(tmp_path))
+    for _ in range(3):
+        add_histogram(_histogram(), path)
+    stored = load_histogram(path)
+    assert stored.total == 9
+    assert int(stored.header['total_count']) == 9